@@ -0,0 +1,4 @@
+"""
+Synthetic-data benchmark suite for the fms ingest, analysis and query hot paths.
+Run with ``python -m benchmarks.run``, see run.py for the options.
+"""
@@ -0,0 +1,735 @@
+"""
+Generators for synthetic FMS input files and database fixtures.
+
+Every writer takes a target directory and a seed, and returns the path of the file
+it created. The files mimic the layout of the real test-bench exports closely enough
+to go through the production parsers unchanged (same headers, separators, encodings,
+skipped rows and file naming conventions).
+"""
+
+# Standard library
+import json
+import os
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+    from fms import FMSDataStructure
+
+# Third-party
+import numpy as np
+import pandas as pd
+import openpyxl
+from openpyxl.styles import PatternFill
+
+# Header names of the FMS flow logs, in the order of FMSFlowTestParameters.
+FLOW_LOG_COLUMNS = [
+    "Logtime [s]", "Tu [-]", "Ku [-]", "Heater Proportional Gain [-]",
+    "Heater Integral Gain [1/s]", "Closed Loop Setpoint [degC]",
+    "LPT Voltage [mV]", "LPT Pressure [barA]",
+    "Bridge Voltage [mV]/Resistance [ohm]", "LPT Temperature [degC]",
+    "Duty Cycle 2 [%]", "Duty Cycle [%]", "Closed Loop Setpoint [barA]",
+    "Inlet Pressure [barG]", "PC1 Pressure [barA]",
+    "PC1 Pressure Setpoint [barA]", "PC3 Pressure [barA]",
+    "PC3 Pressure Setpoint [barA]", "Anode Pressure [barA]",
+    "Anode Temperature [degC]", "Anode Mass Flow [mg/s]",
+    "Cathode Pressure [barA]", "Cathode Temperature [degC]",
+    "Cathode Mass Flow [mg/s]", "Anode-to-Cathode Ration [-]",
+    "Vacuum Pressure [mbar]", "TV PT1000 [degC]",
+    "Anode Estimated Flow Rate [mg/s]", "Cathode Estimated Flow Rate [mg/s]",
+    "AC Gas Select [Kr=17, Xe=18]", "Filtered LPT Temperature [degC]",
+    "HPIV Status [Open [1]/Closed [0]]", "TV Power [W]",
+    "TV Voltage [Vrms]", "TV Current [Irms]", "Total Mass Flow [mg/s]",
+    "Average TV Power [W]"
+]
+
+FMS_TVAC_CHANNELS = [
+    '104 <TRP1> (C)', '105 <TRP2> (C)', '106 <TV inlet> (C)', '107 <Manifold> (C)',
+    '108 <LPT> (C)', '109 <HPIV> (C)', '110 <TV outlet> (C)', '113 <FMS inlet> (C)',
+    '114 <Anode outlet> (C)', '115 <Cathode outlet> (C)'
+]
+
+# Nominal LPT sensitivity [mV/bar] and total flow model [mg/s] = a*p + b*p^2,
+# chosen so that a fraction of the generated FR sets passes the FMS flow spec.
+LPT_SENSITIVITY = 14.3
+TOTAL_FLOW_COEFFICIENTS = (0.912, 0.332)
+FR_PRESSURES = [1, 1.5, 2, 2.4]
+AC_RATIO = 13
+
+
+def total_flow_model(pressure: np.ndarray | float) -> np.ndarray | float:
+    a, b = TOTAL_FLOW_COEFFICIENTS
+    return a * pressure + b * pressure**2
+
+
+def write_tv_test_xls(directory: str, tv_id: int = 1, opening_temperature: float = 97, hysteresis: float = 5,
+                      heating_rows: int = 1500, cooling_rows: int = 900, seed: int = 0) -> str:
+    """
+    Write a thermal valve opening test log (whitespace separated text with an .xls extension).
+    Args:
+        directory (str): Target directory.
+        tv_id (int): Thermal valve serial, used in the file name.
+        opening_temperature (float): Temperature [degC] at which the flow rises on heating.
+        hysteresis (float): Shift [degC] of the opening on cooling.
+        heating_rows (int): Number of samples in the heating phase.
+        cooling_rows (int): Number of samples in the cooling phase.
+        seed (int): Random seed for the measurement noise.
+    Returns:
+        str: Path of the written file.
+    """
+    rng = np.random.default_rng(seed)
+    heating = np.linspace(25, 140, heating_rows)
+    cooling = np.linspace(140, 40, cooling_rows)
+    temps = np.concatenate([heating, cooling])
+    centers = np.concatenate([np.full(heating_rows, opening_temperature), np.full(cooling_rows, opening_temperature - hysteresis)])
+    flows = 0.02 + 1.0 / (1 + np.exp(-(temps - centers) / 2.5)) + rng.normal(0, 0.002, len(temps))
+    logtime = np.arange(len(temps)) * 0.5
+
+    lines = [f"TV {tv_id} opening test", "Generated benchmark data", "\t".join(["t", "flow", "gas", "T1f", "T2", "T1", "T2f"])]
+    for t, f, T in zip(logtime, flows, temps):
+        noise = rng.normal(0, 0.05, 3)
+        lines.append(f"{t:.1f}\t{f:.5f}\t18\t{T + noise[0]:.3f}\t{T + noise[1]:.3f}\t{T + noise[2]:.3f}\t{T:.3f}")
+
+    path = os.path.join(directory, f"TV{tv_id:03d}_opening_test.xls")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    return path
+
+
+def _flow_log_signals(test_type: str, rng: np.random.Generator, plateau_rows: int, lpt_set_points: list[float],
+                      lpt_pressures: list[float]) -> dict[str, np.ndarray]:
+    if test_type == "slope":
+        n = plateau_rows * 6
+        avg_power = np.linspace(0, 30, n)
+        total_flow = 0.05 + 4.6 / (1 + np.exp(-(avg_power - 14) / 4))
+        lpt_pressure = np.interp(total_flow, total_flow_model(np.linspace(0, 3, 300)), np.linspace(0, 3, 300))
+        clp = np.zeros(n)
+    elif test_type == "closed_loop":
+        pre_rows = 60
+        n = pre_rows + plateau_rows * len(lpt_set_points)
+        clp = np.zeros(n)
+        for idx, set_point in enumerate(lpt_set_points):
+            clp[pre_rows + idx * plateau_rows: pre_rows + (idx + 1) * plateau_rows] = set_point
+        # First order response of the LPT pressure on the closed loop set point
+        lpt_pressure = np.zeros(n)
+        for i in range(pre_rows, n):
+            lpt_pressure[i] = lpt_pressure[i - 1] + (clp[i] - lpt_pressure[i - 1]) / 15
+        total_flow = 0.01 + total_flow_model(lpt_pressure)
+        avg_power = np.where(np.arange(n) >= pre_rows, 5 + 6 * lpt_pressure, 0)
+    elif test_type == "fr_characteristics":
+        ramp_rows = 10
+        segments = []
+        previous = 0
+        for target in lpt_pressures:
+            segments.append(np.linspace(previous, target, ramp_rows, endpoint=False))
+            segments.append(np.full(plateau_rows, float(target)))
+            previous = target
+        lpt_pressure = np.concatenate(segments)
+        n = len(lpt_pressure)
+        clp = lpt_pressure.copy()
+        total_flow = total_flow_model(lpt_pressure)
+        avg_power = 5 + 6 * lpt_pressure
+    else:
+        raise ValueError(f"Unknown flow test type: {test_type}")
+
+    noise = rng.normal(0, 1, n)
+    if test_type != "fr_characteristics":
+        lpt_pressure = lpt_pressure + 0.0003 * noise
+    return {
+        "closed_loop_pressure": clp,
+        "lpt_pressure": lpt_pressure,
+        "total_flow": total_flow + (0.001 * noise if test_type == "slope" else 0),
+        "avg_tv_power": avg_power,
+    }
+
+
+def write_flow_log(directory: str, test_type: str = "slope", test_id: str = "2025_03_14_10-22-31", inlet_pressure: float = 190,
+                   temperature: float = 22, plateau_rows: int = 300, seed: int = 0,
+                   lpt_set_points: list[float] = [1, 1.625, 2.25, 1.625, 1, 0.2],
+                   lpt_pressures: list[float] = [0.75, 1, 1.25, 1.5, 1.75, 2, 2.25, 2.4]) -> str:
+    """
+    Write an FMS functional flow log as exported by the test bench (tab separated, title line,
+    37 column header and a leading dummy row).
+    Args:
+        directory (str): Target directory.
+        test_type (str): 'slope', 'closed_loop' or 'fr_characteristics'.
+        test_id (str): Test ID in the '%Y_%m_%d_%H-%M-%S' format, used as file name prefix.
+        inlet_pressure (float): Mean inlet pressure [barG], 190 for high and 10 for low pressure tests.
+        temperature (float): TRP temperature [degC].
+        plateau_rows (int): Rows per set point (closed loop, fr_characteristics) or sixth of the slope ramp.
+        seed (int): Random seed for the measurement noise.
+        lpt_set_points (list[float]): Closed loop set points [barA].
+        lpt_pressures (list[float]): FR characteristics pressure steps [barA].
+    Returns:
+        str: Path of the written file.
+    """
+    rng = np.random.default_rng(seed)
+    signals = _flow_log_signals(test_type, rng, plateau_rows, lpt_set_points, lpt_pressures)
+    lpt_pressure = signals["lpt_pressure"]
+    total_flow = signals["total_flow"]
+    avg_power = signals["avg_tv_power"]
+    n = len(lpt_pressure)
+    tv_power = avg_power + rng.normal(0, 0.05, n) * (avg_power > 0)
+    tv_voltage = np.sqrt(np.clip(tv_power, 0, None) * 150)
+
+    columns = [
+        np.arange(n, dtype=float),                                  # logtime
+        np.full(n, 120.0), np.full(n, 0.8), np.full(n, 2.5),         # Tu, Ku, heater gain
+        np.full(n, 0.05), np.zeros(n),                              # heater integral, closed loop temp
+        lpt_pressure * LPT_SENSITIVITY,                             # lpt voltage
+        lpt_pressure,                                               # lpt pressure
+        np.full(n, 3450.0),                                         # bridge voltage
+        temperature + rng.normal(0, 0.1, n),                        # lpt temp
+        np.clip(tv_power / 0.3, 0, 100), np.clip(tv_power / 0.3, 0, 100),  # duty cycles
+        signals["closed_loop_pressure"],                            # closed loop pressure
+        inlet_pressure + rng.normal(0, 0.3, n),                     # inlet pressure
+        lpt_pressure + 0.01, lpt_pressure,                          # pc1 pressure, setpoint
+        np.full(n, 0.001), np.full(n, 0.001),                       # pc3 pressure, setpoint
+        lpt_pressure * 0.6, np.full(n, temperature),                # anode pressure, temp
+        total_flow * AC_RATIO / (AC_RATIO + 1),                     # anode flow
+        lpt_pressure * 0.6, np.full(n, temperature),                # cathode pressure, temp
+        total_flow / (AC_RATIO + 1),                                # cathode flow
+        np.full(n, float(AC_RATIO)), np.full(n, 1e-5),              # ratio, vacuum
+        20 + 3 * avg_power,                                         # tv pt1000
+        total_flow * AC_RATIO / (AC_RATIO + 1), total_flow / (AC_RATIO + 1),  # estimated flows
+        np.full(n, 18.0), temperature + rng.normal(0, 0.02, n),     # gas select, filtered lpt temp
+        np.ones(n),                                                 # hpiv status
+        tv_power, tv_voltage, tv_voltage / 150,                     # tv power, voltage, current
+        total_flow, avg_power,                                      # total flow, average tv power
+    ]
+    df = pd.DataFrame(np.column_stack(columns), columns=FLOW_LOG_COLUMNS)
+    df = pd.concat([pd.DataFrame([np.zeros(len(FLOW_LOG_COLUMNS))], columns=FLOW_LOG_COLUMNS), df], ignore_index=True)
+
+    suffix = {"slope": "Slope", "closed_loop": "Closed Loop", "fr_characteristics": "FR Characteristics"}[test_type]
+    path = os.path.join(directory, f"{test_id}_LP_{suffix}.xls")
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("LP FMS functional test log\n")
+        df.to_csv(f, sep="\t", index=False, float_format="%.6g")
+    return path
+
+
+def write_fms_tvac_csv(directory: str, start: datetime = datetime(2025, 3, 14, 10, 22, 31), rows: int = 20000,
+                       interval: float = 2.0, with_preamble: bool = False, seed: int = 0) -> str:
+    """
+    Write an FMS TVAC cycle export (UTF-16, comma separated, 'Scan'/'Time' plus the thermocouple channels).
+    Args:
+        directory (str): Target directory.
+        start (datetime): Timestamp of the first scan, also encoded in the file name.
+        rows (int): Number of scans.
+        interval (float): Seconds between scans.
+        with_preamble (bool): Prepend the 18 line logger header ('name: ...') some exports contain.
+        seed (int): Random seed for the measurement noise.
+    Returns:
+        str: Path of the written file.
+    """
+    rng = np.random.default_rng(seed)
+    seconds = np.arange(rows) * interval
+    cycle = 45 * np.sin(2 * np.pi * seconds / (6 * 3600)) + 25
+    times = [(start + timedelta(seconds=float(s))).strftime("%m/%d/%Y %H:%M:%S:%f")[:-3] for s in seconds]
+
+    data = {"Scan": np.arange(1, rows + 1), "Time": times}
+    for idx, channel in enumerate(FMS_TVAC_CHANNELS):
+        data[channel] = np.round(cycle + idx * 0.5 + rng.normal(0, 0.2, rows), 3)
+    df = pd.DataFrame(data)
+
+    name = f"FMS TVAC {start.month}_{start.day}_{start.year} {start.hour}_{start.minute}_{start.second}.csv"
+    path = os.path.join(directory, name)
+    with open(path, "w", encoding="utf-16", newline="") as f:
+        if with_preamble:
+            f.write("name: benchmark logger\n")
+            for i in range(17):
+                f.write(f"header line {i}\n")
+        df.to_csv(f, index=False)
+    return path
+
+
+def write_tv_tvac_csv(directory: str, start: datetime = datetime(2025, 3, 14, 10, 22, 31), rows: int = 20000,
+                      interval: float = 5.0, seed: int = 0) -> str:
+    """
+    Write a thermal valve life cycle TVAC export (UTF-16, 16 line preamble, 16 columns including alarms).
+    Args:
+        directory (str): Target directory.
+        start (datetime): Timestamp of the first scan.
+        rows (int): Number of scans.
+        interval (float): Seconds between scans.
+        seed (int): Random seed for the measurement noise.
+    Returns:
+        str: Path of the written file.
+    """
+    rng = np.random.default_rng(seed)
+    seconds = np.arange(rows) * interval
+    cycle = 50 * np.sin(2 * np.pi * seconds / 3600) + 60
+    lines = [f"Preamble line {i}" for i in range(16)]
+    for i, s in enumerate(seconds):
+        t = (start + timedelta(seconds=float(s))).strftime("%d-%m-%Y %H:%M:%S:%f")[:-3]
+        noise = rng.normal(0, 0.2, 4)
+        values = [
+            i + 1, t,
+            f"{cycle[i] + noise[0]:.3f}", 0, f"{cycle[i] + noise[1]:.3f}", 0,
+            f"{cycle[i] * 0.8 + noise[2]:.3f}", 0, f"{cycle[i] * 0.7 + noise[3]:.3f}", 0,
+            "1.0E-05", 0, f"{12 + noise[0]:.3f}", 0, f"{0.08 + noise[1] / 100:.4f}", 0,
+        ]
+        lines.append(",".join(str(v) for v in values))
+
+    path = os.path.join(directory, f"TV TVAC data {start.strftime('%Y%m%d_%H%M%S')}.csv")
+    with open(path, "w", encoding="utf-16", newline="") as f:
+        f.write("\n".join(lines) + "\n")
+    return path
+
+
+def write_lpt_calibration_json(directory: str, serial: str = "P300001", sensitivity: float = LPT_SENSITIVITY,
+                               reference_temperature: float = 22, base_resistance: float = 3450) -> str:
+    """
+    Write an LPT calibration file with a linear pressure and temperature model.
+    Args:
+        directory (str): Target directory.
+        serial (str): LPT serial number.
+        sensitivity (float): Pressure sensitivity [mV/bar].
+        reference_temperature (float): Temperature [degC] at the base resistance.
+        base_resistance (float): Bridge resistance [ohm] at the reference temperature.
+    Returns:
+        str: Path of the written file.
+    """
+    pressure = np.zeros((4, 4))
+    pressure[1, 0] = 1 / sensitivity
+    k = 0.1
+    temperature = np.zeros((4, 4))
+    temperature[0, 0] = reference_temperature - base_resistance * k
+    temperature[1, 0] = k
+    data = {
+        "header": {"serialNumber": serial, "creationDate": "2025-01-15"},
+        "compensationMethods": {
+            "mathematicalModels": {
+                "polynomial3x3": {
+                    "parts": {
+                        "pressure": {"coefficients": pressure.tolist()},
+                        "temperature": {"coefficients": temperature.tolist()},
+                    }
+                }
+            }
+        },
+    }
+    path = os.path.join(directory, f"{serial}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    return path
+
+
+def _fr_flow_rates(rng: np.random.Generator, fr_type: str, spread: float = 0.015) -> list[float]:
+    total = total_flow_model(np.array(FR_PRESSURES))
+    share = AC_RATIO / (AC_RATIO + 1) if fr_type == "anode" else 1 / (AC_RATIO + 1)
+    return [round(float(v), 4) for v in total * share * rng.normal(1, spread)]
+
+
+def write_fr_workbook(directory: str, fr_type: str = "anode", certification: str = "C25-0053", count: int = 200,
+                      seed: int = 0) -> str:
+    """
+    Write an FR test database workbook ('Anode FR Database' / 'Cathode FR Database') starting at row 3,
+    with a solid fill on column A for a subset of the rows (second operator flag).
+    Args:
+        directory (str): Target directory.
+        fr_type (str): 'anode' or 'cathode'.
+        certification (str): Certification batch of the restrictors.
+        count (int): Number of restrictors.
+        seed (int): Random seed for the flow rate spread.
+    Returns:
+        str: Path of the written file.
+    """
+    rng = np.random.default_rng(seed)
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = f"{fr_type.capitalize()} FR Database"
+    ws.append([f"{fr_type.capitalize()} FR test database"])
+    ws.append(["#", "Certification", "Drawing", "ID", "Thickness", "Orifice", "Deviation", "Radius", "Temperature",
+               "1 bar", "1.5 bar", "2 bar", "2.4 bar", "TRS", "Allocated", "Remark"])
+    drawing = "20025,10,18-R4-005" if fr_type == "anode" else "20025,10,18-R4-001"
+    orifice = 0.07095 if fr_type == "anode" else 0.01968
+    fill = PatternFill(fill_type="solid", start_color="FFFF00", end_color="FFFF00")
+    for i in range(1, count + 1):
+        ws.append([i, certification, drawing, i, round(float(rng.normal(0.25, 0.003)), 4),
+                   round(float(orifice * rng.normal(1, 0.01)), 5), round(float(rng.normal(0, 2)), 2),
+                   round(float(rng.normal(0.235, 0.005)), 4), 22.0, *_fr_flow_rates(rng, fr_type),
+                   "FMS-LP-BE-TRS-0021", None, None])
+        if i % 7 == 0:
+            ws.cell(row=ws.max_row, column=1).fill = fill
+
+    path = os.path.join(directory, f"FR Testing - {fr_type.capitalize()}.xlsx")
+    wb.save(path)
+    return path
+
+
+def _hpiv_report_pages(serial: str, rng: np.random.Generator) -> dict[int, list[str]]:
+    def sci(value: float) -> str:
+        exponent = int(np.floor(np.log10(value)))
+        return f"{value / 10**exponent:.1f}×10{exponent}"
+
+    leak = []
+    for size in ("4", "6", "15"):
+        leak += [size, "GHe", f"{rng.normal(320, 2):.1f}", "bar", "5 min", "≤ 1.0×10-6", sci(rng.uniform(1e-8, 9e-7)),
+                 "scc/s", f"{rng.normal(5, 0.2):.2f}", "bar", sci(rng.uniform(1e-8, 9e-7)), "scc/s"]
+    vib = ["5 – 2000 Hz"]
+    for _ in range(2):
+        vib += [f"{rng.normal(1200, 50):.0f} Hz", f"{rng.normal(20, 2):.1f} g", f"{rng.normal(1250, 50):.0f} Hz",
+                f"{rng.normal(21, 2):.1f} g", "-", "-"]
+    return {
+        0: ["ACCEPTANCE TEST REPORT", f"Valve Serial Number : {serial}"],
+        10: ["Weight", "200 gr Maximum", f"{rng.normal(150, 3):.1f} g", "Proof pressure", "Valve Open",
+             f"{rng.normal(500, 5):.1f}", "Valve Closed", f"{rng.normal(400, 5):.1f}"],
+        11: ["Leak test", "Size"] + leak,
+        13: ["Vibration"] + vib[:11] + ["Vibration (grms)", f"{rng.normal(10, 0.3):.2f}", f"{rng.normal(10, 0.3):.2f}"],
+        20: ["Dielectric strength", "< 2", f"{rng.uniform(0.1, 1):.2f}", "Insulation resistance", "> 100", "∞"],
+        21: ["Power consumption", "20±2", f"{rng.normal(20, 0.5):.1f}", "43.3±0.5", f"{rng.normal(43.3, 0.1):.2f}",
+             "< 10", f"{rng.normal(6, 0.2):.2f}", "External leak", "≤ 1.0×10-10", sci(rng.uniform(1e-12, 9e-11))],
+        22: ["Pull-in", "> 310", f"{rng.normal(320, 2):.1f}", "< 18", f"{rng.normal(12, 1):.2f}", "Drop-out",
+             "2 < x < 3.1", f"{rng.normal(2.5, 0.1):.2f}"],
+        23: ["Response", "> 310", f"{rng.normal(320, 2):.1f}", "18±0.2", "18.0", "< 20", f"{rng.normal(10, 1):.2f}",
+             "32±0.2", "32.0", "< 20", f"{rng.normal(9, 1):.2f}", "< 1", f"{rng.uniform(0.1, 0.9):.2f}",
+             "> 10", f"{rng.normal(15, 1):.2f}"],
+        24: ["Cleanliness", "6-10", "140", f"{rng.integers(0, 100)}", "11-25", "20", f"{rng.integers(0, 15)}",
+             "26-50", "5", "-", "51-100", "1", "-", "Over 100", "0", "-"],
+    }
+
+
+def write_test_directory_tree(directory: str, count: int = 20, images: int = 6) -> str:
+    """
+    Write the FMS test folder layout of the share: per FMS an Electrical folder with HPIV scope images,
+    10/190 bara functional test folders and a TVAC folder with cycles and -15/22/70 degC phases,
+    each with its own Electrical and functional test folders. Files are empty.
+    Args:
+        directory (str): Target directory.
+        count (int): Number of FMS test folders.
+        images (int): Scope images per Electrical folder.
+    Returns:
+        str: Root of the tree, usable as test directory.
+    """
+    root = os.path.join(directory, "70 - Testing")
+
+    def touch(folder: str, *names: str) -> None:
+        os.makedirs(folder, exist_ok=True)
+        for name in names:
+            open(os.path.join(folder, name), "w").close()
+
+    scope_images = [f"tek{i:04d}.png" for i in range(images)]
+    for i in range(count):
+        fms = os.path.join(root, f"LP FMS 25-{100 + i:03d} Acceptance Testing")
+        touch(os.path.join(fms, "Electrical Tests"), *scope_images, "notes.txt")
+        for pressure in ("10 bara", "190 bara"):
+            touch(os.path.join(fms, "Functional Tests", pressure), "2025_03_14_10-22-31_slope.xls", "2025_03_14_12-05-10_closed loop.xls")
+        tvac = os.path.join(fms, "TVAC")
+        touch(os.path.join(tvac, "Cycles"), *[f"cycle_{c}.csv" for c in range(4)])
+        for temperature in ("-15 degC", "22 degC", "70 degC"):
+            touch(os.path.join(tvac, temperature, "Electrical"), *scope_images)
+            touch(os.path.join(tvac, temperature, "Functional", "10 bara"), "2025_03_15_09-00-00_open loop.xls")
+    return root
+
+
+def write_trs_share(directory: str, count: int = 2000) -> str:
+    """
+    Write the TRS folder of the share: issued FR TRS documents (revisions and PDF exports included)
+    and unrelated documents of the same folder. Files are empty.
+    Args:
+        directory (str): Target directory.
+        count (int): Number of issued TRS numbers.
+    Returns:
+        str: The TRS folder, usable as save path of the TRS generator.
+    """
+    folder = os.path.join(directory, "TRS")
+    os.makedirs(folder, exist_ok=True)
+    for i in range(1, count + 1):
+        for issue in ("i1-0", "i1-1") if i % 7 == 0 else ("i1-0",):
+            for ext in (".docx", ".pdf"):
+                open(os.path.join(folder, f"FMS-LP-BE-TRS-{i:04d}-{issue} - FR Testing 20025.10.18-R4-001_005{ext}"), "w").close()
+        if i % 5 == 0:
+            open(os.path.join(folder, f"FR measurement log {2020 + i % 6} {i:04d}.xlsx"), "w").close()
+    return folder
+
+
+def write_hpiv_data_package(directory: str, n_valves: int = 8, images_per_page: int = 2, seed: int = 0) -> str:
+    """
+    Write an HPIV end item data package: a hardware revision list followed by one 25 page acceptance
+    test report per valve. Every report page carries the supplier logo (the same image on every page)
+    and a few scans that are unique per valve.
+    Args:
+        directory (str): Target directory.
+        n_valves (int): Number of valve reports.
+        images_per_page (int): Unique images on every report page besides the logo.
+        seed (int): Random seed for the measured values and images.
+    Returns:
+        str: Path of the written file.
+    """
+    import fitz
+
+    rng = np.random.default_rng(seed)
+
+    def png(width: int, height: int) -> bytes:
+        blocks = rng.integers(0, 255, (height // 10, width // 10, 3), dtype=np.uint8)
+        pixels = np.ascontiguousarray(blocks.repeat(10, axis=0).repeat(10, axis=1))
+        return fitz.Pixmap(fitz.csRGB, pixels.shape[1], pixels.shape[0], pixels.tobytes(), False).tobytes("png")
+
+    font = fitz.Font("cjk")  # built-in font covering '–', '×', '≤', '±' and '∞'
+
+    def write_lines(page, lines: list[str], top: float) -> None:
+        writer = fitz.TextWriter(page.rect)
+        for idx, line in enumerate(lines):
+            writer.append((72, top + 14 * idx), line, font=font, fontsize=10)
+        writer.write_text(page)
+
+    logo = png(120, 40)
+    doc = fitz.open()
+    hardware = ["HARDWARE", "Part", "Revision"]
+    for part_number in ["VS197-00-00", "VS197-00-01", "VS197-30-00", "VS197-10-00", "VS197-20-00"]:
+        hardware += [part_number, f"Rev.{'ABCD'[int(rng.integers(0, 4))]}"]
+    for lines in (hardware, ["Hardware list (continued)"], ["Hardware list (continued)"]):
+        write_lines(doc.new_page(), lines, 72)
+
+    for valve in range(n_valves):
+        pages = _hpiv_report_pages(f"VS197-{valve + 1:04d}", rng)
+        for page_idx in range(25):
+            page = doc.new_page()
+            write_lines(page, pages.get(page_idx, [f"Report page {page_idx + 1}"]), 120)
+            page.insert_image(fitz.Rect(400, 20, 520, 60), stream=logo)
+            for img in range(images_per_page):
+                page.insert_image(fitz.Rect(72 + 160 * img, 500, 222 + 160 * img, 650), stream=png(300, 300))
+
+    doc.subset_fonts()
+    path = os.path.join(directory, "SSC-VS197-21-13_End Item Data Package_Rev.D.pdf")
+    doc.save(path, garbage=3, deflate=True)
+    doc.close()
+    return path
+
+
+def seed_flow_restrictors(session: "Session", count: int = 60, anode_certification: str = "C25-0053",
+                          cathode_certification: str = "C25-0054", seed: int = 0) -> None:
+    """
+    Insert tested, unallocated anode and cathode FRs with flow rates around the 13:1 ratio.
+    """
+    from fms.db import AnodeFR, CathodeFR
+
+    rng = np.random.default_rng(seed)
+    for i in range(1, count + 1):
+        session.merge(AnodeFR(fr_id=f"{anode_certification}-{i:03d}", pressures=FR_PRESSURES,
+                              flow_rates=_fr_flow_rates(rng, "anode"), gas_type="Xe", temperature=22,
+                              thickness=0.25, orifice_diameter=0.07095, radius=0.235))
+        session.merge(CathodeFR(fr_id=f"{cathode_certification}-{i:03d}", pressures=FR_PRESSURES,
+                                flow_rates=_fr_flow_rates(rng, "cathode"), gas_type="Xe", temperature=22,
+                                thickness=0.25, orifice_diameter=0.01968, radius=0.235))
+    session.commit()
+
+
+def write_manifold_assembly_workbook(directory: str, count: int = 300, shift: int = 0, anode_certification: str = "C25-0053",
+                                     cathode_certification: str = "C25-0054", short_fr_ids: bool = False) -> str:
+    """
+    Write a manifold assembly status workbook (sheet '20025.10.AB', data from row 3) with one assembled set
+    per row, linking the FRs, filters, outlets and LPTs of seed_manifold_assembly_parts.
+    Args:
+        directory (str): Target directory.
+        count (int): Number of sets.
+        shift (int): Rotates the FMS allocations over the sets, to produce reallocations against an earlier import.
+        anode_certification (str): Certification batch of the anode FRs.
+        cathode_certification (str): Certification batch of the cathode FRs.
+        short_fr_ids (bool): Write the FRs as bare numbers, as done on the shop floor, instead of full FR IDs.
+    Returns:
+        str: Path of the written file.
+    """
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "20025.10.AB"
+    ws.append(["Manifold assembly status"])
+    ws.append(["Set", "Drawing"] + [None] * 12 + ["Allocated", "Assembly cert", "Manifold cert", "Anode FR", "Anode filter",
+                                                  "Anode outlet", "Cathode FR", "Cathode filter", "Cathode outlet", "LPT"])
+    for i in range(1, count + 1):
+        fms = (i + shift - 1) % count + 1
+        anode_fr = i if short_fr_ids else f"{anode_certification}-{i:03d}"
+        cathode_fr = i if short_fr_ids else f"{cathode_certification}-{i:03d}"
+        ws.append([1000 + i, "R2-001"] + ["x"] * 12 + [f"25-{fms:03d} (FM)", "C25-0300", "C25-0100" if i % 2 else None,
+                   anode_fr, "C25-0201", "C25-0202-01", cathode_fr, "C25-0203", "C25-0204-01", f"LPT-P{500000 + i}"])
+    path = os.path.join(directory, f"Manifold assembly {count}-{shift}{'-short' if short_fr_ids else ''}.xlsx")
+    wb.save(path)
+    return path
+
+
+def seed_manifold_assembly_parts(session: "Session", count: int = 300) -> None:
+    """
+    Insert what an assembly import links: FRs, unlinked filter and outlet certificates, free LPTs
+    and available manifolds (half of them certified C25-0100).
+    """
+    from fms.db import FRCertification, LPTCalibration, ManifoldStatus
+    from fms.utils.enums import ManifoldProgressStatus
+
+    seed_flow_restrictors(session, count=count)
+    for certification, part_name in (("C25-0201", "ejay filter"), ("C25-0202", "restrictor outlet"),
+                                     ("C25-0203", "ejay filter"), ("C25-0204", "restrictor outlet")):
+        session.add_all([FRCertification(certification=certification, drawing="20025.10.18", part_name=part_name) for _ in range(count)])
+    session.add_all([LPTCalibration(lpt_id=f"P{500000 + i}", certification="C25-0400") for i in range(1, count + 1)])
+    session.add_all([ManifoldStatus(certification="C25-0100" if i % 2 else "C25-0101", status=ManifoldProgressStatus.AVAILABLE)
+                     for i in range(count // 2)])
+    session.commit()
+
+
+def seed_hpivs(session: "Session", count: int = 300, batches: int = 6, seed: int = 0) -> None:
+    """
+    Insert certified HPIVs with one characteristic per HPIV parameter, spread over several batches.
+    """
+    from fms.db import HPIVCertification, HPIVCharacteristics
+    from fms.utils.enums import HPIVParameters, LimitStatus
+
+    rng = np.random.default_rng(seed)
+    parameters = [p.value for p in HPIVParameters if p != HPIVParameters.HPIV_ID]
+    for i in range(1, count + 1):
+        hpiv_id = f"VS197-{i:04d}"
+        session.merge(HPIVCertification(hpiv_id=hpiv_id, certification=f"C24-{100 + i % batches:04d}"))
+        for parameter in parameters:
+            session.add(HPIVCharacteristics(hpiv_id=hpiv_id, parameter_name=parameter, parameter_value=float(rng.lognormal(0, 1)),
+                                            min_value=0, max_value=100, unit="-", within_limits=LimitStatus.TRUE))
+    session.commit()
+
+
+def seed_fleet_test_results(session: "Session", count: int = 500, seed: int = 0) -> None:
+    """
+    Insert accepted FMS with the default limits and one acceptance result per limited parameter,
+    spread around the limits so part of the fleet is out of or on a limit.
+    """
+    from fms.db import FMSLimits, FMSMain, FMSTestResults
+    from fms.utils.limit_rules import compile_limits
+    from fms.utils.specs import fms_limit_specifications
+
+    rng = np.random.default_rng(seed)
+    rules = compile_limits(fms_limit_specifications)
+    for i in range(1, count + 1):
+        fms_id = f"24-{i:03d}"
+        session.add(FMSMain(fms_id=fms_id, id=i))
+        session.add(FMSLimits(fms_id=fms_id, limits=fms_limit_specifications))
+        for parameter, limits in fms_limit_specifications.items():
+            low, high = limits["min"], limits["max"]
+            if isinstance(low, list):
+                value = [float(rng.uniform(lo - 0.1, hi + 0.1)) for lo, hi in zip(low, high)]
+            elif low is None and high is None:
+                value = float(rng.lognormal(0, 1))
+            else:
+                value = float(rng.uniform(low or 0, 1.1 * high if high is not None else 2 * (low or 1)))
+            session.add(FMSTestResults(fms_id=fms_id, parameter_name=parameter,
+                                       parameter_value=None if isinstance(value, list) else value,
+                                       parameter_json=value if isinstance(value, list) else None,
+                                       within_limits=rules.status(parameter, value)))
+    session.commit()
+
+
+def seed_tv_parts(session: "Session", count: int = 200, certifications: int = 5, seed: int = 0) -> None:
+    """
+    Insert TVs with an opening temperature and measured gaskets and plungers, one per TV, plus a
+    stock of unallocated parts. The number of recorded dimensions varies per certification.
+    """
+    from fms.db import TVCertification, TVStatus
+
+    rng = np.random.default_rng(seed)
+    for tv_id in range(1, count + 1):
+        session.merge(TVStatus(tv_id=tv_id, opening_temp=float(rng.normal(97, 2))))
+    for part_name, nominal in (("thermal valve gasket", [3.2, 1.1, 0.45]), ("thermal valve plunger", [6.0, 2.5])):
+        for i in range(int(count * 1.5)):
+            n_dims = len(nominal) - (i % certifications == 0)
+            nominal_dims = nominal[:n_dims]
+            session.add(TVCertification(
+                certification=f"C25-{500 + i % certifications:04d}", drawing="20025.10.00", part_name=part_name,
+                tv_id=i + 1 if i < count else None, nominal_dimensions=nominal_dims,
+                dimensions=[float(d * rng.normal(1, 0.01)) for d in nominal_dims],
+                min_dimensions=[d * 0.98 for d in nominal_dims], max_dimensions=[d * 1.02 for d in nominal_dims]))
+    session.commit()
+
+
+def seed_tv_tvac_runs(session: "Session", tv_id: int = 1, runs: int = 8, rows: int = 40000, interval: float = 5.0, seed: int = 0) -> None:
+    """
+    Insert consecutive thermal valve life test TVAC runs (1000 cycles each) for one TV.
+    """
+    from fms.db import TVStatus, TVTvac
+
+    rng = np.random.default_rng(seed)
+    session.merge(TVStatus(tv_id=tv_id))
+    hours = np.arange(rows) * interval / 3600
+    for run in range(runs):
+        power_on = (np.sin(2 * np.pi * hours * 1000 / hours[-1]) > 0).astype(float)
+        outlet = 60 + 50 * np.sin(2 * np.pi * hours * 1000 / hours[-1] - 0.3)
+        session.merge(TVTvac(
+            test_id=f"TVAC_{tv_id}_{run + 1:02d}", test_id_list=[f"TVAC_{tv_id}_{run + 1:02d}"], tv_id=tv_id, time=hours.tolist(),
+            outlet_temp_1=(outlet + rng.normal(0, 0.2, rows)).tolist(), outlet_temp_2=(outlet + rng.normal(0, 0.2, rows)).tolist(),
+            if_plate=(0.8 * outlet + rng.normal(0, 0.2, rows)).tolist(), vacuum=(0.5 + rng.normal(0, 0.01, rows)).tolist(),
+            tv_voltage=(12 * power_on + rng.normal(0, 0.01, rows)).tolist(), tv_current=(0.08 * power_on).tolist(), cycles=1000 * (run + 1)))
+    session.commit()
+
+
+def seed_manifold_sets(session: "Session", count: int = 20) -> None:
+    """
+    Insert assembled manifolds with consecutive set IDs, needed to number new potential sets.
+    """
+    from fms.db import ManifoldStatus
+
+    for set_id in range(1, count + 1):
+        if not session.query(ManifoldStatus).filter_by(set_id=set_id).first():
+            session.add(ManifoldStatus(set_id=set_id, certification="C25-0100"))
+    session.commit()
+
+
+def seed_lpts(fms: "FMSDataStructure", directory: str, count: int = 40, seed: int = 0) -> list[str]:
+    """
+    Write LPT calibration JSONs and ingest them through the regular LPT calibration path.
+    The limit status is forced to within limits so the matching benchmarks see every LPT.
+    Returns:
+        list[str]: Paths of the written calibration files.
+    """
+    from fms.db import LPTCalibration
+    from fms.utils.enums import LimitStatus
+    from fms.utils.lpt_manifold import ManifoldData
+
+    rng = np.random.default_rng(seed)
+    files = [
+        write_lpt_calibration_json(directory, serial=f"P{300001 + i}", sensitivity=LPT_SENSITIVITY * rng.normal(1, 0.01))
+        for i in range(count)
+    ]
+    data = ManifoldData(json_files=files)
+    data.extract_coefficients_from_json()
+    fms.lpt_sql.update_lpt_calibration(data)
+
+    session = fms.Session()
+    try:
+        for lpt in session.query(LPTCalibration).all():
+            lpt.within_limits = LimitStatus.TRUE
+        session.commit()
+    finally:
+        session.close()
+    return files
+
+
+def acceptance_test_info(images: int = 40, image_size: int = 400_000, properties: int = 30, seed: int = 0) -> dict:
+    """
+    Acceptance test info as FMSTesting stores it: TVAC phases, functional and vibration sections with
+    scalar results and base64 encoded images (plots, HPIV pictures and extra plots), physical properties
+    and top-level report fields.
+    """
+    import base64
+
+    rng = np.random.default_rng(seed)
+    def image() -> str:
+        return base64.b64encode(rng.integers(0, 256, image_size, dtype=np.uint8).tobytes()).decode("ascii")
+
+    sections = ["tvac_results_hot", "tvac_results_cold", "tvac_results_room", "functional_performance", "vibration"]
+    test_info = {"report_path": "report.docx", "fms_id": "25-900", "fr_performance_voltage_plot": 3, "annex_a": []}
+    for s, section in enumerate(sections):
+        prefix = section.split("_")[-1]
+        test_info[section] = {}
+        for t in range(3):
+            test_type = {f"{prefix}_{t}_result_{p}": float(rng.normal()) for p in range(properties)}
+            test_type.update({f"{prefix}_{t}_max_{p}": 1.0 for p in range(3)})
+            test_info[section][f"test_{t}"] = test_type
+    per_section = max(images // len(sections), 1)
+    for s, section in enumerate(sections):
+        prefix = section.split("_")[-1]
+        test_type = test_info[section]["test_0"]
+        for i in range(per_section - 3):
+            test_type[f"{prefix}_plot_{i}"] = {"image": image(), "caption": f"Plot {i}"}
+        test_type["hpiv_images"] = {"hpiv_opening_image": image(), "hpiv_closing_image": image()}
+        test_type["extra_plots"] = [{"image": image(), "title": "Extra plot"}]
+    test_info["physical_properties"] = {
+        "mass": 420.0,
+        "inlet_location": {"x": 1.0, "y": 2.0, "z": 3.0, "remark": ""},
+        "outlet_location": {"x": 4.0, "y": 5.0, "z": 6.0, "remark": "reworked"},
+    }
+    return test_info
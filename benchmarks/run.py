@@ -0,0 +1,162 @@
+"""
+Run the benchmark scenarios and compare them against the stored JSON baseline.
+
+Usage:
+    python -m benchmarks.run                      # run all, compare against baselines/baseline.json
+    python -m benchmarks.run --only fms.          # run scenarios whose name starts with 'fms.'
+    python -m benchmarks.run --update-baseline    # store the results as the new baseline
+    python -m benchmarks.run --threshold 0.25     # flag scenarios >25% slower than the baseline
+
+Everything runs offline: inputs are generated in a temporary directory, and LOCALAPPDATA/APPDATA
+are pointed there before the fms package is imported, so the sqlite database and json cache
+never touch the user's real data. The exit code is 1 if any scenario regressed or failed.
+"""
+
+# Standard library
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import traceback
+from datetime import datetime
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+DEFAULT_BASELINE = os.path.join(BASELINE_DIR, "baseline.json")
+
+
+def isolate_environment(root: str) -> None:
+    """
+    Point the fms data locations to the benchmark directory and force a headless matplotlib backend.
+    Must be called before anything from fms is imported.
+    """
+    os.environ["LOCALAPPDATA"] = os.path.join(root, "localappdata")
+    os.environ["APPDATA"] = os.path.join(root, "appdata")
+    os.environ["MPLBACKEND"] = "Agg"
+    os.makedirs(os.environ["LOCALAPPDATA"], exist_ok=True)
+    os.makedirs(os.environ["APPDATA"], exist_ok=True)
+
+
+def time_scenario(scenario, workspace, verbose: bool = False) -> dict:
+    """
+    Run a scenario ``repeat`` times (setup excluded) and return its timing statistics.
+    """
+    timings = []
+    sink = io.StringIO()
+    for _ in range(scenario.repeat):
+        with contextlib.redirect_stdout(sys.stdout if verbose else sink):
+            func = scenario.setup(workspace)
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+    return {
+        "group": scenario.group,
+        "repeat": scenario.repeat,
+        "median": round(statistics.median(timings), 6),
+        "min": round(min(timings), 6),
+        "max": round(max(timings), 6),
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Return the names of the scenarios whose median exceeds the baseline median by more than threshold.
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get("results", {}).get(name)
+        if not reference or "median" not in result:
+            continue
+        if result["median"] > reference["median"] * (1 + threshold):
+            regressions.append(name)
+    return regressions
+
+
+def print_table(results: dict, baseline: dict, threshold: float) -> None:
+    print(f"\n{'scenario':<45} {'median [s]':>11} {'baseline [s]':>13} {'change':>8}")
+    print("-" * 80)
+    for name, result in results.items():
+        if "error" in result:
+            print(f"{name:<45} {'FAILED':>11}  {result['error']}")
+            continue
+        reference = baseline.get("results", {}).get(name)
+        if reference:
+            change = result["median"] / reference["median"] - 1 if reference["median"] else 0.0
+            flag = "  <-- regression" if change > threshold else ""
+            print(f"{name:<45} {result['median']:>11.4f} {reference['median']:>13.4f} {change*100:>7.1f}%{flag}")
+        else:
+            print(f"{name:<45} {result['median']:>11.4f} {'-':>13} {'-':>8}")
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the fms benchmark suite.")
+    parser.add_argument("--only", nargs="*", default=None, help="Only run scenarios starting with one of these prefixes.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file to compare against or update.")
+    parser.add_argument("--update-baseline", action="store_true", help="Store the results as the new baseline.")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed relative slowdown of the median.")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated data directory.")
+    parser.add_argument("--verbose", action="store_true", help="Show the output of the benchmarked functions.")
+    args = parser.parse_args(argv)
+
+    root = tempfile.mkdtemp(prefix="fms_bench_")
+    isolate_environment(root)
+
+    from .scenarios import SCENARIOS, Workspace
+
+    selected = [s for name, s in SCENARIOS.items() if not args.only or any(name.startswith(p) for p in args.only)]
+    workspace = Workspace(root=root)
+    results = {}
+    try:
+        for scenario in selected:
+            print(f"Running {scenario.name} ({scenario.repeat}x)")
+            try:
+                results[scenario.name] = time_scenario(scenario, workspace, verbose=args.verbose)
+            except Exception as e:
+                print(f"Error in scenario {scenario.name}: {e}")
+                traceback.print_exc()
+                results[scenario.name] = {"group": scenario.group, "error": str(e)}
+    finally:
+        if args.keep:
+            print(f"Benchmark data kept in {root}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    print_table(results, baseline, args.threshold)
+    regressions = compare(results, baseline, args.threshold)
+    failures = [name for name, result in results.items() if "error" in result]
+
+    if args.update_baseline:
+        if failures:
+            print("Not updating the baseline, some scenarios failed.")
+        else:
+            merged = dict(baseline.get("results", {}))
+            merged.update(results)
+            os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+            with open(args.baseline, "w", encoding="utf-8") as f:
+                json.dump({
+                    "created": datetime.now().isoformat(timespec="seconds"),
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "results": merged,
+                }, f, indent=2)
+            print(f"Baseline written to {args.baseline}")
+        return 1 if failures else 0
+
+    if regressions:
+        print(f"\n{len(regressions)} scenario(s) regressed more than {args.threshold*100:.0f}%: {', '.join(regressions)}")
+    return 1 if regressions or failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
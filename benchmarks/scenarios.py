@@ -0,0 +1,670 @@
+"""
+Timed benchmark scenarios.
+
+A scenario is a ``setup(workspace) -> callable`` pair: the setup builds everything the
+measured call needs (files, database rows, fresh parser instances) and is never timed,
+the returned callable is the hot path being measured. Setups run once per repeat, so
+scenarios that mutate their inputs (e.g. FMSData.test_type, flow_power_slope) always
+start from the same state.
+"""
+
+# Standard library
+import copy
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+# Local imports
+from . import generators as gen
+
+
+@dataclass
+class Scenario:
+    name: str
+    setup: Callable[["Workspace"], Callable[[], Any]]
+    group: str
+    repeat: int = 5
+
+
+SCENARIOS: dict[str, Scenario] = {}
+
+
+def scenario(name: str, group: str, repeat: int = 5) -> Callable:
+    """
+    Register a scenario setup function under the given name.
+    """
+    def decorator(func: Callable) -> Callable:
+        SCENARIOS[name] = Scenario(name=name, setup=func, group=group, repeat=repeat)
+        return func
+    return decorator
+
+
+@dataclass
+class Workspace:
+    """
+    Shared state of a benchmark run: a temporary directory for generated files and a local
+    FMSDataStructure whose sqlite database lives under the (temporary) LOCALAPPDATA.
+    Expensive fixtures are built once through ``cached``.
+    """
+    root: str
+    _cache: dict[str, Any] = field(default_factory=dict)
+    _counter: int = 0
+
+    def path(self, *parts: str) -> str:
+        path = os.path.join(self.root, *parts)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def cached(self, key: str, factory: Callable[[], Any]) -> Any:
+        if key not in self._cache:
+            self._cache[key] = factory()
+        return self._cache[key]
+
+    def next_test_id(self) -> str:
+        """Unique, parseable flow test ID for scenarios that insert new tests."""
+        self._counter += 1
+        return (datetime(2025, 1, 1) + timedelta(minutes=self._counter)).strftime("%Y_%m_%d_%H-%M-%S")
+
+    @property
+    def fms(self):
+        from fms import FMSDataStructure
+        return self.cached("fms", lambda: FMSDataStructure(local=True, absolute_data_dir=self.root))
+
+
+# --------------------------------------------------------------------------------------------------------- #
+# ------------------------------------------------- Fixtures ---------------------------------------------- #
+# --------------------------------------------------------------------------------------------------------- #
+
+BENCH_FMS_ID = "25-900"
+
+
+def _flow_file(ws: Workspace, test_type: str) -> str:
+    test_ids = {"slope": "2025_03_14_10-22-31", "closed_loop": "2025_03_14_12-05-10", "fr_characteristics": "2025_03_14_14-40-02"}
+    return ws.cached(f"flow_{test_type}", lambda: gen.write_flow_log(ws.path("flow"), test_type=test_type, test_id=test_ids[test_type]))
+
+
+def _parsed_flow_test(ws: Workspace, test_type: str):
+    from fms.utils.fms import FMSData
+
+    def parse():
+        data = FMSData(flow_test_file=_flow_file(ws, test_type), test_type=test_type)
+        data.extract_slope_data()
+        return data
+    return ws.cached(f"parsed_{test_type}", parse)
+
+
+def _register_flow_test(ws: Workspace, data, test_id: str = None) -> None:
+    fms_sql = ws.fms.fms_sql
+    fms_sql.selected_fms_id = BENCH_FMS_ID
+    fms_sql.gas_type = "Xe"
+    data = copy.deepcopy(data)
+    if test_id:
+        data.test_id = test_id
+    fms_sql.update_flow_test_results(fms_data=data)
+
+
+def _seeded_functional_tests(ws: Workspace) -> dict[str, str]:
+    def seed():
+        test_ids = {}
+        for test_type in ("slope", "closed_loop"):
+            data = _parsed_flow_test(ws, test_type)
+            _register_flow_test(ws, data)
+            test_ids[test_type] = data.test_id
+        return test_ids
+    return ws.cached("seeded_functional_tests", seed)
+
+
+def _seeded_manifold_db(ws: Workspace) -> None:
+    def seed():
+        session = ws.fms.Session()
+        try:
+            gen.seed_flow_restrictors(session)
+            gen.seed_manifold_sets(session)
+        finally:
+            session.close()
+        gen.seed_lpts(ws.fms, ws.path("lpt"))
+        return True
+    return ws.cached("seeded_manifold_db", seed)
+
+
+def _manifold_query(ws: Workspace):
+    from fms.apps.query.manifold_query import ManifoldQuery
+
+    _seeded_manifold_db(ws)
+    query = ManifoldQuery(session=ws.fms.Session(), local=True)
+    query.get_anodes_with_flow_rates()
+    query.get_cathodes_with_flow_rates()
+    return query
+
+
+def _hpiv_query(ws: Workspace):
+    from fms.apps.query.hpiv_query import HPIVQuery
+
+    def seed():
+        session = ws.fms.Session()
+        try:
+            gen.seed_hpivs(session)
+        finally:
+            session.close()
+        return True
+    ws.cached("seeded_hpivs", seed)
+    query = HPIVQuery(session=ws.fms.Session(), local=True)
+    query.hpiv_id = "VS197-0001"
+    return query
+
+
+def _tv_query(ws: Workspace):
+    from fms.apps.query.tv_query import TVQuery
+
+    def seed():
+        session = ws.fms.Session()
+        try:
+            gen.seed_tv_parts(session)
+        finally:
+            session.close()
+        return True
+    ws.cached("seeded_tv_parts", seed)
+    return TVQuery(session=ws.fms.Session(), local=True)
+
+
+def _fms_query(ws: Workspace):
+    from fms.apps.query.fms_query import FMSQuery
+
+    _seeded_functional_tests(ws)
+    query = FMSQuery(session=ws.fms.Session(), local=True)
+    query.fms_id = BENCH_FMS_ID
+    return query
+
+
+# --------------------------------------------------------------------------------------------------------- #
+# ------------------------------------------------- Ingest ------------------------------------------------ #
+# --------------------------------------------------------------------------------------------------------- #
+
+@scenario("tv.extract_test_results_from_excel", group="ingest")
+def tv_extract_test_results(ws: Workspace) -> Callable:
+    from fms.utils.tv import TVData
+
+    path = ws.cached("tv_test_xls", lambda: gen.write_tv_test_xls(ws.path("tv")))
+    data = TVData(test_results_file=path)
+    return data.extract_tv_test_results_from_excel
+
+
+@scenario("tv.extract_tv_tvac_results", group="ingest", repeat=3)
+def tv_extract_tvac(ws: Workspace) -> Callable:
+    from fms.utils.tv import TVData
+
+    path = ws.cached("tv_tvac_csv", lambda: gen.write_tv_tvac_csv(ws.path("tv_tvac")))
+    data = TVData(csv_file=path)
+    return data.extract_tv_tvac_results
+
+
+@scenario("fms.extract_slope_data[slope]", group="ingest")
+def fms_extract_slope(ws: Workspace) -> Callable:
+    from fms.utils.fms import FMSData
+
+    data = FMSData(flow_test_file=_flow_file(ws, "slope"), test_type="slope")
+    return data.extract_slope_data
+
+
+@scenario("fms.extract_slope_data[closed_loop]", group="ingest")
+def fms_extract_closed_loop(ws: Workspace) -> Callable:
+    from fms.utils.fms import FMSData
+
+    data = FMSData(flow_test_file=_flow_file(ws, "closed_loop"), test_type="closed_loop")
+    return data.extract_slope_data
+
+
+@scenario("fms.extract_slope_data[fr_characteristics]", group="ingest")
+def fms_extract_fr_characteristics(ws: Workspace) -> Callable:
+    from fms.utils.fms import FMSData
+
+    data = FMSData(flow_test_file=_flow_file(ws, "fr_characteristics"), test_type="fr_characteristics")
+    return data.extract_slope_data
+
+
+@scenario("fms.extract_tvac_from_csv", group="ingest", repeat=3)
+def fms_extract_tvac(ws: Workspace) -> Callable:
+    from fms.utils.fms import FMSData
+
+    def files():
+        directory = ws.path("fms_tvac")
+        start = datetime(2025, 3, 14, 10, 22, 31)
+        return [
+            gen.write_fms_tvac_csv(directory, start=start, seed=0),
+            gen.write_fms_tvac_csv(directory, start=start + timedelta(hours=12), with_preamble=True, seed=1),
+        ]
+    data = FMSData(csv_files=ws.cached("fms_tvac_csv", files))
+    return data.extract_tvac_from_csv
+
+
+@scenario("lpt.extract_coefficients_from_json", group="ingest")
+def lpt_extract_json(ws: Workspace) -> Callable:
+    from fms.utils.lpt_manifold import ManifoldData
+
+    def files():
+        return [gen.write_lpt_calibration_json(ws.path("lpt_json"), serial=f"P{400001 + i}") for i in range(25)]
+    data = ManifoldData(json_files=ws.cached("lpt_json", files))
+    return data.extract_coefficients_from_json
+
+
+@scenario("fr.extract_data_from_excel", group="ingest", repeat=3)
+def fr_extract_excel(ws: Workspace) -> Callable:
+    from fms.utils.fr import FRData
+
+    def files():
+        directory = ws.path("fr_excel")
+        return gen.write_fr_workbook(directory, "anode", "C25-0053", seed=0), gen.write_fr_workbook(directory, "cathode", "C25-0054", seed=1)
+    anode, cathode = ws.cached("fr_excel", files)
+    data = FRData(anode_excel=anode, cathode_excel=cathode)
+    return lambda: data.extract_data_from_excel(tools_path=os.path.join(ws.root, "no_tools.json"))
+
+
+@scenario("fr.extract_data_from_excel_large", group="ingest", repeat=3)
+def fr_extract_excel_large(ws: Workspace) -> Callable:
+    from fms.utils.fr import FRData
+    from fms.utils.workbook_cache import clear_workbook_cache
+
+    def files():
+        directory = ws.path("fr_excel_large")
+        return (gen.write_fr_workbook(directory, "anode", "C25-0053", count=5000, seed=0),
+                gen.write_fr_workbook(directory, "cathode", "C25-0054", count=5000, seed=1))
+    anode, cathode = ws.cached("fr_excel_large", files)
+    data = FRData(anode_excel=anode, cathode_excel=cathode)
+
+    def run():
+        clear_workbook_cache()
+        return data.extract_data_from_excel(tools_path=os.path.join(ws.root, "no_tools.json"))
+    return run
+
+
+@scenario("hpiv.extract_hpiv_data", group="ingest", repeat=3)
+def hpiv_extract_data(ws: Workspace) -> Callable:
+    from fms.utils.hpiv import HPIVData
+
+    path = ws.cached("hpiv_package", lambda: gen.write_hpiv_data_package(ws.path("hpiv")))
+    output = ws.path(f"hpiv_out_{ws.next_test_id()}")
+    data = HPIVData(pdf_file=path)
+    return lambda: data.extract_hpiv_data(output_folder=output)
+
+
+@scenario("fms.update_flow_test_results", group="ingest", repeat=3)
+def fms_update_flow_test_results(ws: Workspace) -> Callable:
+    data = _parsed_flow_test(ws, "closed_loop")
+    test_id = ws.next_test_id()
+    return lambda: _register_flow_test(ws, data, test_id=test_id)
+
+
+@scenario("manifold.add_manifold_assembly_data", group="ingest", repeat=3)
+def manifold_add_assembly_data(ws: Workspace) -> Callable:
+    def seed():
+        session = ws.fms.Session()
+        try:
+            gen.seed_manifold_assembly_parts(session)
+        finally:
+            session.close()
+        directory = ws.path("manifold_assembly")
+        first = gen.write_manifold_assembly_workbook(directory)
+        ws.fms.lpt_sql.add_manifold_assembly_data(assembly_file=first)
+        return [gen.write_manifold_assembly_workbook(directory, shift=shift) for shift in (7, 0)]
+    workbooks = ws.cached("manifold_assembly", seed)
+    # Alternate between two allocations, so every run reallocates all sets
+    workbooks.append(workbooks.pop(0))
+    workbook = workbooks[0]
+    return lambda: ws.fms.lpt_sql.add_manifold_assembly_data(assembly_file=workbook)
+
+
+@scenario("manifold.extract_assembly_short_fr_ids", group="ingest", repeat=3)
+def manifold_extract_assembly_short_fr_ids(ws: Workspace) -> Callable:
+    def seed():
+        session = ws.fms.Session()
+        try:
+            gen.seed_flow_restrictors(session, count=300)
+        finally:
+            session.close()
+        return gen.write_manifold_assembly_workbook(ws.path("manifold_assembly"), short_fr_ids=True)
+    workbook = ws.cached("manifold_assembly_short", seed)
+    lpt_sql = ws.fms.lpt_sql
+
+    def run():
+        lpt_sql.assembly_file = workbook
+        lpt_sql.extract_assembly_from_excel()
+    return run
+
+
+# --------------------------------------------------------------------------------------------------------- #
+# ------------------------------------------------ Analysis ----------------------------------------------- #
+# --------------------------------------------------------------------------------------------------------- #
+
+@scenario("tv.get_opening_temperature", group="analysis")
+def tv_opening_temperature(ws: Workspace) -> Callable:
+    from fms.utils.tv import TVData
+
+    def parse():
+        data = TVData(test_results_file=ws.cached("tv_test_xls", lambda: gen.write_tv_test_xls(ws.path("tv"))))
+        data.extract_tv_test_results_from_excel()
+        return data
+    parsed = ws.cached("tv_parsed", parse)
+    data = TVData()
+    data.test_parameters = parsed.test_parameters
+    data.temp_used_for_opening = parsed.temp_used_for_opening
+    return data.get_opening_temperature
+
+
+@scenario("fms.get_response_times", group="analysis")
+def fms_response_times(ws: Workspace) -> Callable:
+    data = _parsed_flow_test(ws, "closed_loop")
+    df = data.df.copy()
+    return lambda: data.get_response_times(df)
+
+
+@scenario("fms.get_flow_power_slope", group="analysis")
+def fms_flow_power_slope(ws: Workspace) -> Callable:
+    from fms.utils.enums import FMSFlowTestParameters
+
+    data = _parsed_flow_test(ws, "slope")
+    flows = data.df[FMSFlowTestParameters.TOTAL_FLOW.value].to_numpy()
+    powers = data.df[FMSFlowTestParameters.AVG_TV_POWER.value].to_numpy()
+    return lambda: data.get_flow_power_slope(flows, powers)
+
+
+@scenario("manifold.match_flow_restrictors", group="analysis", repeat=3)
+def manifold_match_flow_restrictors(ws: Workspace) -> Callable:
+    query = _manifold_query(ws)
+    return lambda: query.match_flow_restrictors(["C25-0053"], ["C25-0054"], exclude_outliers=False)
+
+
+@scenario("manifold.match_sets_to_lpt", group="analysis", repeat=3)
+def manifold_match_sets_to_lpt(ws: Workspace) -> Callable:
+    query = _manifold_query(ws)
+    pairs = sorted(zip(query.all_anodes, query.all_cathodes), key=lambda x: x[0].fr_id)
+    matching_list = [
+        {"anode": anode, "cathode": cathode, "set_id": None,
+         "ratios": [a / c for a, c in zip(anode.flow_rates, cathode.flow_rates)]}
+        for anode, cathode in pairs[:40]
+    ]
+    return lambda: query.match_sets_to_lpt(matching_list=matching_list, temperature=22)
+
+
+# --------------------------------------------------------------------------------------------------------- #
+# -------------------------------------------------- Query ------------------------------------------------ #
+# --------------------------------------------------------------------------------------------------------- #
+
+@scenario("query.load_all_tests", group="query")
+def query_load_all_tests(ws: Workspace) -> Callable:
+    query = _fms_query(ws)
+    query.session.expire_all()
+    return lambda: [len(t.functional_results) for t in query.get_closed_loop_tests(BENCH_FMS_ID) + query.get_slope_tests(BENCH_FMS_ID)]
+
+
+@scenario("query.closed_loop_test_query", group="query", repeat=3)
+def query_closed_loop_plot(ws: Workspace) -> Callable:
+    from fms.utils.plot_render import invalidate_plot_cache
+
+    test_id = _seeded_functional_tests(ws)["closed_loop"]
+    query = _fms_query(ws)
+    query.session.expire_all()
+    invalidate_plot_cache()
+    return lambda: query.closed_loop_test_query(test_id, plot=False)
+
+
+@scenario("query.open_loop_test_query[slope]", group="query", repeat=3)
+def query_slope_plot(ws: Workspace) -> Callable:
+    from fms.utils.plot_render import invalidate_plot_cache
+
+    test_id = _seeded_functional_tests(ws)["slope"]
+    query = _fms_query(ws)
+    query.session.expire_all()
+    test_run = next(t for t in query.get_slope_tests(BENCH_FMS_ID) if t.test_id == test_id)
+    invalidate_plot_cache()
+    return lambda: query.open_loop_test_query(test_run, test_type="slope", plot=False)
+
+
+@scenario("query.functional_plots_revisit", group="query")
+def query_functional_plots_revisit(ws: Workspace) -> Callable:
+    test_ids = _seeded_functional_tests(ws)
+    query = _fms_query(ws)
+    query.session.expire_all()
+    requests = [("closed_loop", {"test_id": test_ids["closed_loop"]}),
+                ("closed_loop", {"test_id": test_ids["closed_loop"], "show_response_times": True}),
+                ("slope", {"test_run": test_ids["slope"]})]
+    query.render_test_plots(requests, workers=1)
+
+    def run():
+        for _ in range(3):
+            query.closed_loop_test_query(test_ids["closed_loop"], plot=False)
+            query.open_loop_test_query(test_ids["slope"], test_type="slope", plot=False)
+            query.closed_loop_test_query(test_ids["closed_loop"], plot=False, show_response_times=True)
+    return run
+
+
+@scenario("testing.fms_bundle_navigation", group="query", repeat=3)
+def testing_fms_bundle_navigation(ws: Workspace) -> Callable:
+    from fms.utils.enums import FunctionalTestType, FMSFlowTestParameters
+    from fms.utils.fms_bundle import fms_bundle, invalidate_fms_bundle
+
+    _seeded_functional_tests(ws)
+    invalidate_fms_bundle()
+
+    # Acceptance test app going back and forth between forms: test lists, TV channels, results and FR links
+    def run():
+        values = []
+        for _ in range(20):
+            bundle = fms_bundle(ws.fms.Session, BENCH_FMS_ID)
+            for test in bundle.tests(FunctionalTestType.LOW_SLOPE, FunctionalTestType.HIGH_SLOPE, FunctionalTestType.LOW_CLOSED_LOOP,
+                                     FunctionalTestType.HIGH_CLOSED_LOOP):
+                channels = bundle.channels(test.test_id)
+                values.append(channels.get(FMSFlowTestParameters.TOTAL_FLOW.value))
+            values.append((len(bundle.test_results), bundle.anode, bundle.lpt_coefficients, bundle.limits))
+        return values
+    return run
+
+
+@scenario("query.hpiv_characteristic_trend", group="query")
+def query_hpiv_trend(ws: Workspace) -> Callable:
+    import matplotlib.pyplot as plt
+    from fms.utils.enums import HPIVParameters
+
+    query = _hpiv_query(ws)
+    query.session.expire_all()
+
+    def run():
+        query.characteristic_trend(HPIVParameters.RESPC_TIME.value, HPIVParameters.FLOWRATE.value, "all")
+        query.plot_characteristic(HPIVParameters.WEIGHT.value, "all")
+        plt.close("all")
+    return run
+
+
+@scenario("query.tv_tvac_life_plots", group="query", repeat=3)
+def query_tv_tvac_life_plots(ws: Workspace) -> Callable:
+    import matplotlib.pyplot as plt
+    from fms.db import TVTvac
+
+    def seed():
+        session = ws.fms.Session()
+        try:
+            gen.seed_tv_tvac_runs(session, tv_id=9001)
+        finally:
+            session.close()
+        return True
+    ws.cached("seeded_tv_tvac_runs", seed)
+    query = _tv_query(ws)
+    query.tvac_runs = query.session.query(TVTvac).filter_by(tv_id=9001).order_by(TVTvac.test_id).all()
+    query.test_reference = query.tvac_runs[-1].test_id
+
+    def run():
+        for time_range in ((0, 60), (4.5, 15)):
+            query.plot_all_tvac_tests(time_range=time_range)
+            query.plot_tvac_analysis(time_range=time_range)
+        # plt.show() does not draw under Agg, render like the notebook backend does
+        for num in plt.get_fignums():
+            plt.figure(num).canvas.draw()
+        plt.close("all")
+    return run
+
+
+@scenario("fr.catalog_serial_options", group="query", repeat=3)
+def fr_catalog_serial_options(ws: Workspace) -> Callable:
+    from fms.utils.fr_catalog import FRCatalog
+
+    def seed():
+        session = ws.fms.Session()
+        try:
+            gen.seed_flow_restrictors(session, count=3000, anode_certification="C26-0100", cathode_certification="C26-0101")
+        finally:
+            session.close()
+    ws.cached("catalog_flow_restrictors", seed)
+
+    # FR testing app start-up, anode/cathode toggles, a search and the outlier check of a few selected FRs
+    def run():
+        session = ws.fms.Session()
+        try:
+            catalog = FRCatalog(session)
+            for fr_type in ("Anode", "Cathode") * 10:
+                catalog.search(fr_type)
+            options = catalog.search("Anode", "C26-0100-12")
+            for fr_id in options[:5]:
+                catalog.record(fr_id)
+                [v[1] for v in catalog.column_values("Anode", "flow_rates") if v]
+            return options
+        finally:
+            session.close()
+    return run
+
+
+@scenario("testing.locate_hpiv_images", group="query", repeat=3)
+def testing_locate_hpiv_images(ws: Workspace) -> Callable:
+    from fms.utils.directory_index import DirectoryIndex
+
+    root = ws.cached("test_directory_tree", lambda: gen.write_test_directory_tree(ws.path("share")))
+    index = DirectoryIndex(root)
+    fms_ids = [f"25-{100 + i:03d}" for i in range(20)]
+
+    # Widget rebuilds of every FMS and phase, as FMSTesting.get_hpiv_images navigates them
+    def run():
+        images = []
+        for _ in range(10):
+            for fms_id in fms_ids:
+                test_folder = next((f for f in index.listdir(root) if fms_id in f), None)
+                test_path = os.path.join(root, test_folder)
+                images.append(index.files(index.first(test_path, "Electrical", case_sensitive=True)))
+                for temperature in ("-15", "22", "70"):
+                    images.append(index.files(index.locate(test_path, "tvac", temperature, "electrical")))
+        return images
+    return run
+
+
+@scenario("fr.trs_batches_and_numbers", group="query", repeat=3)
+def fr_trs_batches_and_numbers(ws: Workspace) -> Callable:
+    from fms.db import AnodeFR, CathodeFR
+    from fms.utils.document_numbers import DocumentNumberAllocator
+    from fms.utils.trs_batches import FRBatchIndex
+
+    folder = ws.cached("trs_share", lambda: gen.write_trs_share(ws.path("share")))
+    # 40 batches of 250 FRs, every 25th FR without flow rates
+    anodes = [AnodeFR(fr_id=f"C26-{200 + b:04d}-{i:03d}", flow_rates=None if i % 25 == 0 else [1.0])
+              for b in range(40) for i in range(1, 251)]
+    cathodes = [CathodeFR(fr_id=f"C26-{300 + b:04d}-{i:03d}", flow_rates=None if i % 25 == 0 else [0.1])
+                for b in range(40) for i in range(1, 251)]
+    anode_batches = sorted({f"C26-{200 + b:04d}" for b in range(40)})
+    cathode_batches = sorted({f"C26-{300 + b:04d}" for b in range(40)})
+
+    # Grouping and exclusions of a TRS over all batches, and the TRS numbers of a session
+    def run():
+        parts = []
+        for frs, batches in ((anodes, anode_batches), (cathodes, cathode_batches)):
+            index = FRBatchIndex(frs)
+            parts.extend(index.exclusions(batches))
+            len(index.included_frs())
+        allocator = DocumentNumberAllocator(folder, prefix="FMS-LP-BE-TRS-")
+        numbers = [allocator.allocate() for _ in range(5)]
+        return parts, numbers
+    return run
+
+
+@scenario("query.tv_dimension_trend", group="query")
+def query_tv_dimension_trend(ws: Workspace) -> Callable:
+    import matplotlib.pyplot as plt
+
+    query = _tv_query(ws)
+    query.session.expire_all()
+
+    def run():
+        for part_name in ("thermal valve gasket", "thermal valve plunger"):
+            query.get_trend("all", part_name, None)
+        plt.close("all")
+    return run
+
+
+@scenario("analysis.limit_rules_fleet", group="analysis")
+def analysis_limit_rules_fleet(ws: Workspace) -> Callable:
+    import random
+    from fms.utils.limit_rules import LimitRules
+    from fms.utils.specs import fms_limit_specifications
+
+    # Acceptance results of 500 FMS, one value per limited parameter (locations as x/y/z)
+    rng = random.Random(47)
+    parameters, values, units = [], [], []
+    for _ in range(500):
+        for parameter, limits in fms_limit_specifications.items():
+            low, high = limits["min"], limits["max"]
+            if isinstance(low, list):
+                value = [rng.uniform(lo - 0.1, hi + 0.1) for lo, hi in zip(low, high)]
+            else:
+                value = rng.uniform(low or 0, 1.1 * high if high is not None else 2 * (low or 1))
+            parameters.append(parameter)
+            values.append(value)
+            units.append(None)
+    changed = copy.deepcopy(fms_limit_specifications)
+    changed["mass"]["max"] = 450
+
+    # Re-evaluation of the whole fleet after a spec change, compiling included
+    def run():
+        return LimitRules.from_limits(changed).evaluate(parameters, values, units)
+    return run
+
+
+@scenario("analysis.fleet_limit_reevaluation", group="analysis", repeat=3)
+def analysis_fleet_limit_reevaluation(ws: Workspace) -> Callable:
+    from fms.utils.limit_reevaluation import LimitReevaluator
+
+    def seed():
+        session = ws.fms.Session()
+        try:
+            gen.seed_fleet_test_results(session)
+        finally:
+            session.close()
+        return True
+    ws.cached("seeded_fleet_test_results", seed)
+    _hpiv_query(ws)
+    _tv_query(ws)
+    session = ws.fms.Session()
+
+    # What-if over the whole fleet: tighter mass, leak and HPIV limits and a narrower opening range
+    def run():
+        reevaluator = LimitReevaluator(
+            session,
+            fms_limits={"mass": {"min": 0, "max": 450}, "tv_high_leak": {"min": 0, "max": 5e-6}},
+            hpiv_limits={"weight": {"min": 0, "max": 2}},
+            tv_limits={"min": 95, "max": 99},
+            lpt_signal_threshold=7.0,
+        )
+        changes = reevaluator.evaluate()
+        return reevaluator.report(), len(changes)
+    return run
+
+
+@scenario("testing.report_context", group="analysis", repeat=3)
+def testing_report_context(ws: Workspace) -> Callable:
+    from fms.utils.report_context import ReportContextBuilder
+
+    test_info = ws.cached("acceptance_test_info", gen.acceptance_test_info)
+    # Template using the scalar results and a third of the images
+    variables = {key for section in test_info.values() if isinstance(section, dict)
+                 for test_type in section.values() if isinstance(test_type, dict) for key in test_type}
+    variables = {key for i, key in enumerate(sorted(variables)) if "plot" not in key or i % 3 == 0}
+
+    # Report context of the acceptance report, images stay encoded until the template renders them
+    def run():
+        return ReportContextBuilder(None, variables=variables).build(test_info)
+    return run
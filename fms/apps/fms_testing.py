@@ -1,6 +1,7 @@
 from __future__ import annotations
 #:- Standard Library:-
 import base64
+import copy
 import io
 import os
 import re
@@ -10,9 +11,7 @@ from datetime import datetime
 import traceback
 
 #:- Third-Party Libraries:-
-import fitz
 import numpy as np
-import pandas as pd
 from scipy.signal import savgol_filter
 from sklearn.linear_model import LinearRegression
 from PIL import Image
@@ -20,7 +19,6 @@ from IPython.display import display
 import ipywidgets as widgets
 from docxtpl import DocxTemplate, InlineImage
 from docx.shared import Mm
-from docx2pdf import convert
 
 #:- Local Imports:-
 from ..utils.general_utils import (
@@ -30,12 +28,21 @@ from ..utils.general_utils import (
     field
 )
 
+from ..utils.acceptance_state import AcceptanceStateStore, read_acceptance_state
+from ..utils.report_conversion import conversion_service
+from ..utils.directory_index import directory_index
+from ..utils.fms_bundle import FMSBundle, fms_bundle, invalidate_fms_bundle
+from ..utils.limit_rules import AXES, OUTSIDE, UNIT_SCALES, LimitRules, axis_parameter, compile_limits
+from ..utils.report_context import LazyInlineImage, ReportContextBuilder
+from ..utils.jobs import Job, JobPanel, check_cancelled, current_job, job_runner, report_progress
 from ..utils.enums import (
     FMSProgressStatus,
     FunctionalTestType,
     FMSProgressStatus,
     FMSFlowTestParameters, 
-    FMSMainParameters
+    FMSMainParameters,
+    LimitStatus,
+    JobStatus
 )
 from sharedBE import author
 import sharedBE as be
@@ -44,7 +51,6 @@ from .. import FMSDataStructure
 from ..db import (
     FMSMain,
     FMSFunctionalTests,
-    FMSFunctionalResults,
     FMSAcceptanceTests,
     FMSTestResults,
     FMSLimits,
@@ -87,6 +93,10 @@ class FMSTesting:
     :type test_folders: list[str]
     :param vibration_folders: Folders in the vibration directory.
     :type vibration_folders: list[str]
+    :param test_index: Shared in-memory index of the test directory tree.
+    :type test_index: DirectoryIndex
+    :param vibration_index: Shared in-memory index of the vibration directory tree.
+    :type vibration_index: DirectoryIndex
     :param output: Output widget for logs/messages.
     :type output: Widget
     :param container: Main UI container.
@@ -133,6 +143,12 @@ class FMSTesting:
     :type author: str
     :param fms_id: Currently processed FMS ID.
     :type fms_id: int
+    :param state_store: Journaled, debounced persistence of 'test_info' for the current FMS.
+    :type state_store: AcceptanceStateStore
+    :param jobs: Progress panel of the report generations running in the background.
+    :type jobs: JobPanel
+    :param reported_fms_ids: FMS IDs whose report is being (or was) generated in this session.
+    :type reported_fms_ids: set[str]
 
     .. methods::
     :param __init__(...): Initializes FMSTesting with required attributes
@@ -141,6 +157,7 @@ class FMSTesting:
     :param ecode_image(base64_string): Decodes base64 string to image (BytesIO)
     :param convert_docx_to_image_bytes(docx_path): Converts DOCX to image in BytesIO
     :param crop_image_bytes(image_bytes, dims): Crops image given byte data and dimensions
+    :param convert_report_to_pdf(word_path): Queues the background PDF conversion of a report
     :param initialize_header(): Sets up header UI components
     :param field(name, value, **kwargs): Creates standardized field dictionary for widget styling
     :param get_test_info(fms_id): Fetches acceptance test information for a given FMS ID
@@ -152,11 +169,8 @@ class FMSTesting:
     :param get_tv_info(): Retrieves TV power & temperature combinations
     :param check_compliance(value, limits): Checks if a value complies with limits
     :param check_all_compliance(): Checks compliance for all test results
-    :param get_tvac_context(): Adds TVAC data to report context
     :param get_power_budget_context(): Adds power budget data to context
-    :param get_physical_properties_context(): Adds physical property data to context
-    :param get_leftover_context(): Adds remaining data to context
-    :param generate_context(): Generates complete report context
+    :param generate_context(): Builds the report context in one pass (ReportContextBuilder) and generates the report
     :param generate_property_fields(property_name): Generates UI fields for a given property
     :param get_power_budget_fields(): Generates UI fields for power budget section
     :param get_conclusion_field(): Generates conclusion field UI component
@@ -165,7 +179,8 @@ class FMSTesting:
     :param test_procedure(): Main procedure for testing steps and UI
     :param start_testing(): Initiates the testing procedure UI
     :param save_current_state(): Saves current procedure state to the database
-    :param update_database(): Updates database after report generation
+    :param get_state_store(): Returns the state store of the current FMS ID
+    :param update_database(fms_id, test_info, session, state_store): Updates database after report generation
     :param get_new_filename(): Generates new filename based on FMS ID and previous reports
     """
 
@@ -184,8 +199,10 @@ class FMSTesting:
         self.main_parameter_values = [i.value for i in FMSMainParameters] if FMSMainParameters else []
         self.test_directory = self.fms.test_path
         self.vibration_directory = r"\\be.local\Doc\DocWork\23026 - SSP - FMS LLI\70 - Testing"
-        self.test_folders = os.listdir(self.test_directory)
-        self.vibration_folders = os.listdir(self.vibration_directory)
+        self.test_index = directory_index(self.test_directory)
+        self.vibration_index = directory_index(self.vibration_directory)
+        self.test_folders = self.test_index.listdir(self.test_directory)
+        self.vibration_folders = self.vibration_index.listdir(self.vibration_directory)
         self.output = widgets.Output()
         self.header_output = widgets.Output()
         self.container = widgets.VBox()
@@ -202,6 +219,10 @@ class FMSTesting:
         self.main_test_results = defaultdict(dict)
         self.draft_json_dir = os.path.join(self.current_dir, "json_files")
         self.test_info = {}
+        self.state_store: AcceptanceStateStore = None
+        self.bundle: FMSBundle = None
+        self.jobs = JobPanel()
+        self.reported_fms_ids: set[str] = set()
 
         self.all_test_info: list[FMSAcceptanceTests] = (
             self.session.query(FMSAcceptanceTests)
@@ -213,7 +234,7 @@ class FMSTesting:
         if self.all_test_info:
             self.draft_fms_ids = [t.fms_id for t in self.all_test_info]
             self.fms_id = self.draft_fms_ids[0]
-            self.test_info = self.all_test_info[0].raw_json if self.all_test_info[0].raw_json else self.test_info
+            self.test_info = self.get_state_store().load(self.session, self.all_test_info[0]) or self.test_info
         self.tvac_map = {
             FunctionalTestType.ROOM: "22°C",
             FunctionalTestType.COLD: "-15°C",
@@ -301,6 +322,7 @@ class FMSTesting:
             if change['name'] == 'value':
                 selected_fms_id = change['new']
                 self.fms_id = selected_fms_id if selected_fms_id else None
+                self.load_bundle()
                 self.start_testing()
                 self.fms_query.fms_id = self.fms_id
 
@@ -315,7 +337,42 @@ class FMSTesting:
 
         logo = widgets.Image(value=open(self.img_path, "rb").read(), format='jpg', width=300, height=100)
 
-        display(widgets.VBox([logo, self.top_container]))
+        display(widgets.VBox([logo, self.top_container, self.jobs.widget]))
+
+    def load_bundle(self, fms_id: str = None) -> FMSBundle | None:
+        """
+        Loads the data bundle of the given (or current) FMS, shared by the property forms and context builders.
+        The cached bundle is reused as long as the data of the FMS is unchanged.
+        Args:
+            fms_id (str, optional): The FMS ID, defaults to the current FMS ID.
+        Returns:
+            FMSBundle | None: The bundle, None if no FMS is selected or loading failed.
+        """
+        fms_id = fms_id or self.fms_id
+        if not fms_id:
+            self.bundle = None
+            return None
+        try:
+            self.bundle = fms_bundle(self.fms.Session, fms_id, tool_lookup=be.tools.group_tools_by_description)
+        except Exception as e:
+            with self.output:
+                print(f"Error loading the data of FMS {fms_id}: {str(e)}")
+                traceback.print_exc()
+            self.bundle = None
+        return self.bundle
+
+    def _get_bundle(self, fms_id: str = None) -> FMSBundle | None:
+        fms_id = fms_id or self.fms_id
+        if self.bundle is None or self.bundle.fms_id != fms_id:
+            return self.load_bundle(fms_id)
+        return self.bundle
+
+    def _invalidate_bundle(self, fms_id: str) -> None:
+        # Drops the shared cache entry and the bundle held by the app, so the next _get_bundle reloads it
+        invalidate_fms_bundle(fms_id)
+        bundle = self.bundle
+        if bundle is not None and bundle.fms_id == fms_id:
+            self.bundle = None
 
     def check_acceptance_test_results(self, fms_id: str) -> None:
         """
@@ -323,8 +380,8 @@ class FMSTesting:
         Args:
             fms_id (str): The FMS ID to retrieve test information for.
         """    
-        fms_entry = self.session.query(FMSMain).filter_by(fms_id=fms_id).first()
-        if not fms_entry:
+        bundle = self._get_bundle(fms_id)
+        if not bundle or not bundle.main:
             return
         
         def set_test_values(d: dict, value_map: dict) -> None:
@@ -334,7 +391,7 @@ class FMSTesting:
                 elif isinstance(v, dict):
                     set_test_values(v, value_map)
         
-        test_results = fms_entry.test_results
+        test_results = bundle.test_results
         value_map = {}
         if test_results:
             cols = ("parameter_name", "parameter_value", "parameter_json")
@@ -384,31 +441,27 @@ class FMSTesting:
         )
         # test_info = load_from_json(f"back_up_{fms_id}")
         # return test_info
+        bundle = self._get_bundle(fms_id)
+
         def get_limits_from_db():
-            fms_limits_check = self.session.query(FMSLimits).filter_by(fms_id = fms_id).first()
-            if fms_limits_check:
-                fms_limits = fms_limits_check.limits
-            else:
-                previous_limits = self.session.query(FMSLimits).order_by(FMSLimits.id.desc()).first()
-                with self.header_output:
-                    print(previous_limits.fms_id)
-                if previous_limits:
-                    fms_limits = previous_limits.limits
-                else:
-                    fms_limits = self.fms.fms_data.fms_limits
-            return fms_limits
+            if bundle and bundle.limits is not None:
+                if bundle.limits_source != fms_id:
+                    with self.header_output:
+                        print(bundle.limits_source)
+                return copy.deepcopy(bundle.limits)
+            return self.fms.fms_data.fms_limits
             
         if existing_entry:
             self.fms_limits = get_limits_from_db()
             self.current_property_index = existing_entry.current_property_index or 0
             self.current_test_type = existing_entry.current_test_type or None
             self.current_subdict = existing_entry.current_subdict or None
-            return existing_entry.raw_json if existing_entry.raw_json else {}
+            return self.get_state_store(fms_id).load(self.session, existing_entry)
         
         # test_info = self.fms.load_procedure(procedure_name="fms_acceptance_testing_procedure")
         procedure = next((i for i in self.procedures if i.version == version and i.project == project), {})
         test_info = procedure.json_script
-        fms_entry = self.session.query(FMSMain).filter_by(fms_id=fms_id).first()
+        fms_entry = bundle.main if bundle else None
         test_info["report_path"] = os.path.join(self.current_dir, procedure.report_path)
         if fms_entry:
             test_info["hpiv_id"] = fms_entry.hpiv_id 
@@ -418,10 +471,10 @@ class FMSTesting:
             test_info["cathode_fr_id"] = fms_entry.cathode_fr_id 
             test_info["gas_type"] = fms_entry.gas_type 
             test_info["gas"] = "Xenon" if fms_entry.gas_type and "xe" in fms_entry.gas_type.lower() else "Krypton"
-            test_info["ratio"] = fms_entry.manifold[0].ac_ratio_specified if fms_entry.manifold else None
+            test_info["ratio"] = bundle.manifold.ac_ratio_specified if bundle.manifold else None
             test_info["author"] = self.author
             test_info["project"] = project
-            lpt: list[LPTCoefficients] = fms_entry.manifold[0].lpt[0].coefficients if fms_entry.manifold and fms_entry.manifold[0].lpt else None
+            lpt: list[LPTCoefficients] = bundle.lpt_coefficients
             if lpt:
                 for coef in lpt:
                     val = coef.parameter_value
@@ -454,22 +507,18 @@ class FMSTesting:
         image_bytes = base64.b64decode(encoded_string)
         return io.BytesIO(image_bytes)
     
-    def convert_docx_to_image_bytes(self, docx_path: str, temp_pdf_path: str = "temp_output.pdf") -> io.BytesIO:
+    def convert_docx_to_image_bytes(self, docx_path: str) -> io.BytesIO:
         """
-        Converts a DOCX file to an image in BytesIO.
+        Converts the first page of a DOCX file to an image in BytesIO.
+        The conversion runs through the report conversion queue and is cached by document content.
         Args:
             docx_path (str): Path to the DOCX file.
-            temp_pdf_path (str): Temporary path for the intermediate PDF file.
         Returns:
             io.BytesIO: The image in BytesIO format.
         """
         with self.output:
-            convert(docx_path, temp_pdf_path)
-        doc = fitz.open(temp_pdf_path)
-        page = doc.load_page(0)
-        pix = page.get_pixmap(dpi=300)
-        img_bytes = io.BytesIO(pix.tobytes("png"))
-        return img_bytes, temp_pdf_path
+            png = conversion_service().preview_png(docx_path, page=0, dpi=300)
+        return io.BytesIO(png)
 
     def crop_image_bytes(self, image_bytes: io.BytesIO, left: int, top: int, right: int, bottom: int) -> io.BytesIO:
         """
@@ -490,70 +539,103 @@ class FMSTesting:
         cropped_bytes.seek(0)
         return cropped_bytes
 
+    def get_state_store(self, fms_id: str = None) -> AcceptanceStateStore:
+        """
+        Returns the state store of the given (or current) FMS ID, flushing the store of the previous FMS.
+        Args:
+            fms_id (str, optional): The FMS ID, defaults to the current FMS ID.
+        Returns:
+            AcceptanceStateStore: The state store of the FMS.
+        """
+        fms_id = fms_id or self.fms_id
+        if not self.state_store or self.state_store.fms_id != fms_id:
+            if self.state_store:
+                self.state_store.flush()
+            self.state_store = AcceptanceStateStore(self.fms.Session, fms_id)
+        return self.state_store
+
     def save_current_state(self, next_step: bool = False, current_property_index: int = None, current_test_type: str = None, current_subdict: dict = None) -> None:
         """
         Saves the current state of the testing procedure to the database.
+        Field changes are journaled as deltas after a short debounce window, the full state is
+        written (compacted) at step boundaries, when the procedure position changes or for a new entry.
         Args:
             next_step (bool): Whether the state is saved because the procedure is moving to the next step.
             current_property_index (int, optional): The current property index.
             current_test_type (str, optional): The current test type.
             current_subdict (dict, optional): The current sub-dictionary.
         """
-        existing_entry = self.session.query(FMSAcceptanceTests).filter_by(fms_id=self.fms_id).first()
-        if existing_entry:
-            existing_entry.raw_json = self.test_info
-            if current_property_index is not None:
-                existing_entry.current_property_index = current_property_index
-            if current_test_type is not None:
-                existing_entry.current_test_type = current_test_type
-            existing_entry.current_subdict = current_subdict
-        else:
-            new_entry = FMSAcceptanceTests(fms_id=self.fms_id, raw_json=self.test_info, version=self.procedure.version)
-            self.session.add(new_entry)
-        if next_step:
-            existing_limits = self.session.query(FMSLimits).filter_by(fms_id=self.fms_id).first()
-            if existing_limits:
-                existing_limits.limits = self.fms_limits
+        state_store = self.get_state_store()
+        if not next_step and current_property_index is None and current_test_type is None and state_store.persisted:
+            state_store.record(self.test_info, current_subdict)
+            return
+
+        # Written under the lock of the job runner, so the commit does not race report jobs and journal writes
+        with job_runner().database_lock:
+            existing_entry = self.session.query(FMSAcceptanceTests).filter_by(fms_id=self.fms_id).first()
+            if existing_entry:
+                if current_property_index is not None:
+                    existing_entry.current_property_index = current_property_index
+                if current_test_type is not None:
+                    existing_entry.current_test_type = current_test_type
+                existing_entry.current_subdict = current_subdict
             else:
-                new_limits = FMSLimits(
-                    fms_id = self.fms_id,
-                    limits = self.fms_limits
-                )
-                self.session.add(new_limits)
-
-            if len(self.main_test_results) > 0:
-                existing_entries = self.session.query(FMSTestResults).filter_by(fms_id=self.fms_id).all()
-                existing_parameters = []
-                for entry in existing_entries:
-                    parameter_name = entry.parameter_name
-                    if parameter_name in self.main_test_results:
-                        existing_parameters.append(parameter_name)
-                        entry.parameter_value = self.main_test_results[parameter_name].get('value') if\
-                              isinstance(self.main_test_results[parameter_name].get('value'), (int, float)) else None
-                        entry.parameter_json = self.main_test_results[parameter_name].get('value') if \
-                            not isinstance(self.main_test_results[parameter_name].get('value'), (int, float)) else None
-                        entry.parameter_unit = self.main_test_results[parameter_name].get('unit')
-                        entry.lower = self.main_test_results[parameter_name].get('lower', False)
-                        entry.equal = self.main_test_results[parameter_name].get('equal', True)
-                        entry.larger = self.main_test_results[parameter_name].get('larger', False)
-                        entry.within_limits = self.main_test_results[parameter_name].get('within_limits')
-                        
-                for param, values in self.main_test_results.items():
-                    if param in existing_parameters:
-                        continue
-                    new_result = FMSTestResults(
-                        fms_id=self.fms_id,
-                        parameter_name=param,
-                        parameter_value=values.get('value') if isinstance(values.get('value'), (int, float)) else None,
-                        parameter_json=values.get('value') if not isinstance(values.get('value'), (int, float)) else None,
-                        parameter_unit=values.get('unit'),
-                        lower=values.get('lower', False),
-                        equal=values.get('equal', True),
-                        larger=values.get('larger', False),
-                        within_limits=values.get('within_limits')
+                existing_entry = FMSAcceptanceTests(fms_id=self.fms_id, version=self.procedure.version)
+                self.session.add(existing_entry)
+            state_store.compact(self.session, existing_entry, self.test_info)
+            if next_step:
+                existing_limits = self.session.query(FMSLimits).filter_by(fms_id=self.fms_id).first()
+                if existing_limits:
+                    existing_limits.limits = self.fms_limits
+                else:
+                    new_limits = FMSLimits(
+                        fms_id = self.fms_id,
+                        limits = self.fms_limits
                     )
-                    self.session.add(new_result)
-        self.session.commit()
+                    self.session.add(new_limits)
+
+                if len(self.main_test_results) > 0:
+                    names = list(self.main_test_results)
+                    statuses = dict(zip(names, compile_limits(self.fms_limits).evaluate(
+                        names,
+                        [self.main_test_results[name].get('value') for name in names],
+                        [self.main_test_results[name].get('unit') for name in names],
+                    )))
+                    existing_entries = self.session.query(FMSTestResults).filter_by(fms_id=self.fms_id).all()
+                    existing_parameters = []
+                    for entry in existing_entries:
+                        parameter_name = entry.parameter_name
+                        if parameter_name in self.main_test_results:
+                            existing_parameters.append(parameter_name)
+                            entry.parameter_value = self.main_test_results[parameter_name].get('value') if\
+                                  isinstance(self.main_test_results[parameter_name].get('value'), (int, float)) else None
+                            entry.parameter_json = self.main_test_results[parameter_name].get('value') if \
+                                not isinstance(self.main_test_results[parameter_name].get('value'), (int, float)) else None
+                            entry.parameter_unit = self.main_test_results[parameter_name].get('unit')
+                            entry.lower = self.main_test_results[parameter_name].get('lower', False)
+                            entry.equal = self.main_test_results[parameter_name].get('equal', True)
+                            entry.larger = self.main_test_results[parameter_name].get('larger', False)
+                            entry.within_limits = statuses.get(parameter_name)
+                        
+                    for param, values in self.main_test_results.items():
+                        if param in existing_parameters:
+                            continue
+                        new_result = FMSTestResults(
+                            fms_id=self.fms_id,
+                            parameter_name=param,
+                            parameter_value=values.get('value') if isinstance(values.get('value'), (int, float)) else None,
+                            parameter_json=values.get('value') if not isinstance(values.get('value'), (int, float)) else None,
+                            parameter_unit=values.get('unit'),
+                            lower=values.get('lower', False),
+                            equal=values.get('equal', True),
+                            larger=values.get('larger', False),
+                            within_limits=statuses.get(param)
+                        )
+                        self.session.add(new_result)
+            self.session.commit()
+        if next_step:
+            # Limits and test results are edited in place, which the data version does not show
+            self._invalidate_bundle(self.fms_id)
 
     def field(self, description: str, field_width: str = "400px", label_width: str = "160px", height: str = "30px") -> dict:
         return dict(description=description,
@@ -622,7 +704,7 @@ class FMSTesting:
                 if fms_check:
                     if fms_check.version:
                         procedure_version.value = fms_check.version
-                    test_info = fms_check.raw_json
+                    test_info = read_acceptance_state(self.session, fms_check, resolve=False)
                     if test_info:
                         project = test_info.get("project", "")
                         if project:
@@ -661,6 +743,7 @@ class FMSTesting:
                     return
                 
             self.procedure = procedure_entry
+            self.load_bundle()
                 
             if not self.fms_id in self.all_fms_field.options:
                 self.all_fms_field.options = list(self.all_fms_field.options) + [self.fms_id]
@@ -751,49 +834,30 @@ class FMSTesting:
             return int(match.group(1)) if match else float('inf')
         
         if not opening_image or not closing_image:
-            test_folder = next((folder for folder in self.test_folders if self.fms_id in folder), None)
-            if not self.tvac_loop:
-                try:
-                    electrical_folder = next((folder for folder in os.listdir(os.path.join(self.test_directory, test_folder)) 
-                                            if "Electrical" in folder), None) if test_folder else None
-                except Exception as e:
-                    traceback.print_exc()
-                    return
-                if electrical_folder:
-                    images = [f for f in os.listdir(os.path.join(self.test_directory, test_folder, electrical_folder)) 
-                            if f.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.gif'))]
-
-                    hpiv_opening_image = min(images, key=extract_number)
-                    hpiv_closing_image = max(images, key=extract_number)
-
-                    self.test_info[test_type]["hpiv_images"] = {
-                        "hpiv_opening_image": self.encode_image(os.path.join(self.test_directory, test_folder, electrical_folder, hpiv_opening_image)) 
-                                            if hpiv_opening_image else None,
-                        "hpiv_closing_image": self.encode_image(os.path.join(self.test_directory, test_folder, electrical_folder, hpiv_closing_image)) 
-                                            if hpiv_closing_image else None
-                    }
-            else:
-                try:
-                    tvac_folder = next((folder for folder in os.listdir(os.path.join(self.test_directory, test_folder)) if "tvac" in folder.lower()), None)
-                except Exception as e:
-                    traceback.print_exc()
-                    return
-                if tvac_folder:
-                    temp_folder = next((folder for folder in os.listdir(os.path.join(self.test_directory, test_folder, tvac_folder)) if self.current_temp.replace("°C", "") in folder), None)
-                    if temp_folder:
-                        electrical_folder = next((folder for folder in os.listdir(os.path.join(self.test_directory, test_folder, tvac_folder, temp_folder)) if "electrical" in folder.lower()), None)
-                        if electrical_folder:
-                            images = [f for f in os.listdir(os.path.join(self.test_directory, test_folder, tvac_folder, temp_folder, electrical_folder)) 
-                                    if f.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.gif'))]
-                            hpiv_opening_image = min(images, key=extract_number)
-                            hpiv_closing_image = max(images, key=extract_number)
-
-                            self.test_info[test_type][subdict]["hpiv_images"] = {
-                                "hpiv_opening_image": self.encode_image(os.path.join(self.test_directory, test_folder, tvac_folder, temp_folder, electrical_folder, hpiv_opening_image)) 
-                                                    if hpiv_opening_image else None,
-                                "hpiv_closing_image": self.encode_image(os.path.join(self.test_directory, test_folder, tvac_folder, temp_folder, electrical_folder, hpiv_closing_image)) 
-                                                    if hpiv_closing_image else None
-                            }
+            test_folder = next((folder for folder in self.test_index.listdir(self.test_directory) if self.fms_id in folder), None)
+            test_path = os.path.join(self.test_directory, test_folder) if test_folder else None
+            try:
+                if not self.tvac_loop:
+                    electrical_folder = self.test_index.first(test_path, "Electrical", case_sensitive=True)
+                else:
+                    tvac_folder = self.test_index.first(test_path, "tvac")
+                    temp_folder = self.test_index.first(tvac_folder, self.current_temp.replace("°C", ""), case_sensitive=True)
+                    electrical_folder = self.test_index.first(temp_folder, "electrical")
+            except Exception as e:
+                traceback.print_exc()
+                return
+            images = self.test_index.files(electrical_folder) if electrical_folder else []
+            if images:
+                hpiv_opening_image = min(images, key=lambda f: extract_number(os.path.basename(f)))
+                hpiv_closing_image = max(images, key=lambda f: extract_number(os.path.basename(f)))
+                hpiv_images = {
+                    "hpiv_opening_image": self.encode_image(hpiv_opening_image),
+                    "hpiv_closing_image": self.encode_image(hpiv_closing_image)
+                }
+                if not self.tvac_loop:
+                    self.test_info[test_type]["hpiv_images"] = hpiv_images
+                else:
+                    self.test_info[test_type][subdict]["hpiv_images"] = hpiv_images
 
             self.save_current_state()
 
@@ -828,7 +892,7 @@ class FMSTesting:
         else:
             file_name = ""
 
-        vibration_folder = next((folder for folder in self.vibration_folders if self.fms_id in folder), None)
+        vibration_folder = next((folder for folder in self.vibration_index.listdir(self.vibration_directory) if self.fms_id in folder), None)
         folder = None
         dropdown = widgets.Dropdown(
             options=[],
@@ -841,22 +905,22 @@ class FMSTesting:
             self.test_info["nlr_document"] = os.path.basename(vibration_folder)
             if not "setup" in prop_key:
                 try:
-                    data_folder = next((folder for folder in os.listdir(os.path.join(self.vibration_directory, vibration_folder)) if "vibration data" in folder.lower()), None)
+                    data_folder = next((folder for folder in self.vibration_index.listdir(os.path.join(self.vibration_directory, vibration_folder)) if "vibration data" in folder.lower()), None)
                 except Exception as e:
                     print(f"Cannot find vibration images for {self.fms_id} in {self.vibration_directory}")
                     return
                 if data_folder:
                     if "overlay" in prop_key:
-                        folder = next((f for f in os.listdir(os.path.join(self.vibration_directory, vibration_folder, data_folder)) if "comparison" in f.lower()), None)
+                        folder = next((f for f in self.vibration_index.listdir(os.path.join(self.vibration_directory, vibration_folder, data_folder)) if "comparison" in f.lower()), None)
                         if folder:
-                            options = sorted([f for f in os.listdir(os.path.join(self.vibration_directory, vibration_folder, data_folder, folder)) if f"({current_axis})" in f.lower()], key = lambda x: int(x.split("_")[-1].split(".")[0]))
+                            options = sorted([f for f in self.vibration_index.listdir(os.path.join(self.vibration_directory, vibration_folder, data_folder, folder)) if f"({current_axis})" in f.lower()], key = lambda x: int(x.split("_")[-1].split(".")[0]))
                             dropdown.options = [(os.path.basename(f).split(".")[0], f) for f in options if f.lower().endswith(('.docx'))]
                             dropdown.description = f"Overlay Image RS on {current_axis}-axis:"
                             dropdown.value = None if not image else file_name
                             # files = [os.path.join(self.vibration_directory, vibration_folder, data_folder, folder, f)
                             # for f in options if f.lower().endswith('.docx')]
                     elif "rs" in prop_key:
-                        folders = [f for f in os.listdir(os.path.join(self.vibration_directory, vibration_folder, data_folder)) if "ts-" in f.lower() and "rs" in f.lower() and f"({current_axis})" in f.lower()]
+                        folders = [f for f in self.vibration_index.listdir(os.path.join(self.vibration_directory, vibration_folder, data_folder)) if "ts-" in f.lower() and "rs" in f.lower() and f"({current_axis})" in f.lower()]
                         if folders:
                             sorted_folders = sorted(folders, key = lambda x: int(os.path.basename(x).split(" ")[0].split("-")[-1]))
                             pre_rs_folder = sorted_folders[0]
@@ -865,52 +929,52 @@ class FMSTesting:
                                 folder = pre_rs_folder
                             elif "post" in prop_key:
                                 folder = post_rs_folder
-                            acceleration_folder = next((f for f in os.listdir(os.path.join(self.vibration_directory, vibration_folder, data_folder, folder)) if "acceleration" in f.lower()), None)
+                            acceleration_folder = next((f for f in self.vibration_index.listdir(os.path.join(self.vibration_directory, vibration_folder, data_folder, folder)) if "acceleration" in f.lower()), None)
                             if acceleration_folder:
                                 folder = os.path.join(folder, acceleration_folder)
-                                options = [f for f in os.listdir(os.path.join(self.vibration_directory, vibration_folder, data_folder, folder)) if f.lower().endswith(('.docx')) and (f"{current_axis}_+{current_axis}" in f.lower()\
+                                options = [f for f in self.vibration_index.listdir(os.path.join(self.vibration_directory, vibration_folder, data_folder, folder)) if f.lower().endswith(('.docx')) and (f"{current_axis}_+{current_axis}" in f.lower()\
                                            or f"{current_axis}_-{current_axis}" in f.lower())]
                                 dropdown.options = [(os.path.basename(f).split(".")[0], f) for f in options]
                                 dropdown.description = f"Select RS Image for {current_axis}-axis:"
                                 dropdown.value = None if not image else file_name
 
                     elif "random_vibration" in prop_key:
-                        parent_folder = next((f for f in os.listdir(os.path.join(self.vibration_directory, vibration_folder, data_folder)) if "random" in f.lower() and f"({current_axis})" in f.lower()), None)
+                        parent_folder = next((f for f in self.vibration_index.listdir(os.path.join(self.vibration_directory, vibration_folder, data_folder)) if "random" in f.lower() and f"({current_axis})" in f.lower()), None)
                         if parent_folder:
-                            measurement_folder = next((f for f in os.listdir(os.path.join(self.vibration_directory, vibration_folder, data_folder, parent_folder)) if "measurement" in f.lower()), None)
+                            measurement_folder = next((f for f in self.vibration_index.listdir(os.path.join(self.vibration_directory, vibration_folder, data_folder, parent_folder)) if "measurement" in f.lower()), None)
                             if measurement_folder:
                                 folder = os.path.join(parent_folder, measurement_folder)
-                                options = [f for f in os.listdir(os.path.join(self.vibration_directory, vibration_folder, data_folder, folder)) if f.lower().endswith(('.docx')) and (f"{current_axis}_+{current_axis}" in f.lower()\
+                                options = [f for f in self.vibration_index.listdir(os.path.join(self.vibration_directory, vibration_folder, data_folder, folder)) if f.lower().endswith(('.docx')) and (f"{current_axis}_+{current_axis}" in f.lower()\
                                            or f"{current_axis}_-{current_axis}" in f.lower())]
                                 dropdown.options = [(os.path.basename(f).split(".")[0], f) for f in options]
                                 dropdown.description = f"Select Random Vibration Image for {current_axis}-axis:"
                                 dropdown.value = None if not image else file_name
             else:
-                picture_folder = next((folder for folder in os.listdir(os.path.join(self.vibration_directory, vibration_folder)) if "pictures" in folder.lower()), None)
+                picture_folder = next((folder for folder in self.vibration_index.listdir(os.path.join(self.vibration_directory, vibration_folder)) if "pictures" in folder.lower()), None)
                 if picture_folder:
                     if current_axis == 'x':
-                        x_folder = next((f for f in os.listdir(os.path.join(self.vibration_directory, vibration_folder, picture_folder)) if "x-axis" in f.lower()), None)
+                        x_folder = next((f for f in self.vibration_index.listdir(os.path.join(self.vibration_directory, vibration_folder, picture_folder)) if "x-axis" in f.lower()), None)
                         if x_folder:
-                            before_folder = next((f for f in os.listdir(os.path.join(self.vibration_directory, vibration_folder, picture_folder, x_folder)) if "before test" in f.lower()), None)
+                            before_folder = next((f for f in self.vibration_index.listdir(os.path.join(self.vibration_directory, vibration_folder, picture_folder, x_folder)) if "before test" in f.lower()), None)
                             if before_folder:
                                 folder = os.path.join(x_folder, before_folder)
                     elif current_axis == 'y':
-                        y_folder = next((f for f in os.listdir(os.path.join(self.vibration_directory, vibration_folder, picture_folder)) if "y-axis" in f.lower()), None)
+                        y_folder = next((f for f in self.vibration_index.listdir(os.path.join(self.vibration_directory, vibration_folder, picture_folder)) if "y-axis" in f.lower()), None)
                         if y_folder:
-                            before_folder = next((f for f in os.listdir(os.path.join(self.vibration_directory, vibration_folder, picture_folder, y_folder)) if "before test" in f.lower()), None)
+                            before_folder = next((f for f in self.vibration_index.listdir(os.path.join(self.vibration_directory, vibration_folder, picture_folder, y_folder)) if "before test" in f.lower()), None)
                             if before_folder:
                                 folder = os.path.join(y_folder, before_folder)
                     elif current_axis == 'z':
-                        z_folder = next((f for f in os.listdir(os.path.join(self.vibration_directory, vibration_folder, picture_folder)) if "z-axis" in f.lower()), None)
+                        z_folder = next((f for f in self.vibration_index.listdir(os.path.join(self.vibration_directory, vibration_folder, picture_folder)) if "z-axis" in f.lower()), None)
                         if z_folder:
-                            before_folder = next((f for f in os.listdir(os.path.join(self.vibration_directory, vibration_folder, picture_folder, z_folder)) if "before test" in f.lower()), None)
+                            before_folder = next((f for f in self.vibration_index.listdir(os.path.join(self.vibration_directory, vibration_folder, picture_folder, z_folder)) if "before test" in f.lower()), None)
                             if before_folder:
                                 folder = os.path.join(z_folder, before_folder)
 
                     if folder:
                         dropdown.options = [
                             (os.path.basename(f).split(".")[0], f)
-                            for f in os.listdir(os.path.join(self.vibration_directory, vibration_folder, picture_folder, folder))
+                            for f in self.vibration_index.listdir(os.path.join(self.vibration_directory, vibration_folder, picture_folder, folder))
                             if f.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.gif'))
                         ]
                         dropdown.description = f"Select Image for {current_axis}-axis:"
@@ -945,10 +1009,8 @@ class FMSTesting:
                     else:
                         full_path = os.path.join(self.vibration_directory, vibration_folder, data_folder, folder, selected_image_path)
                         form.children = [dropdown, widgets.HTML(value="<i>Processing image, please wait...</i>")]
-                        docx_image_bytes, temp_path = self.convert_docx_to_image_bytes(full_path)
+                        docx_image_bytes = self.convert_docx_to_image_bytes(full_path)
                         cropped_image_bytes = self.crop_image_bytes(docx_image_bytes, left=300, top=100, right=3300, bottom=2065)
-                        os.remove(temp_path)
-
 
                         self.test_info[test_type][prop_key]["image"] = self.encode_image(cropped_image_bytes)
                         self.test_info[test_type][prop_key]["path"] = full_path
@@ -1030,15 +1092,16 @@ class FMSTesting:
             get_container()['used_tests'] = used_tests
             self.save_current_state()
 
+        bundle = self._get_bundle()
         test_map: dict[str, list[FMSFunctionalTests | FMSTvac | FMSFRTests]] = {
-            'low_closed_loop_plot': [f for f in self.fms_query.get_closed_loop_tests(self.fms_id) if f.test_type == FunctionalTestType.LOW_CLOSED_LOOP],
-            'low_slope_plot': [f for f in self.fms_query.get_slope_tests(self.fms_id) if f.test_type == FunctionalTestType.LOW_SLOPE],
-            'fr_performance_plot': self.fms_query.get_fr_tests(self.fms_id),
-            'tvac_summary_plot': self.fms_query.get_tvac_tests(self.fms_id),
-            'high_closed_loop_plot': [f for f in self.fms_query.get_closed_loop_tests(self.fms_id) if f.test_type == FunctionalTestType.HIGH_CLOSED_LOOP],
-            'high_slope_plot': [f for f in self.fms_query.get_slope_tests(self.fms_id) if f.test_type == FunctionalTestType.HIGH_SLOPE],
-            'high_open_loop_plot': [f for f in self.fms_query.get_open_loop_tests(self.fms_id) if f.test_type == FunctionalTestType.HIGH_OPEN_LOOP],
-            'low_open_loop_plot': [f for f in self.fms_query.get_open_loop_tests(self.fms_id) if f.test_type == FunctionalTestType.LOW_OPEN_LOOP],
+            'low_closed_loop_plot': bundle.tests(FunctionalTestType.LOW_CLOSED_LOOP) if bundle else [],
+            'low_slope_plot': bundle.tests(FunctionalTestType.LOW_SLOPE) if bundle else [],
+            'fr_performance_plot': list(bundle.fr_tests) if bundle else [],
+            'tvac_summary_plot': list(bundle.tvac) if bundle else [],
+            'high_closed_loop_plot': bundle.tests(FunctionalTestType.HIGH_CLOSED_LOOP) if bundle else [],
+            'high_slope_plot': bundle.tests(FunctionalTestType.HIGH_SLOPE) if bundle else [],
+            'high_open_loop_plot': bundle.tests(FunctionalTestType.HIGH_OPEN_LOOP) if bundle else [],
+            'low_open_loop_plot': bundle.tests(FunctionalTestType.LOW_OPEN_LOOP) if bundle else [],
         }
 
         function_map = {
@@ -1314,7 +1377,8 @@ class FMSTesting:
             at key points in FMS flow testing.
         """
 
-        slope_tests = self.fms_query.get_slope_tests(fms_id = self.fms_id)
+        bundle = self._get_bundle()
+        slope_tests = bundle.tests(FunctionalTestType.HIGH_SLOPE, FunctionalTestType.LOW_SLOPE) if bundle else []
         keys_list = [
             "tv_full_open",
             "tv_full_open_power",
@@ -1359,20 +1423,12 @@ class FMSTesting:
                         high_relevant_test = high_open_loop_tests[-1] if high_open_loop_tests else None
                         tvac_key = temp_type.value.split("_")[0] + "_"
                     if relevant_test:
-                        results: list[FMSFunctionalResults] = relevant_test.functional_results
-                        if results: 
-                            df = pd.DataFrame([{
-                                'parameter_name': res.parameter_name,
-                                'parameter_value': res.parameter_value,
-                            } for res in results])
-                            params = [FMSFlowTestParameters.AVG_TV_POWER.value,
-                                    FMSFlowTestParameters.TOTAL_FLOW.value,
-                                    FMSFlowTestParameters.TV_PT1000.value]
-
-                            df_filtered = df[df['parameter_name'].isin(params)]
-                            tv_power = df_filtered.loc[df_filtered['parameter_name'] == FMSFlowTestParameters.AVG_TV_POWER.value, 'parameter_value'].to_numpy()
-                            total_flow = df_filtered.loc[df_filtered['parameter_name'] == FMSFlowTestParameters.TOTAL_FLOW.value, 'parameter_value'].to_numpy()
-                            pt1000 = df_filtered.loc[df_filtered['parameter_name'] == FMSFlowTestParameters.TV_PT1000.value, 'parameter_value'].to_numpy()
+                        channels = bundle.channels(relevant_test.test_id)
+                        if channels:
+                            empty = np.array([], dtype=float)
+                            tv_power = channels.get(FMSFlowTestParameters.AVG_TV_POWER.value, empty)
+                            total_flow = channels.get(FMSFlowTestParameters.TOTAL_FLOW.value, empty)
+                            pt1000 = channels.get(FMSFlowTestParameters.TV_PT1000.value, empty)
                             tv_full_open_idx = np.argmax(total_flow)
                             tv_full_open = pt1000[tv_full_open_idx]
                             tv_full_open_power = np.max(tv_power)
@@ -1385,16 +1441,12 @@ class FMSTesting:
                                 self.test_info[f"{tvac_key}low_tv_temp_check"] = round(opening_temp,1)
                                 self.test_info[f"{tvac_key}low_tv_power_check"] = round(opening_power,2)
                         if high_relevant_test:
-                            high_results: list[FMSFunctionalResults] = high_relevant_test.functional_results
-                            if high_results:
-                                high_df = pd.DataFrame([{
-                                    'parameter_name': res.parameter_name,
-                                    'parameter_value': res.parameter_value,
-                                } for res in high_results])
-                                high_df_filtered = high_df[high_df['parameter_name'].isin(params)]
-                                high_tv_power = high_df_filtered.loc[high_df_filtered['parameter_name'] == FMSFlowTestParameters.AVG_TV_POWER.value, 'parameter_value'].to_numpy()
-                                high_total_flow = high_df_filtered.loc[high_df_filtered['parameter_name'] == FMSFlowTestParameters.TOTAL_FLOW.value, 'parameter_value'].to_numpy()
-                                high_pt1000 = high_df_filtered.loc[high_df_filtered['parameter_name'] == FMSFlowTestParameters.TV_PT1000.value, 'parameter_value'].to_numpy()
+                            high_channels = bundle.channels(high_relevant_test.test_id)
+                            if high_channels:
+                                empty = np.array([], dtype=float)
+                                high_tv_power = high_channels.get(FMSFlowTestParameters.AVG_TV_POWER.value, empty)
+                                high_total_flow = high_channels.get(FMSFlowTestParameters.TOTAL_FLOW.value, empty)
+                                high_pt1000 = high_channels.get(FMSFlowTestParameters.TV_PT1000.value, empty)
                                 high_tv_temp = high_pt1000[0]
                                 self.test_info[f"{tvac_key}high_tv_temp"] = round(high_tv_temp,1)
                                 high_opening_temp, high_opening_power = self.get_opening_temperature(high_pt1000, high_total_flow, high_tv_power)
@@ -2143,76 +2195,25 @@ class FMSTesting:
                         props.append(k)
         return props, subdict_map
 
-    def get_tvac_context(self, template: DocxTemplate) -> None:
-        """
-        Adds all the test results obtained in the TVAC phases to the report context.
-        Args:
-            template (DocxTemplate): The document template to add images to.
-        """
-        tvac_map = {
-            "tvac_results_hot": "hot",
-            "tvac_results_cold": "cold",
-            "tvac_results_room": "room",
-        }
-
-        limit_keys = ["max", "min", "nominal", "tol"]
-
-        for key, prefix in tvac_map.items():
-            tvac_data = self.test_info.get(key, {})
-            if not isinstance(tvac_data, dict):
-                continue
-
-            for test_type, props in tvac_data.items():
-                if not isinstance(props, dict):
-                    continue
-
-                for prop_key, prop_value in props.items():
-                    context_key = f"{prefix}_{prop_key}"
-                    if isinstance(prop_value, dict) and "image" in prop_value:
-                        image_bytes = self.decode_image(prop_value["image"])
-                        if not bool(image_bytes.getvalue()):
-                            continue
-                        self.context[context_key] = InlineImage(template, image_bytes, width=Mm(145))
-                    elif isinstance(prop_value, dict) and prop_key == "hpiv_images":
-                        opening_image = prop_value.get("hpiv_opening_image", "")
-                        closing_image = prop_value.get("hpiv_closing_image", "")
-                        opening_bytes = self.decode_image(opening_image)
-                        if bool(opening_bytes.getvalue()):
-                            self.context[f"{prefix}_hpiv_opening_image"] = InlineImage(template, opening_bytes, width = Mm(80))
-                        closing_bytes = self.decode_image(closing_image)
-                        if bool(closing_bytes.getvalue()):
-                            self.context[f"{prefix}_hpiv_closing_image"] = InlineImage(template, closing_bytes, width = Mm(80))
-                    elif isinstance(prop_value, list) and prop_key == "extra_plots":
-                        extra_plots = []
-                        for plot_dict in prop_value:
-                            plot_image = plot_dict.get("image")
-                            if plot_image:
-                                plot_bytes = self.decode_image(plot_image)
-                                if bool(plot_bytes.getvalue()):
-                                    plot_dict["image"] = InlineImage(template, plot_bytes, width=Mm(145))
-                                    extra_plots.append(plot_dict)
-                        self.context[context_key] = extra_plots
-                    else:
-                        if not any(i in prop_key for i in limit_keys):
-                            self.context[prop_key] = prop_value
-                        else:
-                            self.context[context_key] = prop_value
-
-            # if key in self.test_info:
-            #     del self.test_info[key]
-
     def get_power_budget_context(self) -> None:
         """
         Extracts power budget information from the test info and adds it to the report context.
+        Placeholders ({parameter}) in the component descriptions are filled in from the report context.
         """
         power_budgets = []
         def get_component_dict(budget_dict, component_name):
             component_dict = next((comp for comp in budget_dict.get("components", []) if comp.get("component") == component_name), None)
-            for i in self.context:
-                if i in component_dict.get("min_description", ""):
-                    component_dict["min_description"] = component_dict["min_description"].replace(f"{{{i}}}", str(self.context[i]))
-                if i in component_dict.get("max_description", ""):
-                    component_dict["max_description"] = component_dict["max_description"].replace(f"{{{i}}}", str(self.context[i]))
+            if not component_dict:
+                return component_dict
+            for description in ("min_description", "max_description"):
+                text = component_dict.get(description, "")
+                if not isinstance(text, str) or "{" not in text:
+                    continue
+                for placeholder in re.findall(r"\{(\w+)\}", text):
+                    value = self.context.get(placeholder)
+                    if placeholder in self.context and not isinstance(value, LazyInlineImage):
+                        text = text.replace(f"{{{placeholder}}}", str(value))
+                component_dict[description] = text
             return component_dict
 
         for budget_type, budget_dict in self.test_info.get("power_budgets", {}).items():
@@ -2244,76 +2245,6 @@ class FMSTesting:
         self.context["power_budgets"] = power_budgets
         # del self.test_info["power_budgets"]
 
-    def get_physical_properties_context(self) -> None:
-        """
-        Extracts physical properties from the test info and adds them to the report context.
-        """
-        physical_props = self.test_info.get("physical_properties", {})
-        mass = physical_props.get("mass", 0)
-        self.context["mass"] = mass
-        for location, values in physical_props.items():
-            if isinstance(values, dict):
-                self.context[location] = values
-                remark = values.get("remark", "")
-                self.context[f"{location}_remark"] = remark
-
-        # del self.test_info["physical_properties"]
-
-    def get_leftover_context(self, template: DocxTemplate) -> None:
-        """
-        Processes any remaining items in the test info and adds them to the report context.
-        Args:
-            template (DocxTemplate): The document template for image embedding.
-        """
-        def process_dict(d):
-            for k, v in d.items():
-                if isinstance(v, dict):
-                    if k == "hpiv_images":
-                        opening_img = self.decode_image(v.get("hpiv_opening_image", ""))
-                        closing_img = self.decode_image(v.get("hpiv_closing_image", ""))
-                        if bool(opening_img.getvalue()):
-                            self.context["hpiv_opening_image"] = InlineImage(template, opening_img, width=Mm(80))
-                        if bool(closing_img.getvalue()):
-                            self.context["hpiv_closing_image"] = InlineImage(template, closing_img, width=Mm(80))
-                        continue
-
-                    if k == "extra_plots" and isinstance(v, list):
-                        extra_plots = []
-                        for plot_dict in v:
-                            plot_image = plot_dict.get("image")
-                            if plot_image:
-                                plot_bytes = self.decode_image(plot_image)
-                                if bool(plot_bytes.getvalue()):
-                                    plot_dict["image"] = InlineImage(template, plot_bytes, width=Mm(145))
-                                    extra_plots.append(plot_dict)
-                        self.context["extra_plots"] = extra_plots
-                        continue
-
-                    if "image" in v and isinstance(v["image"], str):
-                        img_bytes = self.decode_image(v["image"])
-                        if not bool(img_bytes.getvalue()):
-                            continue
-                        if not "setup" in k and not k in self.context:
-                            self.context[k] = InlineImage(template, img_bytes, width=Mm(145))
-                        elif not k in self.context:
-                            self.context[k] = InlineImage(template, img_bytes, width=Mm(80))
-                        for sub_k, sub_v in v.items():
-                            if sub_k != "image" and not sub_k in self.context:
-                                self.context[sub_k] = sub_v
-                        continue
-
-                    process_dict(v)
-
-                else:
-                    if not k in self.context:
-                        self.context[k] = v
-
-        for key, value in self.test_info.items():
-            if isinstance(value, dict):
-                process_dict(value)
-            else:
-                self.context[key] = value
-
     def check_all_compliance(self) -> bool:
         """
         Stepwise compliance check: shows one popup at a time.
@@ -2323,13 +2254,38 @@ class FMSTesting:
         passed_dict = {}
         all_passed = True
         index = 0
-        all_test_results = self.session.query(FMSTestResults).filter_by(fms_id=self.fms_id).all()
+        bundle = self._get_bundle()
+        all_test_results = bundle.test_results if bundle else []
         test_results_dict = {
             res.parameter_name: {"unit": res.parameter_unit, "lower": res.lower, "larger": res.larger} for res in all_test_results
         }
         # if "max_hpiv_opening_response" in test_results_dict:    
         #     with self.output:
         #         print('WAAAT')
+
+        def is_location(value):
+            return isinstance(value, dict) and all(i in value for i in AXES) and "nominal" in value and "tolerances" in value
+
+        # Limit status of every scalar parameter in one vectorized evaluation
+        rules = compile_limits(self.fms_limits)
+        scalars = [(parameter, value) for parameter, value in parameters if not isinstance(value, (dict, list))]
+        statuses = dict(zip([parameter for parameter, _ in scalars], rules.evaluate(
+            [parameter for parameter, _ in scalars],
+            [value for _, value in scalars],
+            [test_results_dict.get(parameter, {}).get("unit", "") for parameter, _ in scalars],
+        )))
+
+        # Location tolerances (nominal ± tolerance per axis) compiled into rules of their own
+        location_axes = [
+            (axis_parameter(parameter, i), value.get("nominal", {}).get(axis), value.get("tolerances", {}).get(f"{axis}_tol"), value.get(axis))
+            for parameter, value in parameters if is_location(value) for i, axis in enumerate(AXES)
+        ]
+        location_axes = [(name, nominal, tol, val) for name, nominal, tol, val in location_axes if nominal is not None and tol is not None]
+        location_rules = LimitRules([name for name, *_ in location_axes],
+                                    [nominal - tol for _, nominal, tol, _ in location_axes],
+                                    [nominal + tol for _, nominal, tol, _ in location_axes])
+        location_codes = dict(zip(location_rules.parameters, location_rules.codes(location_rules.parameters, [val for *_, val in location_axes])))
+
         def format_scientific(parameter, value):
             if not isinstance(value, float):
                 return
@@ -2354,18 +2310,15 @@ class FMSTesting:
             parameter, value = parameters[index]
             index += 1  
 
-            if isinstance(value, dict) and all(i in value for i in ["x", "y", "z"]) and "nominal" in value and "tolerances" in value:
-                loc: dict[str, dict[str, float] | float] = value
-                for axis in ("x", "y", "z"):
-                    val = loc.get(axis)
-                    nominal = loc.get("nominal", {}).get(axis)
-                    tol = loc.get("tolerances", {}).get(f"{axis}_tol")
-
-                    if nominal is None or tol is None:
+            if is_location(value):
+                for i, axis in enumerate(AXES):
+                    name = axis_parameter(parameter, i)
+                    if name not in location_rules.index:
                         continue
 
-                    low, high = nominal - tol, nominal + tol
-                    if val is not None and not (low <= val <= high) and not parameter in self.continue_list:
+                    val = value.get(axis)
+                    low, high = location_rules.bounds(name)
+                    if val is not None and location_codes[name] == OUTSIDE and not parameter in self.continue_list:
                         all_passed = False
                         with self.output:
                             show_modal_popup(
@@ -2414,9 +2367,8 @@ class FMSTesting:
                 check_next()
                 return
 
-            limits = self.fms_limits.get(parameter, {})
-            min_value = limits.get("min")
-            max_value = limits.get("max")
+            min_value, max_value = rules.bounds(parameter)
+            status = statuses.get(parameter)
             unit = test_results_dict.get(parameter, {}).get("unit", "")
             format_scientific(parameter, value)
             if parameter in test_results_dict and not test_results_dict.get(parameter, {}).get("equal", False):
@@ -2428,25 +2380,15 @@ class FMSTesting:
                 if larger:
                     s = "> " + str(self.context[parameter])
                     self.context[parameter] = s
-            if unit == "GOhm":
-                if isinstance(value, float):
-                    value = value * 1e9
-            if min_value is not None and value < min_value and parameter not in self.continue_list:
-                all_passed = False
-                with self.output:
-                    show_modal_popup(
-                        f"[Compliance Error] {parameter}: value {value:.3f} below minimum {min_value:.3f}.\nDo you want to continue anyway?",
-                        lambda param=parameter: handle_fail(param)
-                    )
-                return
-
-            if max_value is not None and value > max_value and parameter not in self.continue_list:
+            if status == LimitStatus.FALSE and parameter not in self.continue_list:
+                value = value * UNIT_SCALES.get(unit, 1)
                 all_passed = False
                 with self.output:
-                    show_modal_popup(
-                        f"[Compliance Error] {parameter}: value {value:.3f} above maximum {max_value:.3f}.\nDo you want to continue anyway?",
-                        lambda param=parameter: handle_fail(param)
-                    )
+                    if min_value is not None and value < min_value:
+                        message = f"[Compliance Error] {parameter}: value {value:.3f} below minimum {min_value:.3f}.\nDo you want to continue anyway?"
+                    else:
+                        message = f"[Compliance Error] {parameter}: value {value:.3f} above maximum {max_value:.3f}.\nDo you want to continue anyway?"
+                    show_modal_popup(message, lambda param=parameter: handle_fail(param))
                 return
 
             passed_dict[f"{parameter}_c"] = "C"
@@ -2491,21 +2433,22 @@ class FMSTesting:
         data = self.fms_query.tv_slope_analysis(get_table=True, correction=True)
         self.context["slope"] = data
 
-    def _get_FR_context(self, template: DocxTemplate = None) -> None:
+    def _get_FR_context(self, template: DocxTemplate = None, variables: set[str] = None) -> None:
         """
         Helper function that uses the FMSQuery class to collect the FR individual performance, performance summary and spec performance.
+        The FR voltage plot is only made if the template uses it (variables, None for always).
         """
-        fms_entry = self.session.query(FMSMain).filter_by(fms_id=self.fms_id).first()
-        if not fms_entry:
+        bundle = self._get_bundle()
+        if not bundle or not bundle.main:
             return 
         
         # Individual FR Performance
-        manifold: ManifoldStatus = fms_entry.manifold[0] if fms_entry.manifold else None
+        manifold: ManifoldStatus = bundle.manifold
         if not manifold:
             return 
         
-        anode: AnodeFR = manifold.anode[0] if manifold.anode else None
-        cathode: CathodeFR = manifold.cathode[0] if manifold.cathode else None
+        anode: AnodeFR = bundle.anode
+        cathode: CathodeFR = bundle.cathode
         if not anode or not cathode:
             return 
         
@@ -2529,6 +2472,8 @@ class FMSTesting:
         self.context["fr_data"] = fr_data
 
         fr_voltage_order = self.test_info.get("fr_performance_voltage_plot", 3)
+        if variables is not None and not {"fr_performance_voltage_plot", "fr_voltage"} & set(variables):
+            return
         if fr_voltage_order:
             test_id = self.test_info.get('functional_performance', {}).get('fr_performance_plot', {}).get('test_id', "")
             if test_id:
@@ -2542,7 +2487,8 @@ class FMSTesting:
         Checks whether the registered test tools are valid, and if so adds them to the report context.
         """
         default_components = self.test_info.get("annex_a")
-        grouped_tools = be.tools.group_tools_by_description(descriptions = default_components)
+        bundle = self._get_bundle()
+        grouped_tools = bundle.tools(default_components) if bundle else be.tools.group_tools_by_description(descriptions = default_components)
         default_tools = []
         for tool, entries in grouped_tools.items():
             tool_entry = entries[0]
@@ -2562,11 +2508,13 @@ class FMSTesting:
 
         template = DocxTemplate(self.test_info["report_path"])
         save_to_json(self.test_info, f"back_up_{self.fms_id}")
-        self.get_tvac_context(template)
+        self.load_bundle()
+        # Only sections the template declares are decoded or queried
+        all_keys = template.get_undeclared_template_variables()
+        builder = ReportContextBuilder(template, variables=all_keys)
+        self.context = builder.build(self.test_info)
         self.get_power_budget_context()
-        self.get_physical_properties_context()
         self.get_test_tools_context()
-        self.get_leftover_context(template)
 
         date = datetime.now()
         date_header = date.strftime("%#d.%b.%Y").upper()
@@ -2579,13 +2527,14 @@ class FMSTesting:
         #     with self.output:
         #         print("Compliance check failed. Report generation aborted.")
         #     return
-        self._get_closed_loop_context()
-        self._get_FR_context(template = template)
-        self._get_tv_slope_context()
+        if builder.wants("closed_loop_data"):
+            self._get_closed_loop_context()
+        self._get_FR_context(template = template, variables = all_keys)
+        if builder.wants("slope"):
+            self._get_tv_slope_context()
 
         word_filename = self.get_new_filename()
 
-        all_keys = template.get_undeclared_template_variables()
         missing_keys = [k for k in all_keys if k not in self.context]
 
         if missing_keys:
@@ -2604,6 +2553,8 @@ class FMSTesting:
     def finalize_report(self, template: DocxTemplate, word_filename: str):
         """
         Helper function that finalizes the generation of the Acceptance Test Report.
+        Rendering, saving and the database update run as a background job (see the jobs panel),
+        so testing can continue with the next FMS while the report is generated.
         
         :param template: docxtpl instance that holds the report template.
         :type template: DocxTemplate
@@ -2611,15 +2562,47 @@ class FMSTesting:
         :type word_filename: str
 
         """
-        template.render(self.context)
-
-        os.makedirs(self.save_path, exist_ok=True)
-        final_word_path = os.path.join(self.save_path, word_filename)
-        template.save(final_word_path)
+        fms_id = self.fms_id
+        # Copied so widget callbacks cannot change them under the job, the images of the context
+        # stay bound to the template itself
+        test_info, context = copy.deepcopy((self.test_info, self.context), {id(template): template})
+        state_store = self.get_state_store()
+        save_path = self.save_path
+        final_word_path = os.path.join(save_path, word_filename)
+
+        def write_report() -> str | None:
+            report_progress(0.1, "Rendering report")
+            template.render(context)
+            check_cancelled()
+            report_progress(0.6, "Saving report")
+            os.makedirs(save_path, exist_ok=True)
+            template.save(final_word_path)
+            report_progress(0.8, "Updating database")
+            session = self.fms.Session()
+            try:
+                with current_job().database():
+                    return self.update_database(fms_id=fms_id, test_info=test_info, session=session, state_store=state_store)
+            finally:
+                session.close()
+
+        def on_done(job: Job) -> None:
+            with self.output:
+                if job.status == JobStatus.DONE:
+                    error = job.result()
+                    if error:
+                        print(error)
+                    print(f"Word report saved: {final_word_path}")
+                    self.convert_report_to_pdf(final_word_path)
+                    return
+                print(f"Report generation of {fms_id} {'failed' if job.status == JobStatus.FAILED else 'was cancelled'}.")
+            self.reported_fms_ids.discard(fms_id)
+            if fms_id not in self.all_fms_field.options:
+                self.all_fms_field.options = list(self.all_fms_field.options) + [fms_id]
 
-        self.update_database()
+        self.jobs.track(job_runner().submit(write_report, name=f"Acceptance report {fms_id}", on_done=on_done))
+        self.reported_fms_ids.add(fms_id)
 
-        self.all_fms_field.options = [i.fms_id for i in self.all_test_info if not i.fms_id == self.fms_id]
+        self.all_fms_field.options = [i.fms_id for i in self.all_test_info if i.fms_id not in self.reported_fms_ids]
         self.all_fms_field.value = None
         self.fms_id = ""
         # self.test_info = self.fms.load_procedure(procedure_name="fms_acceptance_testing_procedure")
@@ -2629,23 +2612,46 @@ class FMSTesting:
         self.current_subdict = None
         self.start_testing()
         with self.output:
-            print(f"Word report saved: {final_word_path}")
+            print(f"Report of {fms_id} queued: {final_word_path}")
 
-    def update_database(self) -> None:
+    def convert_report_to_pdf(self, word_path: str) -> None:
+        """
+        Queues the PDF conversion of a generated report. The conversion runs in the background,
+        together with the other reports queued meanwhile, so testing can continue with the next FMS.
+        Args:
+            word_path (str): Path to the Word report.
+        """
+        def on_converted(future) -> None:
+            with self.output:
+                if future.exception() is None:
+                    print(f"PDF report saved: {future.result()}")
+                else:
+                    print(f"PDF conversion of {os.path.basename(word_path)} failed, the Word report is kept.")
+
+        conversion_service().submit(word_path, callback=on_converted)
+
+    def update_database(self, fms_id: str = None, test_info: dict = None, session: "Session" = None,
+                        state_store: AcceptanceStateStore = None) -> str | None:
         """
         Updates the database to mark the testing as completed and report as generated.
+        Defaults to the current FMS; the report job passes the FMS it was queued for and a session of its own.
+        Returns:
+            str | None: Error message if the FMS is not in the database.
         """
-        fms_entry = self.session.query(FMSMain).filter_by(fms_id=self.fms_id).first()
+        fms_id = fms_id or self.fms_id
+        test_info = test_info if test_info is not None else self.test_info
+        session = session or self.session
+        fms_entry = session.query(FMSMain).filter_by(fms_id=fms_id).first()
         if not fms_entry:
-            with self.output:
-                print(f"[Database Error] FMS ID {self.fms_id} not found in database.")
-            return
+            return f"[Database Error] FMS ID {fms_id} not found in database."
 
         acceptance_test = fms_entry.acceptance_tests[0] if fms_entry.acceptance_tests else None
         if acceptance_test:
+            (state_store or self.get_state_store(fms_id)).compact(session, acceptance_test, test_info)
             acceptance_test.report_generated = True
             acceptance_test.date_created = datetime.now()
 
         fms_entry.status = FMSProgressStatus.TESTING_COMPLETED
-        self.session.commit()
+        session.commit()
+        self._invalidate_bundle(fms_id)
 
@@ -11,6 +11,9 @@ from ..utils.general_utils import field, show_modal_popup
 import sharedBE as be
 from sharedBE import operator
 from .query import ManifoldQuery
+from ..utils.fr_catalog import FRCatalog
+from ..utils.enums import JobStatus
+from ..utils.jobs import Job, JobPanel, job_runner
 import matplotlib.pyplot as plt
 from datetime import datetime
 import numpy as np
@@ -27,31 +30,31 @@ class FRTesting:
         self.fr_sql = self.fms.fr_sql
         self.fr_data = self.fms.fr_data
         self._output = widgets.Output()
-        self.mq = ManifoldQuery(session = self.session, local = local)
+        self.jobs = JobPanel()
+        self._mq = None
         self.img_path = os.path.join(os.path.dirname(__file__), "images", "bradford_logo.jpg")
 
         self.get_flow_restrictors()
         self.logo = widgets.Image(value=open(self.img_path, "rb").read(), format='jpg', width=300, height=100)
         
+    @property
+    def mq(self) -> ManifoldQuery:
+        """
+        Manifold query used for the flow comparison plot, created on first use.
+        """
+        if self._mq is None:
+            self._mq = ManifoldQuery(session = self.session, local = self.local)
+        return self._mq
+
     def get_flow_restrictors(self) -> None:
         """
-        Retrieves all anode and cathode flow restrictors from the database that are not allocated to any set.
+        Sets up the flow restrictor catalog and loads the anode and cathode serial numbers.
+        Records are read from the database when a serial number is selected.
         """
-        self.fr_dict = {}
-        self.fr_entry_dict = {}
+        self.catalog = FRCatalog(self.session)
         try:
-            all_anodes = self.session.query(AnodeFR).all()
-            all_cathodes = self.session.query(CathodeFR).all()
-            for fr in all_anodes:
-                columns = [c.name for c in AnodeFR.__table__.columns]
-                values = [getattr(fr, c) for c in columns]
-                self.fr_dict[fr.fr_id] = {"serial_number": fr.fr_id, 'fr': "Anode", **dict(zip(columns, values))}
-                self.fr_entry_dict[fr.fr_id] = fr
-            for fr in all_cathodes:
-                columns = [c.name for c in CathodeFR.__table__.columns]
-                values = [getattr(fr, c) for c in columns]
-                self.fr_dict[fr.fr_id] = {"serial_number": fr.fr_id, 'fr': "Cathode", **dict(zip(columns, values))}
-                self.fr_entry_dict[fr.fr_id] = fr
+            for fr_type in ("Anode", "Cathode"):
+                self.catalog.serials(fr_type)
 
         except Exception as e:
             print(f"Error retrieving flow restrictor certifications: {e}")
@@ -226,9 +229,9 @@ class FRTesting:
 
     def _check_value(self, value: float, key: str, flow_rate_idx: int | None, flow_rate: bool = False, type: str = "Anode"):
         if not flow_rate:
-            all_values = [i.get(key, None) for i in self.fr_dict.values() if bool(i.get(key, None)) and i.get("fr") == type]
+            all_values = [i for i in self.catalog.column_values(type, key) if bool(i)]
         else:
-            all_values = [i.get("flow_rates", [])[flow_rate_idx] for i in self.fr_dict.values() if bool(i.get("flow_rates", [])) and i.get("fr") == type]
+            all_values = [i[flow_rate_idx] for i in self.catalog.column_values(type, "flow_rates") if bool(i)]
 
         std = np.std(all_values)
         avg = np.average(all_values)
@@ -239,18 +242,19 @@ class FRTesting:
 
     def _update_value(self, value: float, key: str, model: AnodeFR | CathodeFR, flow_rate_idx: float | None = None, flow_rate: bool = False):
         if not flow_rate:
-            self.fr_dict[model.fr_id][key] = value
+            self.catalog.update(model.fr_id, key, value)
             if hasattr(model, key):
                 setattr(model, key, value)
         else:
             if not self._retest:
-                flow_rates = self.fr_dict[model.fr_id]["flow_rates"]
+                flow_rates = self.catalog.record(model.fr_id)["flow_rates"]
                 if not flow_rates:
                     flow_rates = [0, 0, 0, 0]
                 flow_rates[flow_rate_idx] = value
                 setattr(model, "flow_rates", flow_rates)
+                self.catalog.update(model.fr_id, "flow_rates", flow_rates)
             else:
-                extra_tests = self.fr_dict[model.fr_id].get("extra_tests", {})
+                extra_tests = self.catalog.record(model.fr_id).get("extra_tests", {})
                 if extra_tests is None:
                     extra_tests = {}
                 test_key = self._test_widget.value
@@ -258,7 +262,7 @@ class FRTesting:
                 flow_rates[flow_rate_idx] = value
                 extra_tests[test_key] = flow_rates
                 setattr(model, "extra_tests", extra_tests)
-                self.fr_dict[model.fr_id]["extra_tests"] = extra_tests
+                self.catalog.update(model.fr_id, "extra_tests", extra_tests)
         self.session.commit()
 
 
@@ -289,21 +293,39 @@ class FRTesting:
         else:
             self.last_cathode = self._serial_number_widget.value
 
-        new_options = [
-            i for i in self.fr_dict
-            if self.fr_dict[i]['fr'] == ("Anode" if anode_selected else "Cathode")
-        ]
+        self._reset_page()
+        self._set_serial_options(self.last_anode if anode_selected else self.last_cathode)
+
+        if self._serial_number_widget.value is None:
+            self._clear_fields()
+
+    def _set_serial_options(self, selected: str = None):
+        """
+        Shows the current page of the serial numbers of the selected FR type that start with the search text.
+        The selected serial number stays in the options, also if it is on another page.
+        """
+        fr_type = self._fr_widget.value
+        prefix = self._serial_search_widget.value
+        self._page_widget.max = self.catalog.page_count(fr_type, prefix)
+        options = self.catalog.search(fr_type, prefix, self._page_widget.value - 1)
+        if selected and selected not in options and self.catalog.fr_type(selected) == fr_type:
+            options = [selected] + options
 
         self._serial_number_widget.value = None
-        self._serial_number_widget.options = new_options
+        self._serial_number_widget.options = options
+        self._serial_number_widget.value = selected if selected in options else None
 
-        if anode_selected:
-            self._serial_number_widget.value = self.last_anode if self.last_anode in new_options else None
-        else:
-            self._serial_number_widget.value = self.last_cathode if self.last_cathode in new_options else None
+    def _reset_page(self):
+        self._page_widget.unobserve(self._on_page_change, names='value')
+        self._page_widget.value = 1
+        self._page_widget.observe(self._on_page_change, names='value')
 
-        if self._serial_number_widget.value is None:
-            self._clear_fields()
+    def _on_serial_search(self, change):
+        self._reset_page()
+        self._set_serial_options(self._serial_number_widget.value)
+
+    def _on_page_change(self, change):
+        self._set_serial_options(self._serial_number_widget.value)
 
 
     def _on_serial_change(self, change):
@@ -314,8 +336,8 @@ class FRTesting:
         self._loading = True
         self._button_box.children = (self._check_button,)
 
-        if fr_id and fr_id in self.fr_dict:
-            fr_data = self.fr_dict[fr_id]
+        fr_data = self.catalog.record(fr_id) if fr_id else None
+        if fr_data:
             self._temperature_widget.value = fr_data.get('temperature', 0) or 0
             self._radius_widget.value = fr_data.get('radius', 0) or 0
             self._orifice_widget.value = fr_data.get('orifice_diameter', 0) or 0
@@ -409,7 +431,7 @@ class FRTesting:
 
             temperature = self._temperature_widget.value
             orifice = self._orifice_widget.value
-            fr_entry = self.fr_entry_dict.get(self._serial_number_widget.value, None)
+            fr_entry = self.catalog.entry(self._serial_number_widget.value)
 
             if all(f > 0 for f in flow_rates) and temperature and orifice:
                 image_output = widgets.Output()
@@ -427,7 +449,7 @@ class FRTesting:
                 with comparison_image_output:
                     self.mq.fr_flow_analysis(
                         certification="-".join(fr_entry.fr_id.split("-")[:-1]),
-                        fr_entry=self.fr_entry_dict.get(self._serial_number_widget.value, None),
+                        fr_entry=fr_entry,
                         fr_type=self._fr_widget.value,
                         return_models=False,
                         plot=True
@@ -468,10 +490,10 @@ class FRTesting:
                 return
 
             if all(f > 0 for f in flow_rates) and temperature and orifice:
-                self.fr_sql.fr_test_results = self.fr_dict[fr_id]
-                self.fr_sql.fr_test_results["date"] = datetime.now().isoformat()
-                self.fr_sql.fr_test_results["remark"] = self._remark_field.value
-                self.fr_sql.fr_test_results["gas_type"] = self._gas_type_widget.value
+                results = self.catalog.record(fr_id)
+                results["date"] = datetime.now().isoformat()
+                results["remark"] = self._remark_field.value
+                results["gas_type"] = self._gas_type_widget.value
 
                 reference_orifice = (
                     self.fr_data.anode_reference_orifice
@@ -479,7 +501,7 @@ class FRTesting:
                     else self.fr_data.cathode_reference_orifice
                 )
 
-                self.fr_sql.fr_test_results["deviation"] = round(
+                results["deviation"] = round(
                     (orifice - reference_orifice) / reference_orifice * 100, 2
                 )
 
@@ -501,16 +523,29 @@ class FRTesting:
                     for desc, col in self._tool_map.items()
                 ]
 
-                self.fr_sql.fr_test_results["tools"] = [
+                results["tools"] = [
                     {key: value for key, value in data.items() if key in tool_keep_keys}
                     for data in tool_list
                 ]
 
-                self.fr_sql.fr_test_results["operator"] = self._operator_widget.value
-                self.fr_sql.update_fr_test_results()
-                be.tools.update_test_tools(tools_data = tool_list)
+                results["operator"] = self._operator_widget.value
+
+                # Written in the background, one submission after the other, so the next FR can be entered meanwhile
+                submitted = dict(results)
+                def write_results() -> None:
+                    self.fr_sql.fr_test_results = submitted
+                    self.fr_sql.update_fr_test_results()
+                    be.tools.update_test_tools(tools_data = tool_list)
 
-                print(f"FR test results for {fr_id} have been updated in the database.")
+                def on_done(job: Job) -> None:
+                    with self._output:
+                        if job.status == JobStatus.DONE:
+                            print(f"FR test results for {fr_id} have been updated in the database.")
+                        else:
+                            print(f"Updating the FR test results for {fr_id} {'failed' if job.status == JobStatus.FAILED else 'was cancelled'}.")
+
+                self.jobs.track(job_runner().submit(write_results, name=f"FR {fr_id} test results", writes_database=True, on_done=on_done))
+                print(f"Saving FR test results for {fr_id}...")
             else:
                 print("Please enter valid flow rates, pressures, orifice diameter and temperature before submitting results.")
 
@@ -524,7 +559,7 @@ class FRTesting:
 
             fr_id = self._serial_number_widget.value
 
-            fr_entry = self.fr_entry_dict.get(fr_id, None)
+            fr_entry = self.catalog.entry(fr_id)
             if fr_entry:
                 if not all(bool(i) for i in fr_entry.flow_rates):
                     with self._output:
@@ -571,7 +606,7 @@ class FRTesting:
                 return
             
             fr_id = self._serial_number_widget.value
-            fr_entry = self.fr_entry_dict.get(fr_id, None)
+            fr_entry = self.catalog.entry(fr_id)
             extra_tests = fr_entry.extra_tests or {}
             self._test_number = change["new"]
             if not extra_tests:
@@ -607,7 +642,7 @@ class FRTesting:
                 return
             
             fr_id = self._serial_number_widget.value
-            fr_entry = self.fr_entry_dict.get(fr_id, None)
+            fr_entry = self.catalog.entry(fr_id)
             extra_tests = fr_entry.extra_tests.copy()
             main_test_num = [f"test_{i+1}" for i in range(len(extra_tests) + 1) if f"test_{i+1}" not in extra_tests][0] if extra_tests else 0
 
@@ -625,9 +660,8 @@ class FRTesting:
                 fr_entry.extra_tests = extra_tests
                 self.session.commit()
 
-                self.fr_dict[fr_id]["flow_rates"] = retest_flow_rates
-                self.fr_dict[fr_id]["extra_tests"] = extra_tests
-                self.fr_entry_dict[fr_id] = fr_entry
+                self.catalog.update(fr_id, "flow_rates", retest_flow_rates)
+                self.catalog.update(fr_id, "extra_tests", extra_tests)
 
                 options = [(f"Test {i+1} (main)" if i+1 == int(self._test_number.split('_')[-1])\
                                                else f"Test {i+1}", f"test_{i+1}") for i in range(len(self._test_widget.options))]
@@ -646,7 +680,7 @@ class FRTesting:
         """
         Displays the UI for the FR flow testing inputs.
             - Select FR type (Anode/Cathode)
-            - Select serial number from available unallocated FRs
+            - Select serial number from available unallocated FRs, searched by prefix and paged
             - Input temperature, gas type, radius
             - Input pressures and corresponding flow rates
             - Remark field
@@ -654,6 +688,7 @@ class FRTesting:
         -----------
             clear_fields(): Clears all input fields.
             update_serial_options(change): Updates serial number options based on selected FR type.
+            set_serial_options(selected): Shows the current page of the serial numbers matching the search.
             on_serial_change(change): Updates input fields based on selected serial number.
             on_field_change(change): Clears output when any input field changes.
             on_check_clicked(b): Validates the input measurements and displays results.
@@ -696,9 +731,20 @@ class FRTesting:
 
         self._serial_number_widget = widgets.Dropdown(
             **field("Serial Number:"),
-            options=[i for i in self.fr_dict if self.fr_dict[i]['fr'] == "Anode"] if self.fr_dict else [],
-            value=self.fr_id if getattr(self, "fr_id", None) else None
+            options=[],
+            value=None
+        )
+
+        self._serial_search_widget = widgets.Text(
+            placeholder="e.g. C25-0053",
+            **field("Search Serial:")
+        )
+
+        self._page_widget = widgets.BoundedIntText(
+            value=1, min=1, max=1,
+            **field("Page:", label_width="45px", field_width="150px")
         )
+        self._set_serial_options(getattr(self, "fr_id", None))
 
         self._temperature_widget = widgets.BoundedFloatText(**field("Temperature [°C]:"), value=0, min=0, max=50)
         operator_row = widgets.HBox([self._operator_widget, self._drawing_widget, self._temperature_widget])
@@ -710,6 +756,7 @@ class FRTesting:
 
         dimension_row = widgets.HBox([self._orifice_widget, self._radius_widget, self._thickness_widget])
         serial_row = widgets.HBox([self._fr_widget, self._serial_number_widget, self._gas_type_widget])
+        search_row = widgets.HBox([self._serial_search_widget, self._page_widget])
 
         self._test_widget = widgets.Dropdown(
             **field("Select Test Number:"),
@@ -774,6 +821,8 @@ class FRTesting:
 
         self._serial_number_widget.observe(self._on_serial_change, names='value')
         self._fr_widget.observe(self._update_serial_options, names='value')
+        self._serial_search_widget.observe(self._on_serial_search, names='value')
+        self._page_widget.observe(self._on_page_change, names='value')
 
         self._check_button.on_click(self._on_check_clicked)
         submit_button = widgets.Button(button_style='primary', **field("Submit Results"))
@@ -785,6 +834,7 @@ class FRTesting:
             self._test_button_row,
             operator_row,
             serial_row,
+            search_row,
             dimension_row,
             row_1,
             row_15,
@@ -810,6 +860,7 @@ class FRTesting:
                 title,
                 navigation_widget,
                 inner_form,
+                self.jobs.widget,
                 self._output
             ],
             layout=widgets.Layout(spacing=15)
@@ -1,6 +1,6 @@
 import os
-import re
 import io
+import threading
 
 from IPython.display import display
 import ipywidgets as widgets
@@ -13,6 +13,10 @@ from docx.shared import Mm
 from .. import FMSDataStructure
 from ..db import AnodeFR, CathodeFR
 from ..utils.general_utils import show_modal_popup, field
+from ..utils.trs_batches import FRBatchIndex, fr_certification, fr_serial
+from ..utils.document_numbers import DocumentNumberAllocator
+from ..utils.enums import JobStatus
+from ..utils.jobs import Job, JobPanel, check_cancelled, job_runner, report_progress
 import sharedBE as be
 from .query.manifold_query import ManifoldQuery
 
@@ -24,10 +28,14 @@ class FRTRSGenerator:
         self.fr_sql = self.fms_data.fr_sql
         self.context = {}
         self.save_path = save_path
+        self.document_numbers = DocumentNumberAllocator(save_path, prefix="FMS-LP-BE-TRS-")
         self.template_path = os.path.join(os.path.dirname(__file__), "templates", "fr_trs_template.docx")
         self.session: "Session" = self.fms_data.Session()
         self.author = self.fms_data.author
         self.dates: list[datetime] = []
+        self.jobs = JobPanel()
+        # TRS jobs share the template, context and dates, so they run one after the other
+        self._trs_lock = threading.Lock()
 
         self.anode_reference_orifice = self.fr_data.anode_reference_orifice
         self.cathode_reference_orifice = self.fr_data.cathode_reference_orifice
@@ -42,8 +50,8 @@ class FRTRSGenerator:
         self.all_anodes: list[AnodeFR] = self.session.query(AnodeFR).all()
         self.all_cathodes: list[CathodeFR] = self.session.query(CathodeFR).all()
 
-        self.anode_certifications = list(set(["-".join(entry.fr_id.split("-")[:-1]) for entry in self.all_anodes]))
-        self.cathode_certifications = list(set(["-".join(entry.fr_id.split("-")[:-1]) for entry in self.all_cathodes]))
+        self.anode_certifications = list(set([fr_certification(entry.fr_id) for entry in self.all_anodes]))
+        self.cathode_certifications = list(set([fr_certification(entry.fr_id) for entry in self.all_cathodes]))
         self.output = widgets.Output()
         self.plot_output = widgets.Output()
         self.container = widgets.VBox()
@@ -78,6 +86,7 @@ class FRTRSGenerator:
             self.get_reference_values(),
             widgets.VBox([], layout = widgets.Layout(height = "50px")),
             generate_button,
+            self.jobs.widget,
             self.output,
             self.plot_output
         ],
@@ -98,8 +107,9 @@ class FRTRSGenerator:
 
     def generate_trs(self, anode_batches, cathode_batches):
         
-        relevant_anodes = [entry for entry in self.all_anodes if "-".join(entry.fr_id.split("-")[:-1]) in anode_batches]
-        relevant_cathodes = [entry for entry in self.all_cathodes if "-".join(entry.fr_id.split("-")[:-1]) in cathode_batches]
+        anode_batch_set, cathode_batch_set = set(anode_batches), set(cathode_batches)
+        relevant_anodes = [entry for entry in self.all_anodes if fr_certification(entry.fr_id) in anode_batch_set]
+        relevant_cathodes = [entry for entry in self.all_cathodes if fr_certification(entry.fr_id) in cathode_batch_set]
 
 
         if any(not bool(entry.flow_rates) for entry in relevant_anodes + relevant_cathodes):
@@ -113,6 +123,7 @@ class FRTRSGenerator:
     def get_tools(self, anodes: list[AnodeFR], cathodes: list[CathodeFR]) -> list[dict[str, str]]:
         all_frs = anodes + cathodes
         all_used_tools = []
+        seen_tools = set()
 
         def format_value(tool: be.db.TestingTools, column: str):
             value = getattr(tool, column)
@@ -124,10 +135,14 @@ class FRTRSGenerator:
         
         for fr in all_frs:
             tools = fr.tools
-            for tool in tools:
+            for tool in tools or []:
                 description = tool.get("description")
                 model = tool.get("model")
                 serial = tool.get("serial_number")
+                # The same tools are used for a whole batch, look each one up once
+                if (description, model, serial) in seen_tools:
+                    continue
+                seen_tools.add((description, model, serial))
 
                 tool_entry = be.tools.get_tool_by_attributes(model = model, description = description, serial_number = serial)
 
@@ -272,25 +287,13 @@ class FRTRSGenerator:
             return rt
         return f"{value:.3f}"
 
-    def _get_new_filename(self) -> str:
+    def _get_new_filename(self) -> tuple[str, str]:
         """
-        Generates a new unique filename for the report based on existing entries in the database.
+        Generates a new unique filename for the report, with the next TRS number of the save path.
         Returns:
-            str: The generated filename.
+            tuple[str, str]: The TRS reference and the generated filename.
         """
-        all_filenames = os.listdir(self.save_path)
-        with self.output:
-            for name in all_filenames:
-                print(name)
-        filenames = [name for name in all_filenames if name.startswith("FMS-LP-BE-TRS-") and name.endswith(".docx")]
-        numbers = []
-        for name in filenames:
-            match = re.findall(r"\b\d{4}\b", name)
-            if match:
-                numbers.extend(map(int, match))
-
-        new_num = str(max(numbers) + 1 if numbers else 1).zfill(4)
-        doc_ref = f"FMS-LP-BE-TRS-{new_num}"
+        doc_ref = self.document_numbers.reference(self.document_numbers.allocate())
         filename = f"{doc_ref}-i1-0 - FR Testing 20025.10.18-R4-001_005.docx"
         return doc_ref, filename
     
@@ -340,14 +343,76 @@ class FRTRSGenerator:
         return fr_context
 
     def finalize_trs(self, anodes: list[AnodeFR], cathodes: list[CathodeFR], anode_batches: list[str], cathode_batches: list[str]):
+        """
+        Queues the generation of the TRS of the selected batches as a background job (see the jobs panel),
+        further TRSs can be queued meanwhile.
+        """
         with self.output:
             print("Generating TRS...")
 
-        remove_anodes = [entry for entry in anodes if not bool(entry.flow_rates)]
-        remove_cathodes = [entry for entry in cathodes if not bool(entry.flow_rates)]
+        def on_done(job: Job) -> None:
+            with self.output:
+                self.output.clear_output()
+                if job.status != JobStatus.DONE:
+                    print(f"TRS generation {'failed' if job.status == JobStatus.FAILED else 'was cancelled'}.")
+                    return
+                save_path, missing_keys = job.result()
+                for i in missing_keys:
+                    print(f"Missing key in context: {i}")
+                print(f"TRS generated and saved to: {save_path}")
+
+        # The flow plots draw with pyplot and the TRS number is allocated from the save path,
+        # both stay on this thread so the job only renders and saves
+        manifold_query = ManifoldQuery(session = self.session)
+        plots = (manifold_query.fr_flow_analysis(certification = anode_batches, fr_type = "Anode", error = False, plot = False),
+                 manifold_query.fr_flow_analysis(certification = cathode_batches, fr_type = "Cathode", error = False, plot = False))
+        filename = self._get_new_filename()
+
+        name = f"TRS {', '.join(list(anode_batches) + list(cathode_batches))}"
+        self.jobs.track(job_runner().submit(self._write_trs, [entry.fr_id for entry in anodes], [entry.fr_id for entry in cathodes],
+                                            anode_batches, cathode_batches, plots, filename, name=name, on_done=on_done))
 
-        relevant_anodes = [i for i in anodes if i not in remove_anodes]
-        relevant_cathodes = [i for i in cathodes if i not in remove_cathodes]
+    def _write_trs(self, anode_ids: list[str], cathode_ids: list[str], anode_batches: list[str], cathode_batches: list[str],
+                   plots: tuple[bytes, bytes], filename: tuple[str, str]) -> tuple[str, list[str]]:
+        """
+        Renders and saves the TRS of the selected batches, run as a job by finalize_trs.
+        The FRs are loaded again in a session of the job, the app session stays on the kernel thread.
+        Args:
+            anode_ids (list[str]): IDs of the selected anodes.
+            cathode_ids (list[str]): IDs of the selected cathodes.
+            anode_batches (list[str]): Selected anode certifications.
+            cathode_batches (list[str]): Selected cathode certifications.
+            plots (tuple[bytes, bytes]): Anode and cathode flow rate plots.
+            filename (tuple[str, str]): TRS reference and filename from _get_new_filename.
+        Returns:
+            tuple[str, list[str]]: Path of the TRS and the template variables missing from the context.
+        """
+        session = self.fms_data.Session()
+        try:
+            anodes = self._query_frs(session, AnodeFR, anode_ids)
+            cathodes = self._query_frs(session, CathodeFR, cathode_ids)
+            with self._trs_lock:
+                self.context = {}
+                self.dates = []
+                return self._render_trs(anodes, cathodes, anode_batches, cathode_batches, plots, filename)
+        finally:
+            session.close()
+
+    @staticmethod
+    def _query_frs(session: "Session", model: type[AnodeFR | CathodeFR], fr_ids: list[str]) -> list[AnodeFR | CathodeFR]:
+        # Keeps the order of the selection
+        if not fr_ids:
+            return []
+        by_id = {entry.fr_id: entry for entry in session.query(model).filter(model.fr_id.in_(fr_ids)).all()}
+        return [by_id[fr_id] for fr_id in fr_ids if fr_id in by_id]
+
+    def _render_trs(self, anodes: list[AnodeFR], cathodes: list[CathodeFR], anode_batches: list[str], cathode_batches: list[str],
+                    plots: tuple[bytes, bytes], filename: tuple[str, str]) -> tuple[str, list[str]]:
+        report_progress(0.05, "Collecting FR data")
+        anode_index = FRBatchIndex(anodes)
+        cathode_index = FRBatchIndex(cathodes)
+        relevant_anodes = anode_index.included_frs()
+        relevant_cathodes = cathode_index.included_frs()
 
         self.context["author"] = self.author
         self.context["an_ref"] = self.anode_reference_orifice
@@ -359,55 +424,22 @@ class FRTRSGenerator:
         self.context["max_radius"] = self.max_radius
 
         self.template = DocxTemplate(self.template_path)
-        manifold_query = ManifoldQuery(session = self.session)
 
         self.context["anode"] = self._process_fr_context(relevant_anodes, type = "Anode")
         self.context["cathode"] = self._process_fr_context(relevant_cathodes, type = "Cathode")
         self.context["start_date"] = min(self.dates).strftime("%#d.%b.%Y").upper() if self.dates else ""
         self.context["end_date"] = max(self.dates).strftime("%#d.%b.%Y").upper() if self.dates else ""
 
-        anode_batch_groups = {
-            "-".join(cert.fr_id.split("-")[:-1]): [entry for entry in relevant_anodes if\
-                                          entry.fr_id.startswith("-".join(cert.fr_id.split("-")[:-1]))]
-            for cert in anodes
-        }
-
-        cathode_batch_groups = {
-            "-".join(cert.fr_id.split("-")[:-1]): [entry for entry in relevant_cathodes if\
-                                          entry.fr_id.startswith("-".join(cert.fr_id.split("-")[:-1]))]
-            for cert in cathodes
-        }
-
         exclusion_parts = []
-        exclusion_list = []
+        exclusion_list = set()
         exclusion_count = 0
-        frs_excluded = False
-
-        if remove_anodes:
-            frs_excluded = True
-            for cert in anode_batches:
-                serials = []
-                for entry in remove_anodes:
-                    if entry.fr_id.startswith(cert):
-                        if cert not in exclusion_list:
-                            exclusion_list.append(cert)
-                        serials.append(entry.fr_id.split("-")[-1])
-                        exclusion_count += 1
-                if serials:
-                    exclusion_parts.append(f"from {cert}, {', '.join(serials)}")
-
-        if remove_cathodes:
-            frs_excluded = True
-            for cert in cathode_batches:
-                serials = []
-                for entry in remove_cathodes:
-                    if entry.fr_id.startswith(cert):
-                        if cert not in exclusion_list:
-                            exclusion_list.append(cert)
-                        serials.append(entry.fr_id.split("-")[-1])
-                        exclusion_count += 1
-                if serials:
-                    exclusion_parts.append(f"from {cert}, {', '.join(serials)}")
+        frs_excluded = bool(anode_index.excluded or cathode_index.excluded)
+
+        for index, batches in ((anode_index, anode_batches), (cathode_index, cathode_batches)):
+            for cert, serials in index.exclusions(batches):
+                exclusion_list.add(cert)
+                exclusion_count += len(serials)
+                exclusion_parts.append(f"from {cert}, {', '.join(serials)}")
 
         if exclusion_parts:
             exclusion_string = ", ".join(exclusion_parts)
@@ -421,13 +453,11 @@ class FRTRSGenerator:
         self.context["exclusion_string"] = exclusion_string
         self.context["frs_excluded"] = frs_excluded
 
-        tools = self.get_tools(relevant_anodes, relevant_cathodes)
-        self.context["tools"] = tools
         batches = []
 
         def process_groups(group_dict: dict[str, list[AnodeFR | CathodeFR]]):
             for cert, frs in group_dict.items():
-                fr_ids = [int(entry.fr_id.split("-")[-1]) for entry in frs]
+                fr_ids = [int(fr_serial(entry.fr_id)) for entry in frs]
                 if fr_ids:
                     min_fr_id = min(fr_ids)
                     max_fr_id = max(fr_ids)
@@ -441,8 +471,8 @@ class FRTRSGenerator:
                         data["exclusion"] = True
                     batches.append(data)
 
-        process_groups(anode_batch_groups)
-        process_groups(cathode_batch_groups)
+        process_groups(anode_index.included)
+        process_groups(cathode_index.included)
 
         self.context['batches'] = sorted(batches, key=lambda x: (int(x['certification'].split('-')[0][1:]), int(x['certification'].split('-')[-1])))
 
@@ -455,8 +485,7 @@ class FRTRSGenerator:
         tools = self.get_tools(relevant_anodes, relevant_cathodes)
         self.context["tools"] = tools
 
-        anode_plot = manifold_query.fr_flow_analysis(certification = anode_batches, fr_type = "Anode", error = False, plot = False)
-        cathode_plot = manifold_query.fr_flow_analysis(certification = cathode_batches, fr_type = "Cathode", error = False, plot = False)
+        anode_plot, cathode_plot = plots
 
         cathode_table_count = 1 if bool(relevant_cathodes) else 0
         anode_table_count =  cathode_table_count + 1
@@ -479,25 +508,21 @@ class FRTRSGenerator:
 
 
         self.context["part_numbers"] = list(set([entry.drawing for entry in relevant_anodes + relevant_cathodes]))
+        check_cancelled()
 
-        trs_reference, word_filename = self._get_new_filename()
+        trs_reference, word_filename = filename
         self.context["trs_reference"] = trs_reference
 
         all_keys = self.template.get_undeclared_template_variables()
         missing_keys = [k for k in all_keys if k not in self.context]
+        if "end_date" in missing_keys or "start_date" in missing_keys:
+            missing_keys = []
 
-        if missing_keys and not ("end_date" in missing_keys or "start_date" in missing_keys):
-            with self.output:
-                for i in missing_keys:
-                    print(f"Missing key in context: {i}")
-
+        report_progress(0.7, "Rendering TRS")
         self.template.render(self.context)
         save_path = os.path.join(self.save_path, word_filename)
         self.template.save(save_path)
-
-        with self.output:
-            self.output.clear_output()
-            print(f"TRS generated and saved to: {save_path}")
+        return save_path, missing_keys
 
 if __name__ == "__main__":
     generator = FRTRSGenerator()
@@ -18,6 +18,7 @@ from collections import defaultdict
 import traceback
 from datetime import datetime
 import io
+import copy
 
 # Local Imports
 from ... import FMSDataStructure
@@ -35,6 +36,18 @@ from ...utils.enums import (
     FMSMainParameters
 )
 
+from ...utils.plot_render import plot_key, cached_plot, store_plot, render_png, render_pngs
+from ...utils.timeseries import decimate, time_window, axis_buckets
+from ...utils.fms_plots import (
+    draw_open_loop,
+    draw_closed_loop,
+    draw_fr_characteristics,
+    draw_fr_voltage,
+    draw_tvac_cycles
+)
+from ...utils.limit_rules import compile_limits
+from ...utils.specs import fms_limit_specifications
+
 from .tv_query import TVQuery
 from .manifold_query import ManifoldQuery
 from .hpiv_query import HPIVQuery
@@ -153,6 +166,8 @@ class FMSQuery:
         Plot closed loop test data.
     plot_tv_closed_loop(title)
         Plot TV data of the closed loop test.
+    render_test_plots(requests, workers)
+        Render the report images of several tests, in a process pool.
     """
 
     def __init__(self, session: "Session" = None, local: bool = True, fms_id: str = None, lpt_pressures = [0.75, 1, 1.25, 1.5, 1.75, 2, 2.25, 2.4], max_opening_response: float = 300, max_response: float = 60,
@@ -188,6 +203,7 @@ class FMSQuery:
         self._listeners = []
         self.fr_tests_loaded = set()
         self.functional_fms_id = None
+        self._deferred_plots: list[tuple] | None = None
 
         if self.fms_id:
             self.fms_entry = self.session.query(FMSMain).filter_by(fms_id = self.fms_id).first()
@@ -549,6 +565,106 @@ class FMSQuery:
 
         submit_button.on_click(on_submit_clicked)
 
+    def _show_plot(self, draw: callable, figsize: tuple[float, float], data: dict[str, Any]) -> None:
+        """
+        Draw a plot on a pyplot figure and show it in the current output.
+        """
+        fig = plt.figure(figsize=figsize)
+        draw(fig, **data)
+        plt.show()
+
+    def _render_plot(self, key: tuple, draw: callable, figsize: tuple[float, float], data: dict[str, Any], extra: Any = None) -> io.BytesIO | None:
+        """
+        Render a plot headless and cache the image under the given key.
+        While render_test_plots collects plots, the plot is only queued and None is returned.
+        Args:
+            key (tuple): Cache key, see plot_render.plot_key. None renders without caching.
+            draw (callable): Drawing function from fms_plots.
+            figsize (tuple[float, float]): Figure size in inches.
+            data (dict[str, Any]): Keyword arguments of the drawing function.
+            extra (Any): Data stored with the image and returned on cache hits.
+        Returns:
+            BytesIO | None: The plot image.
+        """
+        if self._deferred_plots is not None:
+            self._deferred_plots.append((key, draw, figsize, data, extra))
+            return None
+        png = render_png(draw, figsize, data)
+        if key is not None:
+            store_plot(key, png, extra)
+        return io.BytesIO(png)
+
+    def _functional_version(self, test_run: FMSFunctionalTests) -> tuple:
+        """
+        Data version of a functional test: row count and highest id of its results,
+        and the test columns that appear in the plots.
+        """
+        count, max_id = self.session.query(func.count(FMSFunctionalResults.id), func.max(FMSFunctionalResults.id))\
+            .filter(FMSFunctionalResults.test_id == test_run.test_id).one()
+        return (test_run.id, count, max_id, test_run.trp_temp, test_run.inlet_pressure, test_run.outlet_pressure,
+                test_run.slope_correction, test_run.response_regions, self.fms_entry.gas_type if self.fms_entry else None)
+
+    def _fr_version(self, fms_id: str, test_id: str) -> tuple | None:
+        """
+        Data version of an FR characteristics test, None if the test does not exist.
+        """
+        row = self.session.query(FMSFRTests.id, FMSFRTests.date, FMSMain.gas_type, ManifoldStatus.ac_ratio_specified)\
+            .join(FMSMain, FMSMain.fms_id == FMSFRTests.fms_id)\
+            .outerjoin(ManifoldStatus, ManifoldStatus.allocated == FMSMain.fms_id)\
+            .filter(FMSFRTests.fms_id == fms_id, FMSFRTests.test_id == test_id).first()
+        return tuple(row) if row else None
+
+    def render_test_plots(self, requests: list[tuple[str, dict[str, Any]]], workers: int = None) -> list[bytes | None]:
+        """
+        Render the report images of several tests at once. Cached images are reused, the data of the
+        other plots is gathered in this process and the figures are rendered in a process pool.
+        Args:
+            requests (list[tuple[str, dict]]): (plot kind, keyword arguments) per image, the kinds being
+                'closed_loop', 'open_loop', 'slope', 'fr', 'fr_voltage' and 'tvac', the arguments those of
+                closed_loop_test_query, open_loop_test_query, plot_fr_characteristics, plot_fr_voltage and tvac_cycle_query.
+            workers (int): Number of worker processes, defaults to the CPU count.
+        Returns:
+            list[bytes | None]: PNG image per request, None if there is nothing to plot.
+        """
+        queries = {
+            'closed_loop': self.closed_loop_test_query,
+            'open_loop': lambda **kwargs: self.open_loop_test_query(test_type='open_loop', **kwargs),
+            'slope': lambda **kwargs: self.open_loop_test_query(test_type='slope', **kwargs),
+            'fr': self.plot_fr_characteristics,
+            'fr_voltage': self.plot_fr_voltage,
+            'tvac': self.tvac_cycle_query
+        }
+        images: list[bytes | None] = []
+        queued: dict[int, int] = {}
+        self._deferred_plots = []
+        try:
+            for kind, kwargs in requests:
+                queue_length = len(self._deferred_plots)
+                try:
+                    result = queries[kind](plot=False, **kwargs)
+                except Exception as e:
+                    print(f"Error preparing {kind} plot {kwargs}: {str(e)}")
+                    traceback.print_exc()
+                    result = None
+                if isinstance(result, tuple):
+                    result = result[0]
+                if len(self._deferred_plots) > queue_length:
+                    queued[queue_length] = len(images)
+                images.append(result.getvalue() if isinstance(result, io.BytesIO) else None)
+            deferred = self._deferred_plots
+        finally:
+            self._deferred_plots = None
+
+        pngs = render_pngs([(draw, figsize, data) for _, draw, figsize, data, _ in deferred], workers=workers)
+        for idx, ((key, _, _, _, extra), png) in enumerate(zip(deferred, pngs)):
+            if png is None:
+                continue
+            if key is not None:
+                store_plot(key, png, extra)
+            if idx in queued:
+                images[queued[idx]] = png
+        return images
+
     def _plot_fr_results(self, test_id: str) -> None:
         """
         Helper function to plot both the main FR characteristics as well as the LPT voltage plot.
@@ -624,7 +740,16 @@ class FMSQuery:
             BytesIO: The plot image in a BytesIO object if plot is False.
             list: The data corresponding to the test.
         """
-        
+        cache_key = None
+        if not plot:
+            version = self._fr_version(fms_id, test_id)
+            if version:
+                cache_key = plot_key(self.session, test_id, 'fr', {'fms_id': fms_id}, version)
+                cached = cached_plot(cache_key)
+                if cached:
+                    png, (fr_data, self.lpt_temp) = cached
+                    return io.BytesIO(png), copy.deepcopy(fr_data) if get_table else []
+
         fms_entry: FMSMain = self.fr_test_query(test_id, fms_id=fms_id)
         if not fms_entry:
             return []
@@ -649,55 +774,39 @@ class FMSQuery:
             "LPT Pressure [mV]": [f"{i:.2f}" for i in self.lpt_voltage]
         }
         fr_data = []
-        if get_table:
+        if get_table or not plot:
             for idx in range(len(self.lpt_pressure)):
                 row = {column_mapping[key]: value[idx] for key, value in df_data.items()}
                 fr_data.append(row)
 
-        fig, ax1 = plt.subplots(figsize=(9, 5))
-
-        df = pd.DataFrame(df_data)
-        df = df.to_html(index=False)
-        df_widget = widgets.HTML(value=df, layout=widgets.Layout(width='50%'))
-
-        l1, = ax1.plot(self.lpt_pressure, self.anode_flow, label=f'Anode Flow [{self.units[FMSFlowTestParameters.ANODE_FLOW.value]}]')
-        l2, = ax1.plot(self.lpt_pressure, self.cathode_flow, label=f'Cathode Flow [{self.units[FMSFlowTestParameters.CATHODE_FLOW.value]}]')
-        l3, = ax1.plot(self.lpt_pressure, self.total_flow, label=f'Total Flow [{self.units[FMSFlowTestParameters.TOTAL_FLOW.value]}]')
-        ax1.set_xlabel(f'LPT Pressure [{self.units[FMSFlowTestParameters.LPT_PRESSURE.value]}]')
-        ax1.set_ylabel(f'{gas_type} Mass Flow Rate [{self.units[FMSFlowTestParameters.ANODE_FLOW.value]} {gas_type}]')
-        ax1.grid(True)
-
         title = (
             f'{gas_type} LP FMS - SN {serial} - {self.inlet_pressure} [barA] Inlet Pressure - {self.outlet_pressure} [mbar] Outlet Pressure'
             f' - TRP at {self.temperature} [degC] - Pvac <1E-1 [mbar]'
         )
+        plot_data = {
+            'lpt_pressure': self.lpt_pressure,
+            'anode_flow': self.anode_flow,
+            'cathode_flow': self.cathode_flow,
+            'total_flow': self.total_flow,
+            'ac_ratio': self.ac_ratio,
+            'ratio': self.ratio,
+            'units': self.units,
+            'gas_type': gas_type,
+            'title': title
+        }
 
-        ax2 = ax1.twinx()
-        l4, = ax2.plot(self.lpt_pressure, self.ac_ratio, color='tab:red', label='Anode/Cathode Ratio')
-        l5_upper = ax2.axhline(self.ratio + 0.5, color='tab:orange', linestyle='--', label=f'Ratio Tolerance: {self.ratio}')
-        l5_lower = ax2.axhline(self.ratio - 0.5, color='tab:orange', linestyle='--', label='Ratio Tolerance')
-        ax2.set_ylabel('Anode-to-Cathode Ratio')
-        ax2.set_ylim(bottom=0, top=20)
-        ax2.set_yticks(np.arange(0, 21, 1))
-
-        # Combine legends from both axes
-        lines = [l1, l2, l3, l4, l5_upper]
-        labels = [line.get_label() for line in lines]
-        ax1.legend(lines, labels, loc='upper center', bbox_to_anchor=(0.5, -0.15), ncol=2)
-
-        plt.title(title, wrap=True)
-        plot_output = widgets.Output()
-        data_widget = widgets.HBox([plot_output, df_widget], layout=widgets.Layout(align_items='center', gap='20px'))
         if plot:
+            df = pd.DataFrame(df_data)
+            df = df.to_html(index=False)
+            df_widget = widgets.HTML(value=df, layout=widgets.Layout(width='50%'))
+            plot_output = widgets.Output()
+            data_widget = widgets.HBox([plot_output, df_widget], layout=widgets.Layout(align_items='center', gap='20px'))
             display(data_widget)
             with plot_output:
-                plt.show()
+                self._show_plot(draw_fr_characteristics, (9, 5), plot_data)
         else:
-            buf = io.BytesIO()
-            fig.savefig(buf, format='png', bbox_inches='tight')
-            plt.close(fig)
-            buf.seek(0)
-            return buf, fr_data
+            buf = self._render_plot(cache_key, draw_fr_characteristics, (9, 5), plot_data, extra=(copy.deepcopy(fr_data), self.lpt_temp))
+            return buf, fr_data if get_table else []
         
     def plot_fr_voltage(self, fms_id: str = "", test_id: str = "", initial_order: int = 3, plot: bool = True, listen_order: bool = False) -> io.BytesIO | list[dict[str, Any]]:
         """
@@ -714,6 +823,20 @@ class FMSQuery:
         :return: The image in memory of the plot and the corresponding data in list of rows format.
         :rtype: BytesIO | list[dict[str, Any]]
         """
+        cache_key = None
+        if not plot:
+            version = self._fr_version(fms_id, test_id)
+            if version:
+                options = {'fms_id': fms_id, 'order': initial_order, 'lpt_voltages': self.lpt_voltages,
+                           'min_flow_rates': self.min_flow_rates, 'max_flow_rates': self.max_flow_rates}
+                cache_key = plot_key(self.session, test_id, 'fr_voltage', options, version)
+                cached = cached_plot(cache_key)
+                if cached:
+                    if listen_order:
+                        self.fr_voltage_order = initial_order
+                    png, voltage_data = cached
+                    return io.BytesIO(png), copy.deepcopy(voltage_data)
+
         fms_entry: FMSMain = self.fr_test_query(test_id, fms_id=fms_id)
         if not fms_entry:
             return []
@@ -806,74 +929,69 @@ class FMSQuery:
             styled_df = df.style.apply(style_total_flow, axis=1).format(fmt_dict).hide(axis='index')
             df_widget.value = styled_df.to_html(index = False)
 
-            with plot_output:
-                plot_output.clear_output()
-                fig, ax1 = plt.subplots(figsize=(9, 6))
-                l3, = ax1.plot(self.lpt_voltage, self.total_flow, label=f'Total Flow [{self.units[FMSFlowTestParameters.TOTAL_FLOW.value]}]')
-                ax1.set_xlabel('LPT Voltage [mV]')
-                ax1.set_ylabel(f'Mass Flow Rate [{self.units[FMSFlowTestParameters.ANODE_FLOW.value]} {gas_type}]')
-                ax1.grid(True)
-                if title:
-                    plt.title(title, wrap=True)
-
-                ax2 = ax1.twinx()
-                l4, = ax2.plot(self.lpt_voltage, self.ac_ratio, color='tab:red', label='Anode/Cathode Ratio')
-                l7, = ax1.plot(self.lpt_voltages, calculated_total_flows, linestyle='--', color='tab:blue', label=f'Calculated Total Flow (R²={r2:.2f}, p = {order})')
-                l5, = ax1.plot(self.lpt_voltages, self.min_flow_rates, linestyle='--', color='tab:grey', label='Flow Rate Limits')
-                l6, = ax1.plot(self.lpt_voltages, self.max_flow_rates, linestyle='--', color='tab:grey', label='Flow Rate Limits')
-                l5_upper = ax2.axhline(self.ratio + 0.5, color='tab:orange', linestyle='--', label=f'Ratio Tolerance: {self.ratio}')
-                l5_lower = ax2.axhline(self.ratio - 0.5, color='tab:orange', linestyle='--', label='Ratio Tolerance')
-
-                ax2.set_ylabel('Anode-to-Cathode Ratio')
-                ax2.set_ylim(bottom=0, top=20)
-                ax2.set_yticks(np.arange(0, 21, 1))
-
-                if self.intersections.get('intersections', None):
-                    intersections = self.intersections["intersections"]
-                    for voltage, flow in intersections:
-                        ax1.plot(voltage, flow, 'ro')
-
-                # Legend
-                lines = [l3, l4, l7, l5, l5_upper]
-                labels = [line.get_label() for line in lines]
-                ax1.legend(lines, labels, loc='upper center', bbox_to_anchor=(0.5, -0.15), ncol=2)
-                plt.tight_layout()
-                if listen_order:
-                    self.fr_voltage_order = order
-                if plot:
-                    plt.show()
-                else:
-                    buf = io.BytesIO()
-                    fig.savefig(buf, format='png', bbox_inches='tight')
-                    plt.close(fig)
-                    buf.seek(0)
-                    voltage_data = []
-                    for idx in range(len(self.lpt_voltages)):
-                        row = {column_mapping[key]: i[idx] for key, i in df_data.items()}
-                        row["tot_flow"] = f"{calculated_total_flows[idx]:.3f}" 
+            plot_data = {
+                'lpt_voltage': self.lpt_voltage,
+                'total_flow': self.total_flow,
+                'ac_ratio': self.ac_ratio,
+                'lpt_voltages': self.lpt_voltages,
+                'calculated_total_flows': calculated_total_flows,
+                'min_flow_rates': self.min_flow_rates,
+                'max_flow_rates': self.max_flow_rates,
+                'ratio': self.ratio,
+                'r2': r2,
+                'order': order,
+                'intersections': self.intersections.get('intersections', None),
+                'units': self.units,
+                'gas_type': gas_type,
+                'title': title
+            }
+            if listen_order:
+                self.fr_voltage_order = order
+            if plot:
+                with plot_output:
+                    plot_output.clear_output()
+                    self._show_plot(draw_fr_voltage, (9, 6), plot_data)
+            else:
+                voltage_data = []
+                for idx in range(len(self.lpt_voltages)):
+                    row = {column_mapping[key]: i[idx] for key, i in df_data.items()}
+                    row["tot_flow"] = f"{calculated_total_flows[idx]:.3f}" 
 
-                        voltage_data.append(row)
+                    voltage_data.append(row)
 
-                    return buf, voltage_data
+                key = cache_key if order == initial_order else None
+                buf = self._render_plot(key, draw_fr_voltage, (9, 6), plot_data, extra=copy.deepcopy(voltage_data))
+                return buf, voltage_data
 
         poly_order_widget.observe(on_poly_order_change, names='value')
         return on_poly_order_change({'new': initial_order})
 
-    def open_loop_test_query(self, test_run: FMSFunctionalTests, test_type: str = 'slope', plot: bool = True) -> io.BytesIO | None:
+    def open_loop_test_query(self, test_run: FMSFunctionalTests | str, test_type: str = 'slope', plot: bool = True) -> io.BytesIO | None:
         """
         Query and plot open loop test data for the given test ID and test type.
         Args:
-            test_id (str): The ID of the open loop test to query.
+            test_run (FMSFunctionalTests | str): The open loop test to query, or its test ID.
             test_type (str): The type of open loop test ('slope' or 'open_loop').
             plot (bool): Whether to display the plot or return it as a BytesIO object.
         Returns:
             BytesIO: The plot image in a BytesIO object if plot is False.
         """
         self.tv_slope = None
+        if isinstance(test_run, str):
+            test_run = next((tr for tr in self.fms_entry.functional_tests if tr.test_id == test_run), None) if self.fms_entry else None
         if not test_run:
             print("Test ID not found for this FMS.")
             return
         else:
+            cache_key = None
+            if not plot:
+                kind = 'slope' if 'slope' in test_type.lower() else 'open_loop'
+                cache_key = plot_key(self.session, test_run.test_id, kind, {'fms_id': self.fms_entry.fms_id if self.fms_entry else None},
+                                     self._functional_version(test_run))
+                cached = cached_plot(cache_key)
+                if cached:
+                    return io.BytesIO(cached[0])
+
             self.gas_type = self.fms_entry.gas_type if self.fms_entry else 'Xe'
             self.temperature = test_run.trp_temp
             self.inlet_pressure = test_run.inlet_pressure
@@ -931,7 +1049,7 @@ class FMSQuery:
                 self.pt1000 = get_values(FMSFlowTestParameters.TV_PT1000.value)
                 self.units = {param: get_unit(param) for param in params}
 
-                image = self.plot_open_loop(serial=self.fms_entry.fms_id, gas_type=self.gas_type, plot=plot, test_run = test_run)
+                image = self.plot_open_loop(serial=self.fms_entry.fms_id, gas_type=self.gas_type, plot=plot, test_run = test_run, cache_key = cache_key)
 
                 def on_correction_change(change: dict):
                     correction = correction_checkbox.value
@@ -1093,31 +1211,18 @@ class FMSQuery:
         except:
             traceback.print_exc()
 
-    def plot_open_loop(self, serial: str ='25-050', gas_type: str ='Xe', plot: bool =True, test_run: FMSFunctionalResults = None) -> io.BytesIO | None:
+    def plot_open_loop(self, serial: str ='25-050', gas_type: str ='Xe', plot: bool =True, test_run: FMSFunctionalResults = None,
+                       cache_key: tuple = None) -> io.BytesIO | None:
         """
         Plot open loop or slope test data for the given gas type and serial number.
         Args:
             gas_type (str): The type of gas used in the test (default is 'Xe').
             serial (str): The serial number of the FMS (default is '25-050').
             plot (bool): Whether to display the plot or return it as a BytesIO object.
+            cache_key (tuple, optional): Key under which the rendered image is cached if plot is False.
         Returns:
             BytesIO: The plot image in a BytesIO object if plot is False.
         """
-        fms = FMSFlowTestParameters
-        fig, ax1 = plt.subplots(figsize=(9, 5))
-        color1 = 'tab:blue'
-        color2 = 'tab:orange'
-        color3 = 'tab:green'
-
-        ax1.set_xlabel('Time [s]')
-        ax1.set_ylabel(f'TV Temperature [{self.units[fms.TV_PT1000.value]}]')
-        l1, = ax1.plot(self.logtime, self.pt1000, label='TV Temperature')
-
-        ax2 = ax1.twinx()
-        ax2.set_ylabel(f'Total Flow [{self.units[fms.TOTAL_FLOW.value]} {gas_type}] / LPT Pressure [{self.units[fms.LPT_PRESSURE.value]}]')
-        l2, = ax2.plot(self.logtime, self.total_flow, label='Total Flow', color=color2)
-        l3, = ax2.plot(self.logtime, self.lpt_pressure, label='LPT Pressure', color=color3)
-
         title = (
             f'LP FMS - SN {serial}, TRP at {self.temperature} [degC], MLI, '
             f'{self.inlet_pressure} [barA] Inlet Pressure, '
@@ -1129,22 +1234,20 @@ class FMSQuery:
             title += f'{max(self.tv_powers):.1f}W, '
 
         title += f'\nPvac <1E-1 [mbarA], {self.outlet_pressure} [mbar] Outlet Pressure {test_run.test_id}'
-        ax1.set_title(title, wrap=True)
-        fig.tight_layout()
-
-        lines = [l1, l2, l3]
-        labels = [line.get_label() for line in lines]
-        ax1.legend(lines, labels, loc='upper center', bbox_to_anchor=(0.5, -0.15), ncol=2)
-        ax1.grid(True)
+        plot_data = {
+            'logtime': self.logtime,
+            'pt1000': self.pt1000,
+            'total_flow': self.total_flow,
+            'lpt_pressure': self.lpt_pressure,
+            'units': self.units,
+            'gas_type': gas_type,
+            'title': title
+        }
 
         if plot:
-            plt.show()
+            self._show_plot(draw_open_loop, (9, 5), plot_data)
         else:
-            buf = io.BytesIO()
-            fig.savefig(buf, format='png', bbox_inches='tight')
-            plt.close(fig)
-            buf.seek(0)
-            return buf
+            return self._render_plot(cache_key, draw_open_loop, (9, 5), plot_data)
         
     def closed_loop_test_query(self, test_id: str, plot: bool =True, show_response_times: bool = False) -> io.BytesIO | None:
         """
@@ -1160,6 +1263,14 @@ class FMSQuery:
             print("Test ID not found for this FMS.")
             return
         else:
+            cache_key = None
+            if not plot:
+                options = {'fms_id': self.fms_entry.fms_id, 'show_response_times': bool(show_response_times), 'lpt_set_points': self.lpt_set_points}
+                cache_key = plot_key(self.session, test_id, 'closed_loop', options, self._functional_version(test_run))
+                cached = cached_plot(cache_key)
+                if cached:
+                    return io.BytesIO(cached[0])
+
             plot_output = widgets.Output()
             tv_plot_output = widgets.Output()
             df_widget = widgets.VBox()
@@ -1299,7 +1410,8 @@ class FMSQuery:
                     form = widgets.VBox([show_response_times_checkbox, widgets.HBox([plot_output, widgets.HBox(layout = widgets.Layout(width = "50px")), df_widget], 
                                     layout=widgets.Layout(align_items='center', spacing='20px')), tv_plot_output], layout=widgets.Layout(padding='12px', width='fit-content'))
                     display(form) 
-                image = self.plot_closed_loop(serial=self.fms_entry.fms_id, gas_type=self.gas_type, plot=plot, plot_output = plot_output, tv_plot_output = tv_plot_output, show_response_times=show_response_times)
+                image = self.plot_closed_loop(serial=self.fms_entry.fms_id, gas_type=self.gas_type, plot=plot, plot_output = plot_output, tv_plot_output = tv_plot_output, show_response_times=show_response_times,
+                                              cache_key = cache_key)
 
                 def on_checkbox_clicked(change):
                     show_response_times = show_response_times_checkbox.value
@@ -1325,7 +1437,7 @@ class FMSQuery:
                 return
 
     def plot_closed_loop(self, serial: str = '25-050', gas_type: str = 'Xe', plot: bool = True, plot_output: widgets.Output = None, tv_plot_output: widgets.Output = None,\
-                         show_response_times: bool = False) -> io.BytesIO | None:
+                         show_response_times: bool = False, cache_key: tuple = None) -> io.BytesIO | None:
         """
         Plot closed loop test data including anode flow, cathode flow, closed loop pressure, and LPT pressure.
         Args:
@@ -1334,54 +1446,33 @@ class FMSQuery:
             plot (bool): Whether to display the plot or return it as a BytesIO object.
             plot_output (widgets.Output, optional): The output widget to display the plot. Defaults to None.
             show_response_times (bool, optional): Whether to show response times on the plot. Defaults to False.    
+            cache_key (tuple, optional): Key under which the rendered image is cached if plot is False.
         Returns:
             BytesIO: The plot image in a BytesIO object if plot is False.
         """
-        fig, ax = plt.subplots(figsize=(9, 5))
-        ax.plot(self.logtime, self.anode_flow, label=f'Anode Flow [{self.units[FMSFlowTestParameters.ANODE_FLOW.value]}]')
-        ax.plot(self.logtime, self.cathode_flow, label=f'Cathode Flow [{self.units[FMSFlowTestParameters.CATHODE_FLOW.value]}]')
-        ax.plot(self.logtime, self.closed_loop_pressure, label=f'Closed Loop Setpoint [{self.units[FMSFlowTestParameters.CLOSED_LOOP_PRESSURE.value]}]')
-        ax.plot(self.logtime, self.lpt_pressure, label=f'LPT Pressure [{self.units[FMSFlowTestParameters.LPT_PRESSURE.value]}]')
-
         title = f'LP FMS - SN {serial}, TRP at {self.temperature} [degC], MLI, {self.inlet_pressure} [barA] Inlet Pressure, {self.test_type.replace("_", " ").title()}, \nPvac <1E-1 [mbarA], {self.outlet_pressure} [mbar] Outlet Pressure'
-        ax.set_xlabel('Time [s]')
-        ax.set_ylabel(f'Mass Flow Rate [{self.units[FMSFlowTestParameters.ANODE_FLOW.value]} {gas_type}]/LPT & Setpoint Pressure [barA]')
-        ax.set_title(title, wrap=True)
-        ax.legend(loc="lower center", bbox_to_anchor=(0.5, -0.3), ncol=2)
-        ax.grid()
-
-        if show_response_times:
-            count = 0
-            for region_key, (cl_start_time, lpt_start_time) in self.response_regions.items():
-                y_fill = max(max(self.anode_flow), max(self.cathode_flow))
-                y_level = self.lpt_set_points[count]
-                count += 1
-
-                x0 = cl_start_time
-                x1 = lpt_start_time
-                xm = (x0 + x1) / 2
-                dt = x1 - x0
-
-                ax.fill_between([x0, x1], y1=0, y2=y_fill, alpha=0.4, color='tab:blue')
-
-                ax.plot([x0, x1], [y_level, y_level], color = 'black', linewidth=1)
-                ax.plot([x0, x0], [y_level - 0.1, y_level + 0.1], color = 'black', linewidth=1)
-                ax.plot([x1, x1], [y_level - 0.1, y_level + 0.1], color = 'black', linewidth=1)
-                ax.text(xm, y_level + 0.3, f"{dt:.1f} s", ha='center', va='bottom')
+        plot_data = {
+            'logtime': self.logtime,
+            'anode_flow': self.anode_flow,
+            'cathode_flow': self.cathode_flow,
+            'closed_loop_pressure': self.closed_loop_pressure,
+            'lpt_pressure': self.lpt_pressure,
+            'units': self.units,
+            'gas_type': gas_type,
+            'title': title,
+            'response_regions': self.response_regions if show_response_times else None,
+            'lpt_set_points': self.lpt_set_points
+        }
 
         if plot:
             if plot_output:
                 with plot_output:
                     plot_output.clear_output()
-                    plt.show()
+                    self._show_plot(draw_closed_loop, (9, 5), plot_data)
             else:
-                plt.show()
+                self._show_plot(draw_closed_loop, (9, 5), plot_data)
         else:
-            buf = io.BytesIO()
-            fig.savefig(buf, format='png', bbox_inches='tight')
-            plt.close(fig)
-            buf.seek(0)
-            return buf
+            return self._render_plot(cache_key, draw_closed_loop, (9, 5), plot_data)
 
         if tv_plot_output:
             with tv_plot_output:
@@ -1395,16 +1486,17 @@ class FMSQuery:
             title (str): The title for the plot.
         """
         fig, ax1 = plt.subplots(figsize=(9, 7))
+        logtime, tv_power, pt1000 = decimate(self.logtime, self.tv_power, self.pt1000, buckets=axis_buckets(ax1))
         color1 = 'tab:blue'
         ax1.set_xlabel('Time [s]')
         ax1.set_ylabel(f'TV Power [{self.units[FMSFlowTestParameters.AVG_TV_POWER.value]}]', color=color1)
-        ax1.plot(self.logtime, self.tv_power, color=color1, label='TV Power')
+        ax1.plot(logtime, tv_power, color=color1, label='TV Power')
         ax1.tick_params(axis='y', labelcolor=color1)
 
         ax2 = ax1.twinx()
         color2 = 'tab:red'
         ax2.set_ylabel(f'TV PT1000 Temperature [{self.units[FMSFlowTestParameters.TV_PT1000.value]}]', color=color2)
-        ax2.plot(self.logtime, self.pt1000, color=color2, label='TV PT1000 Temperature')
+        ax2.plot(logtime, pt1000, color=color2, label='TV PT1000 Temperature')
         ax2.tick_params(axis='y', labelcolor=color2)
 
         if title:
@@ -1423,6 +1515,15 @@ class FMSQuery:
         Returns:
             BytesIO: The plot image in a BytesIO object if plot is False.
         """
+        cache_key = None
+        if not plot and self.fms_entry:
+            version = [tuple(row) for row in self.session.query(FMSTvac.id, FMSTvac.date).filter_by(fms_id=self.fms_entry.fms_id).order_by(FMSTvac.id)]
+            if version:
+                cache_key = plot_key(self.session, test_id, 'tvac', {'fms_id': self.fms_entry.fms_id}, version)
+                cached = cached_plot(cache_key)
+                if cached:
+                    return io.BytesIO(cached[0])
+
         test_results: list[FMSTvac] = [tr for tr in self.fms_entry.tvac_results]
         if not test_results:
             print("Test ID not found for this FMS.")
@@ -1463,20 +1564,13 @@ class FMSQuery:
             layout={'width': '600px'}             
         )
         output = widgets.Output()
+        title = f'TVAC Acceptance Cycles LP FMS, SN: {self.fms_entry.fms_id}, Pvac < 1E-1 mbar, MLI'
 
         def update_plot(change: dict) -> None:
             with output:
                 output.clear_output(wait=True)
-                plt.figure(figsize=(9, 7))
-                mask = (time_hours >= change['new'][0]) & (time_hours <= change['new'][1])
-                plt.plot(time_hours[mask], trp1[mask], label='TRP1', color='blue')
-                plt.plot(time_hours[mask], trp2[mask], label='TRP2', color='orange')
-                plt.xlabel('Time [hrs]')
-                plt.ylabel('Temperature [degC]')
-                plt.title(f'TVAC Acceptance Cycles LP FMS, SN: {self.fms_entry.fms_id}, Pvac < 1E-1 mbar, MLI')
-                plt.legend()
-                plt.grid()
-                plt.show()
+                window = time_window(time_hours, *change['new'])
+                self._show_plot(draw_tvac_cycles, (9, 7), {'time_hours': time_hours[window], 'trp1': trp1[window], 'trp2': trp2[window], 'title': title})
 
         if plot:
             slider.observe(update_plot, names='value')
@@ -1484,19 +1578,7 @@ class FMSQuery:
             display(ui)
             update_plot({'new': slider.value})
         else:
-            fig, ax = plt.subplots(figsize=(9, 7))
-            ax.plot(time_hours, trp1, label='TRP1', color='blue')
-            ax.plot(time_hours, trp2, label='TRP2', color='orange')
-            ax.set_xlabel('Time [hrs]')
-            ax.set_ylabel('Temperature [degC]')
-            ax.set_title(f'TVAC Acceptance Cycles LP FMS, SN: {self.fms_entry.fms_id}, Pvac < 1E-1 mbar, MLI')
-            ax.legend()
-            ax.grid()
-            buf = io.BytesIO()
-            fig.savefig(buf, format='png', bbox_inches='tight')
-            plt.close(fig)
-            buf.seek(0)
-            return buf
+            return self._render_plot(cache_key, draw_tvac_cycles, (9, 7), {'time_hours': time_hours, 'trp1': trp1, 'trp2': trp2, 'title': title})
 
     def fms_characteristics_query(self) -> None:
         """
@@ -1507,32 +1589,33 @@ class FMSQuery:
             print("No test results found for this FMS.")
             return None
 
-        df = pd.DataFrame([{
-            'parameter_name': res.parameter_name,
-            'parameter_value': res.parameter_value,
-            'parameter_json': res.parameter_json,
-            'parameter_unit': res.parameter_unit,
-            'larger': res.larger,
-            'lower': res.lower,
-            'equal': res.equal,
-            'within_limits': res.within_limits
-        } for res in test_results])
+        entries = {}
+        for res in test_results:
+            entries.setdefault(res.parameter_name, {
+                'parameter_name': res.parameter_name,
+                'parameter_value': res.parameter_value,
+                'parameter_json': res.parameter_json,
+                'parameter_unit': res.parameter_unit,
+                'larger': res.larger,
+                'lower': res.lower,
+                'equal': res.equal,
+                'within_limits': res.within_limits
+            })
+
+        # Limit status against the current limits of the FMS, the stored status where there is no rule
+        limits = self.fms_entry.limits.limits if self.fms_entry.limits else fms_limit_specifications
+        names = list(entries)
+        statuses = compile_limits(limits).evaluate(
+            names,
+            [entries[name]['parameter_value'] if entries[name]['parameter_value'] is not None else entries[name]['parameter_json'] for name in names],
+            [entries[name]['parameter_unit'] for name in names],
+        )
+        for name, status in zip(names, statuses):
+            if status is not None:
+                entries[name]['within_limits'] = status
 
         def get_entry(parameter_name: str) -> dict:
-            entry = df[df['parameter_name'] == parameter_name]
-            if entry.empty:
-                return {}
-            row = entry.iloc[0]
-            return {
-                'parameter_name': row['parameter_name'],
-                'parameter_value': row['parameter_value'],
-                'parameter_json': row['parameter_json'],
-                'parameter_unit': row['parameter_unit'],
-                'larger': row['larger'],
-                'lower': row['lower'],
-                'equal': row['equal'],
-                'within_limits': row['within_limits']
-            }
+            return entries.get(parameter_name, {})
 
         # --- Power Budgets ---
         hot_power_budget = get_entry(FMSMainParameters.POWER_BUDGET_HOT.value)
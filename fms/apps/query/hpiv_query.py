@@ -11,6 +11,7 @@ import pandas as pd
 from fms import FMSDataStructure
 from fms.db import FMSMain, HPIVCertification, HPIVCharacteristics, HPIVRevisions
 from fms.utils.enums import HPIVParameters, LimitStatus
+from fms.utils.hpiv_matrix import HPIVCharacteristicMatrix, load_characteristic_matrix
 
 if TYPE_CHECKING:
     from sqlalchemy.orm import Session
@@ -37,6 +38,8 @@ class HPIVQuery:
         The currently selected query action.
     all_hpivs : list[HPIVCertification]
         List of all HPIV instances in the database.
+    matrix : HPIVCharacteristicMatrix
+        Pivoted characteristics (valves x parameters) of all HPIVs, shared by the trend and distribution plots.
     all_certifications : list[str]
         List of all unique certification batches in the database.
     hpiv_id : str | None
@@ -100,8 +103,8 @@ class HPIVQuery:
         self.value = "Status"
 
         self.all_hpivs: list[HPIVCertification] = self.session.query(HPIVCertification).all()
-        self.all_certifications = list(set(i.certification if not i.certification == self.certification else i.certification + \
-                                           ' (Current)' if i.certification else None for i in self.all_hpivs if i.characteristics and i.certification))
+        self.matrix: HPIVCharacteristicMatrix = load_characteristic_matrix(self.session)
+        self.all_certifications = list(set(i if not i == self.certification else i + ' (Current)' for i in self.matrix.batches()))
 
     def hpiv_query_field(self) -> None:
         """
@@ -118,7 +121,7 @@ class HPIVQuery:
             style={'description_width': '80px'},
             value=self.hpiv_id if self.hpiv_id else None,
             disabled=True if self.hpiv_id else False,
-            options=sorted([h.hpiv_id for h in self.all_hpivs if h.characteristics], key=lambda x: int(x.split('-')[-1])) if not self.hpiv_id else [self.hpiv_id]
+            options=sorted(self.matrix.hpiv_ids, key=lambda x: int(x.split('-')[-1])) if not self.hpiv_id else [self.hpiv_id]
         )
 
         query_field = widgets.Dropdown(
@@ -144,8 +147,7 @@ class HPIVQuery:
             self.hpiv = next((h for h in self.all_hpivs if h.hpiv_id == self.hpiv_id), None)
             self.characteristics = self.hpiv.characteristics if self.hpiv else []
             self.certification = self.hpiv.certification if self.hpiv else None
-            self.all_certifications = list(set(i.certification if not i.certification == self.certification else i.certification + \
-                                               ' (Current)' for i in self.all_hpivs if i.characteristics and i.certification))
+            self.all_certifications = list(set(i if not i == self.certification else i + ' (Current)' for i in self.matrix.batches()))
             query_field.options = self.actions if self.hpiv_id else []
             query_field.value = 'Status' if self.hpiv_id else None
             with output:
@@ -312,33 +314,18 @@ class HPIVQuery:
             parameter2 (str): The second HPIV parameter to analyze.
             certification (str): The certification batch to filter HPIVs by ('all' for all HPIVs).
         """
-        parameter_check1 = next((i for i in self.characteristics if i.parameter_name == parameter1), None)
+        self.matrix = load_characteristic_matrix(self.session)
+        parameter_check1 = self.matrix.entry(self.hpiv_id, parameter1)
         if parameter_check1:
-            parameter_value1 = parameter_check1.parameter_value
-            within_limits1 = parameter_check1.within_limits
-            unit1 = parameter_check1.unit
+            parameter_value1, unit1, within_limits1 = parameter_check1
 
-        parameter_check2 = next((i for i in self.characteristics if i.parameter_name == parameter2), None)
+        parameter_check2 = self.matrix.entry(self.hpiv_id, parameter2)
         if parameter_check2:
-            parameter_value2 = parameter_check2.parameter_value
-            within_limits2 = parameter_check2.within_limits
-            unit2 = parameter_check2.unit
-
-        pairs = []
-        unit1_check = None
-        unit2_check = None
-        for hpiv in self.all_hpivs:
-            if certification == "all" or hpiv.certification == certification:
-                characteristics: list[HPIVCharacteristics] = hpiv.characteristics
-                val1 = next((c.parameter_value for c in characteristics if c.parameter_name == parameter1), None)
-                val2 = next((c.parameter_value for c in characteristics if c.parameter_name == parameter2), None)
-                if not (unit1_check and unit2_check):
-                    unit1_check = next((c.unit for c in characteristics if c.parameter_name == parameter1), None)
-                    unit2_check = next((c.unit for c in characteristics if c.parameter_name == parameter2), None)
-                if val1 is not None and val2 is not None:
-                    pairs.append((val1, val2))
-
-        all_parameter_values1, all_parameter_values2 = zip(*pairs) if pairs else ([], [])
+            parameter_value2, unit2, within_limits2 = parameter_check2
+
+        all_parameter_values1, all_parameter_values2 = self.matrix.pairs(parameter1, parameter2, certification)
+        unit1_check = self.matrix.units.get(parameter1)
+        unit2_check = self.matrix.units.get(parameter2)
 
         if parameter_check1 and parameter_check2:
             if certification == 'all':
@@ -419,18 +406,14 @@ class HPIVQuery:
             parameter (str): The HPIV parameter to plot.
             certification (str): The certification batch to filter HPIVs by ('all' for all HPIVs).
         """
-        parameter_check = next((i for i in self.characteristics if i.parameter_name == parameter), None)
+        self.matrix = load_characteristic_matrix(self.session)
+        parameter_check = self.matrix.entry(self.hpiv_id, parameter)
         if parameter_check:
-            parameter_value = parameter_check.parameter_value
-            within_limits = parameter_check.within_limits
-            unit = parameter_check.unit
+            parameter_value, unit, within_limits = parameter_check
         else:
-            characteristics: list[HPIVCharacteristics] = self.all_hpivs[0].characteristics if self.all_hpivs else []
-            unit = next((i.unit for i in characteristics if i.parameter_name == parameter), '')
+            unit = self.matrix.units.get(parameter, '')
 
-        all_characteristics: list[HPIVCharacteristics] = [j for i in self.all_hpivs for j in i.characteristics] if certification == 'all' else \
-        [j for i in self.all_hpivs for j in i.characteristics if i.certification == certification]
-        all_parameter_values = [i.parameter_value for i in all_characteristics if i.parameter_name == parameter]
+        all_parameter_values = self.matrix.column(parameter, certification)
         if certification == 'all':
             title = f"Distribution of {parameter} [{unit}], {self.hpiv_id} Indicated,\n{within_limits}" if parameter_check else \
                 f"Distribution of {parameter} [{unit}] Across All HPIVs"
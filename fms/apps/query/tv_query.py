@@ -26,6 +26,8 @@ from fms.utils.enums import (
     TVTestParameters, 
     TVParts
 )
+from fms.utils.tv_dimensions import load_dimension_store
+from fms.utils.timeseries import decimate, time_window, axis_buckets
 from fms.db import (
     TVTestResults,
     TVTestRuns,
@@ -94,6 +96,8 @@ class TVQuery:
         Perform measurement trend analysis for thermal valve parts.
     get_trend(certification, part_name, current_cert):
         Retrieve and plot trend data for the specified certification and part name.
+    get_opening_temperatures(tv_ids):
+        Opening temperatures of several TVs, queried in bulk.
     plot_dimension_trend(dimension_dict, opening_temps, part_name, current_dims, certification, current_certification):
         Plot dimension trend analysis for thermal valve parts.
     tv_remark_field():
@@ -423,39 +427,34 @@ class TVQuery:
             self.allocated_certifications = self.tv.certifications
         else:
             self.allocated_certifications = []
-        part_cert = next((i for i in self.allocated_certifications if i.part_name == part_name and i.tv_id == self.tv_id), None)
+        part = load_dimension_store(self.session).part(part_name)
+        row = part.row(self.tv_id) if self.tv else None
         dummy = False
-        if not part_cert:
-            part_cert = self.session.query(TVCertification).filter(TVCertification.part_name==part_name, TVCertification.tv_id!=None).first()
+        if row is None:
+            row = part.row()
             dummy = True
-        if not part_cert:
+        if row is None:
             print(f"No relevant certifications found for {part_name}.")
             return
-        all_parts = self.session.query(TVCertification).filter_by(part_name=part_name).all()
-        if not all_parts:
-            print(f"No {part_name}s found in the database.")
-            return
 
-        dimensions = part_cert.dimensions
-        if not dimensions:
+        n_dims = int(part.lengths[row])
+        if not n_dims:
             print(f"No dimensions recorded for this {part_name}.")
             return
 
-        nominal_dimensions = part_cert.nominal_dimensions if part_cert.nominal_dimensions else [None] * len(dimensions)
-        min_dimensions_part = part_cert.min_dimensions if part_cert.min_dimensions else [None] * len(dimensions)
-        max_dimensions_part = part_cert.max_dimensions if part_cert.max_dimensions else [None] * len(dimensions)
+        def optional(value: float) -> float | None:
+            return None if np.isnan(value) else float(value)
 
-        for idx, dim in enumerate(dimensions):
-            nominal_dim = nominal_dimensions[idx] if idx < len(nominal_dimensions) else None
-            min_dim = min_dimensions_part[idx] if idx < len(min_dimensions_part) else None
-            max_dim = max_dimensions_part[idx] if idx < len(max_dimensions_part) else None
+        for idx in range(n_dims):
+            dim = optional(part.dimensions[row, idx])
+            nominal_dim = optional(part.nominal_dimensions[row, idx])
+            min_dim = optional(part.min_dimensions[row, idx])
+            max_dim = optional(part.max_dimensions[row, idx])
 
-            # Prepare dimension lists from all parts
-            dimension_list = [p.dimensions[idx] for p in all_parts if p.dimensions and len(p.dimensions) > idx]
-            min_dimensions_all = [p.min_dimensions[idx] for p in all_parts if p.min_dimensions and len(p.min_dimensions) > idx]
-            max_dimensions_all = [p.max_dimensions[idx] for p in all_parts if p.max_dimensions and len(p.max_dimensions) > idx]
+            # Dimension values of all parts
+            dimension_list = part.column(idx)
 
-            if not dimension_list:
+            if not len(dimension_list):
                 print(f"No dimensions recorded for any {part_name} at index {idx}.")
                 continue
             
@@ -576,37 +575,41 @@ class TVQuery:
         opening_temps = {}  
         current_dims = current_cert.dimensions if current_cert and current_cert.dimensions else []
         current_certification = current_cert.certification if current_cert else None
-        all_allocated = [i for i in self.all_allocated if i.part_name == part_name]
-        if certification != 'all':
-            all_allocated = [
-                cert for cert in self.all_allocated 
-                if cert.certification == certification and cert.part_name == part_name
-            ]
-
-        for cert in all_allocated:
-            dims = cert.dimensions
-            if not dims:
-                continue
-
-            tv_main = cert.status if cert.status else None
-            if not tv_main:
-                tv_main = self.session.query(TVStatus).filter_by(tv_id=cert.tv_id).first()
-            if not tv_main:
-                tv_main = (
-                    self.session.query(TVTestRuns)
-                    .filter_by(tv_id=cert.tv_id)
-                    .order_by(TVTestRuns.id.desc())
-                    .first()
-                )
-
-            if tv_main and tv_main.opening_temp is not None:
-                for idx, dim_val in enumerate(dims):
-                    dimension_dict.setdefault(idx, []).append(dim_val)
-                    opening_temps.setdefault(idx, []).append(tv_main.opening_temp)
+        part = load_dimension_store(self.session).part(part_name)
+        rows = part.mask(certification, allocated=True) & (part.lengths > 0)
+        temps = self.get_opening_temperatures(part.tv_ids[rows])
+        rows[rows] = ~np.isnan(temps)
+        temps = temps[~np.isnan(temps)]
+
+        dims = part.dimensions[rows]
+        for idx in range(int(part.lengths[rows].max()) if len(dims) else 0):
+            valid = ~np.isnan(dims[:, idx])
+            dimension_dict[idx] = dims[valid, idx]
+            opening_temps[idx] = temps[valid]
 
         self.plot_dimension_trend(dimension_dict, opening_temps, part_name, current_dims, certification, current_certification)
 
 
+    def get_opening_temperatures(self, tv_ids: np.ndarray) -> np.ndarray:
+        """
+        Opening temperature of each TV, from its status entry or, for TVs without status entry,
+        from its latest test run. Queried in bulk for all TVs at once.
+        Args:
+            tv_ids (np.ndarray): TV IDs.
+        Returns:
+            np.ndarray: Opening temperature per TV ID, NaN if unknown.
+        """
+        ids = {int(i) for i in tv_ids}
+        if not ids:
+            return np.empty(0)
+        temps = {tv_id: temp for tv_id, temp in self.session.query(TVStatus.tv_id, TVStatus.opening_temp).filter(TVStatus.tv_id.in_(ids))}
+        missing = ids - temps.keys()
+        if missing:
+            for tv_id, temp in self.session.query(TVTestRuns.tv_id, TVTestRuns.opening_temp).filter(
+                    TVTestRuns.tv_id.in_(missing)).order_by(TVTestRuns.id.desc()):
+                temps.setdefault(tv_id, temp)
+        return np.array([np.nan if temps.get(int(i)) is None else temps[int(i)] for i in tv_ids], dtype=float)
+
     def plot_dimension_trend(self, dimension_dict: dict[int, list[float]], opening_temps: dict[int, list[float]],\
                               part_name: str, current_dims: list[float], certification: str, current_certification: str) -> None:
         """
@@ -1096,42 +1099,44 @@ class TVQuery:
         ax4 = plt.subplot(2, 2, 4)  # Power
 
         total_cycles = 0
+        buckets = axis_buckets(ax1)
 
         for idx, tvac_run in enumerate(self.tvac_runs):
-            time = tvac_run.time
-            outlet_temp_2 = tvac_run.outlet_temp_2
+            time = np.asarray(tvac_run.time, dtype=float)
+            outlet_temp_2 = np.asarray(tvac_run.outlet_temp_2 or [], dtype=float)
             if_plate = tvac_run.if_plate if tvac_run.if_plate else tvac_run.if_plate_1 if tvac_run.if_plate_1 else tvac_run.if_plate_2
-            vacuum_in_mbar = [10**(v - 5.5) for v in tvac_run.vacuum] if tvac_run.vacuum else []
+            if_plate = np.asarray(if_plate or [], dtype=float)
+            vacuum_in_mbar = 10 ** (np.asarray(tvac_run.vacuum, dtype=float) - 5.5) if tvac_run.vacuum else np.empty(0)
             current = tvac_run.tv_current
             voltage = tvac_run.tv_voltage
             power = np.array(current) * np.array(voltage)
             cycles = tvac_run.cycles
-            max_tv_outlet = max(outlet_temp_2) if outlet_temp_2 else None
-            min_tv_outlet = min(outlet_temp_2) if outlet_temp_2 else None
+            max_tv_outlet = outlet_temp_2.max() if len(outlet_temp_2) else None
+            min_tv_outlet = outlet_temp_2.min() if len(outlet_temp_2) else None
             actual_cycles = self.count_cycles(power) if power.any() else 0
             total_cycles += actual_cycles
 
             if time_range:
-                indices = [i for i, t in enumerate(time) if time_range[0] <= t <= time_range[1]]
-                if not indices:
+                window = time_window(time, *time_range)
+                time = time[window]
+                if not len(time):
                     continue
-                time = [time[i] for i in indices]
-                outlet_temp_2 = [outlet_temp_2[i] for i in indices]
-                if_plate = [if_plate[i] for i in indices] if if_plate else []
-                vacuum_in_mbar = [vacuum_in_mbar[i] for i in indices] if vacuum_in_mbar else []
-                power = [power[i] for i in indices]
+                outlet_temp_2 = outlet_temp_2[window]
+                if_plate = if_plate[window] if len(if_plate) else if_plate
+                vacuum_in_mbar = vacuum_in_mbar[window] if len(vacuum_in_mbar) else vacuum_in_mbar
+                power = power[window]
 
             cycle_start = 0 if cycles <= 1000 else cycles - 1000
             cycle_end = cycles
             label = f'{tvac_run.test_id} | Cycles: {cycle_start}-{cycle_end}\n Actual Cycles: {actual_cycles} | Max TV Outlet: {max_tv_outlet:.2f} °C | Min TV Outlet: {min_tv_outlet:.2f} °C'
             legend_labels.append((colors[idx], label))
 
-            ax1.plot(time, outlet_temp_2, color=colors[idx])
-            if if_plate:
-                ax2.plot(time, if_plate, color=colors[idx])
-            if vacuum_in_mbar:
-                ax3.plot(time, vacuum_in_mbar, color=colors[idx])
-            ax4.plot(time, power, color=colors[idx])
+            ax1.plot(*decimate(time, outlet_temp_2, buckets=buckets), color=colors[idx])
+            if len(if_plate):
+                ax2.plot(*decimate(time, if_plate, buckets=buckets), color=colors[idx])
+            if len(vacuum_in_mbar):
+                ax3.plot(*decimate(time, vacuum_in_mbar, buckets=buckets), color=colors[idx])
+            ax4.plot(*decimate(time, power, buckets=buckets), color=colors[idx])
 
         ax1.set_title(f"TVAC Outlet Temp 2 for cycles 0-{cycle_end}")
         ax1.set_xlabel("Time [h]")
@@ -1174,37 +1179,39 @@ class TVQuery:
             if time_range[0] == time_range[1]:
                 print("Start and end time cannot be the same!")
                 return
-        time = tvac_run.time
-        outlet_temp_1 = tvac_run.outlet_temp_1
-        outlet_temp_2 = tvac_run.outlet_temp_2
+        time = np.asarray(tvac_run.time, dtype=float)
+        outlet_temp_1 = np.asarray(tvac_run.outlet_temp_1, dtype=float)
+        outlet_temp_2 = np.asarray(tvac_run.outlet_temp_2, dtype=float)
         cycles = tvac_run.cycles
         vacuum = tvac_run.vacuum
-        vacuum_in_mbar = [10**(v-5.5) for v in vacuum] if vacuum else []
+        vacuum_in_mbar = 10 ** (np.asarray(vacuum, dtype=float) - 5.5) if vacuum else np.empty(0)
         if_plate = tvac_run.if_plate if tvac_run.if_plate else tvac_run.if_plate_1 if tvac_run.if_plate_1 else tvac_run.if_plate_2
+        if_plate = np.asarray(if_plate or [], dtype=float)
         current = tvac_run.tv_current
         voltage = tvac_run.tv_voltage
         power = np.array(current)*np.array(voltage)
-        max_tv_outlet = max(max(outlet_temp_1), max(outlet_temp_2)) 
-        min_tv_outlet = min(min(outlet_temp_1), min(outlet_temp_2))
+        max_tv_outlet = max(outlet_temp_1.max(), outlet_temp_2.max())
+        min_tv_outlet = min(outlet_temp_1.min(), outlet_temp_2.min())
         actual_cycles = self.count_cycles(power) if power.any() else 0
         if time_range:
-            indices = [i for i, t in enumerate(time) if time_range[0] <= t <= time_range[1]]
-            if not indices:
+            window = time_window(time, *time_range)
+            time = time[window]
+            if not len(time):
                 print("No data in the selected time range.")
                 return
-            time = [time[i] for i in indices]
-            outlet_temp_1 = [outlet_temp_1[i] for i in indices]
-            outlet_temp_2 = [outlet_temp_2[i] for i in indices]
-            if_plate = [if_plate[i] for i in indices] if if_plate else []
-            vacuum_in_mbar = [vacuum_in_mbar[i] for i in indices] if vacuum_in_mbar else []
-            power = [power[i] for i in indices] 
+            outlet_temp_1 = outlet_temp_1[window]
+            outlet_temp_2 = outlet_temp_2[window]
+            if_plate = if_plate[window] if len(if_plate) else if_plate
+            vacuum_in_mbar = vacuum_in_mbar[window] if len(vacuum_in_mbar) else vacuum_in_mbar
+            power = power[window]
 
         plt.figure(figsize=(14, 8))
         start_cycle = 0 if cycles <= 1000 else cycles - 1000
         end_cycle = cycles
-        plt.subplot(2, 2, 1)
-        plt.plot(time, outlet_temp_1, color="tab:blue", label='Outlet Temp 1')
-        plt.plot(time, outlet_temp_2, color="tab:orange", label='Outlet Temp 2')
+        buckets = axis_buckets(plt.subplot(2, 2, 1))
+        outlet_time, outlet_temp_1, outlet_temp_2 = decimate(time, outlet_temp_1, outlet_temp_2, buckets=buckets)
+        plt.plot(outlet_time, outlet_temp_1, color="tab:blue", label='Outlet Temp 1')
+        plt.plot(outlet_time, outlet_temp_2, color="tab:orange", label='Outlet Temp 2')
         plt.title(f'TVAC Outlet Temperatures\nTest ID: {self.test_reference} | Cycles: {start_cycle}-{end_cycle}\n \
                   Actual Cycles: {actual_cycles} | Max TV Outlet: {max_tv_outlet:.2f} °C | Min TV Outlet: {min_tv_outlet:.2f} °C')
         plt.xlabel('Time [h]')
@@ -1213,7 +1220,7 @@ class TVQuery:
         plt.grid(True)
 
         plt.subplot(2, 2, 2)
-        plt.plot(time, if_plate, label='IF Plate Temp', color='tab:orange')
+        plt.plot(*decimate(time, if_plate, buckets=buckets), label='IF Plate Temp', color='tab:orange')
         plt.title(f'TV IF Plate Temperature\nTest ID: {self.test_reference} | Cycles: {start_cycle}-{end_cycle}\n\
                    Actual Cycles: {actual_cycles}')
         plt.xlabel('Time [h]')
@@ -1222,7 +1229,7 @@ class TVQuery:
         plt.grid(True)
 
         plt.subplot(2, 2, 3)
-        plt.plot(time, vacuum_in_mbar, label='Vacuum', color='tab:green')
+        plt.plot(*decimate(time, vacuum_in_mbar, buckets=buckets), label='Vacuum', color='tab:green')
         plt.title(f'TVAC Vacuum Level\nTest ID: {self.test_reference} | Cycles: {start_cycle}-{end_cycle}\n Actual Cycles: {actual_cycles}')
         plt.xlabel('Time [h]')
         plt.ylabel('Vacuum [mbar]')
@@ -1230,7 +1237,7 @@ class TVQuery:
         plt.grid(True)
 
         plt.subplot(2, 2, 4)
-        plt.plot(time, power, label='Power', color='tab:red')
+        plt.plot(*decimate(time, power, buckets=buckets), label='Power', color='tab:red')
         plt.title(f'TVAC Power Consumption\nTest ID: {self.test_reference} | Cycles: {start_cycle}-{end_cycle}\n Actual Cycles: {actual_cycles}')
         plt.xlabel('Time [h]')
         plt.ylabel('Power [W]')
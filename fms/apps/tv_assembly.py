@@ -2,16 +2,15 @@
 from __future__ import annotations
 
 # Standard library
+import copy
 import os
 import re
-import shutil
 from datetime import datetime
 from typing import Any
 
 # Third-party imports
 import tzlocal
 from docxtpl import DocxTemplate
-from docx2pdf import convert
 from IPython.display import display
 import ipywidgets as widgets
 from sqlalchemy.orm import Session
@@ -22,7 +21,9 @@ from ..utils.general_utils import (
     show_modal_popup,
     save_to_json
 )
-from ..utils.enums import TVProgressStatus, TVParts
+from ..utils.enums import TVProgressStatus, TVParts, JobStatus
+from ..utils.report_conversion import conversion_service
+from ..utils.jobs import Job, JobPanel, check_cancelled, current_job, job_runner, report_progress
 from ..db import TVStatus, TVCertification, CoilAssembly
 
 from ..fms_data_structure import FMSDataStructure
@@ -79,6 +80,8 @@ class TVAssembly:
         Dictionary to hold previous steps data for comparison.
     all_tvs_field : widgets.Dropdown
         Dropdown widget to select from all open TV assembly drafts.
+    jobs : JobPanel
+        Progress of the reports generated in the background.
     
     Methods
     -------
@@ -156,6 +159,7 @@ class TVAssembly:
         self.steps: dict[str, dict] = load_from_json('tv_coil_assembly_procedure', directory = self.json_files)
         self.output = widgets.Output()
         self.container = widgets.VBox()
+        self.jobs = JobPanel()
         self.all_drafts = (
             self.session.query(CoilAssembly)
             .filter(CoilAssembly.context.is_(None))
@@ -293,7 +297,7 @@ class TVAssembly:
 
         logo = widgets.Image(value=open(self.img_path, "rb").read(), format='jpg', width=300, height=100)
 
-        display(widgets.VBox([logo, self.top_container, self.header_output]))
+        display(widgets.VBox([logo, self.top_container, self.header_output, self.jobs.widget]))
 
         self.all_tvs_field.observe(self.on_tv_change, names='value')
 
@@ -1662,85 +1666,124 @@ class TVAssembly:
     def render_final_document(self) -> None:
         """
         Renders the final document using the template and saves it as a PDF.
+        Rendering and the database update run as a background job (see the jobs panel),
+        so the operator can continue with the next TV while the report is generated.
         """
-        with self.output:
-            self.doc.render(self.context)
+        doc, self.doc = self.doc, self.get_document()
+        # Copied together, the context refers to the adhesive logs, so the next TV can be started
+        # while the job renders
+        tv_id, resistance_goal = self.tv_id, self.resistance_goal
+        context, steps, adhesive_logs = copy.deepcopy((self.context, self.steps_copy, self.adhesive_logs))
 
         working_dir = os.path.dirname(self.template_path)
         os.makedirs(working_dir, exist_ok=True)
 
-        word_filename = f"As-run-draft ALG-BE-PR-0062 DRAFT4 sn.{self.tv_id}.docx"
+        word_filename = f"As-run-draft ALG-BE-PR-0062 DRAFT4 sn.{tv_id}.docx"
         word_path = os.path.join(working_dir, word_filename)
         pdf_path = word_path.replace(".docx", ".pdf")
 
-        self.doc.save(word_path)
-        with self.output:
-            convert(word_path, pdf_path)
-
-        if os.path.exists(word_path):
-            os.remove(word_path)
-
         os.makedirs(self.save_path, exist_ok=True)
         final_pdf_path = os.path.join(self.save_path, os.path.basename(pdf_path))
-        shutil.move(pdf_path, final_pdf_path)
+
+        def write_report() -> None:
+            report_progress(0.1, "Rendering report")
+            doc.render(context)
+            check_cancelled()
+            report_progress(0.6, "Saving report")
+            doc.save(word_path)
+            report_progress(0.8, "Updating database")
+            session = self.fms.Session()
+            try:
+                with current_job().database():
+                    self.update_database(tv_id=tv_id, context=context, steps=steps, adhesive_logs=adhesive_logs,
+                                         resistance_goal=resistance_goal, session=session)
+            finally:
+                session.close()
+
+        def on_converted(future) -> None:
+            with self.output:
+                if future.exception() is None:
+                    if os.path.exists(word_path):
+                        os.remove(word_path)
+                    print(f"Final report generated and saved to: {final_pdf_path}")
+                else:
+                    print(f"PDF conversion failed, the Word report is kept at: {word_path}")
+
+        def on_done(job: Job) -> None:
+            with self.output:
+                if job.status != JobStatus.DONE:
+                    print(f"Report generation of TV {tv_id} {'failed' if job.status == JobStatus.FAILED else 'was cancelled'}.")
+                    return
+                print(f"Final report queued for conversion to: {final_pdf_path}")
+            # Converted in the background, the operator can continue with the next TV meanwhile
+            conversion_service().submit(word_path, final_pdf_path, callback=on_converted)
+
+        self.jobs.track(job_runner().submit(write_report, name=f"TV {tv_id} assembly report", on_done=on_done))
 
         # delete_json_file(f"tv_coil_assembly_procedure_draft_{self.tv_id}")
         with self.output:
             self.output.clear_output()
-            print(f"Final report generated and saved to: {final_pdf_path}")
-            self.update_database()
+            print(f"Report of TV {tv_id} queued: {final_pdf_path}")
             self.container.children = [
-                widgets.HTML("<h2>Report generated successfully. You can continue working on another TV or close the window.</h2>")
+                widgets.HTML("<h2>Report generation started, see its progress above. You can continue working on another TV meanwhile.</h2>")
             ]
 
             self.all_tvs_field.unobserve(self.on_tv_change, names='value')
-            self.all_tvs_field.options = [i for i in self.all_tvs_field.options if i[1] != self.tv_id]
+            self.all_tvs_field.options = [i for i in self.all_tvs_field.options if i[1] != tv_id]
             self.all_tvs_field.value = None
             self.all_tvs_field.observe(self.on_tv_change, names='value')
 
-    def update_database(self) -> None:
+    def update_database(self, tv_id: int = None, context: dict = None, steps: dict = None, adhesive_logs: list = None,
+                        resistance_goal: int = None, session: "Session" = None) -> None:
         """
         Updates the database with the final assembly data,
         including coil assembly steps, context, adhesive logs, and status.
+        Defaults to the current TV; the report job passes the TV it was queued for and a session of its own.
         """
+        tv_id = tv_id if tv_id is not None else self.tv_id
+        context = context if context is not None else self.context
+        steps = steps if steps is not None else self.steps_copy
+        adhesive_logs = adhesive_logs if adhesive_logs is not None else self.adhesive_logs
+        resistance_goal = resistance_goal if resistance_goal is not None else self.resistance_goal
+        session = session or self.session
         try:
-            assembly_check = self.session.query(CoilAssembly).filter_by(tv_id=self.tv_id).first()
-            existing_cert = self.session.query(TVCertification).filter_by(part_name=TVParts.HOLDER_1.value, tv_id = None).first()
+            assembly_check = session.query(CoilAssembly).filter_by(tv_id=tv_id).first()
+            existing_cert = session.query(TVCertification).filter_by(part_name=TVParts.HOLDER_1.value, tv_id = None).first()
             if existing_cert:
-                existing_cert.tv_id = self.tv_id
-            existing_cert_2 = self.session.query(TVCertification).filter_by(part_name=TVParts.HOLDER_2.value, tv_id = None).first()
+                existing_cert.tv_id = tv_id
+            existing_cert_2 = session.query(TVCertification).filter_by(part_name=TVParts.HOLDER_2.value, tv_id = None).first()
             if existing_cert_2:
-                existing_cert_2.tv_id = self.tv_id
-            status_entry = self.session.query(TVStatus).filter_by(tv_id=self.tv_id).first()
+                existing_cert_2.tv_id = tv_id
+            status_entry = session.query(TVStatus).filter_by(tv_id=tv_id).first()
 
             if status_entry:
                 if status_entry.status == TVProgressStatus.TESTING_COMPLETED:
                     status_entry.status = TVProgressStatus.COIL_MOUNTED
-                status_entry.electric_assembly_by = self.context.get("operator_32", "")
-                status_entry.coil_resistance = self.resistance_goal
-                if self.resistance_goal == 200:
-                    status_entry.coil_resistance_measured = float(self.context.get(f"measured_200_72", 0))
-                elif self.resistance_goal == 150:
-                    status_entry.coil_resistance_measured = float(self.context.get(f"measured_150_72", 0))
-                status_entry.coil_inductance = float(self.context.get(f"inductance_72", 0)) if self.context.get(f"inductance_72") else None
-                status_entry.coil_capacitance = float(self.context.get(f"capacitance_72", 0)) if self.context.get(f"capacitance_72") else None
+                status_entry.electric_assembly_by = context.get("operator_32", "")
+                status_entry.coil_resistance = resistance_goal
+                if resistance_goal == 200:
+                    status_entry.coil_resistance_measured = float(context.get(f"measured_200_72", 0))
+                elif resistance_goal == 150:
+                    status_entry.coil_resistance_measured = float(context.get(f"measured_150_72", 0))
+                status_entry.coil_inductance = float(context.get(f"inductance_72", 0)) if context.get(f"inductance_72") else None
+                status_entry.coil_capacitance = float(context.get(f"capacitance_72", 0)) if context.get(f"capacitance_72") else None
                 status_entry.coil_completion_date = datetime.now().date()
             if assembly_check:
-                assembly_check.steps = self.steps_copy
-                assembly_check.context = self.context
-                assembly_check.adhesive_logs = self.adhesive_logs
+                assembly_check.steps = steps
+                assembly_check.context = context
+                assembly_check.adhesive_logs = adhesive_logs
             else:
                 new_assembly = CoilAssembly(
-                    tv_id=self.tv_id,
-                    steps=self.steps_copy,
-                    context=self.context,
-                    adhesive_logs=self.adhesive_logs
+                    tv_id=tv_id,
+                    steps=steps,
+                    context=context,
+                    adhesive_logs=adhesive_logs
                 )
-                self.session.add(new_assembly)
+                session.add(new_assembly)
 
-            self.session.commit()
+            session.commit()
         except Exception as e:
             with self.output:
                 print("Error updating the database:", e)
-            self.session.rollback()
+            session.rollback()
             return
@@ -22,6 +22,9 @@ from .tv_tvac import TVTvac
 from .hpiv_revisions import HPIVRevisions
 from .fms_acceptance_tests import FMSAcceptanceTests
 from .fms_limits import FMSLimits
+from .fms_acceptance_journal import FMSAcceptanceJournal
+from .fms_acceptance_blobs import FMSAcceptanceBlobs
+from .ingest_metrics import IngestMetrics
 
 from .base import Base
 
@@ -29,4 +32,5 @@ __all__ = [ "HPIVCertification", "HPIVCharacteristics", "Base", "TVTestRuns",
            "TVTestResults", "TVStatus", "TVCertification", "LPTCalibration", 
            "LPTCoefficients", "AnodeFR", "CathodeFR", "FRCertification", "ManifoldStatus",
            "FMSMain", "FMSFRTests", "FMSFunctionalResults", "FMSFunctionalTests", "FMSTestResults", "FMSTvac", "CoilAssembly", 
-           "HPIVRevisions", "TVTvac", "FMSAcceptanceTests", "FMSLimits"]
\ No newline at end of file
+           "HPIVRevisions", "TVTvac", "FMSAcceptanceTests", "FMSLimits", "IngestMetrics",
+           "FMSAcceptanceJournal", "FMSAcceptanceBlobs"]
\ No newline at end of file
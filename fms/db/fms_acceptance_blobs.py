@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, String, LargeBinary, DateTime
+from .base import Base
+
+class FMSAcceptanceBlobs(Base):
+    """
+    --------------------------------------
+    FMS Acceptance Test Blobs Table 1.8.2
+    --------------------------------------
+
+    Columns
+    -------
+    digest : String
+        Primary Key, SHA-256 of the stored string (content address).
+    encoding : String
+        'base64' if data holds the decoded bytes of a base64 string (images), 'utf-8' otherwise.
+    data : LargeBinary
+        Stored content.
+    size : Integer
+        Length of the original string.
+    date_created : DateTime
+        Date when the blob was first stored.
+    """
+    __tablename__ = 'fms_acceptance_blobs'
+
+    digest = Column(String(64), primary_key=True)
+    encoding = Column(String(10), nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    size = Column(Integer, nullable=True)
+    date_created = Column(DateTime, nullable=True)
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, String, JSON, ForeignKey, Boolean, DateTime
+from .base import Base
+
+class FMSAcceptanceJournal(Base):
+    """
+    ----------------------------------------
+    FMS Acceptance Test Journal Table 1.8.1
+    ----------------------------------------
+
+    Columns
+    -------
+    id : Integer
+        Primary Key, order in which the changes were made.
+    fms_id : String
+        Foreign Key, FMS ID (references the main FMS table).
+    path : JSON
+        Keys leading to the changed field of the acceptance test data.
+    value : JSON
+        New value of the field, large images are stored as a blob reference.
+    deleted : Boolean
+        Indicates that the field was removed.
+    date_created : DateTime
+        Date when the change was recorded.
+    """
+    __tablename__ = 'fms_acceptance_journal'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    fms_id = Column(String(50), ForeignKey('fms_main.fms_id'), nullable=False, index=True)
+    path = Column(JSON, nullable=False)
+    value = Column(JSON, nullable=True)
+    deleted = Column(Boolean, default=False)
+    date_created = Column(DateTime, nullable=True)
@@ -0,0 +1,41 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime
+from .base import Base
+
+class IngestMetrics(Base):
+    """
+    -----------------------
+    Ingest Metrics Table 1.9
+    -----------------------
+
+    Columns
+    -------
+    id : Integer
+        Primary Key, unique metric ID.
+    run_id : String
+        Identifier of the ingest run the metric belongs to.
+    metric_type : String
+        Either 'stage' (timed section) or 'counter' (counted items).
+    name : String
+        Stage path (e.g. 'add_fms_main_test_data/parse') or counter name.
+    calls : Integer
+        Number of times the stage was entered, or the counter value.
+    total_seconds : Float
+        Cumulative wall time spent in the stage.
+    max_seconds : Float
+        Longest single call of the stage.
+    share : Float
+        Fraction of the run's wall time spent in the stage.
+    date_created : DateTime
+        Date when the ingest run was reported.
+    """
+    __tablename__ = 'ingest_metrics'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    run_id = Column(String(50), nullable=False)
+    metric_type = Column(String(20), nullable=False)
+    name = Column(String(255), nullable=False)
+    calls = Column(Integer, nullable=True)
+    total_seconds = Column(Float, nullable=True)
+    max_seconds = Column(Float, nullable=True)
+    share = Column(Float, nullable=True)
+    date_created = Column(DateTime, nullable=True)
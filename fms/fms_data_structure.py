@@ -28,6 +28,9 @@ from .utils.lpt_manifold import ManifoldData, ManifoldLogicSQL
 from .utils.fr import FRData, FRLogicSQL
 from .utils.fms import FMSData, FMSLogicSQL
 from .utils.general_utils import load_from_json, save_to_json
+from .utils.instrumentation import profiler
+from .utils.report_text import prefetch_report_texts
+from .utils.directory_index import directory_index
 from .utils.enums import TVParts
 
 # Local packages – queries and processing
@@ -124,6 +127,8 @@ class FMSDataStructure:
             Flag indicating if HPIV data was found.
         certification_listener (CertificationListener): 
             Listener for certification documents.
+        profiler (IngestProfiler):
+            Shared profiler timing the discovery, parse and db stages of the add_* methods.
         all_current_certifications (list): 
             List of all current certification file paths.
         hpiv_test_results (list): 
@@ -179,6 +184,8 @@ class FMSDataStructure:
         Gets a local JSON procedure and uploads it to the database.
     print_table(table_class, limit):
         Print rows of a given table class from the database, to a specified limit.
+    ingest_report(file_name, to_db):
+        Print and save the per-stage timing report of the ingest methods.
     """
     # absolute_data_dir: str = r"C:\\Users\\TANTENS\\Documents\\fms_data_collection"
     def __init__(self, excel_extraction: bool = True, test_path: str = r"\\be.local\Doc\DocWork\20025 - CHEOPS2 Low Power\70 - Testing",
@@ -238,6 +245,7 @@ class FMSDataStructure:
         self.hpiv_found = False
 
         self.certification_listener = None
+        self.profiler = profiler
         Base.metadata.create_all(self.engine)
 
 
@@ -305,6 +313,7 @@ class FMSDataStructure:
         # self.tv_test_thread = threading.Thread(target=self.tv_sql.listen_to_tv_test_results, args=(tv_test_runs,), daemon=False)
         # self.tv_test_thread.start()
 
+    @profiler.timed()
     def add_tv_electrical_data(self, electrical_data: str = "") -> None:
         """
         Add TV electrical data to the database.
@@ -328,6 +337,7 @@ class FMSDataStructure:
         self.lpt_calibration_thread = threading.Thread(target=self.lpt_sql.listen_to_lpt_calibration, args=(lpt_calibration,), daemon=False)
         self.lpt_calibration_thread.start()
 
+    @profiler.timed()
     def add_tv_assembly_data(self, tv_assembly: str = "", tv_summary: str = "", status_file: str = "") -> None:
         """
         Add TV assembly data from Excel files to the database.
@@ -344,6 +354,7 @@ class FMSDataStructure:
             status_file = self.fms_status_path
         self.tv_sql.add_tv_assembly_data(self.excel_extraction, tv_assembly = tv_assembly, tv_summary = tv_summary, status_file = status_file)
 
+    @profiler.timed()
     def add_manifold_assembly_data(self, status_file: str = "") -> None:
         """
         Add manifold assembly data from Excel files to the database.
@@ -354,6 +365,7 @@ class FMSDataStructure:
             status_file = self.fms_status_path
         self.lpt_sql.add_manifold_assembly_data(assembly_file=status_file)
 
+    @profiler.timed()
     def add_fr_test_data(self, anode_fr_path: str = "", cathode_fr_path: str = "") -> None:
         """
         Add flow restrictor test data from Excel files to the database.
@@ -390,6 +402,7 @@ class FMSDataStructure:
         self.fms_main_results_thread = threading.Thread(target=self.fms_sql.listen_to_fms_main_results, args=(data_folder,), daemon=False)
         self.fms_main_results_thread.start()
 
+    @profiler.timed()
     def get_all_certifications(self, local_certifications: str = "") -> None:
         """
         Process all certification documents and update the database accordingly.
@@ -444,12 +457,13 @@ class FMSDataStructure:
         #Test C25-0033
         cert_files = []
 
-        for folder in [self.certification_folder, local_certifications]:
-            cert_files.extend([
-                os.path.join(folder, f)
-                for f in os.listdir(folder)
-                if f.lower().endswith('.pdf')
-            ])
+        with profiler.stage("discovery"):
+            for folder in [self.certification_folder, local_certifications]:
+                cert_files.extend([
+                    os.path.join(folder, f)
+                    for f in os.listdir(folder)
+                    if f.lower().endswith('.pdf')
+                ])
 
         cert_files = [f for f in cert_files if any(company in f.lower() for company in self.companies)]
 
@@ -557,35 +571,40 @@ class FMSDataStructure:
 
                 elif certification in outlet_certifications:
                     reader = TextractReader(pdf_file=file, bucket_folder="Certifications", company=company)
-                    total_lines = reader.get_text()
+                    with profiler.stage("textract"):
+                        total_lines = reader.get_text()
                     self.fr_data.get_certification(total_lines)
                     self.fr_sql.update_fr_certification(self.fr_data)
                     self.fr_data.extracted_fr_parts = {}
 
                 elif certification in lpt_assembly_cert:
                     reader = TextractReader(pdf_file=file, bucket_folder="Certifications", company=company)
-                    total_lines = reader.get_text()
+                    with profiler.stage("textract"):
+                        total_lines = reader.get_text()
                     self.manifold_data.get_assembly_certification(total_lines)
                     self.lpt_sql.update_manifold_certification(self.manifold_data)
                     self.manifold_data.extracted_manifold_parts = {}
 
                 elif certification in lpt_cert:
                     reader = TextractReader(pdf_file=file, bucket_folder="Certifications", company=company)
-                    total_lines = reader.get_text()
+                    with profiler.stage("textract"):
+                        total_lines = reader.get_text()
                     self.manifold_data.get_lpt_certification(total_lines)
                     self.lpt_sql.update_lpt_certification(self.manifold_data)
                     self.manifold_data.extracted_lpt_serials = []
 
                 elif certification in hpiv_certifications:
                     reader = TextractReader(pdf_file=file, bucket_folder="Certifications", company=company)
-                    total_lines = reader.get_text()
+                    with profiler.stage("textract"):
+                        total_lines = reader.get_text()
                     self.hpiv_data.get_certification(total_lines)
                     self.hpiv_sql.update_hpiv_certifications(self.hpiv_data)
                     self.hpiv_data.hpiv_ids = []
 
                 elif certification in restrictor_certifications:
                     reader = TextractReader(pdf_file=file, bucket_folder="Certifications", company=company)
-                    total_lines = reader.get_text()
+                    with profiler.stage("textract"):
+                        total_lines = reader.get_text()
                     self.fr_data.get_certification(total_lines)       
                     self.fr_sql.update_fr_certification(self.fr_data)
                     self.fr_data.extracted_fr_parts = {}             
@@ -593,7 +612,8 @@ class FMSDataStructure:
 
                 elif certification in relevant_amazon_certifications:
                     reader = TextractReader(pdf_file=file, bucket_folder="Certifications", company=company)
-                    total_lines = reader.get_text()
+                    with profiler.stage("textract"):
+                        total_lines = reader.get_text()
                     self.tv_data.get_certification(total_lines)
                     self.tv_sql.update_tv_certification(self.tv_data)
                     self.tv_data.extracted_tv_parts = {}
@@ -660,8 +680,10 @@ class FMSDataStructure:
                         t.join()
 
                 # Update the progress bar for this file
+                profiler.count("files")
                 pbar.update(1)
 
+    @profiler.timed()
     def add_tv_test_results(self, tv_test_path: str = "") -> None:
         """
         Add TV test results from Excel files to the database.
@@ -674,27 +696,22 @@ class FMSDataStructure:
         if not tv_test_path:
             tv_test_path = self.tv_test_path
         session = self.Session()
-        for folder in os.listdir(tv_test_path):
+        index = directory_index(tv_test_path)
+        for folder_entry in index.entries(tv_test_path):
 
-            full_folder = os.path.join(tv_test_path, folder)
-            if os.path.isdir(full_folder) and "test valve #" in folder.lower():
+            folder, full_folder = folder_entry.name, folder_entry.path
+            if folder_entry.is_dir and "test valve #" in folder.lower():
                 # Extract TV number
                 tv_id = int(folder.split("#")[-1].strip().split(" ")[0])
 
                 tv_sql = TVLogicSQL(session=session, fms=self)
 
                 # Collect all .xls files in this folder
-                test_files = [os.path.join(full_folder, f)
-                              for f in os.listdir(full_folder)
-                              if f.lower().endswith('.xls') and 'quench' not in f.lower()]
+                test_files = [f for f in index.files(full_folder, ('.xls',)) if 'quench' not in os.path.basename(f).lower()]
 
                 # Check for subfolders and collect their .xls files
-                for subfolder in os.listdir(full_folder):
-                    full_subfolder = os.path.join(full_folder, subfolder)
-                    if os.path.isdir(full_subfolder):
-                        test_files.extend([os.path.join(full_subfolder, f)
-                                           for f in os.listdir(full_subfolder)
-                                           if f.lower().endswith('.xls') and 'quench' not in f.lower()])
+                for subfolder in index.find(full_folder, "", folder_only=True):
+                    test_files.extend([f for f in index.files(subfolder, ('.xls',)) if 'quench' not in os.path.basename(f).lower()])
 
                 # Get welded date from certification if available
                 cert_check = session.query(TVCertification).filter_by(tv_id=tv_id, part_name=TVParts.WELD.value).first()
@@ -729,7 +746,9 @@ class FMSDataStructure:
                         continue
 
                     tv_data = TVData(test_results_file=test_file)
-                    update = tv_data.extract_tv_test_results_from_excel()
+                    with profiler.stage("parse"):
+                        update = tv_data.extract_tv_test_results_from_excel()
+                    profiler.count("files")
                     if not update:
                         continue
 
@@ -744,7 +763,8 @@ class FMSDataStructure:
                     tv_sql.tv_id = tv_id
                     tv_sql.tv_test_reference = test_reference
                     tv_sql.tv_welded = welded
-                    tv_sql.update_tv_test_results(tv_data)
+                    with profiler.stage("db"):
+                        tv_sql.update_tv_test_results(tv_data)
 
                     if not welded:
                         last_pre_weld_opening_temp = tv_data.opening_temperature
@@ -756,8 +776,10 @@ class FMSDataStructure:
                     if last_pre_weld_opening_temp is not None:
                         status_entry.pre_weld_opening_temp = last_pre_weld_opening_temp
 
-        session.commit()
+        with profiler.stage("db"):
+            session.commit()
 
+    @profiler.timed()
     def add_hpiv_data(self, hpiv_data_packages: str = "", output_folder: str = "") -> None:
         """
         Add HPIV data from PDF files to the database.
@@ -770,17 +792,22 @@ class FMSDataStructure:
         """
         if not hpiv_data_packages:
             hpiv_data_packages = os.path.join(self.absolute_data_dir, "HPIV_data_packages")
-        data_packages = [os.path.join(hpiv_data_packages, f) for f in os.listdir(hpiv_data_packages) if f.lower().endswith('.pdf')]
+        with profiler.stage("discovery"):
+            data_packages = [os.path.join(hpiv_data_packages, f) for f in os.listdir(hpiv_data_packages) if f.lower().endswith('.pdf')]
         if not output_folder:
             output_folder = os.path.join(self.absolute_data_dir, "extracted_HPIV_reports")
             if not os.path.exists(output_folder):
                 os.makedirs(output_folder)
         for package in data_packages:
             hpiv_data = HPIVData(pdf_file=package) 
-            hpiv_data.extract_hpiv_data(output_folder=output_folder)
-            self.hpiv_sql.update_hpiv_characteristics(hpiv_data)
-            self.hpiv_sql.update_hpiv_revisions(hpiv_data)
-
+            with profiler.stage("parse"):
+                hpiv_data.extract_hpiv_data(output_folder=output_folder)
+            with profiler.stage("db"):
+                self.hpiv_sql.update_hpiv_characteristics(hpiv_data)
+                self.hpiv_sql.update_hpiv_revisions(hpiv_data)
+            profiler.count("files")
+
+    @profiler.timed()
     def add_lpt_calibration_data(self, lpt_path: str = "") -> None:
         """
         Add LPT calibration data from JSON files to the database.
@@ -794,40 +821,54 @@ class FMSDataStructure:
         if not lpt_path:
             lpt_path = os.path.join(self.absolute_data_dir, "LPT_data/LPT_coefficient_data")
         json_files = []
-        for root, dirs, files in os.walk(lpt_path):
-            for f in files:
-                if f.lower().endswith('.json'):
-                    json_files.append(os.path.join(root, f))
+        with profiler.stage("discovery"):
+            for root, dirs, files in os.walk(lpt_path):
+                for f in files:
+                    if f.lower().endswith('.json'):
+                        json_files.append(os.path.join(root, f))
+        profiler.count("files", len(json_files))
         self.manifold_data.json_files = json_files
-        self.manifold_data.extract_coefficients_from_json()
-        self.lpt_sql.update_lpt_calibration(self.manifold_data)
+        with profiler.stage("parse"):
+            self.manifold_data.extract_coefficients_from_json()
+        with profiler.stage("db"):
+            self.lpt_sql.update_lpt_calibration(self.manifold_data)
         self.manifold_data.lpt_coefficients = {}
         self.manifold_data.lpt_calibration = {}
         self.manifold_data.json_files = []
 
+    @profiler.timed()
     def add_fms_main_test_data(self, fms_main_files: str =  "",
-        fms_status_path: str = "") -> None:
+        fms_status_path: str = "", workers: int = None) -> None:
         """
         Add FMS main test data from the test reports to the database.
         This method scans the FMS main test results directory for PDF files,
-        extracts relevant test data, and updates the database with the
+        extracts the report texts in a process pool (cached by content hash),
+        parses the relevant test data, and updates the database with the
         extracted data.
         Args:
             fms_main_files (str): Path to the directory containing FMS main test results.
             fms_status_path (str): Path to the FMS status overview Excel file.
+            workers (int): Number of processes for the text extraction, defaults to the CPU count.
         """
         if not fms_main_files:
             fms_main_files = os.path.join(self.absolute_data_dir, "FMS_data/test_results")
         if not fms_status_path:
             fms_status_path = self.fms_status_path
     
-        main_files = [os.path.join(fms_main_files, f) for f in os.listdir(fms_main_files) if f.lower().endswith('.pdf')]
+        with profiler.stage("discovery"):
+            main_files = [os.path.join(fms_main_files, f) for f in os.listdir(fms_main_files) if f.lower().endswith('.pdf')]
+        with profiler.stage("pdf_text"):
+            prefetch_report_texts(main_files, workers=workers)
         for main in main_files:
             fms_data = FMSData(pdf_file=main, status_file=fms_status_path)
-            fms_data.extract_FMS_test_results()
-            self.fms_sql.add_fms_assembly_data(fms_data)
-            self.fms_sql.update_fms_main_test_results(fms_data)
-
+            with profiler.stage("parse"):
+                fms_data.extract_FMS_test_results()
+            with profiler.stage("db"):
+                self.fms_sql.add_fms_assembly_data(fms_data)
+                self.fms_sql.update_fms_main_test_results(fms_data)
+            profiler.count("files")
+
+    @profiler.timed()
     def add_fms_functional_test_data(self, test_path: str = "", fms_ids: list[str] = []) -> None:
         """
         Add FMS main functional test data from the test reports to the database.
@@ -851,80 +892,64 @@ class FMSDataStructure:
             f"25-{i:03d}" for i in range(45, 65)
         ]
 
-        def all_matches(path: str, keyword: str, extension: str = None, folder_only: bool = False) -> list[str]:
-            if path is None or not os.path.exists(path):
-                return []
-            matches = []
-            for entry in os.listdir(path):
-                full_path = os.path.join(path, entry)
-                if folder_only and not os.path.isdir(full_path):
+        index = directory_index(test_path)
+
+        with profiler.stage("discovery"):
+            for entry in index.entries(test_path):
+                f, full_f_path = entry.name, entry.path
+                if not entry.is_dir:
                     continue
-                if keyword.lower() in entry.lower():
-                    if extension and not entry.lower().endswith(extension.lower()):
-                        continue
-                    matches.append(full_path)
-            return matches
-
-        for f in os.listdir(test_path):
-            full_f_path = os.path.join(test_path, f)
-            if not os.path.isdir(full_f_path):
-                continue
-
-            serial = next((s for s in serials if s in f), None)
-            if not serial:
-                continue
-
-            slope_files[serial] = []
-            closed_loop_files[serial] = []
-            fr_files[serial] = []
-            tvac_files[serial] = []
-            open_loop_files[serial] = []
-
-            functional_folder = next(iter(all_matches(full_f_path, "function", folder_only=True)), None)
-            low_folder = next(iter(all_matches(functional_folder, "10 bara", folder_only=True)), None)
-            high_folder = next(iter(all_matches(functional_folder, "190 bara", folder_only=True)), None)
-
-            def add_files(target_list, folder, keywords, ext=".xls"):
-                if not folder:
-                    return
-                for kw in keywords:
-                    target_list.extend(all_matches(folder, kw, extension=ext))
-
-            add_files(slope_files[serial], low_folder, ["slope"])
-            add_files(closed_loop_files[serial], low_folder, ["closed loop"])
-            add_files(fr_files[serial], low_folder, ["fr", "characteristics", "fr_test"])
-
-            add_files(slope_files[serial], high_folder, ["slope"])
-            add_files(closed_loop_files[serial], high_folder, ["closed loop"])
-            add_files(fr_files[serial], high_folder, ["fr", "characteristics", "fr_test"])
-
-            tvac_folder = next(iter(all_matches(full_f_path, "tvac", folder_only=True)), None)
-            if not tvac_folder:
-                continue
-
-            tvac_cycle_folder = next(iter(all_matches(tvac_folder, "cycl", folder_only=True)), None)
-            if tvac_cycle_folder:
-                tvac_files[serial].extend(
-                    os.path.join(tvac_cycle_folder, i)
-                    for i in os.listdir(tvac_cycle_folder)
-                    if i.lower().endswith(".csv")
-                )
-
-            temp_conditions = ["-15 degC", "22 degC", "70 degC"]
-            pressures = ["10 bara", "190 bara"]
-
-            for temp in temp_conditions:
-                temp_folders = all_matches(tvac_folder, temp, folder_only=True)
-                for temp_folder in temp_folders:
-                    func_folders = all_matches(temp_folder, "function", folder_only=True)
-                    for func_folder in func_folders:
-                        for pressure in pressures:
-                            pressure_folders = all_matches(func_folder, pressure, folder_only=True)
-                            for pressure_folder in pressure_folders:
-                                add_files(slope_files[serial], pressure_folder, ["slope"])
-                                add_files(closed_loop_files[serial], pressure_folder, ["closed loop"])
-                                add_files(open_loop_files[serial], pressure_folder, ["open loop"])
 
+                serial = next((s for s in serials if s in f), None)
+                if not serial:
+                    continue
+
+                slope_files[serial] = []
+                closed_loop_files[serial] = []
+                fr_files[serial] = []
+                tvac_files[serial] = []
+                open_loop_files[serial] = []
+
+                functional_folder = index.first(full_f_path, "function", folder_only=True)
+                low_folder = index.first(functional_folder, "10 bara", folder_only=True)
+                high_folder = index.first(functional_folder, "190 bara", folder_only=True)
+
+                def add_files(target_list, folder, keywords, ext=".xls"):
+                    if not folder:
+                        return
+                    for kw in keywords:
+                        target_list.extend(index.find(folder, kw, extension=ext))
+
+                add_files(slope_files[serial], low_folder, ["slope"])
+                add_files(closed_loop_files[serial], low_folder, ["closed loop"])
+                add_files(fr_files[serial], low_folder, ["fr", "characteristics", "fr_test"])
+
+                add_files(slope_files[serial], high_folder, ["slope"])
+                add_files(closed_loop_files[serial], high_folder, ["closed loop"])
+                add_files(fr_files[serial], high_folder, ["fr", "characteristics", "fr_test"])
+
+                tvac_folder = index.first(full_f_path, "tvac", folder_only=True)
+                if not tvac_folder:
+                    continue
+
+                tvac_cycle_folder = index.first(tvac_folder, "cycl", folder_only=True)
+                if tvac_cycle_folder:
+                    tvac_files[serial].extend(index.files(tvac_cycle_folder, (".csv",)))
+
+                temp_conditions = ["-15 degC", "22 degC", "70 degC"]
+                pressures = ["10 bara", "190 bara"]
+
+                for temp in temp_conditions:
+                    temp_folders = index.find(tvac_folder, temp, folder_only=True)
+                    for temp_folder in temp_folders:
+                        func_folders = index.find(temp_folder, "function", folder_only=True)
+                        for func_folder in func_folders:
+                            for pressure in pressures:
+                                pressure_folders = index.find(func_folder, pressure, folder_only=True)
+                                for pressure_folder in pressure_folders:
+                                    add_files(slope_files[serial], pressure_folder, ["slope"])
+                                    add_files(closed_loop_files[serial], pressure_folder, ["closed loop"])
+                                    add_files(open_loop_files[serial], pressure_folder, ["open loop"])
 
         session = self.Session()
         for serial in serials:
@@ -941,9 +966,12 @@ class FMSDataStructure:
             for slope_test in slope:
                 print(slope_test)
                 fms_data = FMSData(test_type="slope", flow_test_file=slope_test)
-                fms_data.extract_slope_data()
+                with profiler.stage("parse"):
+                    fms_data.extract_slope_data()
                 fms_data.gas_type = gas_type
-                fms_sql.update_flow_test_results(fms_data)
+                with profiler.stage("db"):
+                    fms_sql.update_flow_test_results(fms_data)
+                profiler.count("files")
 
             # for open_loop_test in open_loop_files.get(serial, []):
             #     fms_data = FMSData(test_type="open_loop", flow_test_file=open_loop_test)
@@ -971,6 +999,25 @@ class FMSDataStructure:
             #     fms_data.gas_type = gas_type
             #     fms_sql.update_tvac_cycle_results(fms_data)   
 
+    def ingest_report(self, file_name: str = "", to_db: bool = False) -> dict:
+        """
+        Print and save the per-stage timing report collected by the add_* methods and listeners.
+        Args:
+            file_name (str): Name of the JSON report in the json cache. Defaults to '<name>_report_<run_id>'.
+            to_db (bool): Also write the report rows to the IngestMetrics table.
+        Returns:
+            dict: The structured timing report.
+        """
+        self.profiler.print_summary()
+        report = self.profiler.save_report(file_name=file_name or None)
+        if to_db:
+            session = self.Session()
+            try:
+                self.profiler.write_to_db(session)
+            finally:
+                session.close()
+        return report
+
     def print_table(self, table_class: object, limit: int = None) -> None:
         """
         Print the contents of a database table to the console.
@@ -174,12 +174,16 @@ def collect_all_data(include_data: list[DataParts], local = True,
         fms_main_files: str = "",
         test_path: str = "",
         fms_ids: list[str] = [],
-        absolute_data_dir: str = ""
+        absolute_data_dir: str = "",
+        timing_report: bool = False,
+        metrics_to_db: bool = False
     ) -> None:
     if not absolute_data_dir:
         fms_data = FMSDataStructure(local=local)
     else:
         fms_data = FMSDataStructure(local=local, absolute_data_dir=absolute_data_dir)
+    # The profiler is shared by the process, the report only covers this collection
+    fms_data.profiler.reset()
 
     for data_part in include_data:
         # collect_certification_data(fms_data, local_certifications, data_part)
@@ -194,6 +198,9 @@ def collect_all_data(include_data: list[DataParts], local = True,
         add_fms_testing_tools(fms_data=fms_data, data_parts=data_part)
         add_procedures(data_parts=data_part)
 
+    if timing_report or metrics_to_db:
+        fms_data.ingest_report(to_db=metrics_to_db)
+
 # ----------------------------------------------------------------------------------------------------------------------------------- #
 # ---------------------------------------------- Logic for Listening to Data  ------------------------------------------------------- #
 # ----------------------------------------------------------------------------------------------------------------------------------- #
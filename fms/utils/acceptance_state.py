@@ -0,0 +1,353 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Callable
+
+# Standard library
+import atexit
+import base64
+import binascii
+import copy
+import hashlib
+import math
+import threading
+import traceback
+import weakref
+from datetime import datetime
+
+# Third-party
+from sqlalchemy import event
+
+# Local imports
+from ..db import FMSAcceptanceTests, FMSAcceptanceJournal, FMSAcceptanceBlobs
+from .jobs import job_runner
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+BLOB_PREFIX = "blob:sha256:"
+"""Prefix of the references that replace large strings (base64 images) in the stored JSON."""
+BLOB_MIN_LENGTH = 4096
+"""Strings of at least this length are stored as content-addressed blobs."""
+
+_stores: "weakref.WeakSet[AcceptanceStateStore]" = weakref.WeakSet()
+"""Live state stores, their pending changes are written at interpreter exit."""
+_COMMIT_CALLBACKS = "acceptance_state_after_commit"
+"""Session info key of the callbacks waiting for the commit of a compaction."""
+
+
+@atexit.register
+def _flush_stores() -> None:
+    for store in list(_stores):
+        store.flush()
+
+
+def _run_committed(session: "Session") -> None:
+    callbacks = session.info.pop(_COMMIT_CALLBACKS, [])
+    for callback in callbacks:
+        callback()
+
+
+def _drop_committed(session: "Session") -> None:
+    session.info.pop(_COMMIT_CALLBACKS, None)
+
+
+def _after_commit(session: "Session", callback: Callable[[], None]) -> None:
+    """
+    Run a callback once the current transaction of a session is committed, it is dropped on rollback.
+    The session gets one pair of listeners, the callbacks are kept in its info.
+    """
+    if not event.contains(session, "after_commit", _run_committed):
+        event.listen(session, "after_commit", _run_committed)
+        event.listen(session, "after_rollback", _drop_committed)
+    session.info.setdefault(_COMMIT_CALLBACKS, []).append(callback)
+
+
+def flatten(data: dict, prefix: tuple = ()) -> dict[tuple, Any]:
+    """
+    Leaf values of a nested dictionary by key path. Empty dictionaries are leaves,
+    lists are copied so later in-place edits show up as changes.
+    Args:
+        data (dict): Nested dictionary.
+        prefix (tuple): Path of data itself.
+    Returns:
+        dict[tuple, Any]: Key path -> leaf value.
+    """
+    leaves = {}
+    for key, value in data.items():
+        path = prefix + (str(key),)
+        if isinstance(value, dict) and value:
+            leaves.update(flatten(value, path))
+        else:
+            leaves[path] = copy.deepcopy(value) if isinstance(value, (list, dict)) else value
+    return leaves
+
+
+def _same(a: Any, b: Any) -> bool:
+    if a is b:
+        return True
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b):
+        return True
+    return type(a) == type(b) and a == b
+
+
+def _set_path(data: dict, path: list[str], value: Any) -> None:
+    for key in path[:-1]:
+        if not isinstance(data.get(key), dict):
+            data[key] = {}
+        data = data[key]
+    data[path[-1]] = value
+
+
+def _delete_path(data: dict, path: list[str]) -> None:
+    for key in path[:-1]:
+        data = data.get(key)
+        if not isinstance(data, dict):
+            return
+    data.pop(path[-1], None)
+
+
+def _blob_refs(value: Any, refs: set[str]) -> None:
+    if isinstance(value, str) and value.startswith(BLOB_PREFIX):
+        refs.add(value[len(BLOB_PREFIX):])
+    elif isinstance(value, dict):
+        for v in value.values():
+            _blob_refs(v, refs)
+    elif isinstance(value, list):
+        for v in value:
+            _blob_refs(v, refs)
+
+
+def _replace_refs(value: Any, blobs: dict[str, str]) -> Any:
+    if isinstance(value, str) and value.startswith(BLOB_PREFIX):
+        return blobs.get(value[len(BLOB_PREFIX):], value)
+    if isinstance(value, dict):
+        return {k: _replace_refs(v, blobs) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_replace_refs(v, blobs) for v in value]
+    return value
+
+
+def resolve_blobs(session: "Session", value: Any) -> Any:
+    """
+    Replace the blob references in a JSON value by the stored strings, fetching all blobs in one query.
+    Args:
+        session (Session): Database session.
+        value (Any): JSON value containing blob references.
+    Returns:
+        Any: The value with the original strings.
+    """
+    refs = set()
+    _blob_refs(value, refs)
+    if not refs:
+        return value
+    blobs = {}
+    for blob in session.query(FMSAcceptanceBlobs).filter(FMSAcceptanceBlobs.digest.in_(refs)):
+        blobs[blob.digest] = base64.b64encode(blob.data).decode('utf-8') if blob.encoding == 'base64' else blob.data.decode('utf-8')
+    return _replace_refs(value, blobs)
+
+
+def read_acceptance_state(session: "Session", entry: FMSAcceptanceTests, resolve: bool = True) -> dict:
+    """
+    Acceptance test data of an entry: the snapshot in raw_json with the journaled changes replayed.
+    Args:
+        session (Session): Database session.
+        entry (FMSAcceptanceTests): Acceptance test entry.
+        resolve (bool): Replace the blob references by the stored images.
+    Returns:
+        dict: The acceptance test data (test_info).
+    """
+    state = copy.deepcopy(entry.raw_json) if entry.raw_json else {}
+    journal = session.query(FMSAcceptanceJournal).filter_by(fms_id=entry.fms_id).order_by(FMSAcceptanceJournal.id).all()
+    for change in journal:
+        if change.deleted:
+            _delete_path(state, change.path)
+        else:
+            _set_path(state, change.path, copy.deepcopy(change.value))
+    return resolve_blobs(session, state) if resolve else state
+
+
+class AcceptanceStateStore:
+    """
+    Persists the acceptance test data of one FMS as field-level changes.
+
+    Instead of rewriting the complete test_info into FMSAcceptanceTests.raw_json on every field
+    change, changes are coalesced over a short debounce window and appended to the
+    FMSAcceptanceJournal table (one row per changed field) from a background thread with its own
+    session. Large strings (the base64 encoded plots and images) are stored once in the
+    FMSAcceptanceBlobs table under their SHA-256 and referenced from the JSON. At step boundaries
+    the state is compacted: raw_json receives a snapshot and the journal of the FMS is cleared.
+
+    Attributes
+    ----------
+    fms_id : str
+        FMS ID of the acceptance test.
+    debounce : float
+        Seconds to wait for further changes before writing.
+    persisted : bool
+        Whether the acceptance test entry exists in the database.
+
+    Methods
+    -------
+    load(session, entry):
+        Load the test data of an entry and take it as the persisted state.
+    record(test_info, current_subdict=None):
+        Schedule a debounced write of the changes.
+    flush():
+        Write the pending changes now.
+    compact(session, entry, test_info):
+        Write a snapshot into the entry and clear the journal.
+    """
+
+    def __init__(self, session_factory: Callable[[], "Session"], fms_id: str, debounce: float = 0.75) -> None:
+        self.session_factory = session_factory
+        self.fms_id = fms_id
+        self.debounce = debounce
+        self.persisted = False
+        self._shadow: dict[tuple, Any] = {}
+        self._persisted_subdict = None
+        self._pending = None
+        self._timer: threading.Timer | None = None
+        self._lock = threading.RLock()
+        # Held while writing, so the database is not blocked by record() and writes do not overlap
+        self._write_lock = threading.Lock()
+        self._known_blobs: set[str] = set()
+        _stores.add(self)
+
+    def load(self, session: "Session", entry: FMSAcceptanceTests) -> dict:
+        """
+        Load the test data of an entry, with journal replayed and images resolved.
+        Args:
+            session (Session): Database session.
+            entry (FMSAcceptanceTests): Acceptance test entry of this FMS.
+        Returns:
+            dict: The acceptance test data (test_info).
+        """
+        test_info = read_acceptance_state(session, entry)
+        with self._write_lock, self._lock:
+            self._shadow = flatten(test_info)
+            self._persisted_subdict = entry.current_subdict
+            self.persisted = True
+        return test_info
+
+    def record(self, test_info: dict, current_subdict: str = None) -> None:
+        """
+        Remember the current state and write the changes after the debounce window.
+        Args:
+            test_info (dict): Current acceptance test data.
+            current_subdict (str): Current sub-dictionary of the procedure.
+        """
+        with self._lock:
+            self._pending = (flatten(test_info), current_subdict)
+            if self._timer is None:
+                self._timer = threading.Timer(self.debounce, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _blob_ref(self, session: "Session", text: str, seen: set[str]) -> str:
+        # Digests are only known once the write referencing them is committed, a rolled back blob is inserted again
+        digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        if digest not in self._known_blobs and digest not in seen and session.get(FMSAcceptanceBlobs, digest) is None:
+            try:
+                data = base64.b64decode(text, validate=True)
+                encoding = 'base64' if base64.b64encode(data).decode('utf-8') == text else 'utf-8'
+            except (binascii.Error, ValueError):
+                encoding = 'utf-8'
+            if encoding == 'utf-8':
+                data = text.encode('utf-8')
+            session.add(FMSAcceptanceBlobs(digest=digest, encoding=encoding, data=data, size=len(text), date_created=datetime.now()))
+            session.flush()
+        seen.add(digest)
+        return f"{BLOB_PREFIX}{digest}"
+
+    def _externalize(self, session: "Session", value: Any, seen: set[str]) -> Any:
+        if isinstance(value, str) and len(value) >= BLOB_MIN_LENGTH:
+            return self._blob_ref(session, value, seen)
+        if isinstance(value, dict):
+            return {k: self._externalize(session, v, seen) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._externalize(session, v, seen) for v in value]
+        return value
+
+    def flush(self) -> None:
+        """
+        Write the pending changes to the journal.
+        The state is snapshot under the lock and written outside of it, so record() is never held up
+        by the database; changes recorded meanwhile are written by the next flush. The write is
+        serialized with the other database writes of the process (see JobRunner.database_lock). Failed writes are
+        retried with the next flush, as the persisted state is only updated on success.
+        """
+        # The database lock of the job runner comes first, as report jobs compact while holding it
+        with job_runner().database_lock, self._write_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                pending = self._pending
+                if pending is None:
+                    return
+                shadow, persisted_subdict = self._shadow, self._persisted_subdict
+
+            leaves, current_subdict = pending
+            removed = [path for path in shadow if path not in leaves]
+            changed = [path for path, value in leaves.items() if path not in shadow or not _same(shadow[path], value)]
+            seen: set[str] = set()
+            if removed or changed or current_subdict != persisted_subdict:
+                session: "Session" = None
+                try:
+                    session = self.session_factory()
+                    now = datetime.now()
+                    for path in removed:
+                        session.add(FMSAcceptanceJournal(fms_id=self.fms_id, path=list(path), value=None, deleted=True, date_created=now))
+                    for path in changed:
+                        session.add(FMSAcceptanceJournal(fms_id=self.fms_id, path=list(path), value=self._externalize(session, leaves[path], seen),
+                                                         deleted=False, date_created=now))
+                    if current_subdict != persisted_subdict:
+                        entry = session.query(FMSAcceptanceTests).filter_by(fms_id=self.fms_id).first()
+                        if entry:
+                            entry.current_subdict = current_subdict
+                    session.commit()
+                except Exception as e:
+                    print(f"Error saving acceptance test changes for FMS {self.fms_id}: {str(e)}")
+                    traceback.print_exc()
+                    if session:
+                        session.rollback()
+                    return
+                finally:
+                    if session:
+                        session.close()
+
+            with self._lock:
+                self._known_blobs |= seen
+                self._shadow = leaves
+                self._persisted_subdict = current_subdict
+                if self._pending is pending:
+                    self._pending = None
+
+    def compact(self, session: "Session", entry: FMSAcceptanceTests, test_info: dict) -> None:
+        """
+        Write a snapshot of the test data into the entry and drop the journal of this FMS.
+        Pending changes are superseded by the snapshot. The caller commits the session, the snapshot
+        is taken as the persisted state once that commit succeeds; after a rollback the next flush
+        writes the changes against the previous state again.
+        Args:
+            session (Session): Database session the entry belongs to.
+            entry (FMSAcceptanceTests): Acceptance test entry of this FMS (new or existing).
+            test_info (dict): Current acceptance test data.
+        """
+        seen: set[str] = set()
+        with self._write_lock, self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._pending = None
+            entry.raw_json = self._externalize(session, test_info, seen)
+            session.query(FMSAcceptanceJournal).filter_by(fms_id=self.fms_id).delete(synchronize_session=False)
+        leaves, current_subdict = flatten(test_info), entry.current_subdict
+
+        def committed() -> None:
+            with self._lock:
+                self._known_blobs |= seen
+                self._shadow = leaves
+                self._persisted_subdict = current_subdict
+                self.persisted = True
+
+        _after_commit(session, committed)
@@ -17,6 +17,7 @@ from ..utils.tv import TVData
 from ..utils.fr import FRData
 from ..utils.hpiv import HPIVData
 from ..utils.lpt_manifold import ManifoldData
+from .instrumentation import profiler
 
 # Type-checking imports
 if TYPE_CHECKING:
@@ -233,7 +234,8 @@ class CertificationListener(FileSystemEventHandler):
             self.company = next(company for company in self.companies if company in pdf_file.lower())
             try:
                 reader = TextractReader(pdf_file=pdf_file, bucket_folder="Certifications", company=self.company, load_json=self.load_from_json, save_json=self.save_to_json)
-                total_lines = reader.get_text()
+                with profiler.stage("certification_listener/textract"):
+                    total_lines = reader.get_text()
                 # print(total_lines)
             except Exception as e:
                 print(f"Error processing PDF file {pdf_file}: {e}")
@@ -255,8 +257,11 @@ class CertificationListener(FileSystemEventHandler):
                     obj.company = self.company
 
                 # Process certification lines and update DB
-                self.function_map[process_part](total_lines)
-                self.sql_map[process_part](obj)
+                with profiler.stage("certification_listener/parse"):
+                    self.function_map[process_part](total_lines)
+                with profiler.stage("certification_listener/db"):
+                    self.sql_map[process_part](obj)
+                profiler.count(f"certification_listener/{process_part}")
 
                 # Reset any attributes if needed
                 if hasattr(obj, 'total_amount'):
@@ -0,0 +1,100 @@
+# Standard library
+from collections.abc import Iterator, Mapping
+
+# Third-party
+import numpy as np
+import pandas as pd
+
+
+class ColumnarResults(Mapping):
+    """
+    Column oriented container for parsed test data, handed from the parsers to the SQL writers
+    and the analysis methods instead of a list of per-row dictionaries.
+
+    Behaves as a read-only mapping of parameter name -> NumPy array (all columns have the same length).
+    Its truth value is False when it holds no rows, like the empty list it replaces.
+
+    Attributes
+    ----------
+    units : dict[str, str]
+        Parameter name -> unit.
+    n_rows : int
+        Number of rows (samples) per column.
+
+    Methods
+    -------
+    from_dataframe(df, units=None):
+        Build the container from the columns of a DataFrame.
+    valid_mask(name):
+        Boolean mask of the non-NaN entries of a column.
+    to_lists():
+        Columns as lists of Python scalars, for JSON/ARRAY database columns.
+    to_dataframe():
+        Columns as a DataFrame.
+    """
+
+    def __init__(self, columns: dict[str, np.ndarray] = None, units: dict[str, str] = None) -> None:
+        self._columns = {name: np.asarray(values) for name, values in (columns or {}).items()}
+        lengths = {len(values) for values in self._columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"All columns must have the same length, got {sorted(lengths)}")
+        self.n_rows = lengths.pop() if lengths else 0
+        self.units = dict(units or {})
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, units: dict[str, str] = None) -> "ColumnarResults":
+        """
+        Build the container from a DataFrame, copying each column into its own array.
+        Args:
+            df (pd.DataFrame): Parsed test data.
+            units (dict[str, str]): Parameter name -> unit.
+        Returns:
+            ColumnarResults: The column arrays of the DataFrame.
+        """
+        return cls({col: df[col].to_numpy(copy=True) for col in df.columns}, units)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self._columns[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._columns)
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    def __bool__(self) -> bool:
+        return self.n_rows > 0
+
+    def __repr__(self) -> str:
+        return f"ColumnarResults({self.n_rows} rows, columns={list(self._columns)})"
+
+    def valid_mask(self, name: str) -> np.ndarray:
+        """
+        Boolean mask of the entries of a column that are not NaN (or a 'nan' string).
+        Args:
+            name (str): Parameter name.
+        Returns:
+            np.ndarray: True where the value should be stored.
+        """
+        values = self._columns[name]
+        if values.dtype.kind in 'fc':
+            return ~np.isnan(values)
+        if values.dtype.kind in 'iub':
+            return np.ones(len(values), dtype=bool)
+        return np.array([not (isinstance(v, float) and np.isnan(v)) and str(v).lower() != "nan" for v in values], dtype=bool)
+
+    def to_lists(self) -> dict[str, list]:
+        """
+        Columns as lists of Python scalars.
+        Returns:
+            dict[str, list]: Parameter name -> values.
+        """
+        return {name: values.tolist() for name, values in self._columns.items()}
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Columns as a DataFrame.
+        Returns:
+            pd.DataFrame: One column per parameter.
+        """
+        return pd.DataFrame(self._columns)
@@ -0,0 +1,320 @@
+from __future__ import annotations
+
+# Standard library
+import os
+import threading
+import time
+import traceback
+
+# Third-party
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+DEFAULT_MAX_AGE = 30.0
+"""Seconds a directory listing is used before its mtime is checked again."""
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.gif')
+
+
+def _key(path: str) -> str:
+    return os.path.normcase(os.path.normpath(path))
+
+
+class IndexedEntry:
+    """
+    File or folder of an indexed directory, as returned by os.scandir.
+    """
+
+    __slots__ = ("name", "path", "is_dir", "size", "mtime")
+
+    def __init__(self, name: str, path: str, is_dir: bool, size: int, mtime: float) -> None:
+        self.name = name
+        self.path = path
+        self.is_dir = is_dir
+        self.size = size
+        self.mtime = mtime
+
+
+class _Listing:
+
+    __slots__ = ("path", "entries", "mtime", "checked")
+
+    def __init__(self, path: str, entries: list[IndexedEntry], mtime: float, checked: float) -> None:
+        self.path = path
+        self.entries = entries
+        self.mtime = mtime
+        self.checked = checked
+
+
+class _IndexEventHandler(FileSystemEventHandler):
+
+    def __init__(self, index: "DirectoryIndex") -> None:
+        self.index = index
+
+    def on_any_event(self, event) -> None:
+        for path in (event.src_path, getattr(event, "dest_path", None)):
+            if path:
+                self.index.invalidate(os.path.dirname(path))
+                if event.is_directory:
+                    self.index.invalidate(path)
+
+
+class DirectoryIndex:
+    """
+    In-memory index of a directory tree on the network share (names, folder flags, sizes, mtimes).
+
+    Every directory is listed once with os.scandir and answered from memory afterwards, so repeated
+    substring searches through test folder -> tvac -> temperature folder -> Electrical cost no SMB
+    round trips. A listing older than max_age is revalidated with a single stat of the directory and
+    only listed again if its mtime changed (entries were added, removed or renamed). With watch(),
+    watchdog events invalidate the affected listings right away.
+
+    Attributes
+    ----------
+    root : str
+        Root directory of the index.
+    max_age : float
+        Seconds a listing is trusted before its mtime is checked.
+
+    Methods
+    -------
+    entries(path):
+        Indexed entries of a directory.
+    listdir(path):
+        Names in a directory, like os.listdir.
+    find(path, keyword, folder_only=False, extension=None, case_sensitive=False):
+        Paths of the entries whose name contains a keyword.
+    first(path, keyword, folder_only=False, extension=None, case_sensitive=False):
+        First of find, or None.
+    locate(path, *keywords):
+        Folder reached by following one keyword per level.
+    files(path, extensions):
+        Paths of the files with one of the extensions.
+    snapshot(path=None, max_depth=None):
+        Index a subtree in one walk.
+    refresh():
+        Revalidate all listings against the directory mtimes.
+    invalidate(path=None):
+        Drop a listing, or all of them.
+    watch():
+        Invalidate listings from watchdog events.
+    stop():
+        Stop watching.
+    """
+
+    def __init__(self, root: str, max_age: float = DEFAULT_MAX_AGE) -> None:
+        self.root = root
+        self.max_age = max_age
+        self._listings: dict[str, _Listing] = {}
+        self._lock = threading.Lock()
+        self._observer = None
+
+    def _scan(self, path: str) -> _Listing:
+        mtime = os.stat(path).st_mtime
+        entries = []
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                    stat = entry.stat()
+                    size, entry_mtime = (0 if is_dir else stat.st_size), stat.st_mtime
+                except OSError:
+                    is_dir, size, entry_mtime = False, 0, 0.0
+                entries.append(IndexedEntry(entry.name, entry.path, is_dir, size, entry_mtime))
+        return _Listing(path, entries, mtime, time.monotonic())
+
+    def entries(self, path: str) -> list[IndexedEntry]:
+        """
+        Indexed entries of a directory, listed on first use.
+        Args:
+            path (str): Directory path.
+        Returns:
+            list[IndexedEntry]: Entries in listing order.
+        Raises:
+            OSError: If the directory cannot be listed, as os.listdir.
+        """
+        key = _key(path)
+        with self._lock:
+            listing = self._listings.get(key)
+        now = time.monotonic()
+        if listing is not None and now - listing.checked > self.max_age:
+            try:
+                unchanged = os.stat(path).st_mtime == listing.mtime
+            except OSError:
+                unchanged = False
+            if unchanged:
+                listing.checked = now
+            else:
+                listing = None
+        if listing is None:
+            listing = self._scan(path)
+            with self._lock:
+                self._listings[key] = listing
+        return listing.entries
+
+    def listdir(self, path: str) -> list[str]:
+        """
+        Names in a directory, like os.listdir.
+        """
+        return [entry.name for entry in self.entries(path)]
+
+    def find(self, path: str, keyword: str, folder_only: bool = False, extension: str | tuple[str, ...] = None,
+             case_sensitive: bool = False) -> list[str]:
+        """
+        Paths of the entries of a directory whose name contains a keyword.
+        Args:
+            path (str): Directory path, None or a missing directory gives no matches.
+            keyword (str): Substring of the name.
+            folder_only (bool): Only match folders.
+            extension (str | tuple[str, ...]): Only match files with this extension (case-insensitive).
+            case_sensitive (bool): Match the keyword case-sensitively.
+        Returns:
+            list[str]: Matching paths in listing order.
+        """
+        if not path:
+            return []
+        try:
+            entries = self.entries(path)
+        except FileNotFoundError:
+            return []
+        keyword = keyword if case_sensitive else keyword.lower()
+        if isinstance(extension, str):
+            extension = (extension,)
+        extension = tuple(e.lower() for e in extension) if extension else None
+        matches = []
+        for entry in entries:
+            if folder_only and not entry.is_dir:
+                continue
+            name = entry.name if case_sensitive else entry.name.lower()
+            if keyword not in name:
+                continue
+            if extension and not entry.name.lower().endswith(extension):
+                continue
+            matches.append(entry.path)
+        return matches
+
+    def first(self, path: str, keyword: str, folder_only: bool = False, extension: str | tuple[str, ...] = None,
+              case_sensitive: bool = False) -> str | None:
+        """
+        First path of find, or None.
+        """
+        return next(iter(self.find(path, keyword, folder_only, extension, case_sensitive)), None)
+
+    def locate(self, path: str, *keywords: str) -> str | None:
+        """
+        Folder reached from path by descending into the first folder matching each keyword in turn,
+        e.g. locate(test_directory, '25-050', 'tvac', '70', 'electrical').
+        Returns:
+            str | None: Folder path, None if a level has no match.
+        """
+        for keyword in keywords:
+            path = self.first(path, keyword, folder_only=True)
+            if path is None:
+                return None
+        return path
+
+    def files(self, path: str, extensions: tuple[str, ...] = IMAGE_EXTENSIONS) -> list[str]:
+        """
+        Paths of the files in a directory with one of the extensions (case-insensitive).
+        """
+        return self.find(path, "", extension=extensions)
+
+    def snapshot(self, path: str = None, max_depth: int = None) -> int:
+        """
+        Index a subtree in one scandir walk, so later lookups below it are answered from memory.
+        Args:
+            path (str): Top of the subtree, defaults to the root.
+            max_depth (int): Number of folder levels below path to index, None for all.
+        Returns:
+            int: Number of directories listed.
+        """
+        stack = [(path or self.root, 0)]
+        listed = 0
+        while stack:
+            folder, depth = stack.pop()
+            try:
+                entries = self.entries(folder)
+            except OSError as e:
+                print(f"Error indexing {folder}: {str(e)}")
+                continue
+            listed += 1
+            if max_depth is None or depth < max_depth:
+                stack.extend((entry.path, depth + 1) for entry in entries if entry.is_dir)
+        return listed
+
+    def refresh(self) -> int:
+        """
+        Revalidate every listing with a stat of its directory, listing changed directories again
+        and dropping removed ones.
+        Returns:
+            int: Number of directories listed again.
+        """
+        with self._lock:
+            listings = list(self._listings.items())
+        changed = 0
+        for key, listing in listings:
+            try:
+                if os.stat(listing.path).st_mtime == listing.mtime:
+                    listing.checked = time.monotonic()
+                    continue
+                fresh = self._scan(listing.path)
+            except OSError:
+                fresh = None
+            with self._lock:
+                if fresh is None:
+                    self._listings.pop(key, None)
+                else:
+                    self._listings[key] = fresh
+                    changed += 1
+        return changed
+
+    def invalidate(self, path: str = None) -> None:
+        """
+        Drop the listing of a directory (all listings if path is None); it is listed again on next use.
+        """
+        with self._lock:
+            if path is None:
+                self._listings.clear()
+            else:
+                self._listings.pop(_key(path), None)
+
+    def watch(self) -> None:
+        """
+        Start a watchdog observer on the root that invalidates the listings of changed directories.
+        """
+        if self._observer is not None:
+            return
+        try:
+            observer = Observer()
+            observer.schedule(_IndexEventHandler(self), self.root, recursive=True)
+            observer.daemon = True
+            observer.start()
+            self._observer = observer
+        except Exception as e:
+            print(f"Error watching {self.root}, falling back to mtime checks: {str(e)}")
+            traceback.print_exc()
+
+    def stop(self) -> None:
+        """
+        Stop the watchdog observer.
+        """
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+
+_indexes: dict[str, DirectoryIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def directory_index(root: str) -> DirectoryIndex:
+    """
+    Directory index of a root shared within the process, so every app and widget rebuild reuses its listings.
+    """
+    key = _key(root)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = DirectoryIndex(root)
+        return index
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+# Standard library
+import glob
+import json
+import os
+import re
+import time
+
+STATE_FILE = ".document_numbers.json"
+"""Allocator state, stored next to the documents so every user shares it."""
+
+
+class DocumentNumberAllocator:
+    """
+    Allocates consecutive document numbers (e.g. FMS-LP-BE-TRS-0022) for a directory of documents.
+
+    The last issued number per prefix is kept in a small JSON state file in the document directory,
+    so a new number costs one read and one write instead of listing and parsing the whole share.
+    The state is seeded once from the file names present; a lock file serializes concurrent
+    allocations, and numbers of documents saved by hand meanwhile are skipped.
+
+    Attributes
+    ----------
+    directory : str
+        Directory of the documents and the state file.
+    prefix : str
+        Document reference before the number.
+    digits : int
+        Number of digits of the number.
+
+    Methods
+    -------
+    peek():
+        Number the next allocation returns.
+    allocate():
+        Issue the next number.
+    reference(number):
+        Document reference of a number.
+    """
+
+    def __init__(self, directory: str, prefix: str, digits: int = 4, lock_timeout: float = 30, stale_lock: float = 120) -> None:
+        self.directory = directory
+        self.prefix = prefix
+        self.digits = digits
+        self.lock_timeout = lock_timeout
+        self.stale_lock = stale_lock
+        self.state_path = os.path.join(directory, STATE_FILE)
+        self.lock_path = self.state_path + ".lock"
+
+    def reference(self, number: int) -> str:
+        return f"{self.prefix}{str(number).zfill(self.digits)}"
+
+    def _scan(self) -> int:
+        # One-time seed: highest number in the file names of the directory
+        pattern = re.compile(re.escape(self.prefix) + r"(\d{%d})" % self.digits)
+        numbers = [int(m.group(1)) for m in map(pattern.match, os.listdir(self.directory)) if m]
+        return max(numbers, default=0)
+
+    def _read(self) -> dict[str, int]:
+        try:
+            with open(self.state_path, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _write(self, state: dict[str, int]) -> None:
+        tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=4)
+        os.replace(tmp_path, self.state_path)
+
+    def _taken(self, number: int) -> bool:
+        return bool(glob.glob(os.path.join(glob.escape(self.directory), glob.escape(self.reference(number)) + "*")))
+
+    def _acquire(self) -> None:
+        deadline = time.monotonic() + self.lock_timeout
+        while True:
+            try:
+                os.close(os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(self.lock_path) > self.stale_lock:
+                        os.remove(self.lock_path)
+                        continue
+                except OSError:
+                    continue
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Document number lock {self.lock_path} is held by another user")
+                time.sleep(0.1)
+
+    def _release(self) -> None:
+        try:
+            os.remove(self.lock_path)
+        except FileNotFoundError:
+            pass
+
+    def _next(self, state: dict[str, int]) -> int:
+        last = state.get(self.prefix)
+        number = (self._scan() if last is None else last) + 1
+        while self._taken(number):
+            number += 1
+        return number
+
+    def peek(self) -> int:
+        """
+        Number the next allocation returns, without issuing it.
+        """
+        return self._next(self._read())
+
+    def allocate(self) -> int:
+        """
+        Issue the next document number.
+        Returns:
+            int: The number, see reference for the document reference.
+        Raises:
+            TimeoutError: If another allocation holds the lock for longer than lock_timeout.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        self._acquire()
+        try:
+            state = self._read()
+            number = self._next(state)
+            state[self.prefix] = number
+            self._write(state)
+            return number
+        finally:
+            self._release()
@@ -411,4 +411,14 @@ class LPTCoefficientParameters(Enum):
     D0_T = 'd0_t'
     D1_T = 'd1_t'
     D2_T = 'd2_t'
-    D3_T = 'd3_t'
\ No newline at end of file
+    D3_T = 'd3_t'
+
+class JobStatus(Enum):
+    """
+    State of a background job, see utils.jobs.
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
@@ -0,0 +1,144 @@
+# Standard library
+import os
+import re
+import threading
+
+# Third-party
+import pandas as pd
+
+# Local imports
+from .enums import FMSFlowTestParameters
+
+FLOW_LOG_HEADERS: dict[str, FMSFlowTestParameters] = dict(zip([
+    "Logtime [s]", "Tu [-]", "Ku [-]", "Heater Proportional Gain [-]",
+    "Heater Integral Gain [1/s]", "Closed Loop Setpoint [degC]",
+    "LPT Voltage [mV]", "LPT Pressure [barA]",
+    "Bridge Voltage [mV]/Resistance [ohm]", "LPT Temperature [degC]",
+    "Duty Cycle 2 [%]", "Duty Cycle [%]", "Closed Loop Setpoint [barA]",
+    "Inlet Pressure [barG]", "PC1 Pressure [barA]",
+    "PC1 Pressure Setpoint [barA]", "PC3 Pressure [barA]",
+    "PC3 Pressure Setpoint [barA]", "Anode Pressure [barA]",
+    "Anode Temperature [degC]", "Anode Mass Flow [mg/s]",
+    "Cathode Pressure [barA]", "Cathode Temperature [degC]",
+    "Cathode Mass Flow [mg/s]", "Anode-to-Cathode Ration [-]",
+    "Vacuum Pressure [mbar]", "TV PT1000 [degC]",
+    "Anode Estimated Flow Rate [mg/s]", "Cathode Estimated Flow Rate [mg/s]",
+    "AC Gas Select [Kr=17, Xe=18]", "Filtered LPT Temperature [degC]",
+    "HPIV Status [Open [1]/Closed [0]]", "TV Power [W]",
+    "TV Voltage [Vrms]", "TV Current [Irms]", "Total Mass Flow [mg/s]",
+    "Average TV Power [W]"
+], FMSFlowTestParameters))
+"""Header names written by the flow test bench, mapped to the flow test parameters (same order)."""
+
+
+class FlowLogFormat:
+    """
+    Layout of an FMS flow test log, detected once from the first lines of the file.
+
+    Attributes
+    ----------
+    sep : str
+        Field separator.
+    header_row : int
+        Index of the header line.
+    positions : dict[str, int]
+        Flow test parameter -> field position in the data lines.
+    units : dict[str, str]
+        Flow test parameter -> unit, taken from the header names.
+
+    Methods
+    -------
+    read(flow_test_file, parameters):
+        Parse the given parameters of the log into a DataFrame.
+    """
+
+    def __init__(self, sep: str, header_row: int, positions: dict[str, int], units: dict[str, str]) -> None:
+        self.sep = sep
+        self.header_row = header_row
+        self.positions = positions
+        self.units = units
+
+    def read(self, flow_test_file: str, parameters: list[str]) -> pd.DataFrame:
+        """
+        Parse the log with the C engine, keeping only the requested parameters.
+        The first data line after the header is skipped, as it does not contain a valid sample.
+        Args:
+            flow_test_file (str): Path to the flow log.
+            parameters (list[str]): Flow test parameter names to read.
+        Returns:
+            pd.DataFrame: Numeric columns named after the parameters, in the requested order.
+        """
+        positions = {self.positions[param]: param for param in parameters}
+        df = pd.read_csv(
+            flow_test_file,
+            sep=self.sep,
+            engine='c',
+            header=None,
+            skiprows=self.header_row + 2,
+            usecols=sorted(positions),
+            on_bad_lines='skip'
+        )
+        df.columns = [positions[pos] for pos in sorted(positions)]
+        df = df[parameters]
+        return df.apply(pd.to_numeric, errors='coerce')
+
+
+def _clean_header(name: str) -> str:
+    name = re.sub(r'[\t\n\r\f\v]', '', name.replace('﻿', ''))
+    return name.strip().rstrip(',')
+
+
+def _detect(flow_test_file: str, sample_lines: int = 30) -> FlowLogFormat | None:
+    with open(flow_test_file, 'r', errors='replace') as f:
+        lines = [line for _, line in zip(range(sample_lines), f)]
+
+    best = None
+    for idx, line in enumerate(lines[:-1]):
+        for sep in ('\t', ';', ','):
+            names = [_clean_header(n) for n in line.rstrip('\r\n').split(sep)]
+            matches = sum(name in FLOW_LOG_HEADERS for name in names)
+            if matches and (best is None or matches > best[0]):
+                best = (matches, idx, sep, names)
+    if best is None:
+        return None
+
+    _, header_row, sep, names = best
+    # An empty header name means the data lines carry one extra leading field
+    offset = 1 if any(not name for name in names) else 0
+    first_data = lines[header_row + 1].rstrip('\r\n').split(sep)
+
+    positions, units = {}, {}
+    for idx, name in enumerate(names):
+        if name not in FLOW_LOG_HEADERS or idx + offset >= len(first_data):
+            continue
+        param = FLOW_LOG_HEADERS[name].value
+        positions[param] = idx + offset
+        match = re.search(r'\[(?P<unit>[^\]]+)\]', name)
+        if match:
+            units[param] = match.group('unit').strip()
+    return FlowLogFormat(sep=sep, header_row=header_row, positions=positions, units=units)
+
+
+_format_cache: dict[tuple[str, int, int], FlowLogFormat | None] = {}
+_format_lock = threading.Lock()
+
+
+def detect_flow_log_format(flow_test_file: str) -> FlowLogFormat | None:
+    """
+    Detect the separator, header line and column positions of a flow log from its first lines.
+    The result is cached per file (path, modification time and size), so the listener and the
+    backfill never inspect the same file twice.
+    Args:
+        flow_test_file (str): Path to the flow log.
+    Returns:
+        FlowLogFormat | None: Detected layout, None if no flow test header was found.
+    """
+    stat = os.stat(flow_test_file)
+    key = (os.path.abspath(flow_test_file), stat.st_mtime_ns, stat.st_size)
+    with _format_lock:
+        if key in _format_cache:
+            return _format_cache[key]
+    fmt = _detect(flow_test_file)
+    with _format_lock:
+        _format_cache[key] = fmt
+    return fmt
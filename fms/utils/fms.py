@@ -1,4 +1,5 @@
 # Standard library imports
+import copy
 import os
 import re
 import sys
@@ -9,12 +10,10 @@ from threading import Timer
 from enum import Enum
 
 # Third-party imports
-import fitz
 import ipywidgets as widgets
 import matplotlib.pyplot as plt
 from matplotlib.ticker import FormatStrFormatter
 import numpy as np
-import openpyxl
 import pandas as pd
 from scipy.interpolate import interp1d
 from sklearn.linear_model import LinearRegression
@@ -57,6 +56,16 @@ from .general_utils import (
     load_from_json, 
     delete_json_file, 
 )
+from .instrumentation import profiler
+from .tvac_reader import TVACReader
+from .flow_log import FLOW_LOG_HEADERS, detect_flow_log_format
+from .columnar import ColumnarResults
+from .workbook_cache import load_sheet
+from .report_text import ReportText
+from .timeseries import decimate, axis_buckets
+from .specs import fms_limit_specifications
+from .limit_rules import compile_limits
+from .limit_reevaluation import reevaluate_limits
 
 # Optional: modify sys.path for script execution (if running as main)
 if __name__ == "__main__":
@@ -163,7 +172,8 @@ class FMSListener(FileSystemEventHandler):
         elif filename.endswith('.pdf'):
             try:
                 self.fms_data = FMSData(pdf_file=event.src_path)
-                self.fms_data.extract_FMS_test_results()
+                with profiler.stage("fms_listener/parse"):
+                    self.fms_data.extract_FMS_test_results()
                 self.processed = True
             except Exception as e:
                 print(f"Error processing PDF file {event.src_path}: {e}")
@@ -179,6 +189,7 @@ class FMSData:
     Attributes:
         General files and test info:
             pdf_file (str): Path to the PDF with FMS test data.
+            report_sections (list): Section markers of the acceptance report handled by the parsers.
             flow_test_file (str): Path to the flow test XLS file.
             csv_files (list): CSV files for TVAC cycle data.
             status_file (str): Status Excel template.
@@ -202,6 +213,8 @@ class FMSData:
         TVAC and temperature:
             temperature_type (str): Type of temperature measurement used.
             tvac_map (dict): Mapping of TVAC parameters.
+            tvac_time_format (str): Timestamp format of the TVAC logger exports.
+            tvac_data (ColumnarResults): Extracted TVAC columns (parameter name -> array).
 
         FMS parameters and limits:
             fms_main_parameters (list): Main FMS parameter names (FMSMainParameters enum).
@@ -223,6 +236,7 @@ class FMSData:
 
         Flow test helpers:
             preprocess_flow_dataframe(trial, df)
+            read_flow_log_by_separator(keep_cols, separation, trial)
             extract_slope_data(separation, trial)
             group_by_lpt_pressures()
             get_flow_power_slope(flows, powers, num_points)
@@ -260,6 +274,8 @@ class FMSData:
 
         self.flow_test_file = flow_test_file
         self.pdf_file = pdf_file
+        self.report_sections = ['3. test item definition', '6. test results', 'bonding, isolation and capacitance', 'valve performance',
+                                'pressure proof pressure', 'tvac cycle', 'power budget']
         self.test_type = test_type
         self.lpt_pressures = lpt_pressures
         self.lpt_set_points = lpt_set_points
@@ -268,7 +284,7 @@ class FMSData:
         self.min_flow_rates = min_flow_rates
         self.max_flow_rates = max_flow_rates
         self.fms_main_test_results = {}
-        self.functional_test_results = {}
+        self.functional_test_results = ColumnarResults()
         self.temperature = None
         self.status_file = status_file
         self.range12_low = range12_low
@@ -304,118 +320,11 @@ class FMSData:
             '114 <Anode outlet> (C)': FMSTvacParameters.ANODE_OUTLET_TEMP.value,
             '115 <Cathode outlet> (C)': FMSTvacParameters.CATHODE_OUTLET_TEMP.value,
         }
+        self.tvac_time_format = "%m/%d/%Y %H:%M:%S:%f"
 
         self.fms_main_parameters = [param.value for param in FMSMainParameters]
 
-        self.fms_limits = {
-            'mass': {'min': 0, 'max': 500},
-            'power_budget_cold': {'min': None, 'max': None},
-            'power_budget_room': {'min': None, 'max': None},
-            'power_budget_hot': {'min': None, 'max': None},
-            'room_hpiv_dropout_voltage': {'min': 0, 'max': 4},
-            'room_hpiv_pullin_voltage': {'min': 0, 'max': 18},
-            'room_hpiv_closing_response': {'min': 0, 'max': 20},
-            'room_hpiv_hold_power': {'min': None, 'max': None},
-            'room_hpiv_opening_response': {'min': 0, 'max': 20},
-            'room_hpiv_opening_power': {'min': None, 'max': None},
-            'room_hpiv_inductance': {'min': None, 'max': None},
-            'room_tv_inductance': {'min': None, 'max': None},
-            'room_hpiv_resistance': {'min': None, 'max': None},
-            'room_tv_pt_resistance': {'min': None, 'max': None},
-            'room_tv_resistance': {'min': 150-0.1*150, 'max': 150+0.1*150, 'nominal': 150, 'tolerance': 10},
-            'room_lpt_resistance': {'min': None, 'max': None},
-            'room_tv_high_leak': {'min': 0, 'max': 1e-5},
-            'room_tv_low_leak': {'min': 0, 'max': 1e-5},
-            'room_tv_low_leak_open': {'min': None, 'max': None},
-            'room_hpiv_high_leak': {'min': 0, 'max': 1e-5},
-            'room_hpiv_low_leak': {'min': 0, 'max': 1e-5},
-            'cold_hpiv_dropout_voltage': {'min': 0, 'max': 4},
-            'cold_hpiv_pullin_voltage': {'min': 0, 'max': 18},
-            'cold_hpiv_closing_response': {'min': 0, 'max': 20},
-            'cold_hpiv_hold_power': {'min': None, 'max': None},
-            'cold_hpiv_opening_response': {'min': 0, 'max': 20},
-            'cold_hpiv_opening_power': {'min': None, 'max': None},
-            'cold_hpiv_inductance': {'min': None, 'max': None},
-            'cold_tv_inductance': {'min': None, 'max': None},
-            'cold_hpiv_resistance': {'min': None, 'max': None},
-            'cold_tv_pt_resistance': {'min': None, 'max': None},
-            'cold_tv_resistance': {'min': 150-0.1*150, 'max': 150+0.1*150, 'nominal': 150, 'tolerance': 10},
-            'cold_lpt_resistance': {'min': None, 'max': None},
-            'cold_tv_high_leak': {'min': 0, 'max': 1e-5},
-            'cold_tv_low_leak': {'min': 0, 'max': 1e-5},
-            'cold_tv_low_leak_open': {'min': None, 'max': None},
-            'cold_hpiv_high_leak': {'min': 0, 'max': 1e-5},
-            'cold_hpiv_low_leak': {'min': 0, 'max': 1e-5},
-            'hot_hpiv_dropout_voltage': {'min': 0, 'max': 4},
-            'hot_hpiv_pullin_voltage': {'min': 0, 'max': 18},
-            'hot_hpiv_closing_response': {'min': 0, 'max': 20},
-            'hot_hpiv_hold_power': {'min': None, 'max': None},
-            'hot_hpiv_opening_response': {'min': 0, 'max': 20},
-            'hot_hpiv_opening_power': {'min': None, 'max': None},
-            'hot_hpiv_inductance': {'min': None, 'max': None},
-            'hot_tv_inductance': {'min': None, 'max': None},
-            'hot_hpiv_resistance': {'min': None, 'max': None},
-            'hot_tvpt_resistance': {'min': None, 'max': None},
-            'hot_tv_resistance': {'min': 150-0.1*150, 'max': 150+0.1*150, 'nominal': 150, 'tolerance': 10},
-            'hot_lpt_resistance': {'min': None, 'max': None},
-            'hot_tv_pt_resistance': {'min': None, 'max': None},
-            'hot_tv_high_leak': {'min': 0, 'max': 1e-5},
-            'hot_tv_low_leak': {'min': 0, 'max': 1e-5},
-            'hot_tv_low_leak_open': {'min': None, 'max': None},
-            'hot_hpiv_high_leak': {'min': 0, 'max': 1e-5},
-            'hot_hpiv_low_leak': {'min': 0, 'max': 1e-5},
-            'tv_high_leak': {'min': 0, 'max': 1e-5},
-            'tv_low_leak': {'min': 0, 'max': 1e-5},
-            'hpiv_high_leak': {'min': 0, 'max': 1e-5},
-            'hpiv_low_leak': {'min': 0, 'max': 1e-5},
-            'inlet_location': {'min': [-23.2, -88.45, 11.6], 'max': [-22.4, -87.75, 12.0]},
-            'outlet_anode': {'min': [47.65, 24.6, 11.4], 'max': [49.35, 26.4, 12.2]},
-            'outlet_cathode': {'min': [25.55, 24.6, 11.4], 'max': [27.25, 26.4, 12.2]},
-            'fms_envelope': {'min': [117.0, 141.4, 25.3], 'max': [119.0, 143.4, 27.3]},
-            'tv_housing_bonding': {'min': 0, 'max': 5},
-            'bonding_tv_housing': {'min': 0, 'max': 5},
-            'tv_housing_hpiv': {'min': 0, 'max': 5},
-            'hpiv_housing_tv': {'min': 0, 'max': 5},
-            'lpt_housing_bonding': {'min': 0, 'max': 5},
-            'bonding_lpt_housing': {'min': 0, 'max': 5},
-            'j01_bonding': {'min': 0, 'max': 30},
-            'bonding_j01': {'min': 0, 'max': 30},
-            'j02_bonding': {'min': 0, 'max': 30},
-            'bonding_j02': {'min': 0, 'max': 30},
-            'j01_pin_bonding': {'min': 0, 'max': 30},
-            'bonding_j01_pin': {'min': 0, 'max': 30},
-            'j02_pin_bonding': {'min': 0, 'max': 30},
-            'bonding_j02_pin': {'min': 0, 'max': 30},
-            'lpt_psig': {'min': 10e6, 'max': None},
-            'lpt_psig_rtn': {'min': 10e6, 'max': None},
-            'iso_lpt_tsig': {'min': 10e6, 'max': None},
-            'iso_lpt_tsig_rtn': {'min': 10e6, 'max': None},
-            'lpt_power': {'min': 10e6, 'max': None},
-            'lpt_power_rtn': {'min': 10e6, 'max': None},
-            'iso_pt_sgn': {'min': 10e6, 'max': None},
-            'iso_pt_sgn_rtn': {'min': 10e6, 'max': None},
-            'tv_power': {'min': 10e6, 'max': None},
-            'tv_power_rtn': {'min': 10e6, 'max': None},
-            'hpiv_power': {'min': 10e6, 'max': None},
-            'hpiv_power_rtn': {'min': 10e6, 'max': None},
-            'cap_lpt_tsig': {'min': 0, 'max': 50},
-            'cap_lpt_tsig_rtn': {'min': 0, 'max': 50},
-            'cap_pt_sgn': {'min': 0, 'max': 50},
-            'cap_pt_sgn_rtn': {'min': 0, 'max': 50},
-            'lpt_resistance': {'min': 3442-0.1*3442, 'max': 3442+0.1*3442, 'nominal': 3442, 'tolerance': 10},
-            'tv_resistance': {'min': 150-0.1*150, 'max': 150+0.1*150, 'nominal': 150, 'tolerance': 10},
-            'tv_pt_resistance': {'min': None, 'max': None},
-            'hpiv_resistance': {'min': 43.3-0.1*43.3, 'max': 43.3+0.1*43.3, 'nominal': 43.3, 'tolerance': 10},
-            'hpiv_opening_power': {'min': None, 'max': None},
-            'hpiv_opening_response': {'min': 0, 'max': 20},
-            'hpiv_hold_power': {'min': None, 'max': None},
-            'hpiv_closing_response': {'min': 0, 'max': 20},
-            'hpiv_pullin_voltage': {'min': 0, 'max': 18},
-            'hpiv_dropout_voltage': {'min': 0, 'max': 4},
-            'low_pressure_ext_leak': {'min': 0, 'max': 1e-6},
-            'high_pressure_ext_leak_low': {'min': 0, 'max': 1e-6},
-            'high_pressure_ext_leak_high': {'min': 0, 'max': 1e-6},
-        }
+        self.fms_limits = copy.deepcopy(fms_limit_specifications)
 
     def get_tvac_parameter(self, base_param: str, tvac_label: str) -> str:
         """Helper function to get the appropriate parameter name based on TVAC label"""
@@ -511,47 +420,37 @@ class FMSData:
     def extract_tvac_from_csv(self) -> None:
         """
         Extract TVAC cycle data from CSV files and store in functional_test_results.
-        Creates a Pandas DataFrame from the CSV files and processes the data.
+        The CSV layout is detected once per file by the TVACReader, which parses the
+        thermocouple channels into column arrays. functional_test_results holds the
+        columns (ColumnarResults), concatenated over all CSV files.
         Time is normalized so the earliest timestamp across all CSVs starts at 0 seconds.
         """
-        self.tvac_df = pd.DataFrame()
+        time_col = FMSTvacParameters.TIME.value
+        parts: list[dict[str, np.ndarray]] = []
         start_times = []
 
         for csv_file in self.csv_files:
-            df = pd.read_csv(
-                csv_file,
-                sep=None,
-                engine='python',
-                encoding='utf-16',
-                on_bad_lines='skip'
-            )
-
-            if any('name:' in str(col).lower() for col in df.columns):
-                df = pd.read_csv(
-                    csv_file,
-                    sep=None,
-                    engine='python',
-                    encoding='utf-16',
-                    on_bad_lines='skip',
-                    skiprows=18
-                )
-
-            df.ffill(inplace=True)
-            df.drop('Scan', axis=1, inplace=True)
-
-            col_map = {col: self.tvac_map[col] for col in df.columns if col in self.tvac_map}
-            df = df[list(col_map.keys())]
-            df.rename(columns=col_map, inplace=True)
+            reader = TVACReader(csv_file)
+            columns = reader.read_columns(usecols=list(self.tvac_map), time_column='Time', time_format=self.tvac_time_format)
+            columns = {self.tvac_map[col]: values for col, values in columns.items()}
+            if len(columns.get(time_col, [])) == 0:
+                print(f"No TVAC data found in {csv_file}")
+                continue
 
-            time_col = FMSTvacParameters.TIME.value
-            df[time_col] = pd.to_datetime(df[time_col].str.replace(r'(?<=\d{2}:\d{2}:\d{2}):', '.', regex=True))
+            start_times.append(columns[time_col][0])
+            parts.append(columns)
 
-            start_times.append(df[time_col].iloc[0])
-            self.tvac_df = pd.concat([self.tvac_df, df], ignore_index=True)
+        if not parts:
+            self.tvac_data = ColumnarResults()
+            self.functional_test_results = self.tvac_data
+            return
 
         # Normalize time relative to the earliest timestamp across all CSVs
         t0 = min(start_times)
-        self.tvac_df[time_col] = (self.tvac_df[time_col] - t0).dt.total_seconds()
+        keys = [key for key in parts[0] if all(key in part for part in parts)]
+        columns = {key: np.concatenate([part[key] for part in parts]) for key in keys}
+        columns[time_col] = (columns[time_col] - t0) / np.timedelta64(1, 's')
+        self.tvac_data = ColumnarResults(columns)
 
         # Determine test_id based on last CSV file name
         base_name = os.path.basename(self.csv_files[-1])
@@ -565,15 +464,16 @@ class FMSData:
         else:
             self.test_id = base_name
 
-        self.functional_test_results = self.tvac_df.to_dict(orient='records')
-        # print(self.tvac_df.head())
+        self.functional_test_results = self.tvac_data
 
     def plot_tvac_cycle(self, serial: str = '25-050') -> None:
         """
-        Plot TVAC cycle data from the extracted DataFrame.
+        Plot TVAC cycle data from the extracted columns.
         """
-        plt.plot(self.tvac_df[FMSTvacParameters.TIME.value], self.tvac_df[FMSTvacParameters.TRP1.value], label='TRP1', color='blue')
-        plt.plot(self.tvac_df[FMSTvacParameters.TIME.value], self.tvac_df[FMSTvacParameters.TRP2.value], label='TRP2', color='orange')
+        time, trp1, trp2 = decimate(self.tvac_data[FMSTvacParameters.TIME.value], self.tvac_data[FMSTvacParameters.TRP1.value],
+                                    self.tvac_data[FMSTvacParameters.TRP2.value], buckets=axis_buckets(plt.gca()))
+        plt.plot(time, trp1, label='TRP1', color='blue')
+        plt.plot(time, trp2, label='TRP2', color='orange')
 
         plt.xlabel('Time [hrs]')
         plt.ylabel('Temperature [degC]')
@@ -591,25 +491,7 @@ class FMSData:
         Returns:
             pd.DataFrame: Preprocessed DataFrame.
         """
-        expected_columns = [
-            "Logtime [s]", "Tu [-]", "Ku [-]", "Heater Proportional Gain [-]",
-            "Heater Integral Gain [1/s]", "Closed Loop Setpoint [degC]",
-            "LPT Voltage [mV]", "LPT Pressure [barA]",
-            "Bridge Voltage [mV]/Resistance [ohm]", "LPT Temperature [degC]",
-            "Duty Cycle 2 [%]", "Duty Cycle [%]", "Closed Loop Setpoint [barA]",
-            "Inlet Pressure [barG]", "PC1 Pressure [barA]",
-            "PC1 Pressure Setpoint [barA]", "PC3 Pressure [barA]",
-            "PC3 Pressure Setpoint [barA]", "Anode Pressure [barA]",
-            "Anode Temperature [degC]", "Anode Mass Flow [mg/s]",
-            "Cathode Pressure [barA]", "Cathode Temperature [degC]",
-            "Cathode Mass Flow [mg/s]", "Anode-to-Cathode Ration [-]",
-            "Vacuum Pressure [mbar]", "TV PT1000 [degC]",
-            "Anode Estimated Flow Rate [mg/s]", "Cathode Estimated Flow Rate [mg/s]",
-            "AC Gas Select [Kr=17, Xe=18]", "Filtered LPT Temperature [degC]",
-            "HPIV Status [Open [1]/Closed [0]]", "TV Power [W]",
-            "TV Voltage [Vrms]", "TV Current [Irms]", "Total Mass Flow [mg/s]",
-            "Average TV Power [W]"
-        ]
+        expected_columns = list(FLOW_LOG_HEADERS)
         first_col_name = df.columns[0]
         second_col_name = df.columns[1]
         if any('unnamed' in i.lower() for i in df.columns):
@@ -629,53 +511,64 @@ class FMSData:
         df = df[[col for col in df.columns if col in expected_columns]]
         return df
 
+    def read_flow_log_by_separator(self, keep_cols: list[str], separation: str = '\t', trial: int = 0) -> pd.DataFrame:
+        """
+        Fallback reader for flow logs whose layout could not be detected,
+        tries the given separator, then the python engine sniffer and finally a comma.
+        Args:
+            keep_cols (list[str]): Flow test parameters that must be present.
+            separation (str): First separator to try.
+            trial (int): Number of separators already tried.
+        Returns:
+            pd.DataFrame: DataFrame with the keep_cols columns.
+        """
+        separators = [separation, None, ',']
+        for trial in range(trial, len(separators)):
+            separation = separators[trial]
+            df = pd.read_csv(self.flow_test_file, sep=separation, skiprows=1) if not separation == None else pd.read_csv(self.flow_test_file, sep = None, engine = 'python', skiprows=1)
+            df = self.preprocess_flow_dataframe(trial, df)
+            df.drop(df.index[0], inplace=True)
+            df.ffill(inplace=True)
+            df.dropna(axis=1, how='all', inplace=True)
+            param_map = {}
+            self.units = {}
+            df.columns = df.columns.str.strip().str.rstrip(',')
+            for idx, col in enumerate(list(df.columns)):
+                match = re.search(r'(?P<param>.*?)\s*\[(?P<unit>[^\]]+)\]', col)
+                if match:
+                    unit = match.group('unit').strip()
+                    self.units[self.test_parameter_names[idx]] = unit
+                    param_map[col] = self.test_parameter_names[idx]
+
+            df.rename(columns=param_map, inplace=True)
+            if all(col in df.columns for col in keep_cols):
+                return df[keep_cols]
+            print("Not all columns found, trying another separator.")
+        raise ValueError("Could not parse the flow test file with expected columns.")
+
     def extract_slope_data(self, separation: str = '\t', trial: int = 0) -> None:
         """
         Extracts the relevant test data from FMS flow tests.
-            Creates a Pandas DataFrame from the raw xls file and processes the data,
-            converts the dataframe to functional_test_results attribute.
+            The layout of the raw xls file is detected once (and cached per file), only the
+            needed columns are parsed, the data is processed and converted to the
+            functional_test_results attribute.
         Args:
-            separation (str): Separator used in the CSV file.
+            separation (str): Separator tried first if the layout could not be detected.
             trial (int): Trial number for parsing attempts.
         """
-        df = pd.read_csv(self.flow_test_file, sep=separation, skiprows=1) if not separation == None else pd.read_csv(self.flow_test_file, sep = None, engine = 'python', skiprows=1)
         self.test_id = os.path.basename(self.flow_test_file).split('_LP_')[0]
-        df = self.preprocess_flow_dataframe(trial, df)
-        df.drop(df.index[0], inplace=True)
-        df.ffill(inplace=True)
-        df.dropna(axis=1, how='all', inplace=True)  
-        # first_col_name = df.columns[0]
-        # second_col_name = df.columns[1]
-        # if any('unnamed' in i.lower() for i in df.columns):
-        #     df.drop(columns=[first_col_name], inplace=True)
-        #     df.rename(columns={second_col_name: first_col_name}, inplace=True)
-        param_map = {}
-        self.units = {}
-        df.columns = df.columns.str.strip().str.rstrip(',')
-        for idx, col in enumerate(list(df.columns)):
-            match = re.search(r'(?P<param>.*?)\s*\[(?P<unit>[^\]]+)\]', col)
-            if match:
-                unit = match.group('unit').strip()
-                self.units[self.test_parameter_names[idx]] = unit
-                param_map[col] = self.test_parameter_names[idx]
-
-        df.rename(columns=param_map, inplace=True)
         fms = FMSFlowTestParameters
         keep_cols = [fms.LOGTIME.value, fms.AVG_TV_POWER.value, fms.TOTAL_FLOW.value, fms.TV_CURRENT.value, fms.TV_VOLTAGE.value, fms.TV_POWER.value,
                      fms.CLOSED_LOOP_PRESSURE.value, fms.TV_PT1000.value, fms.CATHODE_FLOW.value, fms.ANODE_FLOW.value, fms.INLET_PRESSURE.value, fms.PC3_SETPOINT.value,
                      fms.CATHODE_PRESSURE.value, fms.ANODE_PRESSURE.value, fms.LPT_PRESSURE.value, fms.LPT_VOLTAGE.value, fms.LPT_TEMP.value]
 
-        if all(col in df.columns for col in keep_cols):
-            df = df[keep_cols]
+        flow_format = detect_flow_log_format(self.flow_test_file)
+        if flow_format and all(col in flow_format.positions for col in keep_cols):
+            df = flow_format.read(self.flow_test_file, keep_cols)
+            df.ffill(inplace=True)
+            self.units = dict(flow_format.units)
         else:
-            print("Not all columns found, trying another separator.")
-            trials = [None, ',']
-            trial = trial + 1
-            if trial >= len(trials):
-                raise ValueError("Could not parse the flow test file with expected columns.")
-            separation = trials[trial-1]
-            self.extract_slope_data(separation=separation, trial=trial+1)
-            return
+            df = self.read_flow_log_by_separator(keep_cols, separation, trial)
 
         for col in df.columns:
             if col != FMSFlowTestParameters.LOGTIME.value:
@@ -694,7 +587,7 @@ class FMSData:
 
         df[fms.LOGTIME.value] = df[fms.LOGTIME.value] - df[fms.LOGTIME.value].iloc[0]
 
-        self.functional_test_results = df.to_dict(orient='records')
+        self.functional_test_results = ColumnarResults.from_dataframe(df, self.units)
         
         self.outlet_pressure = float(df[fms.PC3_SETPOINT.value].iloc[0]) * 1000
         mean_inlet_pressure = df[fms.INLET_PRESSURE.value].mean()
@@ -718,17 +611,20 @@ class FMSData:
                 self.tv_slope = np.mean(np.diff(self.tv_powers)/ np.diff(self.tv_times))*60
                 flows = df[FMSFlowTestParameters.TOTAL_FLOW.value].to_numpy()
                 powers = df[FMSFlowTestParameters.AVG_TV_POWER.value].to_numpy()
-                self.flow_power_slope = self.get_flow_power_slope(flows, powers)
+                with profiler.stage("analysis"):
+                    self.flow_power_slope = self.get_flow_power_slope(flows, powers)
                 self.slope_correction = self.inlet_pressure / mean_inlet_pressure
         else:
             self.tv_slope = None
 
         self.df = df
         if self.test_type == 'fr_characteristics':
-            self.group_by_lpt_pressures()
-            self.functional_test_results = self.df.to_dict(orient='records')
+            with profiler.stage("analysis"):
+                self.group_by_lpt_pressures()
+            self.functional_test_results = ColumnarResults.from_dataframe(self.df, self.units)
         elif self.test_type.endswith("closed_loop"):
-            self.response_times, self.response_regions = self.get_response_times(df = self.df)
+            with profiler.stage("analysis"):
+                self.response_times, self.response_regions = self.get_response_times(df = self.df)
 
     def get_response_times(self, df: pd.DataFrame) -> dict[str, list]:
         response_times = {}
@@ -1119,11 +1015,16 @@ class FMSData:
             serial (str): FMS serial number for the plot title.
             gas_type (str): Gas type used in the test for labeling.
         """
+        fms = FMSFlowTestParameters
         plt.figure(figsize=(9, 7))
-        plt.plot(self.df[FMSFlowTestParameters.LOGTIME.value], self.df[FMSFlowTestParameters.ANODE_FLOW.value], label=f'Anode Flow [{self.units[FMSFlowTestParameters.ANODE_FLOW.value]}]')
-        plt.plot(self.df[FMSFlowTestParameters.LOGTIME.value], self.df[FMSFlowTestParameters.CATHODE_FLOW.value], label=f'Cathode Flow [{self.units[FMSFlowTestParameters.CATHODE_FLOW.value]}]')
-        plt.plot(self.df[FMSFlowTestParameters.LOGTIME.value], self.df[FMSFlowTestParameters.CLOSED_LOOP_PRESSURE.value], label=f'Closed Loop Setpoint [{self.units[FMSFlowTestParameters.CLOSED_LOOP_PRESSURE.value]}]')
-        plt.plot(self.df[FMSFlowTestParameters.LOGTIME.value], self.df[FMSFlowTestParameters.LPT_PRESSURE.value], label=f'LPT Pressure [{self.units[FMSFlowTestParameters.LPT_PRESSURE.value]}]')
+        logtime, anode_flow, cathode_flow, closed_loop_pressure, lpt_pressure = decimate(
+            self.df[fms.LOGTIME.value], self.df[fms.ANODE_FLOW.value], self.df[fms.CATHODE_FLOW.value],
+            self.df[fms.CLOSED_LOOP_PRESSURE.value], self.df[fms.LPT_PRESSURE.value], buckets=axis_buckets(plt.gca())
+        )
+        plt.plot(logtime, anode_flow, label=f'Anode Flow [{self.units[FMSFlowTestParameters.ANODE_FLOW.value]}]')
+        plt.plot(logtime, cathode_flow, label=f'Cathode Flow [{self.units[FMSFlowTestParameters.CATHODE_FLOW.value]}]')
+        plt.plot(logtime, closed_loop_pressure, label=f'Closed Loop Setpoint [{self.units[FMSFlowTestParameters.CLOSED_LOOP_PRESSURE.value]}]')
+        plt.plot(logtime, lpt_pressure, label=f'LPT Pressure [{self.units[FMSFlowTestParameters.LPT_PRESSURE.value]}]')
         
         title = f'LP FMS - SN {serial}, TRP at {self.temperature} [degC], MLI, {self.inlet_pressure} [barA] Inlet Pressure, {self.test_type.replace("_", " ").title()}, Pvac <1E-1 [mbarA], {self.outlet_pressure} [mbar] Outlet Pressure'
         plt.xlabel('Time [s]')
@@ -1143,17 +1044,19 @@ class FMSData:
             title (str): Optional title for the plot.
         """
         fig, ax1 = plt.subplots()
+        logtime, tv_power, pt1000 = decimate(self.df[FMSFlowTestParameters.LOGTIME.value], self.df[FMSFlowTestParameters.AVG_TV_POWER.value],
+                                             self.df[FMSFlowTestParameters.TV_PT1000.value], buckets=axis_buckets(ax1))
 
         color1 = 'tab:blue'
         ax1.set_xlabel('Time [s]')
         ax1.set_ylabel(f'TV Power [{self.units[FMSFlowTestParameters.TV_POWER.value]}]', color=color1)
-        ax1.plot(self.df[FMSFlowTestParameters.LOGTIME.value], self.df[FMSFlowTestParameters.AVG_TV_POWER.value], color=color1, label='TV Power')
+        ax1.plot(logtime, tv_power, color=color1, label='TV Power')
         ax1.tick_params(axis='y', labelcolor=color1)
 
         ax2 = ax1.twinx()
         color2 = 'tab:red'
         ax2.set_ylabel(f'TV PT1000 Temperature [{self.units[FMSFlowTestParameters.TV_PT1000.value]}]', color=color2)
-        ax2.plot(self.df[FMSFlowTestParameters.LOGTIME.value], self.df[FMSFlowTestParameters.TV_PT1000.value], color=color2, label='TV PT1000 Temperature')
+        ax2.plot(logtime, pt1000, color=color2, label='TV PT1000 Temperature')
         ax2.tick_params(axis='y', labelcolor=color2)
 
         if title:
@@ -1171,20 +1074,22 @@ class FMSData:
         """
         fms = FMSFlowTestParameters
         fig, ax1 = plt.subplots(figsize=(9, 7))
+        logtime, pt1000, total_flow, lpt_pressure = decimate(self.df[fms.LOGTIME.value], self.df[fms.TV_PT1000.value], self.df[fms.TOTAL_FLOW.value],
+                                                             self.df[fms.LPT_PRESSURE.value], buckets=axis_buckets(ax1))
         color1 = 'tab:blue'
         color2 = 'tab:orange'
         color3 = 'tab:green'
 
         ax1.set_xlabel('Time [s]')
         ax1.set_ylabel(f'TV Temperature [{self.units[fms.TV_PT1000.value]}]')
-        l1, = ax1.plot(self.df[fms.LOGTIME.value], self.df[fms.TV_PT1000.value], label='TV Temperature')
+        l1, = ax1.plot(logtime, pt1000, label='TV Temperature')
 
         ax2 = ax1.twinx()
         ax2.set_ylabel(
             f'Total Flow [{self.units[fms.TOTAL_FLOW.value]} {gas_type}] / LPT Pressure [{self.units[fms.LPT_PRESSURE.value]}]'
         )
-        l2, = ax2.plot(self.df[fms.LOGTIME.value], self.df[fms.TOTAL_FLOW.value], label='Total Flow', color=color2)
-        l3, = ax2.plot(self.df[fms.LOGTIME.value], self.df[fms.LPT_PRESSURE.value], label='LPT Pressure', color=color3)
+        l2, = ax2.plot(logtime, total_flow, label='Total Flow', color=color2)
+        l3, = ax2.plot(logtime, lpt_pressure, label='LPT Pressure', color=color3)
 
         title = (
             f'LP FMS - SN {serial}, TRP at {self.temperature} [degC], MLI, '
@@ -1444,21 +1349,27 @@ class FMSData:
     def extract_FMS_test_results(self) -> None:
         """
         Extract FMS test results from the provided PDF file and status Excel file.
+        The page texts come from the (content hash) cache of the report, only pages holding
+        one of the report_sections markers are parsed.
         Populates the component_serials dictionary and other relevant attributes.
         Instantiates the fms_main_test_results attribute with the extracted data.
         """
         
-        pdf_document = fitz.open(self.pdf_file)
-        page_number = 0
+        report = ReportText(self.pdf_file).load()
+        pages = report.pages
+        n_pages = len(pages)
+        section_index = report.section_index(self.report_sections)
+        candidates = iter(sorted({0}.union(*section_index.values())))
+        page_number = next(candidates, n_pages)
         TVAC_count = 0
         tvac_label = ['hot', 'cold', 'room']
 
-        while page_number < len(pdf_document):
-            page = pdf_document[page_number]
-            page_text = page.get_text()
+        while page_number < n_pages:
+            page_text = pages[page_number]
+            page_lower = report.lower[page_number]
 
             if page_number == 0:
-                local_text = page_text.lower().split('\n')
+                local_text = page_lower.split('\n')
                 project_ref = None
                 for item in local_text:
                     match = re.search(r'\b\d{5}\b', item)
@@ -1467,7 +1378,7 @@ class FMSData:
                         break
                 self.project_ref = project_ref
                 
-            if '3. test item definition' in page_text.lower():
+            if '3. test item definition' in page_lower:
                 lines = [line for line in page_text.strip().split('\n')]
                 for i in range(len(lines)):
                     line = lines[i].strip().lower()
@@ -1478,24 +1389,20 @@ class FMSData:
                         self.try_serial = next_line.split(' ')[0]
                         break
 
-            if '6. test results' in page_text.lower() and 5 <= page_number <= 20:
+            if '6. test results' in page_lower and 5 <= page_number <= 20:
                 lines = [line for line in page_text.strip().split('\n')]
                 self.parse_measurements(lines)
                 self.component_serials = self.parse_serials(lines)
                 if self.gas_type:
                     self.component_serials['gas_type'] = self.gas_type.capitalize()
 
-                status_sheet = openpyxl.load_workbook(self.status_file)
-                status_sheet = status_sheet["20025.10.AF"]
-
-                for row in status_sheet.iter_rows(min_row=2, min_col = 1, max_col = 65, values_only=True):
-                    if all(cell == None for cell in row):
-                        break
-                    serial_number, model, review = row[:3]
-                    serial_number = serial_number[:6]
+                status_rows = load_sheet(self.status_file, "20025.10.AF").index(column=1, min_row=2, max_col=65, prefix=6)
+                row = status_rows.get(self.component_serials.get('fms_id', ''))
+                if row:
+                    model, review = row[1:3]
                     if review:
                         review = review[:2]
-                    
+
                     delivered = row[62]
                     shipment = row[61]
                     rfs = row[64]
@@ -1510,15 +1417,14 @@ class FMSData:
                     if scrap_check and str(scrap_check).lower() == 'scrap':
                         status = FMSProgressStatus.SCRAPPED
 
-                    if serial_number == self.component_serials.get('fms_id', ''):
-                        self.component_serials['model'] = model 
-                        self.component_serials['status'] = status
-                        self.component_serials['rfs'] = rfs
-                        self.component_serials['drawing'] = f"20025.10.AF-{review}"
+                    self.component_serials['model'] = model 
+                    self.component_serials['status'] = status
+                    self.component_serials['rfs'] = rfs
+                    self.component_serials['drawing'] = f"20025.10.AF-{review}"
 
-            if 'bonding, isolation and capacitance' in page_text.lower() and page_number >=5:
+            if 'bonding, isolation and capacitance' in page_lower and page_number >=5:
                 lines = [line for line in page_text.strip().split('\n')]
-                next_page_text = pdf_document[page_number + 1].get_text() if page_number + 1 < len(pdf_document) else ""
+                next_page_text = pages[page_number + 1] if page_number + 1 < n_pages else ""
                 if next_page_text:
                     next_lines = [line for line in next_page_text.strip().split('\n')]
                     lines.extend(next_lines)
@@ -1526,19 +1432,19 @@ class FMSData:
                     self.extract_electrical_results(lines)
                     page_number += 1
 
-            if 'valve performance' in page_text.lower() and 5 <= page_number <= 20:
+            if 'valve performance' in page_lower and 5 <= page_number <= 20:
                 lines = [line for line in page_text.strip().split('\n')]
                 self.extract_hpiv_performance(lines)
 
-            if 'pressure proof pressure' in page_text.lower() and 5 <= page_number <= 25:
+            if 'pressure proof pressure' in page_lower and 5 <= page_number <= 25:
                 lines = [line for line in page_text.strip().split('\n')]
                 self.extract_leakage(lines, search_proof_pressure = True)
                 page_number += 5
 
-            if 'tvac cycle' in page_text.lower() and not 'health check' in page_text.lower() and not 'functional performance' in page_text.lower() and 20 <= page_number <= 55:
+            if 'tvac cycle' in page_lower and not 'health check' in page_lower and not 'functional performance' in page_lower and 20 <= page_number <= 55:
                 if TVAC_count <= 2:
                     lines = [line for line in page_text.strip().split('\n')]
-                    next_page_text = pdf_document[page_number + 1].get_text() if page_number + 1 < len(pdf_document) else ""
+                    next_page_text = pages[page_number + 1] if page_number + 1 < n_pages else ""
                     if next_page_text:
                         next_lines = [line for line in next_page_text.strip().split('\n')]
                         lines.extend(next_lines)
@@ -1549,7 +1455,7 @@ class FMSData:
                         TVAC_count += 1
                         page_number += 2
 
-            if 'power budget' in page_text.lower() and page_number >= 40:
+            if 'power budget' in page_lower and page_number >= 40:
                 lines = [line for line in page_text.strip().split('\n')]
                 table_count = 0
                 for line in lines:
@@ -1557,7 +1463,7 @@ class FMSData:
                         table_count += 1
                 if not table_count == 3:
                     while table_count < 3:
-                        next_page_text = pdf_document[page_number + 1].get_text() if page_number + 1 < len(pdf_document) else ""
+                        next_page_text = pages[page_number + 1] if page_number + 1 < n_pages else ""
                         if next_page_text:
                             next_lines = [line for line in next_page_text.strip().split('\n')]
                             lines.extend(next_lines)
@@ -1566,6 +1472,8 @@ class FMSData:
                 self.extract_power_budget(lines)
 
             page_number += 1
+            # Continue with the next page holding one of the section markers
+            page_number = next((p for p in candidates if p >= page_number), n_pages)
         if self.project_ref:
             self.component_serials["project"] = self.project_ref
 
@@ -2130,6 +2038,8 @@ class FMSLogicSQL:
             This can be done automatically from the test reports or directly using input from the FMSTesting class procedure.
         update_limit_database(): 
             Updates the FMSLimits table with specified limits for the parameters of the FMS in acceptance testing.
+        reevaluate_limits(dry_run, **proposed): 
+            Recomputes the limit status of all stored results in bulk and reports the changes, or only reports them for proposed limits.
     """
 
     def __init__(self, session: "Session", fms: "FMSDataStructure"):
@@ -2354,22 +2264,29 @@ class FMSLogicSQL:
                 # Update test results
                 characteristics = session.query(FMSFunctionalResults).filter_by(test_id=self.test_id).all()
                 if not characteristics:
-                    for row in self.functional_test_results:
-                        logtime = row.get('logtime', 0)
-                        for param, value in row.items():
-                            if param == 'logtime':
-                                continue
-                            if (isinstance(value, float) and np.isnan(value)) or str(value).lower() == "nan":
-                                continue
-                            flow_entry = FMSFunctionalResults(
-                                test_id=self.test_id,
-                                logtime=logtime,
-                                parameter_name=param,
-                                parameter_value=value,
-                                parameter_unit=self.units[param]
-                            )
-                            session.add(flow_entry)
-                    session.commit()
+                    with profiler.stage("session_add"):
+                        results = self.functional_test_results
+                        units = results.units or self.units
+                        logtimes = results['logtime'].tolist() if 'logtime' in results else [0] * results.n_rows
+                        params = [param for param in results if param != 'logtime']
+                        columns = [(param, results[param].tolist(), results.valid_mask(param).tolist(), units[param]) for param in params]
+                        rows = 0
+                        for idx, logtime in enumerate(logtimes):
+                            for param, values, valid, unit in columns:
+                                if not valid[idx]:
+                                    continue
+                                flow_entry = FMSFunctionalResults(
+                                    test_id=self.test_id,
+                                    logtime=logtime,
+                                    parameter_name=param,
+                                    parameter_value=values[idx],
+                                    parameter_unit=unit
+                                )
+                                session.add(flow_entry)
+                                rows += 1
+                        profiler.count("rows", n=rows)
+                    with profiler.stage("commit"):
+                        session.commit()
                     self.check_test_status()
                 else:
                     print("This test has already been registered in the database")
@@ -2467,7 +2384,7 @@ class FMSLogicSQL:
                         new_fms.tv_id = tv_check.tv_id
                     session.add(new_fms)                
                 fr_columns = FMSFRTests.__table__.columns.keys()
-                update_dict = {key: [value[key] for value in self.functional_test_results] for key in fr_columns if key in self.functional_test_results[0] \
+                update_dict = {key: self.functional_test_results[key].tolist() for key in fr_columns if key in self.functional_test_results \
                                and not key == FMSFlowTestParameters.INLET_PRESSURE.value}
                 try:
                     date = datetime.strptime(self.test_id, "%Y_%m_%d_%H-%M-%S").date()
@@ -2531,9 +2448,8 @@ class FMSLogicSQL:
                     if tv_check:
                         new_fms.tv_id = tv_check.tv_id
                     session.add(new_fms)
-                total = len(self.functional_test_results)
                 tvac_columns = FMSTvac.__table__.columns.keys()
-                update_dict = {key: [value[key] for value in self.functional_test_results] for key in tvac_columns if key in self.functional_test_results[0]}
+                update_dict = {key: values.tolist() for key, values in self.functional_test_results.items() if key in tvac_columns}
 
                 try:
                     date = datetime.strptime(self.test_id, "%Y_%m_%d_%H-%M-%S").date()
@@ -3139,25 +3055,8 @@ class FMSLogicSQL:
         Returns:
             LimitStatus | None: Limit status (TRUE, FALSE, ON_LIMIT) or None if no limits are defined.
         """
-        limits = fms_data.fms_limits.get(parameter_name, {}) if fms_data else self.fms_listener.fms_data.fms_limits.get(parameter_name, {})
-        limit_min = limits.get('min')
-        limit_max = limits.get('max')
-        if unit == 'GOhm':
-            value = value * 1e9  
-
-        if limit_min is None and limit_max is None:
-            return None
-        if limit_min is not None and value < limit_min:
-            return LimitStatus.FALSE
-        if limit_max is not None and value > limit_max:
-            return LimitStatus.FALSE
-
-        if limit_min is not None and value == limit_min:
-            return LimitStatus.ON_LIMIT
-        if limit_max is not None and value == limit_max:
-            return LimitStatus.ON_LIMIT
-
-        return LimitStatus.TRUE
+        limits = fms_data.fms_limits if fms_data else self.fms_listener.fms_data.fms_limits
+        return compile_limits(limits).status(parameter_name, value, unit)
 
     def update_fms_main_test_results(self, fms_data: FMSData = None) -> None:
         """
@@ -3185,17 +3084,25 @@ class FMSLogicSQL:
                 print("FMS ID not found in component serials.")
                 return
             
-            for param, values in self.fms_test_results.items():
-                characteristics = session.query(FMSTestResults).filter_by(
-                    fms_id=fms_id, parameter_name = param).all()
-                if characteristics:
-                    for char in characteristics:
-                        session.delete(char)
-                    session.commit()
-
-                if param in [FMSMainParameters.POWER_BUDGET_COLD.value, 
+            power_budgets = [FMSMainParameters.POWER_BUDGET_COLD.value, 
                              FMSMainParameters.POWER_BUDGET_HOT.value, 
-                             FMSMainParameters.POWER_BUDGET_ROOM.value]:
+                             FMSMainParameters.POWER_BUDGET_ROOM.value]
+            existing = session.query(FMSTestResults).filter(FMSTestResults.fms_id == fms_id,
+                FMSTestResults.parameter_name.in_(list(self.fms_test_results))).all()
+            for char in existing:
+                session.delete(char)
+
+            # Limit status of all parameters in one vectorized evaluation
+            limits = fms_data.fms_limits if fms_data else self.fms_listener.fms_data.fms_limits
+            checked = [(param, values) for param, values in self.fms_test_results.items() if param not in power_budgets]
+            statuses = dict(zip([param for param, _ in checked], compile_limits(limits).evaluate(
+                [param for param, _ in checked],
+                [values.get('value') for _, values in checked],
+                [values.get('unit', None) for _, values in checked],
+            )))
+
+            for param, values in self.fms_test_results.items():
+                if param in power_budgets:
                     value = values
                     unit = 'W'
                     lower = False
@@ -3205,7 +3112,7 @@ class FMSLogicSQL:
                 else:
                     value = values.get('value')
                     unit = values.get('unit', None)
-                    within_limits = self.get_limit_status(param, value, unit, fms_data)
+                    within_limits = statuses.get(param)
                     lower = values.get('lower', False)
                     larger = values.get('larger', False)
                     equal = values.get('equal', True)
@@ -3239,13 +3146,12 @@ class FMSLogicSQL:
         Updates the limit database with the latest FMS limits.
         """
         session: "Session" = self.Session()
-        fms_data = FMSData()
-        fms_limits = fms_data.fms_limits
+        fms_limits = copy.deepcopy(fms_limit_specifications)
 
-        processed_fms_ids = [i.fms_id for i in session.query(FMSMain).all()]
+        processed_fms_ids = [fms_id for fms_id, in session.query(FMSMain.fms_id).all()]
+        limited_fms_ids = {fms_id for fms_id, in session.query(FMSLimits.fms_id).all()}
         for fms_id in processed_fms_ids:
-            existing = session.query(FMSLimits).filter_by(fms_id = fms_id).first()
-            if existing:
+            if fms_id in limited_fms_ids:
                 continue
             limits_entry = FMSLimits(
                 fms_id=fms_id,
@@ -3256,6 +3162,28 @@ class FMSLogicSQL:
         session.commit()
         self.fms.print_table(FMSLimits)
 
+    def reevaluate_limits(self, dry_run: bool = False, **proposed) -> pd.DataFrame | None:
+        """
+        Recomputes the limit status of all stored FMS, HPIV, LPT and TV results in bulk and writes the changed ones.
+        Args:
+            dry_run (bool, optional): Only report which units would change status (what-if). Defaults to False.
+            **proposed: Proposed limits, see LimitReevaluator (fms_limits, hpiv_limits, tv_limits, lpt_signal_threshold),
+                only evaluated with dry_run.
+        Returns:
+            pd.DataFrame | None: Change report (unit, parameter, old -> new status), None on error.
+        """
+        session: "Session" = self.Session()
+        try:
+            report = reevaluate_limits(session, dry_run=dry_run, **proposed)
+            display(report)
+            return report
+        except Exception as e:
+            print(f"Error re-evaluating limits: {str(e)}")
+            session.rollback()
+            traceback.print_exc()
+        finally:
+            session.close()
+
 
 if __name__ == "__main__":
     # Example usage
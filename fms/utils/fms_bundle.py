@@ -0,0 +1,288 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Callable
+
+# Standard library
+import copy
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+
+# Third-party
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import selectinload
+
+# Local imports
+from ..db import (
+    FMSMain,
+    FMSLimits,
+    FMSTestResults,
+    FMSFunctionalTests,
+    FMSFunctionalResults,
+    FMSFRTests,
+    FMSTvac,
+    ManifoldStatus,
+    LPTCalibration,
+)
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session, sessionmaker
+    from .enums import FunctionalTestType
+
+MAX_CACHED_BUNDLES = 8
+"""Number of FMS bundles kept in memory, least recently used ones are dropped first."""
+
+_EMPTY_CHANNELS = MappingProxyType({})
+
+
+def fms_data_version(session: "Session", fms_id: str) -> tuple:
+    """
+    Data version of an FMS, read in a single statement: row count and highest id of its limits,
+    test results, functional tests, FR tests, TVAC tests and manifold, the highest limits id (fallback limits)
+    and functional results id, and the main record columns shown in the app. The results are versioned by the
+    highest id of the whole table, which is read from the primary key index instead of counting the results
+    of the FMS; results are only ever added, after their test.
+    Args:
+        session (Session): Database session.
+        fms_id (str): FMS ID.
+    Returns:
+        tuple: Hashable version, changes when rows of the FMS are added or removed.
+    """
+    counters = [
+        (FMSLimits.id, FMSLimits.fms_id == fms_id),
+        (FMSTestResults.id, FMSTestResults.fms_id == fms_id),
+        (FMSFunctionalTests.id, FMSFunctionalTests.fms_id == fms_id),
+        (FMSFRTests.id, FMSFRTests.fms_id == fms_id),
+        (FMSTvac.id, FMSTvac.fms_id == fms_id),
+        (ManifoldStatus.manifold_id, ManifoldStatus.allocated == fms_id),
+    ]
+    columns = []
+    for key, criterion in counters:
+        columns.append(select(func.count(key)).where(criterion).scalar_subquery())
+        columns.append(select(func.max(key)).where(criterion).scalar_subquery())
+    columns.append(select(func.max(FMSLimits.id)).scalar_subquery())
+    columns.append(select(func.max(FMSFunctionalResults.id)).scalar_subquery())
+    for column in (FMSMain.id, FMSMain.status, FMSMain.gas_type, FMSMain.hpiv_id, FMSMain.tv_id, FMSMain.lpt_id,
+                   FMSMain.anode_fr_id, FMSMain.cathode_fr_id):
+        columns.append(select(column).where(FMSMain.fms_id == fms_id).scalar_subquery())
+    columns.append(select(ManifoldStatus.ac_ratio_specified).where(ManifoldStatus.allocated == fms_id).scalar_subquery())
+    return tuple(session.execute(select(*columns)).one())
+
+
+class FMSBundle:
+    """
+    Data of one FMS for the acceptance test app, loaded in one round of eager queries: the main record with
+    its limits, test results, functional/FR/TVAC tests and the FR, LPT, TV and HPIV links, plus the channel
+    arrays of the functional tests. The entries are detached from their session once loaded, so reading them
+    never queries the database, and the bundle cannot be changed; a new bundle is loaded when the data version
+    of the FMS changes.
+
+    Attributes
+    ----------
+    fms_id : str
+        FMS ID.
+    version : tuple
+        Data version the bundle was loaded at, see fms_data_version.
+    main : FMSMain | None
+        Main record, None if the FMS is not in the database.
+    limits : dict | None
+        Limits of the FMS, else those of the last FMS with limits, None if there are none. Copy before editing.
+    limits_source : str | None
+        FMS ID the limits belong to.
+    test_results : tuple[FMSTestResults, ...]
+        Stored acceptance test results.
+    functional_tests : tuple[FMSFunctionalTests, ...]
+        Functional tests in insertion order.
+    fr_tests : tuple[FMSFRTests, ...]
+        FR characteristics tests.
+    tvac : tuple[FMSTvac, ...]
+        TVAC cycle tests.
+    manifold : ManifoldStatus | None
+        Allocated manifold.
+    anode, cathode : AnodeFR | CathodeFR | None
+        FRs of the manifold.
+    lpt_coefficients : tuple[LPTCoefficients, ...]
+        Calibration coefficients of the LPT of the manifold.
+    hpiv, thermal_valve : tuple
+        HPIV certification and TV status entries linked to the FMS.
+
+    Methods
+    -------
+    tests(*test_types):
+        Functional tests of the given types.
+    channels(test_id):
+        Parameter arrays of a functional test.
+    tools(descriptions):
+        Test tools grouped by description.
+    """
+
+    __slots__ = ("fms_id", "version", "main", "limits", "limits_source", "test_results", "functional_tests", "fr_tests",
+                 "tvac", "manifold", "anode", "cathode", "lpt_coefficients", "hpiv", "thermal_valve", "_channels",
+                 "_tool_lookup", "_tools", "_tools_lock")
+
+    def __init__(self, fms_id: str, version: tuple, main: FMSMain | None, limits: dict | None, limits_source: str | None,
+                 channels: dict[str, dict[str, np.ndarray]], tool_lookup: Callable[..., dict] = None) -> None:
+        set_ = object.__setattr__
+        set_(self, "fms_id", fms_id)
+        set_(self, "version", version)
+        set_(self, "main", main)
+        set_(self, "limits", limits)
+        set_(self, "limits_source", limits_source)
+        set_(self, "test_results", tuple(main.test_results) if main else ())
+        set_(self, "functional_tests", tuple(sorted(main.functional_tests, key=lambda t: t.id)) if main else ())
+        set_(self, "fr_tests", tuple(main.fr_tests) if main else ())
+        set_(self, "tvac", tuple(main.tvac_results) if main else ())
+        manifold = main.manifold[0] if main and main.manifold else None
+        set_(self, "manifold", manifold)
+        set_(self, "anode", manifold.anode[0] if manifold and manifold.anode else None)
+        set_(self, "cathode", manifold.cathode[0] if manifold and manifold.cathode else None)
+        set_(self, "lpt_coefficients", tuple(manifold.lpt[0].coefficients) if manifold and manifold.lpt else ())
+        set_(self, "hpiv", tuple(main.hpiv) if main else ())
+        set_(self, "thermal_valve", tuple(main.thermal_valve) if main else ())
+        set_(self, "_channels", MappingProxyType({test_id: MappingProxyType(arrays) for test_id, arrays in channels.items()}))
+        set_(self, "_tool_lookup", tool_lookup)
+        set_(self, "_tools", {})
+        set_(self, "_tools_lock", threading.Lock())
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"FMSBundle is immutable, cannot set {name}")
+
+    def __repr__(self) -> str:
+        return f"FMSBundle({self.fms_id}, {len(self.functional_tests)} functional tests, version={self.version})"
+
+    def tests(self, *test_types: "FunctionalTestType") -> list[FMSFunctionalTests]:
+        """
+        Functional tests of the given types, in insertion order.
+        """
+        return [t for t in self.functional_tests if t.test_type in test_types]
+
+    def channels(self, test_id: str) -> MappingProxyType:
+        """
+        Parameter arrays of a functional test.
+        Args:
+            test_id (str): Test ID.
+        Returns:
+            MappingProxyType: Parameter name -> read-only array of its values in logging order (None as NaN),
+                empty if the test has no results.
+        """
+        return self._channels.get(test_id, _EMPTY_CHANNELS)
+
+    def tools(self, descriptions: list[str]) -> dict[str, list[dict]]:
+        """
+        Test tools grouped by description, looked up once per bundle.
+        Args:
+            descriptions (list[str]): Tool descriptions (annex A of the procedure).
+        Returns:
+            dict[str, list[dict]]: Description -> tool entries, a copy that may be edited.
+        """
+        if self._tool_lookup is None:
+            return {}
+        key = tuple(descriptions or ())
+        with self._tools_lock:
+            if key not in self._tools:
+                self._tools[key] = self._tool_lookup(descriptions=descriptions) or {}
+            return copy.deepcopy(self._tools[key])
+
+
+def _load_channels(session: "Session", test_ids: list[str]) -> dict[str, dict[str, np.ndarray]]:
+    values: dict[str, dict[str, list]] = {}
+    if test_ids:
+        rows = session.query(FMSFunctionalResults.test_id, FMSFunctionalResults.parameter_name, FMSFunctionalResults.parameter_value)\
+            .filter(FMSFunctionalResults.test_id.in_(test_ids)).order_by(FMSFunctionalResults.id)
+        for test_id, name, value in rows:
+            values.setdefault(test_id, {}).setdefault(name, []).append(value)
+    channels = {}
+    for test_id, parameters in values.items():
+        arrays = {}
+        for name, series in parameters.items():
+            array = np.asarray(series, dtype=float)
+            array.setflags(write=False)
+            arrays[name] = array
+        channels[test_id] = arrays
+    return channels
+
+
+def load_fms_bundle(session: "Session", fms_id: str, version: tuple = None, tool_lookup: Callable[..., dict] = None) -> FMSBundle:
+    """
+    Load the bundle of an FMS with eager queries (one per relationship) and one projected query for the
+    channel arrays. Expunge or close the session afterwards to detach the entries.
+    Args:
+        session (Session): Database session.
+        fms_id (str): FMS ID.
+        version (tuple, optional): Data version, read if not given.
+        tool_lookup (Callable, optional): Function grouping test tools by description (keyword argument descriptions).
+    Returns:
+        FMSBundle: The bundle.
+    """
+    if version is None:
+        version = fms_data_version(session, fms_id)
+    main = (
+        session.query(FMSMain)
+        .options(
+            selectinload(FMSMain.limits),
+            selectinload(FMSMain.test_results),
+            selectinload(FMSMain.functional_tests),
+            selectinload(FMSMain.fr_tests),
+            selectinload(FMSMain.tvac_results),
+            selectinload(FMSMain.hpiv),
+            selectinload(FMSMain.thermal_valve),
+            selectinload(FMSMain.manifold).selectinload(ManifoldStatus.anode),
+            selectinload(FMSMain.manifold).selectinload(ManifoldStatus.cathode),
+            selectinload(FMSMain.manifold).selectinload(ManifoldStatus.lpt).selectinload(LPTCalibration.coefficients),
+        )
+        .filter_by(fms_id=fms_id)
+        .first()
+    )
+
+    limits_entry = main.limits if main else None
+    if limits_entry is None:
+        limits_entry = session.query(FMSLimits).order_by(FMSLimits.id.desc()).first()
+    limits = copy.deepcopy(limits_entry.limits) if limits_entry else None
+    limits_source = limits_entry.fms_id if limits_entry else None
+
+    channels = _load_channels(session, [t.test_id for t in main.functional_tests] if main else [])
+    return FMSBundle(fms_id, version, main, limits, limits_source, channels, tool_lookup)
+
+
+_bundles: OrderedDict[tuple[str, str], FMSBundle] = OrderedDict()
+_bundles_lock = threading.Lock()
+
+
+def fms_bundle(Session: "sessionmaker", fms_id: str, tool_lookup: Callable[..., dict] = None) -> FMSBundle:
+    """
+    Bundle of an FMS shared within the process. The cached bundle is returned as long as the data version of
+    the FMS is unchanged (one query), else the bundle is loaded again.
+    Args:
+        Session (sessionmaker): Session factory of the database.
+        fms_id (str): FMS ID.
+        tool_lookup (Callable, optional): Function grouping test tools by description, see load_fms_bundle.
+    Returns:
+        FMSBundle: The bundle.
+    """
+    session = Session()
+    try:
+        key = (str(session.get_bind().url), fms_id)
+        version = fms_data_version(session, fms_id)
+        with _bundles_lock:
+            bundle = _bundles.get(key)
+            if bundle is not None and bundle.version == version:
+                _bundles.move_to_end(key)
+                return bundle
+        bundle = load_fms_bundle(session, fms_id, version, tool_lookup)
+        with _bundles_lock:
+            _bundles[key] = bundle
+            _bundles.move_to_end(key)
+            while len(_bundles) > MAX_CACHED_BUNDLES:
+                _bundles.popitem(last=False)
+        return bundle
+    finally:
+        session.close()
+
+
+def invalidate_fms_bundle(fms_id: str = None) -> None:
+    """
+    Forget the cached bundle of an FMS (all bundles if fms_id is None), e.g. after editing its entries in place.
+    """
+    with _bundles_lock:
+        for key in [k for k in _bundles if fms_id is None or k[1] == fms_id]:
+            _bundles.pop(key, None)
@@ -0,0 +1,161 @@
+"""
+Drawing functions of the FMS functional test plots.
+
+Every function draws on a given figure from plain data only, so the same code serves the
+interactive pyplot figures of the query apps and the headless figures rendered (possibly in
+worker processes) for the acceptance reports, see plot_render.render_png. Long time series
+are decimated to the plot resolution (min/max per bucket) before drawing.
+"""
+
+# Third-party
+import numpy as np
+from matplotlib.figure import Figure
+
+# Local imports
+from .enums import FMSFlowTestParameters
+from .timeseries import decimate, axis_buckets
+
+
+def draw_open_loop(fig: Figure, logtime: list[float], pt1000: list[float], total_flow: list[float], lpt_pressure: list[float],
+                   units: dict[str, str], gas_type: str, title: str) -> None:
+    """
+    Open loop or slope test: TV temperature, total flow and LPT pressure over time.
+    """
+    fms = FMSFlowTestParameters
+    ax1 = fig.subplots()
+    logtime, pt1000, total_flow, lpt_pressure = decimate(logtime, pt1000, total_flow, lpt_pressure, buckets=axis_buckets(ax1))
+    ax1.set_xlabel('Time [s]')
+    ax1.set_ylabel(f'TV Temperature [{units[fms.TV_PT1000.value]}]')
+    l1, = ax1.plot(logtime, pt1000, label='TV Temperature')
+
+    ax2 = ax1.twinx()
+    ax2.set_ylabel(f'Total Flow [{units[fms.TOTAL_FLOW.value]} {gas_type}] / LPT Pressure [{units[fms.LPT_PRESSURE.value]}]')
+    l2, = ax2.plot(logtime, total_flow, label='Total Flow', color='tab:orange')
+    l3, = ax2.plot(logtime, lpt_pressure, label='LPT Pressure', color='tab:green')
+
+    ax1.set_title(title, wrap=True)
+    fig.tight_layout()
+
+    lines = [l1, l2, l3]
+    labels = [line.get_label() for line in lines]
+    ax1.legend(lines, labels, loc='upper center', bbox_to_anchor=(0.5, -0.15), ncol=2)
+    ax1.grid(True)
+
+
+def draw_closed_loop(fig: Figure, logtime: list[float], anode_flow: list[float], cathode_flow: list[float], closed_loop_pressure: list[float],
+                     lpt_pressure: list[float], units: dict[str, str], gas_type: str, title: str, response_regions: dict = None,
+                     lpt_set_points: list[float] = None) -> None:
+    """
+    Closed loop test: flows, setpoint and LPT pressure over time, optionally with the response time regions.
+    """
+    fms = FMSFlowTestParameters
+    ax = fig.subplots()
+    logtime, anode_flow, cathode_flow, closed_loop_pressure, lpt_pressure = decimate(logtime, anode_flow, cathode_flow, closed_loop_pressure,
+                                                                                     lpt_pressure, buckets=axis_buckets(ax))
+    ax.plot(logtime, anode_flow, label=f'Anode Flow [{units[fms.ANODE_FLOW.value]}]')
+    ax.plot(logtime, cathode_flow, label=f'Cathode Flow [{units[fms.CATHODE_FLOW.value]}]')
+    ax.plot(logtime, closed_loop_pressure, label=f'Closed Loop Setpoint [{units[fms.CLOSED_LOOP_PRESSURE.value]}]')
+    ax.plot(logtime, lpt_pressure, label=f'LPT Pressure [{units[fms.LPT_PRESSURE.value]}]')
+
+    ax.set_xlabel('Time [s]')
+    ax.set_ylabel(f'Mass Flow Rate [{units[fms.ANODE_FLOW.value]} {gas_type}]/LPT & Setpoint Pressure [barA]')
+    ax.set_title(title, wrap=True)
+    ax.legend(loc="lower center", bbox_to_anchor=(0.5, -0.3), ncol=2)
+    ax.grid()
+
+    if response_regions:
+        y_fill = max(max(anode_flow), max(cathode_flow))
+        for count, (cl_start_time, lpt_start_time) in enumerate(response_regions.values()):
+            y_level = lpt_set_points[count]
+            x0 = cl_start_time
+            x1 = lpt_start_time
+            xm = (x0 + x1) / 2
+            dt = x1 - x0
+
+            ax.fill_between([x0, x1], y1=0, y2=y_fill, alpha=0.4, color='tab:blue')
+
+            ax.plot([x0, x1], [y_level, y_level], color='black', linewidth=1)
+            ax.plot([x0, x0], [y_level - 0.1, y_level + 0.1], color='black', linewidth=1)
+            ax.plot([x1, x1], [y_level - 0.1, y_level + 0.1], color='black', linewidth=1)
+            ax.text(xm, y_level + 0.3, f"{dt:.1f} s", ha='center', va='bottom')
+
+
+def draw_fr_characteristics(fig: Figure, lpt_pressure: list[float], anode_flow: list[float], cathode_flow: list[float], total_flow: list[float],
+                            ac_ratio: list[float], ratio: float, units: dict[str, str], gas_type: str, title: str) -> None:
+    """
+    FR characteristics test: anode, cathode and total flow against LPT pressure, with the anode/cathode ratio.
+    """
+    fms = FMSFlowTestParameters
+    ax1 = fig.subplots()
+    l1, = ax1.plot(lpt_pressure, anode_flow, label=f'Anode Flow [{units[fms.ANODE_FLOW.value]}]')
+    l2, = ax1.plot(lpt_pressure, cathode_flow, label=f'Cathode Flow [{units[fms.CATHODE_FLOW.value]}]')
+    l3, = ax1.plot(lpt_pressure, total_flow, label=f'Total Flow [{units[fms.TOTAL_FLOW.value]}]')
+    ax1.set_xlabel(f'LPT Pressure [{units[fms.LPT_PRESSURE.value]}]')
+    ax1.set_ylabel(f'{gas_type} Mass Flow Rate [{units[fms.ANODE_FLOW.value]} {gas_type}]')
+    ax1.grid(True)
+
+    ax2 = ax1.twinx()
+    l4, = ax2.plot(lpt_pressure, ac_ratio, color='tab:red', label='Anode/Cathode Ratio')
+    l5_upper = ax2.axhline(ratio + 0.5, color='tab:orange', linestyle='--', label=f'Ratio Tolerance: {ratio}')
+    ax2.axhline(ratio - 0.5, color='tab:orange', linestyle='--', label='Ratio Tolerance')
+    ax2.set_ylabel('Anode-to-Cathode Ratio')
+    ax2.set_ylim(bottom=0, top=20)
+    ax2.set_yticks(np.arange(0, 21, 1))
+
+    # Combine legends from both axes
+    lines = [l1, l2, l3, l4, l5_upper]
+    labels = [line.get_label() for line in lines]
+    ax1.legend(lines, labels, loc='upper center', bbox_to_anchor=(0.5, -0.15), ncol=2)
+    ax2.set_title(title, wrap=True)
+
+
+def draw_fr_voltage(fig: Figure, lpt_voltage: list[float], total_flow: list[float], ac_ratio: list[float], lpt_voltages: list[float],
+                    calculated_total_flows: list[float], min_flow_rates: list[float], max_flow_rates: list[float], ratio: float,
+                    r2: float, order: int, intersections: list[tuple[float, float]], units: dict[str, str], gas_type: str, title: str) -> None:
+    """
+    FR characteristics against LPT voltage, with the polynomial extrapolation and the flow rate limits.
+    """
+    fms = FMSFlowTestParameters
+    ax1 = fig.subplots()
+    l3, = ax1.plot(lpt_voltage, total_flow, label=f'Total Flow [{units[fms.TOTAL_FLOW.value]}]')
+    ax1.set_xlabel('LPT Voltage [mV]')
+    ax1.set_ylabel(f'Mass Flow Rate [{units[fms.ANODE_FLOW.value]} {gas_type}]')
+    ax1.grid(True)
+    if title:
+        ax1.set_title(title, wrap=True)
+
+    ax2 = ax1.twinx()
+    l4, = ax2.plot(lpt_voltage, ac_ratio, color='tab:red', label='Anode/Cathode Ratio')
+    l7, = ax1.plot(lpt_voltages, calculated_total_flows, linestyle='--', color='tab:blue', label=f'Calculated Total Flow (R²={r2:.2f}, p = {order})')
+    l5, = ax1.plot(lpt_voltages, min_flow_rates, linestyle='--', color='tab:grey', label='Flow Rate Limits')
+    ax1.plot(lpt_voltages, max_flow_rates, linestyle='--', color='tab:grey', label='Flow Rate Limits')
+    l5_upper = ax2.axhline(ratio + 0.5, color='tab:orange', linestyle='--', label=f'Ratio Tolerance: {ratio}')
+    ax2.axhline(ratio - 0.5, color='tab:orange', linestyle='--', label='Ratio Tolerance')
+
+    ax2.set_ylabel('Anode-to-Cathode Ratio')
+    ax2.set_ylim(bottom=0, top=20)
+    ax2.set_yticks(np.arange(0, 21, 1))
+
+    for voltage, flow in intersections or []:
+        ax1.plot(voltage, flow, 'ro')
+
+    # Legend
+    lines = [l3, l4, l7, l5, l5_upper]
+    labels = [line.get_label() for line in lines]
+    ax1.legend(lines, labels, loc='upper center', bbox_to_anchor=(0.5, -0.15), ncol=2)
+    fig.tight_layout()
+
+
+def draw_tvac_cycles(fig: Figure, time_hours: np.ndarray, trp1: np.ndarray, trp2: np.ndarray, title: str) -> None:
+    """
+    TVAC cycles: TRP temperatures over time.
+    """
+    ax = fig.subplots()
+    time_hours, trp1, trp2 = decimate(time_hours, trp1, trp2, buckets=axis_buckets(ax))
+    ax.plot(time_hours, trp1, label='TRP1', color='blue')
+    ax.plot(time_hours, trp2, label='TRP2', color='orange')
+    ax.set_xlabel('Time [hrs]')
+    ax.set_ylabel('Temperature [degC]')
+    ax.set_title(title)
+    ax.legend()
+    ax.grid()
@@ -9,7 +9,6 @@ import json
 
 # --- Third-Party Libraries ---
 import numpy as np
-import openpyxl
 from watchdog.events import FileSystemEventHandler
 from watchdog.observers import Observer
 
@@ -30,6 +29,7 @@ from ..db import (
 from .ocr_reader import OCRReader
 from .textract import TextractReader
 from .general_utils import extract_total_amount
+from .workbook_cache import iter_records
 from .enums import (
     FRParts,
     ManifoldProgressStatus,
@@ -753,55 +753,24 @@ class FRData:
         self.previous_ids = []
         operator = operator
 
-        wb_anode = openpyxl.load_workbook(self.anode_excel, data_only=True)
-        if 'Anode FR Database' in wb_anode.sheetnames:
-            wb_anode.active = wb_anode['Anode FR Database']
-        else:
-            wb_anode.active = wb_anode.active
-
-        ws = wb_anode.active
-        for idx, row in enumerate(wb_anode.active.iter_rows(min_row=3, values_only=True)):
-            if all(cell is None for cell in row):
-                break
-            fr_dict = self.excel_data_loop(row, type='anode', tools_path=tools_path)
-            cell = ws.cell(row=idx+1, column=1)
-            filled = cell.fill.fill_type == 'solid'
-            if filled and bool(fr_dict.get("flow_rates", [])):
-                actual_operator = "NRN"
-            elif bool(fr_dict.get("flow_rates", [])):
-                actual_operator = operator
-            else:
-                actual_operator = ""
-
-            if fr_dict:  
-                fr_dict["operator"] = actual_operator
-                self.fr_test_results.append(fr_dict)
-
-        wb_cathode = openpyxl.load_workbook(self.cathode_excel, data_only=True)
-        if 'Cathode FR Database' in wb_cathode.sheetnames:
-            wb_cathode.active = wb_cathode['Cathode FR Database']
-        else:
-            wb_cathode.active = wb_cathode.active
-
-        ws = wb_cathode.active
-        for idx, row in enumerate(wb_cathode.active.iter_rows(min_row=3, values_only=True)):
-            if all(cell is None for cell in row):
-                break
-            fr_dict = self.excel_data_loop(row, type='cathode', tools_path=tools_path)
-            cell = ws.cell(row=idx+1, column=1)
-            filled = cell.fill.fill_type == 'solid'
-            if filled and bool(fr_dict.get("flow_rates", [])):
-                actual_operator = "NRN"
-            elif bool(fr_dict.get("flow_rates", [])):
-                actual_operator = operator
-            else:
-                actual_operator = ""
+        sheets = [(self.anode_excel, 'Anode FR Database', 'anode'), (self.cathode_excel, 'Cathode FR Database', 'cathode')]
+        for excel, sheet, fr_type in sheets:
+            # The solid fill of column A marks rows tested by the second operator
+            for record in iter_records(excel, sheet, min_row=3, flag_column=1, fallback=True):
+                row = record.values
+                if all(cell is None for cell in row):
+                    break
+                fr_dict = self.excel_data_loop(row, type=fr_type, tools_path=tools_path)
+                if record.filled and bool(fr_dict.get("flow_rates", [])):
+                    actual_operator = "NRN"
+                elif bool(fr_dict.get("flow_rates", [])):
+                    actual_operator = operator
+                else:
+                    actual_operator = ""
 
-            if fr_dict:  
-                fr_dict["operator"] = actual_operator
-                self.fr_test_results.append(fr_dict)
-            if fr_dict: 
-                self.fr_test_results.append(fr_dict)
+                if fr_dict:
+                    fr_dict["operator"] = actual_operator
+                    self.fr_test_results.append(fr_dict)
 
         return self.fr_test_results
 
@@ -0,0 +1,175 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+# Standard library
+import bisect
+
+# Local imports
+from ..db import AnodeFR, CathodeFR
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+PAGE_SIZE = 200
+"""Serial numbers per page of the serial dropdown."""
+
+_MODELS = {"Anode": AnodeFR, "Cathode": CathodeFR}
+
+
+class FRCatalog:
+    """
+    Flow restrictor catalog of the FR testing app.
+
+    Only the serial numbers are loaded up front, with one projected query per FR type, into sorted
+    lists; the dropdown options are served from them by prefix (binary search) and page. The full
+    record of an FR is read when its serial is selected, and the column values for the outlier
+    check are projected per column on first use. Loaded data is kept until invalidate().
+
+    Attributes
+    ----------
+    session : Session
+        Session of the app, also holding the FR entries that are edited.
+    page_size : int
+        Serial numbers per page.
+
+    Methods
+    -------
+    serials(fr_type):
+        Sorted serial numbers of a type.
+    search(fr_type, prefix="", page=0):
+        One page of the serial numbers starting with a prefix.
+    page_count(fr_type, prefix=""):
+        Number of pages of search.
+    fr_type(fr_id):
+        'Anode' or 'Cathode' for a serial number.
+    entry(fr_id):
+        Database entry of an FR.
+    record(fr_id):
+        All columns of an FR as a dictionary, as the form and update_fr_test_results use it.
+    update(fr_id, key, value):
+        Change a value of a record.
+    column_values(fr_type, key):
+        Values of a column over all FRs of a type.
+    invalidate(fr_type=None):
+        Drop loaded data.
+    """
+
+    def __init__(self, session: "Session", page_size: int = PAGE_SIZE) -> None:
+        self.session = session
+        self.page_size = page_size
+        self._serials: dict[str, list[str]] = {}
+        self._records: dict[str, dict] = {}
+        self._columns: dict[tuple[str, str], list] = {}
+
+    def serials(self, fr_type: str) -> list[str]:
+        """
+        Sorted serial numbers of a type, loaded with a single projected query.
+        Args:
+            fr_type (str): 'Anode' or 'Cathode'.
+        Returns:
+            list[str]: Serial numbers, do not modify.
+        """
+        if fr_type not in self._serials:
+            model = _MODELS[fr_type]
+            self._serials[fr_type] = sorted(fr_id for fr_id, in self.session.query(model.fr_id))
+        return self._serials[fr_type]
+
+    def _range(self, fr_type: str, prefix: str) -> tuple[int, int]:
+        serials = self.serials(fr_type)
+        if not prefix:
+            return 0, len(serials)
+        return bisect.bisect_left(serials, prefix), bisect.bisect_left(serials, prefix + "\uffff")
+
+    def search(self, fr_type: str, prefix: str = "", page: int = 0) -> list[str]:
+        """
+        One page of the serial numbers of a type starting with a prefix.
+        Args:
+            fr_type (str): 'Anode' or 'Cathode'.
+            prefix (str): Start of the serial number, e.g. 'C25-0053'.
+            page (int): Page index.
+        Returns:
+            list[str]: At most page_size serial numbers.
+        """
+        lo, hi = self._range(fr_type, prefix.strip())
+        start = lo + max(page, 0) * self.page_size
+        return self.serials(fr_type)[start:min(start + self.page_size, hi)]
+
+    def page_count(self, fr_type: str, prefix: str = "") -> int:
+        """
+        Number of pages of search, at least 1.
+        """
+        lo, hi = self._range(fr_type, prefix.strip())
+        return max(1, -(-(hi - lo) // self.page_size))
+
+    def fr_type(self, fr_id: str) -> str | None:
+        """
+        'Anode' or 'Cathode' for a serial number, None if it is unknown.
+        """
+        for fr_type in _MODELS:
+            serials = self.serials(fr_type)
+            idx = bisect.bisect_left(serials, fr_id)
+            if idx < len(serials) and serials[idx] == fr_id:
+                return fr_type
+        return None
+
+    def entry(self, fr_id: str) -> AnodeFR | CathodeFR | None:
+        """
+        Database entry of an FR, from the identity map of the session if it is loaded.
+        """
+        fr_type = self.fr_type(fr_id) if fr_id else None
+        return self.session.get(_MODELS[fr_type], fr_id) if fr_type else None
+
+    def record(self, fr_id: str) -> dict | None:
+        """
+        All columns of an FR plus 'serial_number' and 'fr' (type), read on first use.
+        The dictionary is kept and shared, so edits made through update stay visible.
+        Args:
+            fr_id (str): Serial number.
+        Returns:
+            dict | None: The record, None if the FR does not exist.
+        """
+        if fr_id not in self._records:
+            entry = self.entry(fr_id)
+            if entry is None:
+                return None
+            columns = [c.name for c in entry.__table__.columns]
+            self._records[fr_id] = {"serial_number": fr_id, "fr": self.fr_type(fr_id), **{c: getattr(entry, c) for c in columns}}
+        return self._records[fr_id]
+
+    def update(self, fr_id: str, key: str, value: object) -> None:
+        """
+        Change a value of a record, and of the column values of its type.
+        """
+        record = self.record(fr_id)
+        if record is None:
+            return
+        record[key] = value
+        self._columns.pop((record["fr"], key), None)
+
+    def column_values(self, fr_type: str, key: str) -> list:
+        """
+        Values of a column over all FRs of a type, loaded with a single projected query.
+        Values of records changed through update take precedence over the database values.
+        Args:
+            fr_type (str): 'Anode' or 'Cathode'.
+            key (str): Column name.
+        Returns:
+            list: Values in serial number order, None included.
+        """
+        if (fr_type, key) not in self._columns:
+            model = _MODELS[fr_type]
+            values = []
+            for fr_id, value in self.session.query(model.fr_id, getattr(model, key)).order_by(model.fr_id):
+                record = self._records.get(fr_id)
+                values.append(record.get(key) if record is not None else value)
+            self._columns[(fr_type, key)] = values
+        return self._columns[(fr_type, key)]
+
+    def invalidate(self, fr_type: str = None) -> None:
+        """
+        Drop the loaded serial numbers, records and column values (of one type, or all).
+        """
+        for name in ([fr_type] if fr_type else list(_MODELS)):
+            self._serials.pop(name, None)
+            self._records = {k: v for k, v in self._records.items() if v["fr"] != name}
+            self._columns = {k: v for k, v in self._columns.items() if k[0] != name}
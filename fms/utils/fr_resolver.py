@@ -0,0 +1,102 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+# Local imports
+from ..db import AnodeFR, CathodeFR, FRCertification
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+_MODELS = {'anode': (AnodeFR, FRCertification.anode_fr_id), 'cathode': (CathodeFR, FRCertification.cathode_fr_id)}
+
+
+def _suffix_map(ids: list[str]) -> dict[str, list[str]]:
+    # Short serials are zero padded to at least 3 characters, so every match shares the last 3 characters.
+    # An FR linked to several certificates (filter and outlet) is listed once, at its first position
+    buckets: dict[str, list[str]] = {}
+    for fr_id in dict.fromkeys(str(fr_id) for fr_id in ids if fr_id):
+        buckets.setdefault(fr_id[-3:], []).append(fr_id)
+    return buckets
+
+
+class FRSerialResolver:
+    """
+    Resolves the short FR numbers of the assembly sheet (e.g. '12') to full FR IDs ('C25-0053-012').
+
+    The tested anode/cathode FR IDs and the FR IDs linked to filter/outlet certificates are read once
+    per FR type into suffix -> candidates maps, in database order. A lookup then checks only the
+    candidates ending in the same digits: first the C24 FRs for 24-series FMS, then all tested FRs,
+    then the certificate links. IDs already given in full in the sheet or resolved before are skipped.
+
+    Attributes
+    ----------
+    session : Session
+        Session used to load the candidate IDs.
+    ambiguities : list[dict]
+        Lookups with several candidates or none: type, serial, fms_id, chosen ID and candidates.
+
+    Methods
+    -------
+    consume(type, fr_id):
+        Mark a full FR ID as taken.
+    resolve(type, fr_id, fms_id=None):
+        Full FR ID for a short FR number.
+    """
+
+    def __init__(self, session: "Session") -> None:
+        self.session = session
+        self.ambiguities: list[dict] = []
+        self._tested: dict[str, dict[str, list[str]]] = {}
+        self._linked: dict[str, dict[str, list[str]]] = {}
+        self._consumed: dict[str, set[str]] = {'anode': set(), 'cathode': set()}
+
+    def _load(self, type: str) -> None:
+        if type in self._tested:
+            return
+        model, cert_column = _MODELS[type]
+        tested = self.session.query(model.fr_id).filter(model.flow_rates != None)
+        linked = self.session.query(cert_column).filter(cert_column != None)
+        self._tested[type] = _suffix_map([fr_id for fr_id, in tested])
+        self._linked[type] = _suffix_map([fr_id for fr_id, in linked])
+
+    def consume(self, type: str, fr_id: str) -> None:
+        """
+        Mark a full FR ID as taken, so short numbers no longer resolve to it.
+        Args:
+            type (str): Type of FR ('anode' or 'cathode').
+            fr_id (str): Full FR ID.
+        """
+        self._consumed[type].add(fr_id)
+
+    def _candidates(self, buckets: dict[str, list[str]], type: str, serial: str, prefix: str = None) -> list[str]:
+        consumed = self._consumed[type]
+        return [fr_id for fr_id in buckets.get(serial[-3:], [])
+                if fr_id.endswith(serial) and fr_id not in consumed and (prefix is None or fr_id.startswith(prefix))]
+
+    def resolve(self, type: str, fr_id: str, fms_id: str = None) -> str:
+        """
+        Full FR ID for a short FR number, marking it as taken.
+        Args:
+            type (str): Type of FR ('anode' or 'cathode').
+            fr_id (str): Short FR number.
+            fms_id (str, optional): FMS ID, 24-series FMS prefer C24 FRs. Defaults to None.
+        Returns:
+            str: Full FR ID, or the zero padded number if no FR matches.
+        """
+        self._load(type)
+        serial = str(fr_id).zfill(3)
+        start_fms = fms_id.split("-")[0] if fms_id else None
+        tiers = [(self._tested[type], "C24")] if start_fms == "24" else []
+        tiers += [(self._tested[type], None), (self._linked[type], None)]
+
+        for buckets, prefix in tiers:
+            candidates = self._candidates(buckets, type, serial, prefix)
+            if candidates:
+                chosen = candidates[0]
+                if len(candidates) > 1:
+                    self.ambiguities.append({'type': type, 'serial': serial, 'fms_id': fms_id, 'chosen': chosen, 'candidates': candidates})
+                self.consume(type, chosen)
+                return chosen
+
+        self.ambiguities.append({'type': type, 'serial': serial, 'fms_id': fms_id, 'chosen': None, 'candidates': []})
+        return serial
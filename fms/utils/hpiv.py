@@ -1,11 +1,13 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING, Any
 # Standard library imports
+import hashlib
 import os
 import re
 import sys
 import time
 import traceback
+from concurrent.futures import ProcessPoolExecutor
 
 # Third-party imports
 import fitz
@@ -26,6 +28,8 @@ if TYPE_CHECKING:
 from ..db import HPIVCharacteristics, HPIVCertification, HPIVRevisions
 from .enums import LimitStatus, HPIVParameters, HPIVParts
 from .ocr_reader import OCRReader
+from .instrumentation import profiler
+from .hpiv_matrix import invalidate_characteristic_matrix
 
 
 class HPIVDataListener(FileSystemEventHandler):
@@ -74,7 +78,8 @@ class HPIVDataListener(FileSystemEventHandler):
                 print(self.path)
                 if self.path.endswith("HPIV_data_packages"):
                     self.tr = HPIVData(pdf_file=pdf_file)
-                    self.tr.extract_hpiv_data()
+                    with profiler.stage("hpiv_listener/parse"):
+                        self.tr.extract_hpiv_data()
                 elif self.path.endswith("certifications"):
                     if 'space solutions' in pdf_file.lower():
                         self.tr = HPIVData(pdf_file=pdf_file)                    
@@ -84,6 +89,78 @@ class HPIVDataListener(FileSystemEventHandler):
                 # Ensure processing flag is reset after processing
                 self._processing = False
 
+def _write_valve_report(pdf_file: str, from_page: int, to_page: int, report_file: str, images_folder: str) -> int:
+    """
+    Write the acceptance report of one valve and its unique images.
+    Images are deduplicated by xref and by the SHA-1 of their bytes, so the logos repeated
+    on every page are written once.
+    Args:
+        pdf_file (str): Path to the HPIV data package.
+        from_page (int): First page of the valve report (0-based).
+        to_page (int): Last page of the valve report (0-based).
+        report_file (str): Path of the split valve report.
+        images_folder (str): Folder for the extracted images.
+    Returns:
+        int: Number of images written.
+    """
+    image_count = 0
+    seen_xrefs = set()
+    seen_digests = set()
+    with fitz.open(pdf_file) as pdf_document:
+        with fitz.open() as new_pdf:
+            new_pdf.insert_pdf(pdf_document, from_page=from_page, to_page=to_page)
+            new_pdf.save(report_file)
+
+        for page_number in range(from_page, to_page + 1):
+            for img_index, img in enumerate(pdf_document.get_page_images(page_number, full=True)):
+                xref = img[0]
+                if xref in seen_xrefs:
+                    continue
+                seen_xrefs.add(xref)
+                base_image = pdf_document.extract_image(xref)
+                image_bytes = base_image["image"]
+                digest = hashlib.sha1(image_bytes).digest()
+                if digest in seen_digests:
+                    continue
+                seen_digests.add(digest)
+
+                image_path = os.path.join(images_folder, f"page{page_number+1}_img{img_index+1}.{base_image['ext']}")
+                with open(image_path, "wb") as img_file:
+                    img_file.write(image_bytes)
+                image_count += 1
+    return image_count
+
+
+def write_valve_reports(jobs: list[tuple[str, int, int, str, str]], workers: int = None) -> int:
+    """
+    Write the split valve reports and their images in a process pool.
+    Falls back to writing in this process if the pool fails.
+    Args:
+        jobs (list[tuple]): (pdf_file, from_page, to_page, report_file, images_folder) per valve.
+        workers (int): Number of worker processes, defaults to the CPU count. 1 writes in this process.
+    Returns:
+        int: Total number of images written.
+    """
+    if not jobs:
+        return 0
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return sum(pool.map(_write_valve_report, *zip(*jobs)))
+        except Exception as e:
+            print(f"Parallel report splitting failed, writing sequentially: {str(e)}")
+            traceback.print_exc()
+    image_count = 0
+    for job in jobs:
+        try:
+            image_count += _write_valve_report(*job)
+        except Exception as e:
+            print(f"Error writing valve report {job[3]}: {str(e)}")
+            traceback.print_exc()
+    return image_count
+
+
 class HPIVData:
     """
     Class for extracting and processing HPIV test results from PDF documents.
@@ -121,6 +198,8 @@ class HPIVData:
         Initialize the HPIV parameters dictionary with standard test limits.
     extract_hpiv_data():
         Extract HPIV test data from the current PDF document.
+    parse_valve_report(pages):
+        Extract the test results of one valve from the page texts of its report.
     check_within_limits():
         Check if for the parameters in the test results attribute, 
         the corresponding value is within defined limits.
@@ -232,7 +311,7 @@ class HPIVData:
         }
         
 
-    def extract_hpiv_data(self, output_folder: str = "") -> None:
+    def extract_hpiv_data(self, output_folder: str = "", workers: int = None) -> None:
         """
         Extract HPIV test data from PDF documents.
         
@@ -242,181 +321,35 @@ class HPIVData:
         extraction from specific pages of the test reports.
         
         The method:
-        1. Opens and processes the PDF document
-        2. Identifies individual valve test reports within the PDF
-        3. Extracts test data from specific pages
-        4. Saves individual valve reports and associated images
+        1. Reads the text of every page of the PDF document once
+        2. Identifies individual valve test reports (and the hardware revision list) within the PDF
+        3. Writes the individual valve reports and their unique images through a process pool
+        4. Extracts the test data from the page texts of each report
         5. Populates the test results with extracted values
+        Args:
+            output_folder (str): Folder for the split reports, defaults to the working directory.
+            workers (int): Number of processes writing the valve reports, defaults to the CPU count.
         
         Returns:
             None: Updates self.test_results list with extracted data
         """
         #pdf_file = 'SSC-VS197-21-13_End Item Data Package_Rev.D_241219'
         split_report_folder = os.path.join(output_folder, 'HPIV_reports') if output_folder else 'HPIV_reports'
-        pdf_document = fitz.open(self.pdf_file)
-        if not os.path.exists(split_report_folder):
-            os.makedirs(split_report_folder)
-        new_acceptance_report = False
-        for page_number in range(len(pdf_document)):
-            page = pdf_document[page_number]
-            page_text = page.get_text()
+        os.makedirs(split_report_folder, exist_ok=True)
+        with fitz.open(self.pdf_file) as pdf_document:
+            pages = [page.get_text() for page in pdf_document]
 
+        valve_reports = []
+        for page_number, page_text in enumerate(pages):
             if 'ACCEPTANCE TEST REPORT\nValve Serial Number :' in page_text:
                 #start of new report identified
                 valve_serial = page_text.replace('\n','').split('Serial Number : ')[-1]
-                self.get_hpiv_parameters()  # Initialize parameters for the new valve
-
-                self.hpiv_parameters[HPIVParameters.HPIV_ID.value] = valve_serial
-                self.hpivs.add(valve_serial)
-
-                valve_folder = os.path.join(split_report_folder, valve_serial)
-                os.makedirs(valve_folder, exist_ok=True)
-                images_folder = os.path.join(valve_folder, "extracted_images") if output_folder else "extracted_images"
-                os.makedirs(images_folder, exist_ok=True)
-
-                new_pdf = fitz.open()
-                new_pdf.insert_pdf(pdf_document, from_page=page_number, to_page=page_number+24)
-                new_pdf.save(os.path.join(valve_folder, f'Acceptance_report_valve_{valve_serial}.pdf'))
-
-                image_count = 0
-                processed_images = set()  # Store hashes of already saved images
-                for newpdf_page_number in range(len(new_pdf)):
-                    newpdf_page = new_pdf[newpdf_page_number]
-
-                    # Extract images from the page
-                    for img_index, img in enumerate(newpdf_page.get_images(full=True)):
-                        xref = img[0]
-                        # Extract the image bytes
-                        base_image = new_pdf.extract_image(xref)
-                        image_bytes = base_image["image"]
-                        image_ext = base_image["ext"]
-                    
-                        # Check if the image is similar to any processed image
-                        is_duplicate = False
-                        for saved_image in processed_images:
-                            if image_bytes==saved_image:
-                                # print(f"Skipped similar image on page {page_number + 1}, index {img_index + 1}")
-                                is_duplicate = True
-                                break
-                        if is_duplicate:
-                            continue
-                        
-                        # Save the image if it's unique
-                        image_filename = f"page{page_number+1}_img{img_index+1}.{image_ext}"
-                        image_path = os.path.join(images_folder, image_filename)
-                    
-                        with open(image_path, "wb") as img_file:
-                            img_file.write(image_bytes)
-                    
-                        # print(f"Saved: {image_path}")
-                        processed_images.add(image_bytes)
-                        image_count += 1
-                    
-                #extracting results from the report
-                #proof pressure test results
-                newpdf_page = new_pdf[10]
-                local_text = newpdf_page.get_text().split('\n')
-                self.hpiv_parameters[HPIVParameters.WEIGHT.value]['value'] = float(local_text[local_text.index('200 gr Maximum')+1].replace('g','').replace(' ',''))
-                self.hpiv_parameters[HPIVParameters.PROOF_OPEN.value]['value'] = float(local_text[local_text.index('Valve Open')+1].replace('',''))
-                self.hpiv_parameters[HPIVParameters.PROOF_CLOSED.value]['value'] = float(local_text[local_text.index('Valve Closed')+1].replace('',''))
-                
-                # leak test results
-                newpdf_page = new_pdf[11]
-                local_text = newpdf_page.get_text().split('\n')
-                self.hpiv_parameters[HPIVParameters.LEAK_4_HP_PRESS.value]['value'] = float(local_text[local_text.index('4')+2].replace('',''))
-                self.hpiv_parameters[HPIVParameters.LEAK_4_HP.value]['value'] = float(local_text[local_text.index('4')+6].split('×10')[0]) * 10**float(local_text[local_text.index('4')+6].split('×10')[1])
-                self.hpiv_parameters[HPIVParameters.LEAK_4_LP_PRESS.value]['value'] = float(local_text[local_text.index('4')+8].replace('',''))  
-                self.hpiv_parameters[HPIVParameters.LEAK_4_LP.value]['value'] = float(local_text[local_text.index('4')+10].split('×10')[0]) * 10**float(local_text[local_text.index('4')+10].split('×10')[1])
-                self.hpiv_parameters[HPIVParameters.LEAK_6_HP_PRESS.value]['value'] = float(local_text[local_text.index('6')+2].replace('',''))
-                self.hpiv_parameters[HPIVParameters.LEAK_6_HP.value]['value'] = float(local_text[local_text.index('6')+6].split('×10')[0]) * 10**float(local_text[local_text.index('6')+6].split('×10')[1])
-                self.hpiv_parameters[HPIVParameters.LEAK_6_LP_PRESS.value]['value'] = float(local_text[local_text.index('6')+8].replace('',''))  
-                self.hpiv_parameters[HPIVParameters.LEAK_6_LP.value]['value'] = float(local_text[local_text.index('6')+10].split('×10')[0]) * 10**float(local_text[local_text.index('6')+10].split('×10')[1])
-                self.hpiv_parameters[HPIVParameters.LEAK_15_HP_PRESS.value]['value'] = float(local_text[local_text.index('15')+2].replace('',''))
-                self.hpiv_parameters[HPIVParameters.LEAK_15_HP.value]['value'] = float(local_text[local_text.index('15')+6].split('×10')[0]) * 10**float(local_text[local_text.index('15')+6].split('×10')[1])
-                self.hpiv_parameters[HPIVParameters.LEAK_15_LP_PRESS.value]['value'] = float(local_text[local_text.index('15')+8].replace('',''))  
-                self.hpiv_parameters[HPIVParameters.LEAK_15_LP.value]['value'] = float(local_text[local_text.index('15')+10].split('×10')[0]) * 10**float(local_text[local_text.index('15')+10].split('×10')[1])
-            
-                # Vibration test results
-                newpdf_page = new_pdf[13]
-                local_text = newpdf_page.get_text().split('\n')
-                vib_results_index = local_text.index('5 – 2000 Hz')
-                if 'refer to' in str(local_text[vib_results_index+1]).lower():
-                    self.hpiv_parameters[HPIVParameters.BEFORE_VIB_FREQ_X.value]['value'] = 0
-                    self.hpiv_parameters[HPIVParameters.BEFORE_VIB_FREQ_Y.value]['value'] = 0
-                    self.hpiv_parameters[HPIVParameters.BEFORE_VIB_PEAK_X.value]['value'] = 0
-                    self.hpiv_parameters[HPIVParameters.BEFORE_VIB_PEAK_Y.value]['value'] = 0
-                    self.hpiv_parameters[HPIVParameters.AFTER_VIB_PEAK_X.value]['value'] = 0
-                    self.hpiv_parameters[HPIVParameters.AFTER_VIB_FREQ_X.value]['value'] = 0
-                    self.hpiv_parameters[HPIVParameters.AFTER_VIB_PEAK_Y.value]['value'] = 0
-                    self.hpiv_parameters[HPIVParameters.AFTER_VIB_FREQ_Y.value]['value'] = 0
-                else:
-                    self.hpiv_parameters[HPIVParameters.BEFORE_VIB_FREQ_X.value]['value'] = float(local_text[vib_results_index+1].replace('Hz','').replace(' ',''))
-                    self.hpiv_parameters[HPIVParameters.BEFORE_VIB_PEAK_X.value]['value'] = float(local_text[vib_results_index+2].replace('g','').replace(' ',''))
-                    self.hpiv_parameters[HPIVParameters.BEFORE_VIB_FREQ_Y.value]['value'] = float(local_text[vib_results_index+3].replace('Hz','').replace(' ',''))
-                    self.hpiv_parameters[HPIVParameters.BEFORE_VIB_PEAK_Y.value]['value'] = float(local_text[vib_results_index+4].replace('g','').replace(' ',''))
-                    self.hpiv_parameters[HPIVParameters.AFTER_VIB_FREQ_X.value]['value'] = float(local_text[vib_results_index+7].replace('Hz','').replace(' ',''))
-                    self.hpiv_parameters[HPIVParameters.AFTER_VIB_PEAK_X.value]['value'] = float(local_text[vib_results_index+8].replace('g','').replace(' ',''))
-                    self.hpiv_parameters[HPIVParameters.AFTER_VIB_FREQ_Y.value]['value'] = float(local_text[vib_results_index+9].replace('Hz','').replace(' ',''))
-                    self.hpiv_parameters[HPIVParameters.AFTER_VIB_PEAK_Y.value]['value'] = float(local_text[vib_results_index+10].replace('g','').replace(' ',''))
-                
-                self.hpiv_parameters[HPIVParameters.VIB_GRMS_X.value]['value'] = float(local_text[local_text.index('Vibration (grms)')+1])
-                self.hpiv_parameters[HPIVParameters.VIB_GRMS_Y.value]['value'] = float(local_text[local_text.index('Vibration (grms)')+2])
-            
-                # electric test results
-                newpdf_page = new_pdf[20]
-                local_text = newpdf_page.get_text().split('\n')
-                self.hpiv_parameters[HPIVParameters.DIELECTRIC_STR.value]['value'] = float(local_text[local_text.index('< 2')+1].replace('',''))
-                raw_value = local_text[local_text.index('> 100')+1].replace(' ', '')
-                if '∞' in raw_value:
-                    raw_value = raw_value.replace('∞', '1e+19')
-                self.hpiv_parameters[HPIVParameters.INSULATION_RES.value]['value'] = float(raw_value)
-                newpdf_page = new_pdf[21]
-                local_text = newpdf_page.get_text().split('\n')
-                self.hpiv_parameters[HPIVParameters.POWER_TEMP.value]['value'] = float(local_text[local_text.index('20±2')+1].replace('',''))
-                self.hpiv_parameters[HPIVParameters.POWER_RES.value]['value'] = float(local_text[local_text.index('43.3±0.5')+1].replace('',''))
-                self.hpiv_parameters[HPIVParameters.POWER_POWER.value]['value'] = float(local_text[local_text.index('< 10')+1].replace('',''))
-                self.hpiv_parameters[HPIVParameters.EXT_LEAK.value]['value'] = float(local_text[local_text.index('≤ 1.0×10-10')+1].split('×10')[0]) * 10**float(local_text[local_text.index('≤ 1.0×10-10')+1].split('×10')[1])
-                
-                newpdf_page = new_pdf[22]
-                local_text = newpdf_page.get_text().split('\n')
-                self.hpiv_parameters[HPIVParameters.PULLIN_PRES.value]['value'] = float(local_text[local_text.index('> 310')+1].replace('',''))
-                self.hpiv_parameters[HPIVParameters.PULLIN_VOLT.value]['value'] = float(local_text[local_text.index('< 18')+1].replace('',''))
-                try:
-                    self.hpiv_parameters[HPIVParameters.DROPOUT_VOLT.value]['value'] = float(local_text[local_text.index('> 2 ')+1].replace('',''))
-                except Exception as e:
-                    # print([i.replace(' ', '').lower() for i in local_text])
-                    id_ = next((idx for idx, i in enumerate(local_text) if '2<x<3.1' in i.replace(' ', '').lower() and len(i.replace(' ', '')) < 25), 0)
-                    # print(local_text[id_])
-                    self.hpiv_parameters[HPIVParameters.DROPOUT_VOLT.value]['value'] = float(local_text[id_ + 1].strip())
-                
-                newpdf_page = new_pdf[23]
-                local_text = newpdf_page.get_text().split('\n')
-                self.hpiv_parameters[HPIVParameters.RESPO_PRES.value]['value'] = float(local_text[local_text.index('> 310')+1].replace('',''))
-                self.hpiv_parameters[HPIVParameters.RESPO_VOLT.value]['value'] = float(local_text[local_text.index('18±0.2')+1].replace('',''))
-                self.hpiv_parameters[HPIVParameters.RESPO_TIME.value]['value'] = float(local_text[local_text.index('< 20')+1].replace('',''))
-                local_text = local_text[local_text.index('< 20')+1:]
-                self.hpiv_parameters[HPIVParameters.RESPC_VOLT.value]['value'] = float(local_text[local_text.index('32±0.2')+1].replace('',''))
-                self.hpiv_parameters[HPIVParameters.RESPC_TIME.value]['value'] = float(local_text[local_text.index('< 20')+1].replace('',''))
-                self.hpiv_parameters[HPIVParameters.PRESSD.value]['value'] = float(local_text[local_text.index('< 1')+1].replace('',''))
-                self.hpiv_parameters[HPIVParameters.FLOWRATE.value]['value'] = float(local_text[local_text.index('> 10')+1].replace('',''))           
-                
-                # cleanliness results
-                newpdf_page = new_pdf[24]
-                local_text = newpdf_page.get_text().split('\n')
-                self.hpiv_parameters[HPIVParameters.CLEANLINESS_6_10.value]['value'] = float(local_text[local_text.index('6-10')+2].replace('-','0'))
-                self.hpiv_parameters[HPIVParameters.CLEANLINESS_11_25.value]['value'] = float(local_text[local_text.index('11-25')+2].replace('-','0'))
-                self.hpiv_parameters[HPIVParameters.CLEANLINESS_26_50.value]['value'] = float(local_text[local_text.index('26-50')+2].replace('-','0'))
-                self.hpiv_parameters[HPIVParameters.CLEANLINESS_51_100.value]['value'] = float(local_text[local_text.index('51-100')+2].replace('-','0'))
-                self.hpiv_parameters[HPIVParameters.CLEANLINESS_100.value]['value'] = float(local_text[local_text.index('Over 100')+2].replace('-','0'))
-
-                self.test_results.append(self.hpiv_parameters)
-            
+                valve_reports.append((valve_serial, page_number))
+
             if "HARDWARE" in page_text and 'Part' in page_text:
                 local_text: list[str] = page_text.split('\n')
-                next_page = pdf_document[page_number+1]
-                local_text.extend(next_page.get_text().split('\n'))
-                next_page2 = pdf_document[page_number+2]
-                local_text.extend(next_page2.get_text().split('\n'))
+                local_text.extend(pages[page_number+1].split('\n'))
+                local_text.extend(pages[page_number+2].split('\n'))
 
                 for part_name, part_number in self.part_number_map.items():
                     try:
@@ -428,9 +361,121 @@ class HPIVData:
                         'part_name': part_name.value
                     }
 
-        pdf_document.close()
+        jobs = []
+        for valve_serial, page_number in valve_reports:
+            valve_folder = os.path.join(split_report_folder, valve_serial)
+            os.makedirs(valve_folder, exist_ok=True)
+            images_folder = os.path.join(valve_folder, "extracted_images") if output_folder else "extracted_images"
+            os.makedirs(images_folder, exist_ok=True)
+            report_file = os.path.join(valve_folder, f'Acceptance_report_valve_{valve_serial}.pdf')
+            jobs.append((self.pdf_file, page_number, min(page_number + 24, len(pages) - 1), report_file, images_folder))
+        with profiler.stage("split_reports"):
+            write_valve_reports(jobs, workers=workers)
+
+        for valve_serial, page_number in valve_reports:
+            self.get_hpiv_parameters()  # Initialize parameters for the new valve
+            self.hpiv_parameters[HPIVParameters.HPIV_ID.value] = valve_serial
+            self.hpivs.add(valve_serial)
+            self.parse_valve_report(pages[page_number:page_number + 25])
+            self.test_results.append(self.hpiv_parameters)
+
         self.check_within_limits() 
-        
+
+    def parse_valve_report(self, pages: list[str]) -> None:
+        """
+        Extract the test results of one valve from the page texts of its acceptance test report.
+        Args:
+            pages (list[str]): Text of the 25 report pages, starting at the report cover page.
+        """
+        #extracting results from the report
+        #proof pressure test results
+        local_text = pages[10].split('\n')
+        self.hpiv_parameters[HPIVParameters.WEIGHT.value]['value'] = float(local_text[local_text.index('200 gr Maximum')+1].replace('g','').replace(' ',''))
+        self.hpiv_parameters[HPIVParameters.PROOF_OPEN.value]['value'] = float(local_text[local_text.index('Valve Open')+1].replace('',''))
+        self.hpiv_parameters[HPIVParameters.PROOF_CLOSED.value]['value'] = float(local_text[local_text.index('Valve Closed')+1].replace('',''))
+
+        # leak test results
+        local_text = pages[11].split('\n')
+        self.hpiv_parameters[HPIVParameters.LEAK_4_HP_PRESS.value]['value'] = float(local_text[local_text.index('4')+2].replace('',''))
+        self.hpiv_parameters[HPIVParameters.LEAK_4_HP.value]['value'] = float(local_text[local_text.index('4')+6].split('×10')[0]) * 10**float(local_text[local_text.index('4')+6].split('×10')[1])
+        self.hpiv_parameters[HPIVParameters.LEAK_4_LP_PRESS.value]['value'] = float(local_text[local_text.index('4')+8].replace('',''))  
+        self.hpiv_parameters[HPIVParameters.LEAK_4_LP.value]['value'] = float(local_text[local_text.index('4')+10].split('×10')[0]) * 10**float(local_text[local_text.index('4')+10].split('×10')[1])
+        self.hpiv_parameters[HPIVParameters.LEAK_6_HP_PRESS.value]['value'] = float(local_text[local_text.index('6')+2].replace('',''))
+        self.hpiv_parameters[HPIVParameters.LEAK_6_HP.value]['value'] = float(local_text[local_text.index('6')+6].split('×10')[0]) * 10**float(local_text[local_text.index('6')+6].split('×10')[1])
+        self.hpiv_parameters[HPIVParameters.LEAK_6_LP_PRESS.value]['value'] = float(local_text[local_text.index('6')+8].replace('',''))  
+        self.hpiv_parameters[HPIVParameters.LEAK_6_LP.value]['value'] = float(local_text[local_text.index('6')+10].split('×10')[0]) * 10**float(local_text[local_text.index('6')+10].split('×10')[1])
+        self.hpiv_parameters[HPIVParameters.LEAK_15_HP_PRESS.value]['value'] = float(local_text[local_text.index('15')+2].replace('',''))
+        self.hpiv_parameters[HPIVParameters.LEAK_15_HP.value]['value'] = float(local_text[local_text.index('15')+6].split('×10')[0]) * 10**float(local_text[local_text.index('15')+6].split('×10')[1])
+        self.hpiv_parameters[HPIVParameters.LEAK_15_LP_PRESS.value]['value'] = float(local_text[local_text.index('15')+8].replace('',''))  
+        self.hpiv_parameters[HPIVParameters.LEAK_15_LP.value]['value'] = float(local_text[local_text.index('15')+10].split('×10')[0]) * 10**float(local_text[local_text.index('15')+10].split('×10')[1])
+
+        # Vibration test results
+        local_text = pages[13].split('\n')
+        vib_results_index = local_text.index('5 – 2000 Hz')
+        if 'refer to' in str(local_text[vib_results_index+1]).lower():
+            self.hpiv_parameters[HPIVParameters.BEFORE_VIB_FREQ_X.value]['value'] = 0
+            self.hpiv_parameters[HPIVParameters.BEFORE_VIB_FREQ_Y.value]['value'] = 0
+            self.hpiv_parameters[HPIVParameters.BEFORE_VIB_PEAK_X.value]['value'] = 0
+            self.hpiv_parameters[HPIVParameters.BEFORE_VIB_PEAK_Y.value]['value'] = 0
+            self.hpiv_parameters[HPIVParameters.AFTER_VIB_PEAK_X.value]['value'] = 0
+            self.hpiv_parameters[HPIVParameters.AFTER_VIB_FREQ_X.value]['value'] = 0
+            self.hpiv_parameters[HPIVParameters.AFTER_VIB_PEAK_Y.value]['value'] = 0
+            self.hpiv_parameters[HPIVParameters.AFTER_VIB_FREQ_Y.value]['value'] = 0
+        else:
+            self.hpiv_parameters[HPIVParameters.BEFORE_VIB_FREQ_X.value]['value'] = float(local_text[vib_results_index+1].replace('Hz','').replace(' ',''))
+            self.hpiv_parameters[HPIVParameters.BEFORE_VIB_PEAK_X.value]['value'] = float(local_text[vib_results_index+2].replace('g','').replace(' ',''))
+            self.hpiv_parameters[HPIVParameters.BEFORE_VIB_FREQ_Y.value]['value'] = float(local_text[vib_results_index+3].replace('Hz','').replace(' ',''))
+            self.hpiv_parameters[HPIVParameters.BEFORE_VIB_PEAK_Y.value]['value'] = float(local_text[vib_results_index+4].replace('g','').replace(' ',''))
+            self.hpiv_parameters[HPIVParameters.AFTER_VIB_FREQ_X.value]['value'] = float(local_text[vib_results_index+7].replace('Hz','').replace(' ',''))
+            self.hpiv_parameters[HPIVParameters.AFTER_VIB_PEAK_X.value]['value'] = float(local_text[vib_results_index+8].replace('g','').replace(' ',''))
+            self.hpiv_parameters[HPIVParameters.AFTER_VIB_FREQ_Y.value]['value'] = float(local_text[vib_results_index+9].replace('Hz','').replace(' ',''))
+            self.hpiv_parameters[HPIVParameters.AFTER_VIB_PEAK_Y.value]['value'] = float(local_text[vib_results_index+10].replace('g','').replace(' ',''))
+
+        self.hpiv_parameters[HPIVParameters.VIB_GRMS_X.value]['value'] = float(local_text[local_text.index('Vibration (grms)')+1])
+        self.hpiv_parameters[HPIVParameters.VIB_GRMS_Y.value]['value'] = float(local_text[local_text.index('Vibration (grms)')+2])
+
+        # electric test results
+        local_text = pages[20].split('\n')
+        self.hpiv_parameters[HPIVParameters.DIELECTRIC_STR.value]['value'] = float(local_text[local_text.index('< 2')+1].replace('',''))
+        raw_value = local_text[local_text.index('> 100')+1].replace(' ', '')
+        if '∞' in raw_value:
+            raw_value = raw_value.replace('∞', '1e+19')
+        self.hpiv_parameters[HPIVParameters.INSULATION_RES.value]['value'] = float(raw_value)
+        local_text = pages[21].split('\n')
+        self.hpiv_parameters[HPIVParameters.POWER_TEMP.value]['value'] = float(local_text[local_text.index('20±2')+1].replace('',''))
+        self.hpiv_parameters[HPIVParameters.POWER_RES.value]['value'] = float(local_text[local_text.index('43.3±0.5')+1].replace('',''))
+        self.hpiv_parameters[HPIVParameters.POWER_POWER.value]['value'] = float(local_text[local_text.index('< 10')+1].replace('',''))
+        self.hpiv_parameters[HPIVParameters.EXT_LEAK.value]['value'] = float(local_text[local_text.index('≤ 1.0×10-10')+1].split('×10')[0]) * 10**float(local_text[local_text.index('≤ 1.0×10-10')+1].split('×10')[1])
+
+        local_text = pages[22].split('\n')
+        self.hpiv_parameters[HPIVParameters.PULLIN_PRES.value]['value'] = float(local_text[local_text.index('> 310')+1].replace('',''))
+        self.hpiv_parameters[HPIVParameters.PULLIN_VOLT.value]['value'] = float(local_text[local_text.index('< 18')+1].replace('',''))
+        try:
+            self.hpiv_parameters[HPIVParameters.DROPOUT_VOLT.value]['value'] = float(local_text[local_text.index('> 2 ')+1].replace('',''))
+        except Exception as e:
+            # print([i.replace(' ', '').lower() for i in local_text])
+            id_ = next((idx for idx, i in enumerate(local_text) if '2<x<3.1' in i.replace(' ', '').lower() and len(i.replace(' ', '')) < 25), 0)
+            # print(local_text[id_])
+            self.hpiv_parameters[HPIVParameters.DROPOUT_VOLT.value]['value'] = float(local_text[id_ + 1].strip())
+
+        local_text = pages[23].split('\n')
+        self.hpiv_parameters[HPIVParameters.RESPO_PRES.value]['value'] = float(local_text[local_text.index('> 310')+1].replace('',''))
+        self.hpiv_parameters[HPIVParameters.RESPO_VOLT.value]['value'] = float(local_text[local_text.index('18±0.2')+1].replace('',''))
+        self.hpiv_parameters[HPIVParameters.RESPO_TIME.value]['value'] = float(local_text[local_text.index('< 20')+1].replace('',''))
+        local_text = local_text[local_text.index('< 20')+1:]
+        self.hpiv_parameters[HPIVParameters.RESPC_VOLT.value]['value'] = float(local_text[local_text.index('32±0.2')+1].replace('',''))
+        self.hpiv_parameters[HPIVParameters.RESPC_TIME.value]['value'] = float(local_text[local_text.index('< 20')+1].replace('',''))
+        self.hpiv_parameters[HPIVParameters.PRESSD.value]['value'] = float(local_text[local_text.index('< 1')+1].replace('',''))
+        self.hpiv_parameters[HPIVParameters.FLOWRATE.value]['value'] = float(local_text[local_text.index('> 10')+1].replace('',''))           
+
+        # cleanliness results
+        local_text = pages[24].split('\n')
+        self.hpiv_parameters[HPIVParameters.CLEANLINESS_6_10.value]['value'] = float(local_text[local_text.index('6-10')+2].replace('-','0'))
+        self.hpiv_parameters[HPIVParameters.CLEANLINESS_11_25.value]['value'] = float(local_text[local_text.index('11-25')+2].replace('-','0'))
+        self.hpiv_parameters[HPIVParameters.CLEANLINESS_26_50.value]['value'] = float(local_text[local_text.index('26-50')+2].replace('-','0'))
+        self.hpiv_parameters[HPIVParameters.CLEANLINESS_51_100.value]['value'] = float(local_text[local_text.index('51-100')+2].replace('-','0'))
+        self.hpiv_parameters[HPIVParameters.CLEANLINESS_100.value]['value'] = float(local_text[local_text.index('Over 100')+2].replace('-','0'))
+
     def check_within_limits(self) -> None:
         """
         Check if test result values are within defined limits.
@@ -764,6 +809,7 @@ class HPIVLogicSQL:
                         session.add(new_certification)
                         
             session.commit()
+            invalidate_characteristic_matrix()
             # print(f"Successfully updated database with {len(self.hpiv_test_results)} HPIV records")
             # self.fms.print_table(HPIVCharacteristics)
             
@@ -866,6 +912,7 @@ class HPIVLogicSQL:
                     continue
 
             session.commit()
+            invalidate_characteristic_matrix()
             print(f"Successfully updated database with HPIV certifications")
             self.fms.print_table(HPIVCertification)
             
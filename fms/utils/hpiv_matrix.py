@@ -0,0 +1,220 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+# Standard library
+import threading
+
+# Third-party
+import numpy as np
+import pandas as pd
+from sqlalchemy import case, func, select
+
+# Local imports
+from ..db import HPIVCertification, HPIVCharacteristics
+from .enums import LimitStatus
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+
+class HPIVCharacteristicMatrix:
+    """
+    Pivoted HPIV characteristics: one row per valve, one column per parameter.
+
+    Built from a single query over HPIVCertification joined with HPIVCharacteristics, so the
+    query app never walks the valves and their lazy-loaded characteristics one by one.
+    Missing parameters are NaN in values and None in within_limits. Only valves with at least
+    one characteristic are included.
+
+    Attributes
+    ----------
+    hpiv_ids : list[str]
+        Valve serial numbers, one per row.
+    certifications : np.ndarray
+        Certification batch per valve (None if not certified yet).
+    parameters : list[str]
+        Parameter names, one per column.
+    values : np.ndarray
+        (valves x parameters) float array of the parameter values.
+    within_limits : np.ndarray
+        (valves x parameters) object array of LimitStatus.
+    units : dict[str, str]
+        Parameter name -> unit.
+    signature : tuple
+        Change marker of the characteristics and certifications when the matrix was built, see _signature.
+
+    Methods
+    -------
+    column(parameter, certification='all'):
+        Values of a parameter across the valves of a batch.
+    pairs(parameter1, parameter2, certification='all'):
+        Values of two parameters for the valves that have both.
+    entry(hpiv_id, parameter):
+        Value, unit and limit status of one valve parameter.
+    batches():
+        Certification batches of the valves.
+    to_dataframe():
+        Values as a DataFrame indexed by valve serial.
+    """
+
+    def __init__(self, rows: list[tuple], signature: tuple = None) -> None:
+        self.signature = signature
+        self.hpiv_ids: list[str] = []
+        self.parameters: list[str] = []
+        self.units: dict[str, str] = {}
+        certifications: list[str | None] = []
+        row_index: dict[str, int] = {}
+        col_index: dict[str, int] = {}
+        cells: dict[tuple[int, int], tuple[float, str, LimitStatus | None]] = {}
+
+        for hpiv_id, certification, parameter, value, unit, within_limits in rows:
+            if hpiv_id not in row_index:
+                row_index[hpiv_id] = len(self.hpiv_ids)
+                self.hpiv_ids.append(hpiv_id)
+                certifications.append(certification)
+            if parameter not in col_index:
+                col_index[parameter] = len(self.parameters)
+                self.parameters.append(parameter)
+            if unit and parameter not in self.units:
+                self.units[parameter] = unit
+            # The first entry of a parameter wins, like the relationship scan it replaces
+            cells.setdefault((row_index[hpiv_id], col_index[parameter]), (value, unit, within_limits))
+
+        shape = (len(self.hpiv_ids), len(self.parameters))
+        self.values = np.full(shape, np.nan)
+        self.within_limits = np.full(shape, None, dtype=object)
+        for (row, col), (value, _, within_limits) in cells.items():
+            self.values[row, col] = np.nan if value is None else value
+            self.within_limits[row, col] = within_limits
+        self._cell_units = {cell: unit for cell, (_, unit, _) in cells.items() if unit}
+        self.certifications = np.array(certifications, dtype=object)
+        self._row_index = row_index
+        self._col_index = col_index
+
+    def _rows(self, certification: str) -> np.ndarray:
+        if certification == 'all':
+            return np.ones(len(self.hpiv_ids), dtype=bool)
+        return self.certifications == certification
+
+    def column(self, parameter: str, certification: str = 'all') -> np.ndarray:
+        """
+        Values of a parameter across the valves of a certification batch, NaN entries removed.
+        Args:
+            parameter (str): Parameter name.
+            certification (str): Certification batch, 'all' for every valve.
+        Returns:
+            np.ndarray: Parameter values.
+        """
+        col = self._col_index.get(parameter)
+        if col is None:
+            return np.empty(0)
+        values = self.values[self._rows(certification), col]
+        return values[~np.isnan(values)]
+
+    def pairs(self, parameter1: str, parameter2: str, certification: str = 'all') -> tuple[np.ndarray, np.ndarray]:
+        """
+        Values of two parameters for the valves of a batch that have both.
+        Args:
+            parameter1 (str): First parameter name.
+            parameter2 (str): Second parameter name.
+            certification (str): Certification batch, 'all' for every valve.
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Values of parameter1 and parameter2, aligned per valve.
+        """
+        col1 = self._col_index.get(parameter1)
+        col2 = self._col_index.get(parameter2)
+        if col1 is None or col2 is None:
+            return np.empty(0), np.empty(0)
+        block = self.values[self._rows(certification)][:, [col1, col2]]
+        block = block[~np.isnan(block).any(axis=1)]
+        return block[:, 0], block[:, 1]
+
+    def entry(self, hpiv_id: str, parameter: str) -> tuple[float, str, LimitStatus | None] | None:
+        """
+        Value, unit and limit status of one parameter of one valve.
+        Args:
+            hpiv_id (str): Valve serial number.
+            parameter (str): Parameter name.
+        Returns:
+            tuple | None: (value, unit, within_limits), None if the valve has no such parameter.
+        """
+        row = self._row_index.get(hpiv_id)
+        col = self._col_index.get(parameter)
+        if row is None or col is None or np.isnan(self.values[row, col]):
+            return None
+        unit = self._cell_units.get((row, col), self.units.get(parameter))
+        return float(self.values[row, col]), unit, self.within_limits[row, col]
+
+    def batches(self) -> list[str]:
+        """
+        Certification batches of the valves in the matrix.
+        Returns:
+            list[str]: Unique certification batches.
+        """
+        return list({c for c in self.certifications if c})
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Values as a DataFrame indexed by valve serial, with the certification batch as first column.
+        Returns:
+            pd.DataFrame: One row per valve, one column per parameter.
+        """
+        df = pd.DataFrame(self.values, index=pd.Index(self.hpiv_ids, name='hpiv_id'), columns=self.parameters)
+        df.insert(0, 'certification', self.certifications)
+        return df
+
+
+_matrix_cache: dict[str, HPIVCharacteristicMatrix] = {}
+_matrix_lock = threading.Lock()
+
+
+def _signature(session: "Session") -> tuple:
+    # Row count and highest id see added or removed characteristics, the value sum and the ids summed per
+    # status see values and statuses updated in place (also by other processes), the number of certified
+    # valves sees new certifications
+    status_sums = [func.sum(case((HPIVCharacteristics.within_limits == status, HPIVCharacteristics.id), else_=0))
+                   for status in LimitStatus]
+    certified = select(func.count(HPIVCertification.certification)).scalar_subquery()
+    return tuple(session.query(func.count(HPIVCharacteristics.id), func.max(HPIVCharacteristics.id),
+                               func.sum(HPIVCharacteristics.parameter_value), *status_sums, certified).one())
+
+
+def load_characteristic_matrix(session: "Session") -> HPIVCharacteristicMatrix:
+    """
+    Pivoted characteristics of all HPIVs, queried once per database and reused until
+    invalidate_characteristic_matrix() is called (by HPIVLogicSQL after every write), or
+    until the characteristics change: rows added or removed, values or limit statuses updated
+    in place, or valves certified.
+    Args:
+        session (Session): Database session.
+    Returns:
+        HPIVCharacteristicMatrix: Valves x parameters matrix.
+    """
+    key = str(session.get_bind().url)
+    signature = _signature(session)
+    with _matrix_lock:
+        cached = _matrix_cache.get(key)
+        if cached is not None and cached.signature == signature:
+            return cached
+
+    rows = session.query(
+        HPIVCertification.hpiv_id,
+        HPIVCertification.certification,
+        HPIVCharacteristics.parameter_name,
+        HPIVCharacteristics.parameter_value,
+        HPIVCharacteristics.unit,
+        HPIVCharacteristics.within_limits
+    ).join(HPIVCharacteristics, HPIVCharacteristics.hpiv_id == HPIVCertification.hpiv_id).order_by(HPIVCharacteristics.id).all()
+    matrix = HPIVCharacteristicMatrix(rows, signature=signature)
+
+    with _matrix_lock:
+        _matrix_cache[key] = matrix
+    return matrix
+
+
+def invalidate_characteristic_matrix() -> None:
+    """
+    Forget the cached characteristic matrices, e.g. after new characteristics or certifications were written.
+    """
+    with _matrix_lock:
+        _matrix_cache.clear()
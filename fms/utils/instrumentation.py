@@ -0,0 +1,220 @@
+# Standard library
+import functools
+import threading
+import time
+import traceback
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Iterator, TYPE_CHECKING
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+# Local imports
+from ..db import IngestMetrics
+from .general_utils import save_to_json
+
+
+class IngestProfiler:
+    """
+    Collects wall-clock timings and counters for the ingest pipeline.
+
+    Stages are entered with the ``stage`` context manager or the ``timed`` decorator.
+    Nested stages are recorded under a slash-separated path (e.g.
+    ``add_fms_main_test_data/parse``), tracked per thread so the listener threads
+    do not mix their stacks. Counters record how many items (files, rows, pages)
+    went through a stage.
+
+    Attributes
+    ----------
+    name : str
+        Name of the profiled run, used as prefix for the report file.
+    enabled : bool
+        If False, stages and counters are no-ops.
+    run_id : str
+        Identifier of the current run, regenerated on reset().
+    started : datetime
+        Start time of the current run.
+    stages : dict
+        Stage path -> {'calls', 'total', 'max'} accumulated timings.
+    counters : dict
+        Counter name -> accumulated count.
+
+    Methods
+    -------
+    stage(name):
+        Context manager timing a (nested) section.
+    timed(name=None):
+        Decorator timing a function as a stage.
+    count(name, n=1):
+        Increment a counter.
+    report():
+        Build the structured report dictionary.
+    save_report(file_name=None, directory="appdata"):
+        Write the report to the JSON cache.
+    write_to_db(session):
+        Persist the report rows into the IngestMetrics table.
+    print_summary(top=15):
+        Print the slowest stages with their share of the run.
+    reset():
+        Clear all timings and counters and start a new run.
+    """
+
+    def __init__(self, name: str = "ingest", enabled: bool = True) -> None:
+        self.name = name
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.run_id = uuid.uuid4().hex[:12]
+            self.started = datetime.now()
+            self._t0 = time.perf_counter()
+            self.stages = {}
+            self.counters = {}
+
+    def _stack(self) -> list[str]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Time the enclosed block as a stage, nested under the currently open stage.
+        """
+        if not self.enabled:
+            yield
+            return
+        stack = self._stack()
+        stack.append(name)
+        path = "/".join(stack)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            with self._lock:
+                entry = self.stages.setdefault(path, {"calls": 0, "total": 0.0, "max": 0.0})
+                entry["calls"] += 1
+                entry["total"] += elapsed
+                entry["max"] = max(entry["max"], elapsed)
+
+    def timed(self, name: str | None = None) -> Callable:
+        """
+        Decorator that runs the wrapped function inside ``stage(name)``,
+        defaulting to the function name.
+        """
+        def decorator(func: Callable) -> Callable:
+            stage_name = name or func.__name__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(stage_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def count(self, name: str, n: int = 1) -> None:
+        """
+        Increment a counter, prefixed with the currently open stage path.
+        """
+        if not self.enabled:
+            return
+        stack = self._stack()
+        key = "/".join(stack + [name]) if stack else name
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + n
+
+    def report(self) -> dict[str, Any]:
+        """
+        Build the structured timing report of the current run.
+        Returns:
+            dict: Run metadata, per-stage timings (sorted by total time) and counters.
+        """
+        wall = time.perf_counter() - self._t0
+        with self._lock:
+            stages = {
+                path: {
+                    "calls": entry["calls"],
+                    "total_seconds": round(entry["total"], 6),
+                    "mean_seconds": round(entry["total"] / entry["calls"], 6) if entry["calls"] else 0.0,
+                    "max_seconds": round(entry["max"], 6),
+                    "share": round(entry["total"] / wall, 4) if wall > 0 else 0.0,
+                }
+                for path, entry in sorted(self.stages.items(), key=lambda x: x[1]["total"], reverse=True)
+            }
+            counters = dict(sorted(self.counters.items()))
+        return {
+            "name": self.name,
+            "run_id": self.run_id,
+            "started": self.started.isoformat(timespec="seconds"),
+            "wall_seconds": round(wall, 6),
+            "stages": stages,
+            "counters": counters,
+        }
+
+    def save_report(self, file_name: str | None = None, directory: str = "appdata") -> dict[str, Any]:
+        """
+        Save the timing report as JSON, by default in the json cache as '<name>_report_<run_id>'.
+        """
+        report = self.report()
+        if not file_name:
+            file_name = f"{self.name}_report_{self.run_id}"
+        save_to_json(report, file_name, directory=directory)
+        return report
+
+    def write_to_db(self, session: "Session") -> None:
+        """
+        Persist the current report into the IngestMetrics table.
+        """
+        report = self.report()
+        try:
+            date_created = datetime.now()
+            rows = [
+                IngestMetrics(
+                    run_id=self.run_id,
+                    metric_type="stage",
+                    name=path,
+                    calls=entry["calls"],
+                    total_seconds=entry["total_seconds"],
+                    max_seconds=entry["max_seconds"],
+                    share=entry["share"],
+                    date_created=date_created,
+                )
+                for path, entry in report["stages"].items()
+            ]
+            rows.extend(
+                IngestMetrics(
+                    run_id=self.run_id,
+                    metric_type="counter",
+                    name=name,
+                    calls=value,
+                    date_created=date_created,
+                )
+                for name, value in report["counters"].items()
+            )
+            session.add_all(rows)
+            session.commit()
+        except Exception as e:
+            print(f"Error writing ingest metrics: {e}")
+            traceback.print_exc()
+            session.rollback()
+
+    def print_summary(self, top: int = 15) -> None:
+        """
+        Print the slowest stages of the current run with their share of the wall time.
+        """
+        report = self.report()
+        print(f"\n--- {self.name} run {self.run_id}: {report['wall_seconds']:.2f} s ---")
+        for path, entry in list(report["stages"].items())[:top]:
+            print(f"{entry['share']*100:6.1f}%  {entry['total_seconds']:9.3f} s  {entry['calls']:6d}x  {path}")
+        for name, value in report["counters"].items():
+            print(f"{value:>8}  {name}")
+
+
+profiler = IngestProfiler()
+"""Shared profiler used by FMSDataStructure and the listeners."""
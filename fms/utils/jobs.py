@@ -0,0 +1,413 @@
+from __future__ import annotations
+from typing import Any, Callable
+
+# Standard library
+import itertools
+import threading
+import traceback
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+# Third-party
+import ipywidgets as widgets
+
+# Local imports
+from .enums import JobStatus
+
+MAX_WORKERS = 2
+"""Number of jobs running at the same time, further jobs wait in the queue."""
+
+MAX_PANEL_ROWS = 10
+"""Number of jobs shown in a JobPanel, the oldest finished ones are removed first."""
+
+_job_ids = itertools.count(1)
+_current = threading.local()
+
+
+class JobCancelled(Exception):
+    """
+    Raised by check_cancelled inside a job whose cancellation was requested.
+    """
+
+
+def call_now(callback: Callable, *args: Any) -> None:
+    """
+    Dispatcher calling the callback right away, in the thread that finished the job (headless use).
+    """
+    callback(*args)
+
+
+def kernel_dispatcher() -> Callable:
+    """
+    Dispatcher handing callbacks to the IPython kernel's event loop, so results and progress reach the
+    widgets from the kernel thread. Outside a kernel the callbacks are called right away (call_now).
+    """
+    try:
+        from IPython import get_ipython
+        io_loop = getattr(getattr(get_ipython(), "kernel", None), "io_loop", None)
+    except ImportError:
+        io_loop = None
+    add_callback = getattr(io_loop, "add_callback", None)
+    return add_callback if callable(add_callback) else call_now
+
+
+class Job:
+    """
+    Background job submitted to a JobRunner.
+
+    Cancellation is cooperative: a queued job is dropped right away, a running job stops at its next
+    check_cancelled call. Jobs running in a process can only be cancelled while queued.
+
+    Attributes
+    ----------
+    id : int
+        Job number, unique within the process.
+    name : str
+        Description shown in the progress panel.
+    status : JobStatus
+        Current state.
+    progress : float
+        Fraction done, 0 to 1.
+    message : str
+        Last progress message.
+    error : BaseException | None
+        Error of a failed job.
+    writes_database : bool
+        Whether the job holds the database lock of its runner while it runs.
+    future : Future
+        Future of the job result.
+
+    Methods
+    -------
+    report(progress=None, message=None):
+        Update the progress, from within the job.
+    check_cancelled():
+        Raise JobCancelled if cancellation was requested.
+    cancel():
+        Request cancellation.
+    done():
+        Whether the job finished, failed or was cancelled.
+    result(timeout=None):
+        Wait for the job and return its result.
+    wait(timeout=None):
+        Wait for the job without raising its error.
+    add_listener(listener):
+        Call listener(job) on every progress or status change.
+    database():
+        Lock serializing the database writes of the runner.
+    """
+
+    def __init__(self, runner: "JobRunner", name: str, writes_database: bool = False) -> None:
+        self.id = next(_job_ids)
+        self.name = name
+        self.status = JobStatus.PENDING
+        self.progress = 0.0
+        self.message = ""
+        self.error: BaseException | None = None
+        self.writes_database = writes_database
+        self.future: Future | None = None
+        self._runner = runner
+        self._cancel_requested = threading.Event()
+        self._finished = threading.Event()
+        self._listeners: list[Callable[[Job], None]] = []
+
+    def __repr__(self) -> str:
+        return f"Job({self.id}, {self.name!r}, {self.status.value}, {self.progress:.0%})"
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel_requested.is_set()
+
+    def add_listener(self, listener: Callable[["Job"], None]) -> None:
+        self._listeners.append(listener)
+
+    def _notify(self) -> None:
+        for listener in list(self._listeners):
+            self._runner.dispatch(listener, self)
+
+    def report(self, progress: float = None, message: str = None) -> None:
+        """
+        Update the progress of the job.
+        Args:
+            progress (float, optional): Fraction done, clipped to 0-1.
+            message (str, optional): Current step, shown next to the progress bar.
+        """
+        if progress is not None:
+            self.progress = min(max(float(progress), 0.0), 1.0)
+        if message is not None:
+            self.message = message
+        self._notify()
+
+    def check_cancelled(self) -> None:
+        if self._cancel_requested.is_set():
+            raise JobCancelled(f"Job {self.name} was cancelled")
+
+    def cancel(self) -> bool:
+        """
+        Request cancellation of the job.
+        Returns:
+            bool: True if the job was still queued and is dropped, False if it runs (or ran) and
+                stops at its next check_cancelled call, if any.
+        """
+        self._cancel_requested.set()
+        return self.future.cancel() if self.future is not None else False
+
+    def done(self) -> bool:
+        return self.status in (JobStatus.DONE, JobStatus.FAILED, JobStatus.CANCELLED)
+
+    def result(self, timeout: float = None) -> Any:
+        """
+        Wait for the job and return its result, raises the error of a failed job.
+        The job status is final once this returns.
+        """
+        result = self.future.result(timeout)
+        self._finished.wait(timeout)
+        return result
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Wait until the job finished, failed or was cancelled.
+        Returns:
+            bool: False if the timeout expired first.
+        """
+        return self._finished.wait(timeout)
+
+    def database(self) -> threading.RLock:
+        """
+        Lock serializing the database writes of the runner, use as 'with job.database(): ...'.
+        """
+        return self._runner.database_lock
+
+
+def current_job() -> Job | None:
+    """
+    Job running in the current thread, None outside a job.
+    """
+    return getattr(_current, "job", None)
+
+
+def report_progress(progress: float = None, message: str = None) -> None:
+    """
+    Report progress of the job running in the current thread, does nothing outside a job.
+    """
+    job = current_job()
+    if job is not None:
+        job.report(progress, message)
+
+
+def check_cancelled() -> None:
+    """
+    Raise JobCancelled if the job running in the current thread was cancelled, does nothing outside a job.
+    """
+    job = current_job()
+    if job is not None:
+        job.check_cancelled()
+
+
+class JobRunner:
+    """
+    Runs long actions of the notebook apps (report generation, database updates) in the background, so
+    the widgets stay responsive and several reports can be queued while data entry continues.
+
+    Jobs run on a thread pool; picklable top-level functions can be sent to a process pool instead for
+    CPU-bound work. Jobs marked writes_database hold the database lock of the runner while they run, so
+    their database writes never interleave; other jobs take the lock (job.database()) around their writes
+    only. Completion callbacks and progress listeners are handed to the dispatcher, by default the event
+    loop of the IPython kernel.
+
+    Attributes
+    ----------
+    max_workers : int
+        Number of jobs running at the same time.
+    dispatcher : Callable
+        Calls (callback, *args) on the thread that may update widgets, see kernel_dispatcher.
+    database_lock : threading.RLock
+        Lock serializing database writes. Jobs submitted with writes_database hold it while they run,
+        other jobs take it with job.database(); writers outside the jobs (app commits on the kernel thread,
+        background writers) take it as well, so all writes of the process to the database go one at a time.
+        It is taken before any lock of the writer itself.
+    jobs : list[Job]
+        Submitted jobs, oldest first.
+
+    Methods
+    -------
+    submit(fn, *args, name=None, writes_database=False, process=False, on_done=None, **kwargs):
+        Queue fn(*args, **kwargs) as a job.
+    dispatch(callback, *args):
+        Hand a callback to the dispatcher.
+    pending():
+        Jobs that did not finish yet.
+    shutdown(wait=True, cancel_pending=False):
+        Stop the workers.
+    """
+
+    def __init__(self, max_workers: int = MAX_WORKERS, process_workers: int = None, dispatcher: Callable = None) -> None:
+        self.max_workers = max_workers
+        self.process_workers = process_workers
+        self.dispatcher = dispatcher or kernel_dispatcher()
+        self.database_lock = threading.RLock()
+        self.jobs: list[Job] = []
+        self._threads = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fms-job")
+        self._processes: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._processes is None:
+                self._processes = ProcessPoolExecutor(max_workers=self.process_workers)
+            return self._processes
+
+    def dispatch(self, callback: Callable, *args: Any) -> None:
+        try:
+            self.dispatcher(callback, *args)
+        except Exception as e:
+            print(f"Error dispatching job callback: {str(e)}")
+            traceback.print_exc()
+
+    def submit(self, fn: Callable, *args: Any, name: str = None, writes_database: bool = False, process: bool = False,
+               on_done: Callable[[Job], None] = None, **kwargs: Any) -> Job:
+        """
+        Queue fn(*args, **kwargs) as a background job.
+        Args:
+            fn (Callable): Function to run. Thread jobs can use report_progress and check_cancelled.
+            name (str, optional): Description of the job, defaults to the function name.
+            writes_database (bool, optional): Hold the database lock while the job runs.
+            process (bool, optional): Run fn in a worker process (fn and its arguments must be picklable).
+            on_done (Callable[[Job], None], optional): Called through the dispatcher once the job finished,
+                failed or was cancelled; read the outcome from job.status and job.result().
+        Returns:
+            Job: The queued job.
+        """
+        job = Job(self, name or getattr(fn, "__name__", "job"), writes_database)
+        if process:
+            target = lambda: self._process_pool().submit(fn, *args, **kwargs).result()
+        else:
+            target = lambda: fn(*args, **kwargs)
+        with self._lock:
+            self.jobs.append(job)
+        job.future = self._threads.submit(self._run, job, target)
+        job.future.add_done_callback(lambda future: self._finish(job, on_done))
+        return job
+
+    def _run(self, job: Job, target: Callable[[], Any]) -> Any:
+        job.check_cancelled()
+        job.status = JobStatus.RUNNING
+        job._notify()
+        _current.job = job
+        try:
+            if job.writes_database:
+                with self.database_lock:
+                    return target()
+            return target()
+        finally:
+            _current.job = None
+
+    def _finish(self, job: Job, on_done: Callable[[Job], None] | None) -> None:
+        future = job.future
+        error = None if future.cancelled() else future.exception()
+        if future.cancelled() or isinstance(error, JobCancelled):
+            job.status = JobStatus.CANCELLED
+            job.message = "Cancelled"
+        elif error is not None:
+            job.status = JobStatus.FAILED
+            job.error = error
+            job.message = str(error)
+            print(f"Job {job.name} failed: {str(error)}")
+            traceback.print_exception(type(error), error, error.__traceback__)
+        else:
+            job.status = JobStatus.DONE
+            job.progress = 1.0
+        job._finished.set()
+        job._notify()
+        if on_done is not None:
+            self.dispatch(on_done, job)
+
+    def pending(self) -> list[Job]:
+        with self._lock:
+            return [job for job in self.jobs if not job.done()]
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = False) -> None:
+        """
+        Stop the workers once the running (and, unless cancel_pending, the queued) jobs are done.
+        """
+        if cancel_pending:
+            for job in self.pending():
+                job.cancel()
+        self._threads.shutdown(wait=wait)
+        with self._lock:
+            processes, self._processes = self._processes, None
+        if processes is not None:
+            processes.shutdown(wait=wait)
+
+
+_runner: JobRunner | None = None
+_runner_lock = threading.Lock()
+
+
+def job_runner() -> JobRunner:
+    """
+    Job runner shared by the apps of this process, so their database writes are serialized together.
+    """
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = JobRunner()
+        return _runner
+
+
+class JobPanel:
+    """
+    Progress of background jobs as widgets: one row per job with its name, a progress bar,
+    the current step and a cancel button.
+
+    Attributes
+    ----------
+    widget : widgets.VBox
+        Panel to display.
+    max_rows : int
+        Number of jobs shown.
+
+    Methods
+    -------
+    track(job):
+        Add a row for the job and follow its progress.
+    """
+
+    _STYLES = {JobStatus.DONE: "success", JobStatus.FAILED: "danger", JobStatus.CANCELLED: "warning"}
+
+    def __init__(self, max_rows: int = MAX_PANEL_ROWS) -> None:
+        self.max_rows = max_rows
+        self.widget = widgets.VBox([])
+        self._rows: OrderedDict[int, tuple] = OrderedDict()
+
+    def track(self, job: Job) -> Job:
+        """
+        Add a row for the job and follow its progress.
+        Returns:
+            Job: The job, for chaining after submit.
+        """
+        name = widgets.HTML(f"<b>{job.name}</b>", layout=widgets.Layout(width="300px"))
+        bar = widgets.FloatProgress(value=job.progress, min=0, max=1, layout=widgets.Layout(width="250px"))
+        status = widgets.HTML("", layout=widgets.Layout(width="350px"))
+        cancel = widgets.Button(description="Cancel", layout=widgets.Layout(width="80px"))
+        cancel.on_click(lambda b: job.cancel())
+        self._rows[job.id] = (job, widgets.HBox([name, bar, status, cancel]), bar, status, cancel)
+        while len(self._rows) > self.max_rows:
+            finished = next((job_id for job_id, row in self._rows.items() if row[0].done()), None)
+            if finished is None:
+                break
+            del self._rows[finished]
+        self.widget.children = [row[1] for row in self._rows.values()]
+        job.add_listener(self._update)
+        self._update(job)
+        return job
+
+    def _update(self, job: Job) -> None:
+        row = self._rows.get(job.id)
+        if row is None:
+            return
+        _, _, bar, status, cancel = row
+        bar.value = job.progress
+        bar.bar_style = self._STYLES.get(job.status, "info")
+        status.value = f"{job.status.value.title()}{': ' + job.message if job.message else ''}"
+        cancel.disabled = job.done() or job.cancel_requested
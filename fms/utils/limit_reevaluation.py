@@ -0,0 +1,284 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any
+
+# Standard library
+import json
+
+# Third-party
+import numpy as np
+import pandas as pd
+from sqlalchemy import String, case, select, type_coerce
+
+# Local imports
+from ..db import FMSLimits, FMSTestResults, HPIVCharacteristics, LPTCalibration, TVStatus, TVTestRuns
+from .fms_bundle import invalidate_fms_bundle
+from .hpiv_matrix import invalidate_characteristic_matrix
+from .limit_rules import NO_LIMIT, WITHIN, ON_LIMIT, OUTSIDE, code_statuses, compile_limits, limit_codes, lpt_signal_statuses
+from .specs import fms_limit_specifications
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+
+# Status codes by the name the Enum columns store
+_STORED_CODES = {code_statuses([code])[0].name: code for code in (WITHIN, ON_LIMIT, OUTSIDE)}
+
+LPT_SIGNAL_THRESHOLD = 7.5
+LPT_SIGNAL_TOLERANCE = 0.05
+LPT_PRESSURE_THRESHOLD = 0.2
+"""LPT check of the stored statuses: highest allowed signal, its tolerance and the check pressure."""
+
+
+def _limit(value: Any) -> float:
+    return np.nan if value is None else float(value)
+
+
+def _status_text(status: Any) -> str | None:
+    return status.value if status is not None else None
+
+
+class LimitReevaluator:
+    """
+    Re-evaluates the stored limit status of the whole fleet in bulk: FMS acceptance results against the
+    limits of their FMS, HPIV characteristics against their certified limits, LPT calibrations against the
+    signal threshold and TV test runs against the opening temperature range of their TV.
+
+    Every table is read with one projected query and evaluated with the vectorized limit rules, so nothing
+    is parsed again; only the statuses that change are written, with one bulk update per table. Proposed
+    limits turn the evaluation into a what-if: the changes show which units would flip status, and they
+    cannot be applied, the stored limits stay the reference of the stored statuses.
+
+    TV test runs have no stored status, their changes (status with the stored range -> with the proposed
+    one) are reported but never written.
+
+    Attributes
+    ----------
+    session : Session
+        Session the rows are read and written with.
+    fms_limits : dict | None
+        Proposed FMS limits per parameter, applied over the limits of every FMS.
+    hpiv_limits : dict | None
+        Proposed HPIV limits per parameter ({'min', 'max'}), applied over the certified limits.
+    tv_limits : dict | None
+        Proposed opening temperature range ({'min', 'max'}) of every TV.
+    lpt_signal_threshold : float
+        Highest allowed LPT signal at the check pressure.
+    proposed : bool
+        Whether limits differing from the stored ones are proposed.
+    changes : list[dict]
+        Change report of the last evaluate call.
+
+    Methods
+    -------
+    evaluate():
+        Recompute the statuses and report the changes.
+    apply():
+        Write the changed statuses and commit.
+    report():
+        Changes as a DataFrame.
+    """
+
+    def __init__(self, session: "Session", fms_limits: dict[str, dict] = None, hpiv_limits: dict[str, dict] = None,
+                 tv_limits: dict = None, lpt_signal_threshold: float = LPT_SIGNAL_THRESHOLD,
+                 lpt_signal_tolerance: float = LPT_SIGNAL_TOLERANCE, lpt_pressure_threshold: float = LPT_PRESSURE_THRESHOLD) -> None:
+        self.session = session
+        self.fms_limits = fms_limits
+        self.hpiv_limits = hpiv_limits
+        self.tv_limits = tv_limits
+        self.lpt_signal_threshold = lpt_signal_threshold
+        self.lpt_signal_tolerance = lpt_signal_tolerance
+        self.lpt_pressure_threshold = lpt_pressure_threshold
+        self.proposed = bool(fms_limits or hpiv_limits or tv_limits) or (
+            (lpt_signal_threshold, lpt_signal_tolerance, lpt_pressure_threshold)
+            != (LPT_SIGNAL_THRESHOLD, LPT_SIGNAL_TOLERANCE, LPT_PRESSURE_THRESHOLD)
+        )
+        self.changes: list[dict] = []
+        self._updates: dict[type, list[dict]] = {}
+
+    def _change(self, table: type, key: Any, unit: Any, parameter: str, value: Any, old: Any, new: Any) -> None:
+        self.changes.append({'table': table.__tablename__, 'key': key, 'unit': unit, 'parameter': parameter,
+                             'value': value, 'old': old, 'new': new})
+
+    def _fms_test_results(self) -> None:
+        # Raw columns: JSON is only decoded for results without a scalar value, statuses are compared by their stored name
+        json_value = type_coerce(case((FMSTestResults.parameter_value.is_(None), FMSTestResults.parameter_json)), String)
+        rows = self.session.connection().execute(select(
+            FMSTestResults.id, FMSTestResults.fms_id, FMSTestResults.parameter_name, FMSTestResults.parameter_value,
+            json_value, FMSTestResults.parameter_unit, type_coerce(FMSTestResults.within_limits, String)
+        )).all()
+        limits_text = dict(self.session.connection().execute(select(FMSLimits.fms_id, type_coerce(FMSLimits.limits, String))).all())
+
+        updates = []
+        self._updates[FMSTestResults] = updates
+        if not rows:
+            return
+        ids, fms_ids, names, scalars, jsons, units, stored = zip(*rows)
+        values = [scalar if scalar is not None else (json.loads(text) if text is not None else None)
+                  for scalar, text in zip(scalars, jsons)]
+
+        # Compiled rules per FMS, FMS with equal limits share one evaluation
+        fms_index = {}
+        inverse = np.fromiter((fms_index.setdefault(fms_id, len(fms_index)) for fms_id in fms_ids), dtype=np.intp, count=len(fms_ids))
+        rules_by_text, groups, fms_group = {}, {}, []
+        for fms_id in fms_index:
+            text = limits_text.get(fms_id)
+            if text not in rules_by_text:
+                limits = (json.loads(text) if text else None) or fms_limit_specifications
+                if self.fms_limits:
+                    limits = {**limits, **self.fms_limits}
+                rules_by_text[text] = compile_limits(limits)
+            rules = rules_by_text[text]
+            fms_group.append(groups.setdefault(id(rules), (len(groups), rules))[0])
+        row_group = np.asarray(fms_group, dtype=np.intp)[inverse]
+
+        names_array = np.array(names, dtype=object)
+        values_array = np.empty(len(values), dtype=object)
+        values_array[:] = values
+        units_array = np.array(units, dtype=object)
+        new = np.empty(len(rows), dtype=np.int8)
+        for group, rules in groups.values():
+            rows_in_group = np.flatnonzero(row_group == group)
+            new[rows_in_group] = rules.evaluate_codes(names_array[rows_in_group].tolist(), values_array[rows_in_group].tolist(),
+                                                      units_array[rows_in_group].tolist())
+        old = np.fromiter((_STORED_CODES.get(name, NO_LIMIT) for name in stored), dtype=np.int8, count=len(stored))
+
+        for i in np.flatnonzero(new != old):
+            status = code_statuses(new[i:i + 1])[0]
+            updates.append({'id': ids[i], 'within_limits': status})
+            self._change(FMSTestResults, ids[i], fms_ids[i], names[i], values[i], code_statuses(old[i:i + 1])[0], status)
+
+    def _hpiv_characteristics(self) -> None:
+        rows = self.session.connection().execute(select(
+            HPIVCharacteristics.id, HPIVCharacteristics.hpiv_id, HPIVCharacteristics.parameter_name,
+            HPIVCharacteristics.parameter_value, HPIVCharacteristics.min_value, HPIVCharacteristics.max_value,
+            type_coerce(HPIVCharacteristics.within_limits, String)
+        )).all()
+        updates = []
+        self._updates[HPIVCharacteristics] = updates
+        if not rows:
+            return
+        ids, hpiv_ids, names, values, lower, upper, stored = zip(*rows)
+        values, lower, upper = (np.array([_limit(v) for v in column]) for column in (values, lower, upper))
+        if self.hpiv_limits:
+            names_array = np.array(names, dtype=object)
+            for parameter, limits in self.hpiv_limits.items():
+                mask = names_array == parameter
+                lower[mask] = _limit(limits.get('min'))
+                upper[mask] = _limit(limits.get('max'))
+
+        old = np.fromiter((_STORED_CODES.get(name, NO_LIMIT) for name in stored), dtype=np.int8, count=len(stored))
+        new = limit_codes(values, lower, upper)
+        for i in np.flatnonzero(new != old):
+            status = code_statuses(new[i:i + 1])[0]
+            updates.append({'id': ids[i], 'within_limits': status})
+            self._change(HPIVCharacteristics, ids[i], hpiv_ids[i], names[i], float(values[i]), code_statuses(old[i:i + 1])[0], status)
+
+    def _lpt_calibrations(self) -> None:
+        rows = self.session.execute(select(
+            LPTCalibration.lpt_id, LPTCalibration.signal, LPTCalibration.p_calculated, LPTCalibration.within_limits
+        )).all()
+        # Signal at the check pressure, calibrations without a usable curve keep their status
+        checked, signals = [], []
+        for row in rows:
+            if not row.signal or not row.p_calculated or len(row.signal) != len(row.p_calculated):
+                continue
+            index = np.argmin(np.abs(np.asarray(row.p_calculated, dtype=float) - self.lpt_pressure_threshold))
+            checked.append(row)
+            signals.append(float(row.signal[index]) + self.lpt_signal_tolerance)
+
+        updates = []
+        for row, signal, status in zip(checked, signals, lpt_signal_statuses(signals, self.lpt_signal_threshold)):
+            if status != row.within_limits:
+                updates.append({'lpt_id': row.lpt_id, 'within_limits': status})
+                self._change(LPTCalibration, row.lpt_id, row.lpt_id, 'signal', signal, row.within_limits, status)
+        self._updates[LPTCalibration] = updates
+
+    def _tv_test_runs(self) -> None:
+        if not self.tv_limits:
+            return
+        rows = self.session.execute(
+            select(TVTestRuns.test_reference, TVTestRuns.tv_id, TVTestRuns.opening_temp,
+                   TVStatus.min_opening_temp, TVStatus.max_opening_temp)
+            .join(TVStatus, TVStatus.tv_id == TVTestRuns.tv_id)
+        ).all()
+        if not rows:
+            return
+        values = np.array([_limit(row.opening_temp) for row in rows])
+        old = code_statuses(limit_codes(values, np.array([_limit(row.min_opening_temp) for row in rows]),
+                                        np.array([_limit(row.max_opening_temp) for row in rows])))
+        new = code_statuses(limit_codes(values, np.full(len(rows), _limit(self.tv_limits.get('min'))),
+                                        np.full(len(rows), _limit(self.tv_limits.get('max')))))
+        for row, old_status, new_status in zip(rows, old, new):
+            if old_status != new_status:
+                self._change(TVTestRuns, row.test_reference, row.tv_id, 'opening_temp', row.opening_temp, old_status, new_status)
+
+    def evaluate(self) -> list[dict]:
+        """
+        Recompute the limit status of every row against the current (or proposed) limits.
+        Returns:
+            list[dict]: One entry per changed status with the table, key (row ID), unit (FMS/HPIV/LPT/TV ID),
+                parameter, value and the old and new LimitStatus.
+        """
+        self.changes = []
+        self._updates = {}
+        self._fms_test_results()
+        self._hpiv_characteristics()
+        self._lpt_calibrations()
+        self._tv_test_runs()
+        return self.changes
+
+    def apply(self) -> int:
+        """
+        Write the changed statuses of the last evaluate call, one bulk update per table, and commit.
+        The cached FMS bundles and HPIV characteristic matrices are dropped, as they hold the old statuses.
+        Returns:
+            int: Number of rows updated.
+        Raises:
+            ValueError: If limits are proposed, their evaluation is a what-if only.
+        """
+        if self.proposed:
+            raise ValueError("Statuses evaluated against proposed limits cannot be written, use a dry run")
+        count = 0
+        for table, updates in self._updates.items():
+            if updates:
+                self.session.bulk_update_mappings(table, updates)
+                count += len(updates)
+        self.session.commit()
+        updates, self._updates = self._updates, {}
+        if count:
+            invalidate_fms_bundle()
+        if updates.get(HPIVCharacteristics):
+            invalidate_characteristic_matrix()
+        return count
+
+    def report(self) -> pd.DataFrame:
+        """
+        Changes of the last evaluate call, one row per unit and parameter with its old -> new status.
+        """
+        columns = ['table', 'unit', 'parameter', 'value', 'old', 'new']
+        return pd.DataFrame([
+            {**{k: change[k] for k in columns[:4]}, 'old': _status_text(change['old']), 'new': _status_text(change['new'])}
+            for change in self.changes
+        ], columns=columns)
+
+
+def reevaluate_limits(session: "Session", dry_run: bool = False, **proposed: Any) -> pd.DataFrame:
+    """
+    Re-evaluate the limit status of the whole fleet and write the changes, see LimitReevaluator.
+    Args:
+        session (Session): Database session.
+        dry_run (bool, optional): Only report the changes (what-if), nothing is written.
+        **proposed: Proposed limits (fms_limits, hpiv_limits, tv_limits, lpt_signal_threshold), only
+            evaluated with dry_run.
+    Returns:
+        pd.DataFrame: The change report.
+    Raises:
+        ValueError: If limits are proposed without dry_run.
+    """
+    reevaluator = LimitReevaluator(session, **proposed)
+    if reevaluator.proposed and not dry_run:
+        raise ValueError("Proposed limits are a what-if, re-evaluate them with dry_run=True")
+    reevaluator.evaluate()
+    if not dry_run:
+        reevaluator.apply()
+    return reevaluator.report()
@@ -0,0 +1,297 @@
+from __future__ import annotations
+from typing import Any, Iterable
+
+# Standard library
+import json
+import threading
+from collections import OrderedDict
+
+# Third-party
+import numpy as np
+
+# Local imports
+from .enums import LimitStatus
+
+UNIT_SCALES = {"GOhm": 1e9}
+"""Factor converting a measured value in this unit to the unit of the limits."""
+
+AXES = ("x", "y", "z")
+
+MAX_COMPILED_RULES = 32
+"""Number of compiled limit sets kept in memory, least recently used ones are dropped first."""
+
+# Status codes, ordered by severity so the worst status of several values is their maximum
+NO_LIMIT = -1
+WITHIN = 0
+ON_LIMIT = 1
+OUTSIDE = 2
+
+_STATUSES = np.array([None, LimitStatus.TRUE, LimitStatus.ON_LIMIT, LimitStatus.FALSE], dtype=object)
+
+
+def axis_parameter(parameter: str, axis: int) -> str:
+    """
+    Rule name of one axis of a vector limit, e.g. 'inlet_location.x'.
+    """
+    return f"{parameter}.{AXES[axis]}" if axis < len(AXES) else f"{parameter}.{axis}"
+
+
+def tolerance_bounds(nominal: float, tolerance: float) -> tuple[float, float]:
+    """
+    Lower and upper limit of a nominal value with a tolerance in percent.
+    """
+    return nominal - nominal * tolerance / 100, nominal + nominal * tolerance / 100
+
+
+_VECTOR_TYPES = (list, tuple, np.ndarray)
+
+
+def _number(value: Any) -> float:
+    if type(value) is float or type(value) is int:
+        return value
+    if isinstance(value, (int, float, np.number)) and not isinstance(value, (bool, np.bool_)):
+        return float(value)
+    return np.nan
+
+
+def _floats(values: Iterable) -> np.ndarray:
+    return np.array([np.nan if v is None else float(v) for v in values], dtype=float)
+
+
+def _item(values: Any, index: int) -> Any:
+    if isinstance(values, (list, tuple)):
+        return values[index] if index < len(values) else None
+    return values
+
+
+def limit_codes(values: np.ndarray, lower: np.ndarray, upper: np.ndarray, atol: float = 0.0, rtol: float = 0.0) -> np.ndarray:
+    """
+    Status codes of values against limits given per value, the core of every evaluation.
+    Args:
+        values (np.ndarray): Measured values, NaN has no status.
+        lower, upper (np.ndarray): Limits per value, NaN where there is none.
+        atol, rtol (float, optional): Values on a limit or beyond it by at most atol + rtol * |limit| (as np.isclose)
+            are ON_LIMIT, values strictly between the limits are always WITHIN.
+    Returns:
+        np.ndarray: int8 codes NO_LIMIT, WITHIN, ON_LIMIT or OUTSIDE.
+    """
+    values, lower, upper = (np.asarray(a, dtype=float) for a in (values, lower, upper))
+    checked = ~np.isnan(values) & ~(np.isnan(lower) & np.isnan(upper))
+    with np.errstate(invalid="ignore"):
+        outside = (values < lower) | (values > upper)
+        inside = ~(values <= lower) & ~(values >= upper)
+        on_limit = (np.abs(values - lower) <= atol + rtol * np.abs(lower)) | (np.abs(values - upper) <= atol + rtol * np.abs(upper))
+    codes = np.full(values.shape, NO_LIMIT, dtype=np.int8)
+    codes[checked] = WITHIN
+    codes[checked & outside] = OUTSIDE
+    codes[checked & on_limit & ~inside] = ON_LIMIT
+    return codes
+
+
+def code_statuses(codes: np.ndarray) -> np.ndarray:
+    """
+    LimitStatus of status codes, None for NO_LIMIT.
+    """
+    return _STATUSES[np.asarray(codes, dtype=np.int8) + 1]
+
+
+class LimitRules:
+    """
+    Compiled limit rules: one flat vector per field (parameter, lower, upper, nominal, tolerance, unit),
+    evaluated against vectors of measured values with NumPy instead of per-parameter dictionary lookups.
+
+    A value below lower or above upper is outside the limits (LimitStatus.FALSE), a value equal to a limit
+    is ON_LIMIT, any other value TRUE. Parameters without a rule, rules without limits and values that are
+    not numbers have no status (None). Vector limits (e.g. locations) are compiled into one rule per axis,
+    a vector value gets the worst status of its axes.
+
+    Attributes
+    ----------
+    parameters : list[str]
+        Rule names.
+    lower, upper : np.ndarray
+        Limits, NaN where there is none.
+    nominal, tolerance : np.ndarray
+        Nominal value and tolerance in percent, NaN where there is none.
+    units : list[str | None]
+        Unit of the limits.
+
+    Methods
+    -------
+    from_limits(limits, units=None):
+        Compile a limits dictionary (as stored in FMSLimits).
+    codes(parameters, values, units=None):
+        Status codes of scalar values.
+    evaluate_codes(parameters, values, units=None):
+        Status codes of scalar or vector values.
+    evaluate(parameters, values, units=None):
+        LimitStatus of scalar or vector values.
+    status(parameter, value, unit=None):
+        LimitStatus of a single value.
+    bounds(parameter):
+        Lower and upper limit of a rule.
+    """
+
+    def __init__(self, parameters: list[str], lower: Iterable, upper: Iterable, nominal: Iterable = None,
+                 tolerance: Iterable = None, units: list[str | None] = None) -> None:
+        self.parameters = list(parameters)
+        n = len(self.parameters)
+        self.lower = _floats(lower)
+        self.upper = _floats(upper)
+        self.nominal = _floats(nominal) if nominal is not None else np.full(n, np.nan)
+        self.tolerance = _floats(tolerance) if tolerance is not None else np.full(n, np.nan)
+        self.units = list(units) if units is not None else [None] * n
+        self.index = {parameter: i for i, parameter in enumerate(self.parameters)}
+
+    def __len__(self) -> int:
+        return len(self.parameters)
+
+    def __repr__(self) -> str:
+        return f"LimitRules({len(self.parameters)} rules)"
+
+    @classmethod
+    def from_limits(cls, limits: dict[str, dict], units: dict[str, str] = None) -> "LimitRules":
+        """
+        Compile a limits dictionary: parameter -> {'min', 'max', 'nominal', 'tolerance'}.
+        Missing min/max are derived from nominal and tolerance, list limits become one rule per axis.
+        Args:
+            limits (dict[str, dict]): Limits, e.g. FMSLimits.limits or fms_limit_specifications.
+            units (dict[str, str], optional): Parameter -> unit of its limits.
+        Returns:
+            LimitRules: The compiled rules.
+        """
+        units = units or {}
+        rows = []
+        for parameter, spec in (limits or {}).items():
+            if not isinstance(spec, dict):
+                continue
+            low, high = spec.get("min"), spec.get("max")
+            nominal, tolerance = spec.get("nominal"), spec.get("tolerance")
+            if isinstance(low, (list, tuple)) or isinstance(high, (list, tuple)):
+                length = max(len(v) for v in (low, high) if isinstance(v, (list, tuple)))
+                for axis in range(length):
+                    rows.append((axis_parameter(parameter, axis), _item(low, axis), _item(high, axis), None, None, units.get(parameter)))
+                continue
+            if low is None and high is None and nominal is not None and tolerance is not None:
+                low, high = tolerance_bounds(nominal, tolerance)
+            rows.append((parameter, low, high, nominal, tolerance, units.get(parameter)))
+        if not rows:
+            return cls([], [], [])
+        parameters, lower, upper, nominal, tolerance, rule_units = zip(*rows)
+        return cls(parameters, lower, upper, nominal, tolerance, rule_units)
+
+    def codes(self, parameters: list[str], values: Iterable, units: list[str] = None) -> np.ndarray:
+        """
+        Status codes of scalar values, vectorized over all of them.
+        Args:
+            parameters (list[str]): Rule name per value.
+            values (Iterable): Measured values, non-numbers have no status.
+            units (list[str], optional): Unit per value, see UNIT_SCALES.
+        Returns:
+            np.ndarray: int8 codes NO_LIMIT, WITHIN, ON_LIMIT or OUTSIDE.
+        """
+        n = len(parameters)
+        idx = np.fromiter((self.index.get(p, -1) for p in parameters), dtype=np.intp, count=n)
+        vals = np.fromiter((_number(v) for v in values), dtype=float, count=n)
+        if units is not None and any(u in UNIT_SCALES for u in units):
+            vals = vals * np.fromiter((UNIT_SCALES.get(u, 1.0) for u in units), dtype=float, count=n)
+        known = idx >= 0
+        safe = np.where(known, idx, 0)
+        lower = np.where(known, self.lower[safe] if len(self) else np.nan, np.nan)
+        upper = np.where(known, self.upper[safe] if len(self) else np.nan, np.nan)
+        return limit_codes(vals, lower, upper)
+
+    def evaluate_codes(self, parameters: list[str], values: list, units: list[str] = None) -> np.ndarray:
+        """
+        Status codes of measured values. Vector values of parameters with axis rules get the worst code of their axes.
+        Args:
+            parameters (list[str]): Parameter per value.
+            values (list): Measured values (scalars or x/y/z sequences).
+            units (list[str], optional): Unit per value, see UNIT_SCALES.
+        Returns:
+            np.ndarray: int8 codes NO_LIMIT, WITHIN, ON_LIMIT or OUTSIDE.
+        """
+        parameters, values = list(parameters), list(values)
+        vectors = [i for i, value in enumerate(values)
+                   if isinstance(value, _VECTOR_TYPES) and axis_parameter(parameters[i], 0) in self.index]
+        if not vectors:
+            return self.codes(parameters, values, units)
+
+        # Scalars in one pass, the axes of the vector values in a second one reduced onto their value
+        scalar_values = list(values)
+        flat_parameters, flat_values, flat_units, groups = [], [], [], []
+        for i in vectors:
+            scalar_values[i] = None
+            for axis, item in enumerate(values[i]):
+                flat_parameters.append(axis_parameter(parameters[i], axis))
+                flat_values.append(item)
+                flat_units.append(units[i] if units is not None else None)
+                groups.append(i)
+        codes = self.codes(parameters, scalar_values, units)
+        np.maximum.at(codes, np.asarray(groups, dtype=np.intp), self.codes(flat_parameters, flat_values, flat_units))
+        return codes
+
+    def evaluate(self, parameters: list[str], values: list, units: list[str] = None) -> np.ndarray:
+        """
+        LimitStatus of measured values, see evaluate_codes.
+        Returns:
+            np.ndarray: Object array of LimitStatus, None where there is no limit.
+        """
+        return code_statuses(self.evaluate_codes(parameters, values, units))
+
+    def status(self, parameter: str, value: Any, unit: str = None) -> LimitStatus | None:
+        """
+        LimitStatus of a single measured value, None if it has no limit.
+        """
+        return self.evaluate([parameter], [value], [unit])[0]
+
+    def bounds(self, parameter: str) -> tuple[float | None, float | None]:
+        """
+        Lower and upper limit of a rule, None where there is none.
+        """
+        i = self.index.get(parameter)
+        if i is None:
+            return None, None
+        low, high = self.lower[i], self.upper[i]
+        return (None if np.isnan(low) else float(low)), (None if np.isnan(high) else float(high))
+
+
+_compiled: OrderedDict[str, LimitRules] = OrderedDict()
+_compiled_lock = threading.Lock()
+
+
+def compile_limits(limits: dict[str, dict]) -> LimitRules:
+    """
+    Compiled rules of a limits dictionary, shared by every dictionary with the same content.
+    Args:
+        limits (dict[str, dict]): Limits, e.g. FMSLimits.limits or fms_limit_specifications.
+    Returns:
+        LimitRules: The compiled rules, do not modify.
+    """
+    key = json.dumps(limits or {}, sort_keys=True, default=str)
+    with _compiled_lock:
+        rules = _compiled.get(key)
+        if rules is not None:
+            _compiled.move_to_end(key)
+            return rules
+    rules = LimitRules.from_limits(limits)
+    with _compiled_lock:
+        _compiled[key] = rules
+        while len(_compiled) > MAX_COMPILED_RULES:
+            _compiled.popitem(last=False)
+    return rules
+
+
+def lpt_signal_statuses(adjusted_signals: Iterable, signal_threshold: float) -> np.ndarray:
+    """
+    LimitStatus of LPT signals at the check pressure (signal tolerance included): below the threshold TRUE,
+    on it or above by at most 1e-3 (np.isclose) ON_LIMIT, further above FALSE.
+    Args:
+        adjusted_signals (Iterable): Signals at the check pressure plus the signal tolerance.
+        signal_threshold (float): Highest allowed signal.
+    Returns:
+        np.ndarray: Object array of LimitStatus.
+    """
+    adjusted = np.asarray(list(adjusted_signals), dtype=float)
+    upper = np.full(adjusted.shape, signal_threshold, dtype=float)
+    return code_statuses(limit_codes(adjusted, np.full(adjusted.shape, np.nan), upper, atol=1e-3, rtol=1e-5))
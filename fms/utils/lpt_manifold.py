@@ -19,7 +19,6 @@ if __name__ == "__main__":
 import chardet
 import matplotlib.pyplot as plt
 import numpy as np
-import openpyxl
 from watchdog.events import FileSystemEventHandler
 from watchdog.observers import Observer
 
@@ -34,12 +33,16 @@ from ..db import (
 )
 from .enums import (
     FRStatus,
-    LimitStatus,
     LPTCoefficientParameters,
     ManifoldProgressStatus,
 )
 from .ocr_reader import OCRReader
 from .textract import TextractReader
+from .instrumentation import profiler
+from .workbook_cache import load_sheet
+from .manifold_reconcile import ManifoldAssemblyReconciler
+from .fr_resolver import FRSerialResolver
+from .limit_rules import lpt_signal_statuses
 
 class LPTListener(FileSystemEventHandler):
     """
@@ -103,7 +106,8 @@ class LPTListener(FileSystemEventHandler):
 
                     if json_files:
                         self.lpt_data = ManifoldData(json_files=json_files)
-                        self.lpt_data.extract_coefficients_from_json()
+                        with profiler.stage("lpt_listener/parse"):
+                            self.lpt_data.extract_coefficients_from_json()
                         self.processed = True
                         self.processed_dirs.add(event.src_path)
                     return
@@ -688,6 +692,10 @@ class ManifoldLogicSQL:
         Specified pressure at which the LPT signal is checked.
     assembly_file (str):
         Path to the Excel template for manifold assembly status.
+    assembly_changes (list[dict]):
+        Change report of the last assembly import.
+    fr_resolver (FRSerialResolver):
+        Short FR number resolver of the last assembly import, see its ambiguities.
 
     Methods
     -------
@@ -708,8 +716,8 @@ class ManifoldLogicSQL:
         Updates related parts to the manifold in the database based on assembly data.   
     get_allocated_manifolds():
         Retrieves a list of allocated manifolds from the database.
-    add_manifold_assembly_data(assembly_file):
-        Adds manifold assembly data from the specified Excel file.
+    add_manifold_assembly_data(assembly_file, dry_run=False):
+        Adds manifold assembly data from the specified Excel file and returns the change report.
     update_lpt_certification():
         Updates LPT certification data in the database.
     update_manifold_certification():
@@ -727,6 +735,10 @@ class ManifoldLogicSQL:
         self.signal_tolerance = signal_tolerance
         self.pressure_threshold = pressure_threshold
         self.manifold_assembly_data = []
+        self.anode_ids = []
+        self.cathode_ids = []
+        self.converted_ids = []
+        self.fr_resolver = None
         self.temp_cells = [i.value for i in LPTCoefficientParameters if 't' in i.value.lower() and not i.value.startswith('lpt_id')]
         self.pressure_cells = [i.value for i in LPTCoefficientParameters if 'p' in i.value.lower() and not i.value.startswith('lpt_id')]
 
@@ -797,12 +809,7 @@ class ManifoldLogicSQL:
             'signal': adjusted_signal
         }
 
-        if adjusted_signal < self.signal_threshold:
-            status_dict['status'] = LimitStatus.TRUE
-        elif np.isclose(adjusted_signal, self.signal_threshold, atol=1e-3):
-            status_dict['status'] = LimitStatus.ON_LIMIT
-        else:
-            status_dict['status'] = LimitStatus.FALSE
+        status_dict['status'] = lpt_signal_statuses([adjusted_signal], self.signal_threshold)[0]
 
         return status_dict
 
@@ -871,6 +878,8 @@ class ManifoldLogicSQL:
     def convert_FR_id(self, session: "Session", type: str, fr_id: str, fms_id: str = None) -> str:
         """
         Converts an ambiguous FR ID to the correct format based on type and availability.
+        Lookups go through the FR serial resolver of the current assembly import, which keeps
+        every FR ID already used in the sheet or converted before out of the candidates.
         Args:
             session (Session): SQLAlchemy session for database queries.
             type (str): Type of FR ('anode' or 'cathode').
@@ -879,93 +888,37 @@ class ManifoldLogicSQL:
         Returns:
             str: Converted FR ID or original if not found.
         """
-        self.converted_ids = []
-        start_fms = fms_id.split("-")[0] if fms_id else None
-        fr_id = str(fr_id).zfill(3)
-
         try:
-            if type == 'anode':
-                # First, try matching with FMS "24" priority
-                if start_fms == "24":
-                    fr = session.query(AnodeFR).filter(
-                        ~AnodeFR.fr_id.in_(self.converted_ids),
-                        ~AnodeFR.fr_id.in_(self.anode_ids),
-                        AnodeFR.fr_id.startswith("C24"),
-                        AnodeFR.fr_id.endswith(fr_id),
-                        AnodeFR.flow_rates != None
-                    ).first()
-                    if fr:
-                        self.converted_ids.append(fr.fr_id)
-                        return fr.fr_id
-
-                # Regular search without FMS priority
-                filters = [~AnodeFR.fr_id.in_(self.converted_ids),
-                           ~AnodeFR.fr_id.in_(self.anode_ids),
-                        AnodeFR.fr_id.endswith(fr_id),
-                        AnodeFR.flow_rates != None]
-
-                fr = session.query(AnodeFR).filter(*filters).first()
-                if fr:
-                    self.converted_ids.append(fr.fr_id)
-                    return fr.fr_id
-
-                # FRCertification fallback
-                filters_cert = [~FRCertification.anode_fr_id.in_(self.converted_ids),
-                                ~FRCertification.anode_fr_id.in_(self.anode_ids),
-                                FRCertification.anode_fr_id.endswith(fr_id)]
-                
-                fr = session.query(FRCertification).filter(*filters_cert).first()
-                if fr:
-                    self.converted_ids.append(fr.anode_fr_id)
-                    return fr.anode_fr_id
-
-            elif type == 'cathode':
-                if start_fms == "24":
-                    fr = session.query(CathodeFR).filter(
-                        ~CathodeFR.fr_id.in_(self.converted_ids),
-                        ~CathodeFR.fr_id.in_(self.cathode_ids),
-                        CathodeFR.fr_id.startswith("C24"),
-                        CathodeFR.fr_id.endswith(fr_id),
-                        CathodeFR.flow_rates != None
-                    ).first()
-                    if fr:
-                        self.converted_ids.append(fr.fr_id)
-                        return fr.fr_id
-
-                filters = [~CathodeFR.fr_id.in_(self.converted_ids),
-                            ~CathodeFR.fr_id.in_(self.cathode_ids),
-                        CathodeFR.fr_id.endswith(fr_id),
-                        CathodeFR.flow_rates != None]
-                fr = session.query(CathodeFR).filter(*filters).first()
-                if fr:
-                    self.converted_ids.append(fr.fr_id)
-                    return fr.fr_id
-
-                # FRCertification fallback
-                filters_cert = [~FRCertification.cathode_fr_id.in_(self.converted_ids),
-                                ~FRCertification.cathode_fr_id.in_(self.cathode_ids),
-                                FRCertification.cathode_fr_id.endswith(fr_id)]
-                fr = session.query(FRCertification).filter(*filters_cert).first()
-                if fr:
-                    self.converted_ids.append(fr.cathode_fr_id)
-                    return fr.cathode_fr_id
-
-            return fr_id
+            if self.fr_resolver is None:
+                self.fr_resolver = FRSerialResolver(session)
+                for anode_id in self.anode_ids:
+                    self.fr_resolver.consume('anode', anode_id)
+                for cathode_id in self.cathode_ids:
+                    self.fr_resolver.consume('cathode', cathode_id)
+
+            converted = self.fr_resolver.resolve(type, fr_id, fms_id)
+            if converted != str(fr_id).zfill(3):
+                self.converted_ids.append(converted)
+            return converted
 
         except Exception as e:
             print(f"Error converting FR ID: {str(e)}")
             traceback.print_exc()
             return None
-        
+
     def extract_assembly_from_excel(self) -> None:
         """
         Extracts manifold assembly data from the Excel template.
+        Full FR IDs are collected over the whole sheet first, short FR numbers are converted
+        afterwards with one resolver, so they never resolve to an FR listed further down.
         """
-        wb = openpyxl.open(self.assembly_file, data_only=True)
-        wb.active = wb['20025.10.AB']
+        sheet = load_sheet(self.assembly_file, '20025.10.AB')
+        self.manifold_assembly_data = []
         self.anode_ids = []
         self.cathode_ids = []
-        sheet = wb.active
+        self.converted_ids = []
+        self.fr_resolver = None
+        pending = []
         for row in sheet.iter_rows(min_row=3, max_col = 25, values_only=True):
             if all(cell is None for cell in row[2:]):
                 break
@@ -1016,13 +969,13 @@ class ManifoldLogicSQL:
             # Perform the match
             if anode_fr:
                 if not re.match(pattern, str(anode_fr)):
-                    anode_fr = self.convert_FR_id(self.Session(), 'anode', anode_fr, allocated)
+                    pending.append((len(self.manifold_assembly_data), 'anode', anode_fr, allocated))
                 else:
                     self.anode_ids.append(anode_fr)
 
             if cathode_fr:
                 if not re.match(pattern, str(cathode_fr)):
-                    cathode_fr = self.convert_FR_id(self.Session(), 'cathode', cathode_fr, allocated)
+                    pending.append((len(self.manifold_assembly_data), 'cathode', cathode_fr, allocated))
                 else:
                     self.cathode_ids.append(cathode_fr)
 
@@ -1040,9 +993,25 @@ class ManifoldLogicSQL:
                 'cathode_outlet': cathode_outlet,
                 'lpt_id': lpt_id
             }
-            print(row)
             self.manifold_assembly_data.append(row)
 
+        if pending:
+            session = self.Session()
+            try:
+                for idx, type, fr_id, allocated in pending:
+                    self.manifold_assembly_data[idx][f'{type}_fr'] = self.convert_FR_id(session, type, fr_id, allocated)
+            finally:
+                session.close()
+            for item in self.fr_resolver.ambiguities if self.fr_resolver else []:
+                if item['chosen']:
+                    print(f"{item['type'].capitalize()} FR number {item['serial']} of {item['fms_id']} matches "
+                          f"{', '.join(item['candidates'])}, using {item['chosen']}")
+                else:
+                    print(f"{item['type'].capitalize()} FR number {item['serial']} of {item['fms_id']} matches no FR")
+
+        for row in self.manifold_assembly_data:
+            print(row)
+
     def update_related_parts(self, session: "Session", set_id: str, anode_fr: str, anode_filter: str, anode_outlet: str, \
                              cathode_fr: str, cathode_filter: str, cathode_outlet: str, lpt_id: str) -> None:
         """
@@ -1105,114 +1074,34 @@ class ManifoldLogicSQL:
             traceback.print_exc()
             return {}
 
-    def add_manifold_assembly_data(self, assembly_file: str = None) -> None:
+    def add_manifold_assembly_data(self, assembly_file: str = None, dry_run: bool = False) -> list[dict]:
         """
         Adds manifold assembly data from the specified Excel file.
+        The sheet is reconciled with the database in memory (see ManifoldAssemblyReconciler)
+        and written in one transaction.
         Args:
             assembly_file (str, optional): Path to the Excel template. Defaults to None.
+            dry_run (bool): Only report the changes, without writing them.
+        Returns:
+            list[dict]: Change report of the import (table, key, action and changed columns per entry).
         """
-        current_session_allocated = {}
         session = None
+        self.assembly_changes = []
         if assembly_file:
             self.assembly_file = assembly_file
         try:
             session: "Session" = self.Session()
             self.extract_assembly_from_excel()
-            with_cert = [row for row in self.manifold_assembly_data if row.get('manifold_certification')]
-            without_cert = [row for row in self.manifold_assembly_data if not row.get('manifold_certification')]
-            ordered_rows = with_cert + without_cert
-            allocated_dict: dict[str, ManifoldStatus] = self.get_allocated_manifolds()
-
-            for row in ordered_rows:
-                set_id = row['set_id']
-                drawing = row['drawing']
-                allocated = row['allocated']
-                if allocated and (allocated in allocated_dict or allocated in current_session_allocated):
-                    faulty_manifold = allocated_dict.get(allocated) or current_session_allocated.get(allocated)
-                    faulty_manifold.allocated = None
-                    allocated_dict.pop(allocated, None)
-                    current_session_allocated.pop(allocated, None)
-                    session.merge(faulty_manifold)
-                    session.commit()
-                
-                assembly_certification = row['assembly_certification']
-                manifold_certification = row['manifold_certification']
-                anode_fr = row['anode_fr']
-                anode_filter = row['anode_filter']
-                anode_outlet = row['anode_outlet']
-                cathode_fr = row['cathode_fr']
-                cathode_filter = row['cathode_filter']
-                cathode_outlet = row['cathode_outlet']
-                lpt_id = row['lpt_id']
-                existing_entry = session.query(ManifoldStatus).filter_by(set_id=set_id).first()
-
-                if cathode_fr and anode_fr:
-                    anode_record = session.query(AnodeFR).filter_by(fr_id=anode_fr).first()
-                    cathode_record = session.query(CathodeFR).filter_by(fr_id=cathode_fr).first()
-                    anode_flows = np.array(anode_record.flow_rates) if anode_record and anode_record.flow_rates is not None else np.array([])
-                    cathode_flows = np.array(cathode_record.flow_rates) if cathode_record and cathode_record.flow_rates is not None else np.array([])
-                    if anode_flows.size > 0 and cathode_flows.size > 0:
-                        ratio = np.average(anode_flows / cathode_flows)
-                    else:
-                        ratio = 13
-                else:
-                    ratio = 13
-
-                if existing_entry:
-                    existing_entry.assembly_drawing = drawing
-                    existing_entry.allocated = allocated if allocated else existing_entry.allocated
-                    existing_entry.assembly_certification = assembly_certification if assembly_certification else existing_entry.assembly_certification
-                    existing_entry.certification = manifold_certification if manifold_certification else existing_entry.certification
-                    existing_entry.drawing = drawing
-                    existing_entry.ac_ratio = ratio
-                    existing_entry.ac_ratio_specified = round(ratio)
-                    existing_entry.status = ManifoldProgressStatus.ASSEMBLY_COMPLETED
-                    current_session_allocated[allocated] = existing_entry
-                else:
-                    available_entry = session.query(ManifoldStatus).filter_by(set_id=None, allocated=None, status=ManifoldProgressStatus.AVAILABLE, \
-                                                                              certification=manifold_certification).first() if manifold_certification \
-                        else session.query(ManifoldStatus).filter_by(set_id=None, allocated=None, status=ManifoldProgressStatus.AVAILABLE).first()
-                    if available_entry:
-                        available_entry.set_id = set_id
-                        available_entry.allocated = allocated if allocated else available_entry.allocated
-                        available_entry.assembly_certification = assembly_certification if assembly_certification else available_entry.assembly_certification
-                        available_entry.assembly_drawing = drawing if drawing else available_entry.assembly_drawing
-                        available_entry.ac_ratio = ratio if ratio else 13
-                        available_entry.ac_ratio_specified = 13
-                        available_entry.status = ManifoldProgressStatus.ASSEMBLY_COMPLETED if not assembly_certification else\
-                              ManifoldProgressStatus.WELDING_COMPLETED
-                        current_session_allocated[allocated] = available_entry
-                    else:
-                        new_entry = ManifoldStatus(
-                            set_id=set_id,
-                            assembly_drawing=drawing,
-                            allocated=allocated,
-                            assembly_certification=assembly_certification,
-                            certification=manifold_certification,
-                            status=ManifoldProgressStatus.ASSEMBLY_COMPLETED if not assembly_certification else ManifoldProgressStatus.WELDING_COMPLETED,
-                            ac_ratio=ratio if ratio else 13,
-                            ac_ratio_specified=13
-                        )
-                        session.add(new_entry)
-                        current_session_allocated[allocated] = new_entry
-
-                self.update_related_parts(
-                        session,
-                        set_id,
-                        anode_fr,
-                        anode_filter,
-                        anode_outlet,
-                        cathode_fr,
-                        cathode_filter,
-                        cathode_outlet,
-                        lpt_id
-                    )
-                    
-            session.commit()
+            reconciler = ManifoldAssemblyReconciler(session)
+            self.assembly_changes = reconciler.reconcile(self.manifold_assembly_data)
+            if dry_run:
+                reconciler.discard()
+            else:
+                reconciler.apply()
             # self.fms.print_table(ManifoldStatus)
             # self.fms.print_table(AnodeFR)
             # self.fms.print_table(CathodeFR)
-            
+
         except Exception as e:
             print(f"Error updating manifold assembly data: {str(e)}")
             if session:
@@ -1221,6 +1110,7 @@ class ManifoldLogicSQL:
         finally:
             if session:
                 session.close()
+        return self.assembly_changes
 
     def update_lpt_certification(self, data: ManifoldData = None) -> None:
         """
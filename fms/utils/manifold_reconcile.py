@@ -0,0 +1,278 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any
+
+# Third-party
+import numpy as np
+from sqlalchemy import inspect, or_, update
+
+# Local imports
+from ..db import AnodeFR, CathodeFR, FRCertification, LPTCalibration, ManifoldStatus
+from .enums import ManifoldProgressStatus
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+DEFAULT_AC_RATIO = 13
+"""Anode/cathode ratio used when the flow rates of a set are unknown."""
+
+_FILTER = 'ejay filter'
+_OUTLET = 'restrictor outlet'
+
+
+def _key(value: Any) -> str | None:
+    # Sheet values and the (integer or string) set_id columns compare as text, like sqlite does
+    return None if value is None else str(value).strip()
+
+
+def _ratio(anode: AnodeFR | None, cathode: CathodeFR | None) -> float:
+    anode_flows = np.array(anode.flow_rates) if anode and anode.flow_rates is not None else np.array([])
+    cathode_flows = np.array(cathode.flow_rates) if cathode and cathode.flow_rates is not None else np.array([])
+    if anode_flows.size > 0 and cathode_flows.size > 0:
+        return float(np.average(anode_flows / cathode_flows))
+    return DEFAULT_AC_RATIO
+
+
+class ManifoldAssemblyReconciler:
+    """
+    Reconciles the rows of the manifold assembly sheet with the database in memory.
+
+    Every table involved (ManifoldStatus, AnodeFR, CathodeFR, FRCertification, LPTCalibration)
+    is read once into keyed indexes, the rows are then applied to those entries in sheet order
+    with the same rules as the row-by-row import (reallocations, available manifolds, FR, filter,
+    outlet and LPT links, A/C ratios), and the resulting difference is written in one transaction.
+    The import therefore costs a fixed number of queries, independent of the number of rows.
+
+    Attributes
+    ----------
+    session : Session
+        Session the entries are loaded into and written with.
+    changes : list[dict]
+        Change report of the last reconcile call, see reconcile.
+
+    Methods
+    -------
+    reconcile(rows):
+        Apply the assembly rows to the loaded entries and report the changes.
+    apply():
+        Write the reconciled changes and commit.
+    discard():
+        Drop the reconciled changes.
+    """
+
+    def __init__(self, session: "Session") -> None:
+        self.session = session
+        self.changes: list[dict] = []
+        self._new_entries: list[ManifoldStatus] = []
+        self._released: dict[ManifoldStatus, str] = {}
+
+    def _load(self, rows: list[dict]) -> None:
+        session = self.session
+        set_ids = {_key(row['set_id']) for row in rows if row['set_id'] is not None}
+        anode_ids = {row['anode_fr'] for row in rows if row['anode_fr']}
+        cathode_ids = {row['cathode_fr'] for row in rows if row['cathode_fr']}
+        lpt_ids = {row['lpt_id'] for row in rows if row['lpt_id']}
+        certifications = {row[k] for row in rows for k in ('anode_filter', 'anode_outlet', 'cathode_filter', 'cathode_outlet') if row[k]}
+
+        self.manifolds: list[ManifoldStatus] = session.query(ManifoldStatus).order_by(ManifoldStatus.manifold_id).all()
+        self.by_set_id = {_key(m.set_id): m for m in self.manifolds if m.set_id is not None}
+        self.allocated_dict = {m.allocated: m for m in self.manifolds if m.allocated is not None}
+        self.available = [m for m in self.manifolds if m.set_id is None and m.status == ManifoldProgressStatus.AVAILABLE]
+
+        self.anodes: dict[str, AnodeFR] = {}
+        self.cathodes: dict[str, CathodeFR] = {}
+        self.anode_sets: dict[str, AnodeFR] = {}
+        self.cathode_sets: dict[str, CathodeFR] = {}
+        for model, ids, by_id, by_set in ((AnodeFR, anode_ids, self.anodes, self.anode_sets),
+                                          (CathodeFR, cathode_ids, self.cathodes, self.cathode_sets)):
+            if not ids and not set_ids:
+                continue
+            for fr in session.query(model).filter(or_(model.fr_id.in_(ids), model.set_id.in_(set_ids))):
+                by_id[fr.fr_id] = fr
+                if fr.set_id is not None:
+                    by_set[_key(fr.set_id)] = fr
+
+        # Unlinked filter and outlet certificates per (certification, part), first entry is used first
+        self.anode_parts: dict[tuple[str, str], list[FRCertification]] = {}
+        self.cathode_parts: dict[tuple[str, str], list[FRCertification]] = {}
+        if certifications:
+            parts = session.query(FRCertification).filter(
+                FRCertification.certification.in_(certifications),
+                FRCertification.part_name.in_([_FILTER, _OUTLET]),
+                or_(FRCertification.anode_fr_id == None, FRCertification.cathode_fr_id == None)
+            ).order_by(FRCertification.part_id)
+            for part in parts:
+                if part.anode_fr_id is None:
+                    self.anode_parts.setdefault((part.certification, part.part_name), []).append(part)
+                if part.cathode_fr_id is None:
+                    self.cathode_parts.setdefault((part.certification, part.part_name), []).append(part)
+
+        self.free_lpts: dict[str, LPTCalibration] = {}
+        if lpt_ids:
+            for lpt in session.query(LPTCalibration).filter(LPTCalibration.lpt_id.in_(lpt_ids), LPTCalibration.set_id == None):
+                self.free_lpts[lpt.lpt_id] = lpt
+
+    def _existing(self, set_id: Any) -> ManifoldStatus | None:
+        if set_id is None:
+            # Like filter_by(set_id=None).first(): the first manifold without a set
+            return next((m for m in self.manifolds + self._new_entries if m.set_id is None), None)
+        return self.by_set_id.get(_key(set_id))
+
+    def _take_available(self, certification: str = None) -> ManifoldStatus | None:
+        for idx, manifold in enumerate(self.available):
+            if manifold.allocated is None and (not certification or manifold.certification == certification):
+                return self.available.pop(idx)
+        return None
+
+    def _take_part(self, pool: dict, certification: str, part_name: str) -> FRCertification | None:
+        entries = pool.get((certification, part_name))
+        return entries.pop(0) if entries else None
+
+    def _link_fr(self, set_id: Any, fr: AnodeFR | CathodeFR | None, by_set: dict, pool: dict, filter_cert: str,
+                 outlet_cert: str, column: str) -> None:
+        if not fr or set_id is None or _key(set_id) in by_set:
+            return
+        if fr.set_id is not None and by_set.get(_key(fr.set_id)) is fr:
+            del by_set[_key(fr.set_id)]
+        fr.set_id = set_id
+        by_set[_key(set_id)] = fr
+        for part in (self._take_part(pool, filter_cert, _FILTER), self._take_part(pool, outlet_cert, _OUTLET)):
+            if part:
+                setattr(part, column, fr.fr_id)
+
+    def _allocate(self, manifold: ManifoldStatus, allocated: str | None) -> None:
+        previous = manifold.allocated
+        if previous is not None and previous != allocated:
+            if manifold not in self._released:
+                self._released[manifold] = previous
+            # The manifold no longer holds its previous FMS, a later row allocating it must not release this manifold
+            for index in (self.allocated_dict, self.current_session_allocated):
+                if index.get(previous) is manifold:
+                    del index[previous]
+        manifold.allocated = allocated
+
+    def reconcile(self, rows: list[dict]) -> list[dict]:
+        """
+        Apply the assembly rows to the database entries in memory. Nothing is written yet.
+        Rows with a manifold certification are handled first.
+        Args:
+            rows (list[dict]): Rows of ManifoldLogicSQL.extract_assembly_from_excel.
+        Returns:
+            list[dict]: Change report, one item per created or modified entry with
+                'table', 'key', 'action' ('created' or 'updated') and 'changes' (column -> (old, new)).
+        """
+        rows = [row for row in rows if row.get('manifold_certification')] + [row for row in rows if not row.get('manifold_certification')]
+        self._load(rows)
+        self.current_session_allocated: dict[str, ManifoldStatus] = {}
+        current_session_allocated = self.current_session_allocated
+
+        with self.session.no_autoflush:
+            for row in rows:
+                set_id = row['set_id']
+                drawing = row['drawing']
+                allocated = row['allocated']
+                assembly_certification = row['assembly_certification']
+                manifold_certification = row['manifold_certification']
+
+                if allocated and (allocated in self.allocated_dict or allocated in current_session_allocated):
+                    faulty_manifold = self.allocated_dict.get(allocated) or current_session_allocated.get(allocated)
+                    self._allocate(faulty_manifold, None)
+                    self.allocated_dict.pop(allocated, None)
+                    current_session_allocated.pop(allocated, None)
+
+                anode = self.anodes.get(row['anode_fr']) if row['anode_fr'] else None
+                cathode = self.cathodes.get(row['cathode_fr']) if row['cathode_fr'] else None
+                ratio = _ratio(anode, cathode) if row['anode_fr'] and row['cathode_fr'] else DEFAULT_AC_RATIO
+
+                existing_entry = self._existing(set_id)
+                if existing_entry:
+                    existing_entry.assembly_drawing = drawing
+                    self._allocate(existing_entry, allocated if allocated else existing_entry.allocated)
+                    existing_entry.assembly_certification = assembly_certification if assembly_certification else existing_entry.assembly_certification
+                    existing_entry.certification = manifold_certification if manifold_certification else existing_entry.certification
+                    existing_entry.drawing = drawing
+                    existing_entry.ac_ratio = ratio
+                    existing_entry.ac_ratio_specified = round(ratio)
+                    existing_entry.status = ManifoldProgressStatus.ASSEMBLY_COMPLETED
+                    current_session_allocated[allocated] = existing_entry
+                else:
+                    status = ManifoldProgressStatus.ASSEMBLY_COMPLETED if not assembly_certification else ManifoldProgressStatus.WELDING_COMPLETED
+                    available_entry = self._take_available(manifold_certification)
+                    if available_entry:
+                        available_entry.set_id = set_id
+                        self._allocate(available_entry, allocated if allocated else available_entry.allocated)
+                        available_entry.assembly_certification = assembly_certification if assembly_certification else available_entry.assembly_certification
+                        available_entry.assembly_drawing = drawing if drawing else available_entry.assembly_drawing
+                        available_entry.ac_ratio = ratio if ratio else DEFAULT_AC_RATIO
+                        available_entry.ac_ratio_specified = DEFAULT_AC_RATIO
+                        available_entry.status = status
+                        entry = available_entry
+                    else:
+                        entry = ManifoldStatus(
+                            set_id=set_id,
+                            assembly_drawing=drawing,
+                            allocated=allocated,
+                            assembly_certification=assembly_certification,
+                            certification=manifold_certification,
+                            status=status,
+                            ac_ratio=ratio if ratio else DEFAULT_AC_RATIO,
+                            ac_ratio_specified=DEFAULT_AC_RATIO
+                        )
+                        self._new_entries.append(entry)
+                    if set_id is not None:
+                        self.by_set_id[_key(set_id)] = entry
+                    current_session_allocated[allocated] = entry
+
+                self._link_fr(set_id, anode, self.anode_sets, self.anode_parts, row['anode_filter'], row['anode_outlet'], 'anode_fr_id')
+                self._link_fr(set_id, cathode, self.cathode_sets, self.cathode_parts, row['cathode_filter'], row['cathode_outlet'], 'cathode_fr_id')
+
+                if row['lpt_id']:
+                    lpt = self.free_lpts.pop(row['lpt_id'], None)
+                    if lpt:
+                        lpt.set_id = set_id
+
+        self.changes = self._report()
+        return self.changes
+
+    def _report(self) -> list[dict]:
+        changes = []
+        for entry in self._new_entries:
+            values = {attr.key: (None, getattr(entry, attr.key)) for attr in inspect(ManifoldStatus).column_attrs
+                      if getattr(entry, attr.key) is not None}
+            changes.append({'table': ManifoldStatus.__tablename__, 'key': entry.set_id, 'action': 'created', 'changes': values})
+
+        for entry in self.session.dirty:
+            state = inspect(entry)
+            values = {}
+            for attr in state.mapper.column_attrs:
+                history = state.attrs[attr.key].history
+                if history.has_changes():
+                    values[attr.key] = (history.deleted[0] if history.deleted else None, history.added[0] if history.added else None)
+            if values:
+                key = entry.set_id if isinstance(entry, ManifoldStatus) else state.identity[0]
+                changes.append({'table': state.mapper.local_table.name, 'key': key, 'action': 'updated', 'changes': values})
+        return changes
+
+    def apply(self) -> None:
+        """
+        Write the reconciled changes in one transaction and commit.
+        Allocations that move to another manifold are released first, as allocated is unique.
+        """
+        session = self.session
+        # The entries still differ from their loaded state, so the flush writes their final allocation
+        moved = [m.manifold_id for m, old in self._released.items() if m.manifold_id is not None and m.allocated != old]
+        if moved:
+            with session.no_autoflush:
+                session.execute(update(ManifoldStatus).where(ManifoldStatus.manifold_id.in_(moved)).values(allocated=None)
+                                .execution_options(synchronize_session=False))
+        session.add_all(self._new_entries)
+        session.commit()
+        self._new_entries = []
+        self._released = {}
+
+    def discard(self) -> None:
+        """
+        Drop the reconciled changes without writing anything.
+        """
+        self.session.rollback()
+        self._new_entries = []
+        self._released = {}
@@ -0,0 +1,152 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Callable
+
+# Standard library
+import io
+import os
+import threading
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+# Third-party
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+MAX_CACHED_PLOTS = 256
+"""Number of rendered images kept in memory, least recently used ones are dropped first."""
+
+
+def new_figure(figsize: tuple[float, float]) -> Figure:
+    """
+    Figure drawn by its own Agg canvas, independent of pyplot's global figure state.
+    Args:
+        figsize (tuple[float, float]): Figure size in inches.
+    Returns:
+        Figure: Empty figure.
+    """
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def figure_png(fig: Figure) -> bytes:
+    """
+    Rasterize a figure to PNG, cropped to its content like the report images.
+    """
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', bbox_inches='tight')
+    return buf.getvalue()
+
+
+def render_png(draw: Callable, figsize: tuple[float, float], data: dict[str, Any]) -> bytes:
+    """
+    Draw a plot on a new headless figure and rasterize it.
+    Args:
+        draw (Callable): Module-level drawing function taking the figure and the data as keyword arguments.
+        figsize (tuple[float, float]): Figure size in inches.
+        data (dict[str, Any]): Keyword arguments of the drawing function.
+    Returns:
+        bytes: The PNG image.
+    """
+    fig = new_figure(figsize)
+    draw(fig, **data)
+    return figure_png(fig)
+
+
+def render_pngs(jobs: list[tuple[Callable, tuple[float, float], dict[str, Any]]], workers: int = None) -> list[bytes | None]:
+    """
+    Render several plots in a process pool.
+    Falls back to rendering in this process if the pool fails.
+    Args:
+        jobs (list[tuple]): (draw, figsize, data) per plot, see render_png.
+        workers (int): Number of worker processes, defaults to the CPU count. 1 renders in this process.
+    Returns:
+        list[bytes | None]: PNG image per job, None if rendering failed.
+    """
+    if not jobs:
+        return []
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(render_png, *zip(*jobs)))
+        except Exception as e:
+            print(f"Parallel plot rendering failed, rendering sequentially: {str(e)}")
+            traceback.print_exc()
+    images = []
+    for job in jobs:
+        try:
+            images.append(render_png(*job))
+        except Exception as e:
+            print(f"Error rendering plot {getattr(job[0], '__name__', job[0])}: {str(e)}")
+            traceback.print_exc()
+            images.append(None)
+    return images
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+_plot_cache: OrderedDict[tuple, tuple[bytes, Any]] = OrderedDict()
+_plot_lock = threading.Lock()
+
+
+def plot_key(session: "Session", test_id: str, kind: str, options: dict = None, version: Any = None) -> tuple:
+    """
+    Cache key of a rendered plot.
+    Args:
+        session (Session): Session of the database the data comes from.
+        test_id (str): Test the plot shows.
+        kind (str): Plot type (e.g. 'closed_loop', 'fr_voltage').
+        options (dict): Display options and settings that change the image.
+        version (Any): Data version of the test, e.g. row count and highest id of its results.
+    Returns:
+        tuple: Hashable key.
+    """
+    return (str(session.get_bind().url), test_id, kind, _freeze(options or {}), _freeze(version))
+
+
+def cached_plot(key: tuple) -> tuple[bytes, Any] | None:
+    """
+    Rendered image and the data stored with it, None if the plot was not rendered yet.
+    """
+    with _plot_lock:
+        entry = _plot_cache.get(key)
+        if entry is not None:
+            _plot_cache.move_to_end(key)
+        return entry
+
+
+def store_plot(key: tuple, png: bytes, data: Any = None) -> None:
+    """
+    Remember a rendered image, together with data computed alongside it (e.g. the report table).
+    """
+    with _plot_lock:
+        _plot_cache[key] = (png, data)
+        _plot_cache.move_to_end(key)
+        while len(_plot_cache) > MAX_CACHED_PLOTS:
+            _plot_cache.popitem(last=False)
+
+
+def invalidate_plot_cache(test_id: str = None) -> None:
+    """
+    Forget the rendered images of a test, or all of them.
+    """
+    with _plot_lock:
+        if test_id is None:
+            _plot_cache.clear()
+            return
+        for key in [k for k in _plot_cache if k[1] == test_id]:
+            del _plot_cache[key]
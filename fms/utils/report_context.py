@@ -0,0 +1,209 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any
+
+# Standard library
+import base64
+import io
+
+# Third-party
+from docxtpl import InlineImage
+from docx.shared import Mm
+
+if TYPE_CHECKING:
+    from docxtpl import DocxTemplate
+
+TVAC_PHASES = {
+    "tvac_results_hot": "hot",
+    "tvac_results_cold": "cold",
+    "tvac_results_room": "room",
+}
+"""TVAC result sections of the test info and the prefix of their report variables."""
+
+LIMIT_KEYS = ("max", "min", "nominal", "tol")
+"""TVAC properties containing one of these keep their phase prefix, other values are reported without it."""
+
+PLOT_WIDTH = 145
+SMALL_WIDTH = 80
+"""Image widths in mm: plots, and HPIV and setup pictures."""
+
+
+def has_image(encoded: Any) -> bool:
+    """
+    Whether a stored base64 image holds any data, checked without decoding it.
+    """
+    return isinstance(encoded, str) and bool(encoded.strip()) and encoded != "None"
+
+
+class LazyInlineImage:
+    """
+    InlineImage of a base64 encoded image that is only decoded when docxtpl renders it, so images
+    of sections the template does not show are never decoded.
+
+    Attributes
+    ----------
+    template : DocxTemplate
+        Template the image is rendered into.
+    encoded : str
+        Base64 encoded image.
+    width : int
+        Width in mm.
+
+    Methods
+    -------
+    image():
+        The decoded InlineImage.
+    """
+
+    __slots__ = ("template", "encoded", "width", "_image")
+
+    def __init__(self, template: "DocxTemplate", encoded: str, width: int = PLOT_WIDTH) -> None:
+        self.template = template
+        self.encoded = encoded
+        self.width = width
+        self._image = None
+
+    def image(self) -> InlineImage:
+        if self._image is None:
+            self._image = InlineImage(self.template, io.BytesIO(base64.b64decode(self.encoded)), width=Mm(self.width))
+        return self._image
+
+    # docxtpl inserts an image by rendering it to a string
+    def __str__(self) -> str:
+        return str(self.image())
+
+    def __html__(self) -> str:
+        return self.image().__html__()
+
+    def __repr__(self) -> str:
+        return f"LazyInlineImage({len(self.encoded)} base64 characters, {self.width} mm)"
+
+
+class ReportContextBuilder:
+    """
+    Builds the docxtpl context of an acceptance report in a single traversal of the test info.
+
+    The TVAC results, the physical properties and all remaining values are collected in one pass into a
+    flat variable -> value map. Images become LazyInlineImage proxies, and images of variables the
+    template does not declare are skipped. Precedence is unchanged: TVAC values (hot, cold, room) first,
+    then the physical properties, then the remaining values, which only fill variables still missing,
+    except top-level values and HPIV images, which always win. The test info is not modified.
+
+    Attributes
+    ----------
+    template : DocxTemplate
+        Template the images are rendered into.
+    variables : set[str] | None
+        Undeclared variables of the template, None to keep every image.
+
+    Methods
+    -------
+    wants(*variables):
+        Whether the template uses any of the variables.
+    build(test_info):
+        The report context.
+    """
+
+    def __init__(self, template: "DocxTemplate", variables: set[str] = None) -> None:
+        self.template = template
+        self.variables = set(variables) if variables is not None else None
+
+    def wants(self, *variables: str) -> bool:
+        return self.variables is None or any(v in self.variables for v in variables)
+
+    def _image(self, variable: str, encoded: Any, width: int) -> LazyInlineImage | None:
+        if not has_image(encoded) or not self.wants(variable):
+            return None
+        return LazyInlineImage(self.template, encoded, width)
+
+    def _plots(self, plots: list) -> list[dict]:
+        # Extra plots with an image, copied so the stored plots keep their encoded image
+        return [{**plot, "image": LazyInlineImage(self.template, plot["image"], PLOT_WIDTH)}
+                for plot in plots if isinstance(plot, dict) and has_image(plot.get("image"))]
+
+    def _tvac_property(self, phase: dict, prefix: str, key: str, value: Any) -> None:
+        variable = f"{prefix}_{key}"
+        if isinstance(value, dict) and "image" in value:
+            image = self._image(variable, value["image"], PLOT_WIDTH)
+            if image is not None:
+                phase[variable] = image
+        elif isinstance(value, dict) and key == "hpiv_images":
+            for name in ("hpiv_opening_image", "hpiv_closing_image"):
+                image = self._image(f"{prefix}_{name}", value.get(name, ""), SMALL_WIDTH)
+                if image is not None:
+                    phase[f"{prefix}_{name}"] = image
+        elif isinstance(value, list) and key == "extra_plots":
+            phase[variable] = self._plots(value)
+        elif any(i in key for i in LIMIT_KEYS):
+            phase[variable] = value
+        else:
+            phase[key] = value
+
+    def _visit(self, values: dict, ops: list, tvac: tuple = None, phase: tuple = None) -> None:
+        # tvac: (phase context, prefix) when values is a TVAC phase, phase: the same when values holds the
+        # properties of a TVAC test type
+        for key, value in values.items():
+            if phase is not None:
+                self._tvac_property(*phase, key, value)
+            if not isinstance(value, dict):
+                if key == "extra_plots" and isinstance(value, list):
+                    value = self._plots(value)
+                ops.append((False, key, value))
+                continue
+
+            if key == "hpiv_images":
+                for name in ("hpiv_opening_image", "hpiv_closing_image"):
+                    image = self._image(name, value.get(name, ""), SMALL_WIDTH)
+                    if image is not None:
+                        ops.append((True, name, image))
+            elif "image" in value and isinstance(value["image"], str):
+                if has_image(value["image"]):
+                    image = self._image(key, value["image"], SMALL_WIDTH if "setup" in key else PLOT_WIDTH)
+                    if image is not None:
+                        ops.append((False, key, image))
+                    ops.extend((False, sub_key, sub_value) for sub_key, sub_value in value.items() if sub_key != "image")
+            else:
+                self._visit(value, ops, phase=tvac)
+                continue
+            # Test types stored as an image or HPIV images still report their properties
+            if tvac is not None:
+                for prop_key, prop_value in value.items():
+                    self._tvac_property(*tvac, prop_key, prop_value)
+
+    def _physical_properties(self, properties: dict) -> dict:
+        context = {"mass": properties.get("mass", 0)}
+        for location, values in properties.items():
+            if isinstance(values, dict):
+                context[location] = values
+                context[f"{location}_remark"] = values.get("remark", "")
+        return context
+
+    def build(self, test_info: dict) -> dict:
+        """
+        Build the report context of the test info.
+        Args:
+            test_info (dict): Acceptance test procedure information.
+        Returns:
+            dict: Report variable -> value, images as LazyInlineImage.
+        """
+        phases = {prefix: {} for prefix in TVAC_PHASES.values()}
+        physical = self._physical_properties({})
+        ops = []
+        for key, value in test_info.items():
+            if not isinstance(value, dict):
+                ops.append((True, key, value))
+                continue
+            if key == "physical_properties":
+                physical = self._physical_properties(value)
+            prefix = TVAC_PHASES.get(key)
+            self._visit(value, ops, tvac=(phases[prefix], prefix) if prefix else None)
+
+        context = {}
+        for prefix in TVAC_PHASES.values():
+            context.update(phases[prefix])
+        context.update(physical)
+        for overwrite, key, value in ops:
+            if overwrite:
+                context[key] = value
+            else:
+                context.setdefault(key, value)
+        return context
@@ -0,0 +1,350 @@
+from __future__ import annotations
+
+# Standard library
+import hashlib
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import traceback
+from abc import ABC, abstractmethod
+from concurrent.futures import Future
+from typing import Callable
+
+# Third-party
+import fitz
+
+# Local imports
+from .report_text import file_digest
+
+MAX_BATCH_SIZE = 20
+"""Number of documents converted in one converter session."""
+
+
+def preview_cache_dir() -> str:
+    """
+    Directory of the cached DOCX previews, next to the local database.
+    """
+    return os.path.join(os.environ.get("LOCALAPPDATA", os.getcwd()), "FMSDatabase", "docx_previews")
+
+
+class DocxConverter(ABC):
+    """
+    Converter backend turning a directory of DOCX files into PDF files of the same name.
+
+    Subclasses implement convert_directory; convert_batch stages the documents of a batch under
+    unique names, so one converter session handles all of them even if their file names clash.
+
+    Methods
+    -------
+    available():
+        Whether the backend can run on this machine.
+    convert_directory(input_dir, output_dir):
+        Convert every DOCX in input_dir to PDF in output_dir.
+    convert_batch(jobs):
+        Convert (docx_path, pdf_path) pairs in one session.
+    """
+
+    name = "converter"
+
+    def available(self) -> bool:
+        return True
+
+    @abstractmethod
+    def convert_directory(self, input_dir: str, output_dir: str) -> None:
+        ...
+
+    def convert_batch(self, jobs: list[tuple[str, str]]) -> list[Exception | None]:
+        """
+        Convert several documents in one converter session.
+        Args:
+            jobs (list[tuple[str, str]]): (docx_path, pdf_path) per document.
+        Returns:
+            list[Exception | None]: Error per document, None if its PDF was written.
+        """
+        with tempfile.TemporaryDirectory(prefix="fms_docx_") as staging:
+            input_dir = os.path.join(staging, "in")
+            output_dir = os.path.join(staging, "out")
+            os.makedirs(input_dir)
+            os.makedirs(output_dir)
+            for idx, (docx_path, _) in enumerate(jobs):
+                shutil.copyfile(docx_path, os.path.join(input_dir, f"{idx:04d}.docx"))
+
+            self.convert_directory(input_dir, output_dir)
+
+            errors = []
+            for idx, (docx_path, pdf_path) in enumerate(jobs):
+                converted = os.path.join(output_dir, f"{idx:04d}.pdf")
+                if not os.path.exists(converted):
+                    errors.append(FileNotFoundError(f"{self.name} produced no PDF for {docx_path}"))
+                    continue
+                pdf_dir = os.path.dirname(os.path.abspath(pdf_path))
+                os.makedirs(pdf_dir, exist_ok=True)
+                shutil.move(converted, pdf_path)
+                errors.append(None)
+            return errors
+
+
+class WordConverter(DocxConverter):
+    """
+    Microsoft Word through docx2pdf (Windows and macOS). A directory is converted
+    within a single Word instance.
+    """
+
+    name = "Word"
+
+    def available(self) -> bool:
+        if sys.platform not in ("win32", "darwin"):
+            return False
+        try:
+            import docx2pdf  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def convert_directory(self, input_dir: str, output_dir: str) -> None:
+        from docx2pdf import convert
+        convert(input_dir, output_dir)
+
+
+class LibreOfficeConverter(DocxConverter):
+    """
+    Headless LibreOffice (soffice --convert-to pdf), one process per batch.
+    Uses its own user profile, so it does not collide with an open LibreOffice window.
+    """
+
+    name = "LibreOffice"
+
+    def __init__(self, executable: str = None, timeout: float = 600) -> None:
+        self.executable = executable or shutil.which("soffice") or shutil.which("libreoffice")
+        self.timeout = timeout
+        self.profile_dir = os.path.join(tempfile.gettempdir(), "fms_soffice_profile")
+
+    def available(self) -> bool:
+        return self.executable is not None
+
+    def convert_directory(self, input_dir: str, output_dir: str) -> None:
+        documents = sorted(os.path.join(input_dir, f) for f in os.listdir(input_dir) if f.lower().endswith(".docx"))
+        profile = "file:///" + self.profile_dir.replace("\\", "/").lstrip("/")
+        subprocess.run([self.executable, f"-env:UserInstallation={profile}", "--headless", "--norestore",
+                        "--convert-to", "pdf", "--outdir", output_dir, *documents],
+                       check=True, capture_output=True, timeout=self.timeout)
+
+
+def default_converter() -> DocxConverter:
+    """
+    Word if it is available, headless LibreOffice otherwise.
+    Raises:
+        RuntimeError: If neither is available on this machine.
+    """
+    for converter in (WordConverter(), LibreOfficeConverter()):
+        if converter.available():
+            return converter
+    raise RuntimeError("No DOCX to PDF converter available: install Microsoft Word with docx2pdf, or LibreOffice (soffice on the PATH)")
+
+
+class ReportConversionService:
+    """
+    Background DOCX -> PDF conversion for the as-run and acceptance reports.
+
+    Documents are queued with submit and converted by a single worker thread, which takes every
+    document waiting in the queue (up to max_batch_size) into one converter session, so a batch of
+    reports costs one Word or LibreOffice start-up instead of one per document. The notebook keeps
+    running while the reports are converted; callers wait on the returned future only if they need
+    the PDF. First page previews are rasterized from the converted PDF and cached on disk by the
+    SHA-256 of the document, i.e. by template and context for rendered reports.
+
+    Attributes
+    ----------
+    converter : DocxConverter
+        Backend performing the conversions.
+    max_batch_size : int
+        Maximum number of documents per converter session.
+    cache_dir : str
+        Directory of the cached previews.
+
+    Methods
+    -------
+    submit(docx_path, pdf_path=None, callback=None):
+        Queue a document for conversion.
+    submit_many(docx_paths, pdf_dir=None, callback=None):
+        Queue several documents, converted together.
+    preview_png(docx_path, page=0, dpi=300):
+        PNG image of a page of a document, cached by content.
+    shutdown(wait=True):
+        Stop the worker after the queued documents.
+    """
+
+    def __init__(self, converter: DocxConverter = None, max_batch_size: int = MAX_BATCH_SIZE, cache_dir: str = None) -> None:
+        self.converter = converter or default_converter()
+        self.max_batch_size = max_batch_size
+        self.cache_dir = cache_dir or preview_cache_dir()
+        self._queue: queue.Queue = queue.Queue()
+        self._worker: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def _ensure_worker(self) -> None:
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._process_queue, name="report-conversion", daemon=True)
+                self._worker.start()
+
+    def submit(self, docx_path: str, pdf_path: str = None, callback: Callable[[Future], None] = None) -> Future:
+        """
+        Queue a document for conversion.
+        Args:
+            docx_path (str): Path to the DOCX file.
+            pdf_path (str): Path of the PDF to write, defaults to the DOCX path with .pdf extension.
+            callback (Callable[[Future], None]): Called from the worker thread when the conversion finished.
+        Returns:
+            Future: Resolves to the PDF path, or raises the conversion error.
+        """
+        future = Future()
+        if callback is not None:
+            future.add_done_callback(callback)
+        pdf_path = pdf_path or os.path.splitext(docx_path)[0] + ".pdf"
+        self._queue.put((docx_path, pdf_path, future))
+        self._ensure_worker()
+        return future
+
+    def submit_many(self, docx_paths: list[str], pdf_dir: str = None, callback: Callable[[Future], None] = None) -> list[Future]:
+        """
+        Queue several documents; they are converted in the same converter session.
+        Args:
+            docx_paths (list[str]): Paths to the DOCX files.
+            pdf_dir (str): Directory of the PDFs, defaults to the directory of each DOCX.
+            callback (Callable[[Future], None]): Called per document when its conversion finished.
+        Returns:
+            list[Future]: Future per document, see submit.
+        """
+        futures = []
+        for docx_path in docx_paths:
+            pdf_path = os.path.join(pdf_dir, os.path.splitext(os.path.basename(docx_path))[0] + ".pdf") if pdf_dir else None
+            futures.append(self.submit(docx_path, pdf_path, callback))
+        return futures
+
+    def _process_queue(self) -> None:
+        # Word is driven over COM, which has to be initialized on every thread that uses it
+        try:
+            import pythoncom
+        except ImportError:
+            pythoncom = None
+        if pythoncom is not None:
+            pythoncom.CoInitialize()
+        try:
+            self._convert_queued()
+        finally:
+            if pythoncom is not None:
+                pythoncom.CoUninitialize()
+
+    def _convert_queued(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            stop = False
+            while len(batch) < self.max_batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._convert(batch)
+            if stop:
+                return
+
+    def _convert(self, batch: list[tuple[str, str, Future]]) -> None:
+        batch = [job for job in batch if job[2].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        try:
+            errors = self.converter.convert_batch([(docx_path, pdf_path) for docx_path, pdf_path, _ in batch])
+        except BaseException as e:
+            # docx2pdf exits (SystemExit) when Word fails, which must not stop the worker
+            if not isinstance(e, Exception):
+                e = RuntimeError(f"{self.converter.name} conversion aborted: {e!r}")
+            if len(batch) > 1:
+                # One broken document should not fail the others, convert them one by one
+                print(f"Batch conversion of {len(batch)} documents failed, converting separately: {str(e)}")
+                errors = []
+                for docx_path, pdf_path, _ in batch:
+                    try:
+                        errors.extend(self.converter.convert_batch([(docx_path, pdf_path)]))
+                    except BaseException as single_error:
+                        errors.append(single_error if isinstance(single_error, Exception)
+                                      else RuntimeError(f"{self.converter.name} conversion aborted: {single_error!r}"))
+            else:
+                errors = [e]
+        for (docx_path, pdf_path, future), error in zip(batch, errors):
+            if error is None:
+                future.set_result(pdf_path)
+            else:
+                print(f"Error converting {docx_path} to PDF: {str(error)}")
+                future.set_exception(error)
+
+    def preview_png(self, docx_path: str, page: int = 0, dpi: int = 300) -> bytes:
+        """
+        PNG image of a page of a document. The conversion goes through the queue,
+        the image is cached by the document content.
+        Args:
+            docx_path (str): Path to the DOCX file.
+            page (int): Page index.
+            dpi (int): Resolution of the image.
+        Returns:
+            bytes: The PNG image.
+        """
+        key = hashlib.sha256(f"{file_digest(docx_path)}:{page}:{dpi}".encode('utf-8')).hexdigest()
+        cache_file = os.path.join(self.cache_dir, f"{key}.png")
+        if os.path.exists(cache_file):
+            with open(cache_file, 'rb') as f:
+                return f.read()
+
+        with tempfile.TemporaryDirectory(prefix="fms_preview_") as tmp:
+            pdf_path = self.submit(docx_path, os.path.join(tmp, "preview.pdf")).result()
+            with fitz.open(pdf_path) as doc:
+                png = doc.load_page(page).get_pixmap(dpi=dpi).tobytes("png")
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+            with open(tmp_file, 'wb') as f:
+                f.write(png)
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            print(f"Error caching preview of {docx_path}: {str(e)}")
+            traceback.print_exc()
+        return png
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the worker once the documents queued so far are converted.
+        """
+        with self._lock:
+            worker = self._worker
+            self._worker = None
+        if worker is not None and worker.is_alive():
+            self._queue.put(None)
+            if wait:
+                worker.join()
+
+
+_service: ReportConversionService | None = None
+_service_lock = threading.Lock()
+
+
+def conversion_service() -> ReportConversionService:
+    """
+    Conversion service shared by the report generators of this process.
+    """
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = ReportConversionService()
+        return _service
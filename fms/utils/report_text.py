@@ -0,0 +1,161 @@
+# Standard library
+import hashlib
+import os
+import threading
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+# Third-party
+import fitz
+
+# Local imports
+from .general_utils import load_from_json, save_to_json
+
+
+def report_cache_dir() -> str:
+    """
+    Directory of the extracted report texts, next to the local database.
+    """
+    return os.path.join(os.environ.get("LOCALAPPDATA", os.getcwd()), "FMSDatabase", "pdf_text")
+
+
+_digest_cache: dict[tuple[str, int, int], str] = {}
+_digest_lock = threading.Lock()
+
+
+def file_digest(path: str) -> str:
+    """
+    SHA-256 of the file content, memoized per path, modification time and size.
+    """
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    with _digest_lock:
+        if key in _digest_cache:
+            return _digest_cache[key]
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            sha.update(block)
+    digest = sha.hexdigest()
+    with _digest_lock:
+        _digest_cache[key] = digest
+    return digest
+
+
+class ReportText:
+    """
+    Page texts of a PDF test report, extracted once and cached by content hash.
+
+    Every page is read with fitz exactly once and lowercased once, the texts are stored as JSON
+    under the SHA-256 of the PDF, so parser fixes can be re-run on the same reports without
+    opening them again. The section index (keyword -> pages containing it) lets the parsers
+    visit only the pages they need.
+
+    Attributes
+    ----------
+    pdf_file : str
+        Path to the PDF report.
+    cache_dir : str
+        Directory of the cached texts.
+    digest : str
+        SHA-256 of the PDF content.
+    pages : list[str]
+        Raw text per page.
+    lower : list[str]
+        Lowercased text per page.
+
+    Methods
+    -------
+    load():
+        Load the page texts from the cache, or extract and cache them.
+    find(keyword):
+        Pages whose text contains the keyword.
+    section_index(keywords):
+        Keyword -> pages for a set of section markers.
+    """
+
+    def __init__(self, pdf_file: str, cache_dir: str = None) -> None:
+        self.pdf_file = pdf_file
+        self.cache_dir = cache_dir or report_cache_dir()
+        self.digest = None
+        self.pages = []
+        self.lower = []
+
+    def load(self) -> "ReportText":
+        """
+        Load the page texts, extracting them with fitz only if the content hash is not cached yet.
+        Returns:
+            ReportText: self, for chaining.
+        """
+        self.digest = file_digest(self.pdf_file)
+        cached = load_from_json(self.digest, directory=self.cache_dir)
+        if isinstance(cached.get('pages'), list):
+            self.pages = cached['pages']
+        else:
+            with fitz.open(self.pdf_file) as pdf_document:
+                self.pages = [page.get_text() for page in pdf_document]
+            try:
+                save_to_json({'pdf_file': os.path.basename(self.pdf_file), 'pages': self.pages}, self.digest, directory=self.cache_dir)
+            except Exception as e:
+                print(f"Could not cache the text of {self.pdf_file}: {str(e)}")
+        self.lower = [text.lower() for text in self.pages]
+        return self
+
+    def find(self, keyword: str) -> list[int]:
+        """
+        Pages whose (lowercased) text contains the keyword.
+        Args:
+            keyword (str): Lowercase search string.
+        Returns:
+            list[int]: Page numbers (0-based).
+        """
+        return [idx for idx, text in enumerate(self.lower) if keyword in text]
+
+    def section_index(self, keywords: list[str]) -> dict[str, list[int]]:
+        """
+        Section marker -> pages containing it, built in one pass over the page texts.
+        Args:
+            keywords (list[str]): Lowercase section markers.
+        Returns:
+            dict[str, list[int]]: Keyword -> page numbers (0-based).
+        """
+        index = {keyword: [] for keyword in keywords}
+        for idx, text in enumerate(self.lower):
+            for keyword in keywords:
+                if keyword in text:
+                    index[keyword].append(idx)
+        return index
+
+
+def _extract_report(pdf_file: str, cache_dir: str) -> str:
+    return ReportText(pdf_file, cache_dir=cache_dir).load().digest
+
+
+def prefetch_report_texts(pdf_files: list[str], workers: int = None, cache_dir: str = None) -> None:
+    """
+    Extract and cache the page texts of several reports in a process pool.
+    Reports already cached are only hashed. Falls back to extracting in this process if the pool fails.
+    Args:
+        pdf_files (list[str]): Paths to the PDF reports.
+        workers (int): Number of worker processes, defaults to the CPU count. 1 extracts in this process.
+        cache_dir (str): Directory of the cached texts, defaults to report_cache_dir().
+    """
+    cache_dir = cache_dir or report_cache_dir()
+    pending = [f for f in pdf_files if not os.path.exists(os.path.join(cache_dir, f"{file_digest(f)}.json"))]
+    if not pending:
+        return
+    workers = min(workers or os.cpu_count() or 1, len(pending))
+    if workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(_extract_report, pending, [cache_dir] * len(pending)))
+            return
+        except Exception as e:
+            print(f"Parallel report extraction failed, extracting sequentially: {str(e)}")
+            traceback.print_exc()
+    for pdf_file in pending:
+        try:
+            _extract_report(pdf_file, cache_dir)
+        except Exception as e:
+            print(f"Error extracting text from {pdf_file}: {str(e)}")
+            traceback.print_exc()
@@ -40,4 +40,115 @@ manifold_specifications = {
     "reading_error": 0.005, 
     "xenon_density": 5.894, 
     "krypton_density": 3.749
-}
\ No newline at end of file
+}
+
+# Default acceptance limits, compiled into limit rules by fms.utils.limit_rules
+fms_limit_specifications = {
+    'mass': {'min': 0, 'max': 500},
+    'power_budget_cold': {'min': None, 'max': None},
+    'power_budget_room': {'min': None, 'max': None},
+    'power_budget_hot': {'min': None, 'max': None},
+    'room_hpiv_dropout_voltage': {'min': 0, 'max': 4},
+    'room_hpiv_pullin_voltage': {'min': 0, 'max': 18},
+    'room_hpiv_closing_response': {'min': 0, 'max': 20},
+    'room_hpiv_hold_power': {'min': None, 'max': None},
+    'room_hpiv_opening_response': {'min': 0, 'max': 20},
+    'room_hpiv_opening_power': {'min': None, 'max': None},
+    'room_hpiv_inductance': {'min': None, 'max': None},
+    'room_tv_inductance': {'min': None, 'max': None},
+    'room_hpiv_resistance': {'min': None, 'max': None},
+    'room_tv_pt_resistance': {'min': None, 'max': None},
+    'room_tv_resistance': {'min': 150-0.1*150, 'max': 150+0.1*150, 'nominal': 150, 'tolerance': 10},
+    'room_lpt_resistance': {'min': None, 'max': None},
+    'room_tv_high_leak': {'min': 0, 'max': 1e-5},
+    'room_tv_low_leak': {'min': 0, 'max': 1e-5},
+    'room_tv_low_leak_open': {'min': None, 'max': None},
+    'room_hpiv_high_leak': {'min': 0, 'max': 1e-5},
+    'room_hpiv_low_leak': {'min': 0, 'max': 1e-5},
+    'cold_hpiv_dropout_voltage': {'min': 0, 'max': 4},
+    'cold_hpiv_pullin_voltage': {'min': 0, 'max': 18},
+    'cold_hpiv_closing_response': {'min': 0, 'max': 20},
+    'cold_hpiv_hold_power': {'min': None, 'max': None},
+    'cold_hpiv_opening_response': {'min': 0, 'max': 20},
+    'cold_hpiv_opening_power': {'min': None, 'max': None},
+    'cold_hpiv_inductance': {'min': None, 'max': None},
+    'cold_tv_inductance': {'min': None, 'max': None},
+    'cold_hpiv_resistance': {'min': None, 'max': None},
+    'cold_tv_pt_resistance': {'min': None, 'max': None},
+    'cold_tv_resistance': {'min': 150-0.1*150, 'max': 150+0.1*150, 'nominal': 150, 'tolerance': 10},
+    'cold_lpt_resistance': {'min': None, 'max': None},
+    'cold_tv_high_leak': {'min': 0, 'max': 1e-5},
+    'cold_tv_low_leak': {'min': 0, 'max': 1e-5},
+    'cold_tv_low_leak_open': {'min': None, 'max': None},
+    'cold_hpiv_high_leak': {'min': 0, 'max': 1e-5},
+    'cold_hpiv_low_leak': {'min': 0, 'max': 1e-5},
+    'hot_hpiv_dropout_voltage': {'min': 0, 'max': 4},
+    'hot_hpiv_pullin_voltage': {'min': 0, 'max': 18},
+    'hot_hpiv_closing_response': {'min': 0, 'max': 20},
+    'hot_hpiv_hold_power': {'min': None, 'max': None},
+    'hot_hpiv_opening_response': {'min': 0, 'max': 20},
+    'hot_hpiv_opening_power': {'min': None, 'max': None},
+    'hot_hpiv_inductance': {'min': None, 'max': None},
+    'hot_tv_inductance': {'min': None, 'max': None},
+    'hot_hpiv_resistance': {'min': None, 'max': None},
+    'hot_tvpt_resistance': {'min': None, 'max': None},
+    'hot_tv_resistance': {'min': 150-0.1*150, 'max': 150+0.1*150, 'nominal': 150, 'tolerance': 10},
+    'hot_lpt_resistance': {'min': None, 'max': None},
+    'hot_tv_pt_resistance': {'min': None, 'max': None},
+    'hot_tv_high_leak': {'min': 0, 'max': 1e-5},
+    'hot_tv_low_leak': {'min': 0, 'max': 1e-5},
+    'hot_tv_low_leak_open': {'min': None, 'max': None},
+    'hot_hpiv_high_leak': {'min': 0, 'max': 1e-5},
+    'hot_hpiv_low_leak': {'min': 0, 'max': 1e-5},
+    'tv_high_leak': {'min': 0, 'max': 1e-5},
+    'tv_low_leak': {'min': 0, 'max': 1e-5},
+    'hpiv_high_leak': {'min': 0, 'max': 1e-5},
+    'hpiv_low_leak': {'min': 0, 'max': 1e-5},
+    'inlet_location': {'min': [-23.2, -88.45, 11.6], 'max': [-22.4, -87.75, 12.0]},
+    'outlet_anode': {'min': [47.65, 24.6, 11.4], 'max': [49.35, 26.4, 12.2]},
+    'outlet_cathode': {'min': [25.55, 24.6, 11.4], 'max': [27.25, 26.4, 12.2]},
+    'fms_envelope': {'min': [117.0, 141.4, 25.3], 'max': [119.0, 143.4, 27.3]},
+    'tv_housing_bonding': {'min': 0, 'max': 5},
+    'bonding_tv_housing': {'min': 0, 'max': 5},
+    'tv_housing_hpiv': {'min': 0, 'max': 5},
+    'hpiv_housing_tv': {'min': 0, 'max': 5},
+    'lpt_housing_bonding': {'min': 0, 'max': 5},
+    'bonding_lpt_housing': {'min': 0, 'max': 5},
+    'j01_bonding': {'min': 0, 'max': 30},
+    'bonding_j01': {'min': 0, 'max': 30},
+    'j02_bonding': {'min': 0, 'max': 30},
+    'bonding_j02': {'min': 0, 'max': 30},
+    'j01_pin_bonding': {'min': 0, 'max': 30},
+    'bonding_j01_pin': {'min': 0, 'max': 30},
+    'j02_pin_bonding': {'min': 0, 'max': 30},
+    'bonding_j02_pin': {'min': 0, 'max': 30},
+    'lpt_psig': {'min': 10e6, 'max': None},
+    'lpt_psig_rtn': {'min': 10e6, 'max': None},
+    'iso_lpt_tsig': {'min': 10e6, 'max': None},
+    'iso_lpt_tsig_rtn': {'min': 10e6, 'max': None},
+    'lpt_power': {'min': 10e6, 'max': None},
+    'lpt_power_rtn': {'min': 10e6, 'max': None},
+    'iso_pt_sgn': {'min': 10e6, 'max': None},
+    'iso_pt_sgn_rtn': {'min': 10e6, 'max': None},
+    'tv_power': {'min': 10e6, 'max': None},
+    'tv_power_rtn': {'min': 10e6, 'max': None},
+    'hpiv_power': {'min': 10e6, 'max': None},
+    'hpiv_power_rtn': {'min': 10e6, 'max': None},
+    'cap_lpt_tsig': {'min': 0, 'max': 50},
+    'cap_lpt_tsig_rtn': {'min': 0, 'max': 50},
+    'cap_pt_sgn': {'min': 0, 'max': 50},
+    'cap_pt_sgn_rtn': {'min': 0, 'max': 50},
+    'lpt_resistance': {'min': 3442-0.1*3442, 'max': 3442+0.1*3442, 'nominal': 3442, 'tolerance': 10},
+    'tv_resistance': {'min': 150-0.1*150, 'max': 150+0.1*150, 'nominal': 150, 'tolerance': 10},
+    'tv_pt_resistance': {'min': None, 'max': None},
+    'hpiv_resistance': {'min': 43.3-0.1*43.3, 'max': 43.3+0.1*43.3, 'nominal': 43.3, 'tolerance': 10},
+    'hpiv_opening_power': {'min': None, 'max': None},
+    'hpiv_opening_response': {'min': 0, 'max': 20},
+    'hpiv_hold_power': {'min': None, 'max': None},
+    'hpiv_closing_response': {'min': 0, 'max': 20},
+    'hpiv_pullin_voltage': {'min': 0, 'max': 18},
+    'hpiv_dropout_voltage': {'min': 0, 'max': 4},
+    'low_pressure_ext_leak': {'min': 0, 'max': 1e-6},
+    'high_pressure_ext_leak_low': {'min': 0, 'max': 1e-6},
+    'high_pressure_ext_leak_high': {'min': 0, 'max': 1e-6},
+}
@@ -0,0 +1,95 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+# Third-party
+import numpy as np
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+
+DEFAULT_BUCKETS = 1000
+"""Buckets per plotted series if the axes width is unknown; every bucket keeps its minimum and maximum."""
+
+
+def axis_buckets(ax: "Axes") -> int:
+    """
+    Number of buckets matching the pixel width of an axes, so every pixel column gets one min/max pair.
+    Args:
+        ax (Axes): Axes the series will be drawn on.
+    Returns:
+        int: Number of buckets.
+    """
+    width = ax.get_window_extent().width
+    return max(int(width), 100) if np.isfinite(width) and width > 0 else DEFAULT_BUCKETS
+
+
+def time_window(time: np.ndarray, start: float = None, end: float = None) -> slice | np.ndarray:
+    """
+    Indices of the samples with start <= time <= end, found by binary search on the time axis.
+    Unsorted time axes fall back to a boolean mask.
+    Args:
+        time (np.ndarray): Time axis.
+        start (float): Start of the window, None for no lower bound.
+        end (float): End of the window, None for no upper bound.
+    Returns:
+        slice | np.ndarray: Selection usable as index of the time axis and the series on it.
+    """
+    time = np.asarray(time, dtype=float)
+    if len(time) > 1 and np.any(time[1:] < time[:-1]):
+        mask = np.ones(len(time), dtype=bool)
+        if start is not None:
+            mask &= time >= start
+        if end is not None:
+            mask &= time <= end
+        return np.flatnonzero(mask)
+    lo = 0 if start is None else int(np.searchsorted(time, start, side='left'))
+    hi = len(time) if end is None else int(np.searchsorted(time, end, side='right'))
+    return slice(lo, max(lo, hi))
+
+
+def minmax_indices(values: np.ndarray, buckets: int = DEFAULT_BUCKETS) -> np.ndarray:
+    """
+    Indices of the minimum and maximum of every bucket of a series, plus its first and last sample.
+    NaN samples are ignored unless a bucket holds nothing else.
+    Args:
+        values (np.ndarray): Series values.
+        buckets (int): Number of buckets.
+    Returns:
+        np.ndarray: Sorted unique indices.
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if n <= 2 * buckets:
+        return np.arange(n)
+    size = -(-n // buckets)
+    full = (n // size) * size
+    starts = np.arange(0, full, size)
+    blocks = values[:full].reshape(-1, size)
+    nan = np.isnan(blocks)
+    lows = starts + np.argmin(np.where(nan, np.inf, blocks), axis=1)
+    highs = starts + np.argmax(np.where(nan, -np.inf, blocks), axis=1)
+    indices = [np.array([0, n - 1]), lows, highs]
+    if full < n:
+        tail = values[full:]
+        indices.append(full + np.array([np.nanargmin(tail), np.nanargmax(tail)]) if not np.isnan(tail).all() else np.array([full]))
+    return np.unique(np.concatenate(indices))
+
+
+def decimate(time: np.ndarray, *series: np.ndarray, buckets: int = DEFAULT_BUCKETS) -> tuple[np.ndarray, ...]:
+    """
+    Reduce series on a common time axis to about 2 * buckets points each, keeping the peaks:
+    the union of the per-bucket minima and maxima of every series is kept, so lines drawn
+    from the result cover the same pixels as the full resolution data.
+    Args:
+        time (np.ndarray): Time axis.
+        *series (np.ndarray): Series of the same length as the time axis.
+        buckets (int): Number of buckets per series, see axis_buckets.
+    Returns:
+        tuple[np.ndarray, ...]: The decimated time axis followed by the decimated series.
+    """
+    time = np.asarray(time, dtype=float)
+    series = [np.asarray(s, dtype=float) for s in series]
+    if len(time) <= 2 * buckets:
+        return (time, *series)
+    keep = np.unique(np.concatenate([minmax_indices(s, buckets) for s in series])) if series else minmax_indices(time, buckets)
+    return (time[keep], *(s[keep] for s in series))
@@ -0,0 +1,73 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..db import AnodeFR, CathodeFR
+
+
+def fr_certification(fr_id: str) -> str:
+    """
+    Certification (batch) of an FR ID, e.g. 'C25-0053' for 'C25-0053-012'.
+    """
+    return fr_id.rsplit("-", 1)[0]
+
+
+def fr_serial(fr_id: str) -> str:
+    """
+    Serial number of an FR ID within its batch, e.g. '012' for 'C25-0053-012'.
+    """
+    return fr_id.rsplit("-", 1)[-1]
+
+
+class FRBatchIndex:
+    """
+    FRs of a TRS grouped by certification in a single pass: per batch the FRs included in the TRS
+    (with flow rates) and the excluded ones (without), in the order they were given.
+
+    Attributes
+    ----------
+    included : dict[str, list[AnodeFR | CathodeFR]]
+        Certification -> included FRs, for every batch of the given FRs.
+    excluded : dict[str, list[AnodeFR | CathodeFR]]
+        Certification -> excluded FRs, only batches with exclusions.
+
+    Methods
+    -------
+    included_frs():
+        All included FRs, in the given order.
+    excluded_frs():
+        All excluded FRs, in the given order.
+    exclusions(batches):
+        Serial numbers of the excluded FRs per batch, in the order of the selected batches.
+    """
+
+    def __init__(self, frs: list[AnodeFR | CathodeFR]) -> None:
+        self.included: dict[str, list] = {}
+        self.excluded: dict[str, list] = {}
+        self._included_frs = []
+        self._excluded_frs = []
+        for entry in frs:
+            certification = fr_certification(entry.fr_id)
+            included = self.included.setdefault(certification, [])
+            if bool(entry.flow_rates):
+                included.append(entry)
+                self._included_frs.append(entry)
+            else:
+                self.excluded.setdefault(certification, []).append(entry)
+                self._excluded_frs.append(entry)
+
+    def included_frs(self) -> list[AnodeFR | CathodeFR]:
+        return list(self._included_frs)
+
+    def excluded_frs(self) -> list[AnodeFR | CathodeFR]:
+        return list(self._excluded_frs)
+
+    def exclusions(self, batches: list[str]) -> list[tuple[str, list[str]]]:
+        """
+        Serial numbers of the excluded FRs per batch.
+        Args:
+            batches (list[str]): Selected certifications, in display order.
+        Returns:
+            list[tuple[str, list[str]]]: (certification, serials) for the batches with exclusions.
+        """
+        return [(cert, [fr_serial(entry.fr_id) for entry in self.excluded[cert]]) for cert in batches if cert in self.excluded]
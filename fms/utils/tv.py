@@ -16,7 +16,6 @@ import ipywidgets as widgets
 from IPython.display import display
 import matplotlib.pyplot as plt
 import numpy as np
-import openpyxl
 import pandas as pd
 from sklearn.linear_model import LinearRegression
 from scipy.signal import savgol_filter
@@ -30,6 +29,11 @@ if TYPE_CHECKING:
 # Local imports
 from ..db import TVTestRuns, TVTestResults, TVCertification, TVStatus, TVTvac
 from .textract import TextractReader
+from .instrumentation import profiler
+from .tvac_reader import TVACReader
+from .columnar import ColumnarResults
+from .workbook_cache import SheetSnapshot, load_sheet
+from .tv_dimensions import dimension_row, update_dimension_store, invalidate_dimension_store
 from .general_utils import (
     compare_distributions,
     delete_json_file,
@@ -109,7 +113,8 @@ class TVListener(FileSystemEventHandler):
             try:
                 self.test_reference = os.path.basename(event.src_path).split('_LP_')[0]
                 self.tv_data = TVData(test_results_file=event.src_path)
-                self.tv_data.extract_tv_test_results_from_excel()
+                with profiler.stage("tv_listener/parse"):
+                    self.tv_data.extract_tv_test_results_from_excel()
                 self.processed = True
             finally:
                 self._processing = False
@@ -128,7 +133,8 @@ class TVListener(FileSystemEventHandler):
             self._processing = True
             try:
                 self.tv_data = TVData(csv_file=event.src_path)
-                self.tv_data.extract_tv_tvac_results()
+                with profiler.stage("tv_listener/parse"):
+                    self.tv_data.extract_tv_tvac_results()
                 self.processed = True
             finally:
                 self._processing = False
@@ -188,7 +194,7 @@ class TVData:
         Extracts TV test results from an xls file.
     clean_and_interpolate_date_field(tv_info: dict, date_key: str):
         Cleans and interpolates missing date fields in the TV information dictionary.
-    extract_tv_parameters(wb, tv_id_sequence, assembly_param_map, min_row, max_row):
+    extract_tv_parameters(sheet, tv_id_sequence, assembly_param_map, min_row, max_row):
         Extracts TV assembly parameters from the given workbook.
     extract_tv_assembly_from_excel():
         Extracts TV assembly parameters from the Excel file.
@@ -238,50 +244,35 @@ class TVData:
         self.alarm_columns = [param.value for param in TVTvacParameters if 'ALARM' in param.name]
         self.alarm_columns2 = [param.value for param in TVTvacParameters2 if 'ALARM' in param.name]
 
-    def extract_tv_tvac_results(self) -> None:
+    def extract_tv_tvac_results(self) -> ColumnarResults:
         """
         Extracts TVAC test results from the CSV file.
-        Uses pandas to read the CSV, processes the time column, and stores the results in test_parameters attribute.
+        The TVACReader detects the data layout once; exports with 16 columns follow TVTvacParameters,
+        wider exports TVTvacParameters2. Scan and alarm columns are skipped, the time column is
+        converted to hours since the first scan.
+        Returns:
+            ColumnarResults: Parameter name -> column array, also stored in test_parameters.
         """
-        try:
-            df = pd.read_csv(
-                self.csv_file,
-                sep=None,
-                engine='python',
-                encoding="utf-16",
-                skiprows=16,
-                names=self.tvac_columns
-            )
-            for col in self.alarm_columns:
-                if col in df.columns:
-                    df.drop(columns=[col], inplace=True)
-        except:
-            df = pd.read_csv(
-                self.csv_file,
-                sep=None,
-                engine='python',
-                encoding="utf-16",
-                skiprows=18,
-                names=self.tvac_columns2
-            )
-            for col in self.alarm_columns2:
-                if col in df.columns:
-                    df.drop(columns=[col], inplace=True)
-
-        df.drop(columns=['scan'], inplace=True)
+        reader = TVACReader(self.csv_file)
+        reader.sniff()
+        if reader.n_columns > len(self.tvac_columns):
+            columns, alarm_columns = self.tvac_columns2, self.alarm_columns2
+        else:
+            columns, alarm_columns = self.tvac_columns, self.alarm_columns
 
-        df["time"] = pd.to_datetime(df["time"], format="%d-%m-%Y %H:%M:%S:%f", errors="coerce")
+        usecols = [col for col in columns if col not in alarm_columns and col != TVTvacParameters.SCAN.value]
+        data = reader.read_columns(names=columns, usecols=usecols, time_column=TVTvacParameters.TIME.value,
+                                   time_format="%d-%m-%Y %H:%M:%S:%f")
 
-        first_time = df["time"].iloc[0]
-        df["time"] = (df["time"] - first_time).dt.total_seconds() / 3600
-        print(df.head())
-        self.test_parameters = df.to_dict(orient='records')
+        times = data[TVTvacParameters.TIME.value]
+        data[TVTvacParameters.TIME.value] = (times - times[0]) / np.timedelta64(1, 'h') if len(times) else times.astype(float)
+        self.test_parameters = ColumnarResults(data)
         return self.test_parameters
 
     def extract_tv_test_results_from_excel(self) -> bool:
         """
         Extracts TV test results from an xls file.
-        Uses pandas to read the Excel file, processes the data, and stores the results in test_parameters attribute.
+        Uses pandas to read the Excel file, processes the data, and stores the columns in the test_parameters attribute.
         """
         if not self.test_results_file:
             print("No test results file found")
@@ -333,8 +324,9 @@ class TVData:
             else:
                 self.temp_used_for_opening = TVTestParameters.FILTERED_BODY_TEMP.value
                 self.remark = "All temperature columns have invalid data; defaulting to filtered body temperature"
-        self.test_parameters = df.to_dict(orient='records')
-        self.get_opening_temperature()
+        self.test_parameters = ColumnarResults.from_dataframe(df, self.units)
+        with profiler.stage("analysis"):
+            self.get_opening_temperature()
         return True
 
     def clean_and_interpolate_date_field(self, tv_info: dict, date_key: str) -> None:
@@ -411,11 +403,11 @@ class TVData:
                     continue
 
 
-    def extract_tv_parameters(self, wb: openpyxl.Workbook, tv_id_sequence: list, assembly_param_map: dict, min_row: int, max_row: int) -> None:
+    def extract_tv_parameters(self, sheet: SheetSnapshot, tv_id_sequence: list, assembly_param_map: dict, min_row: int, max_row: int) -> None:
         """
-        Extracts TV assembly parameters from the given workbook with expected format.
+        Extracts TV assembly parameters from the given worksheet with expected format.
         Args:
-            wb (openpyxl.Workbook): The workbook object to extract data from.
+            sheet (SheetSnapshot): The (cached) assembly overview worksheet to extract data from.
             tv_id_sequence (list): List of TV IDs corresponding to columns in the workbook.
             assembly_param_map (dict): Mapping of parameter names to standardized keys and units.
             min_row (int): Minimum row index to start extraction.
@@ -425,7 +417,7 @@ class TVData:
         all_params = []
         unit_sequence = []
 
-        for col_idx, col in enumerate(wb.active.iter_cols(min_row=min_row, min_col=2, max_row=max_row, values_only=True)):
+        for col_idx, col in enumerate(sheet.iter_cols(min_row=min_row, min_col=2, max_row=max_row, values_only=True)):
             if all(cell is None for cell in col):
                 break
 
@@ -488,14 +480,9 @@ class TVData:
                 return tv_id_sequence[tv_idx]
             return None
 
-        wb = openpyxl.load_workbook(assembly_file, data_only=True)
-        wb.active = wb['Overview']
-
-        wb_summary = openpyxl.load_workbook(summary_file, data_only=True)
-        wb_summary = wb_summary.active
-
-        wb_status = openpyxl.load_workbook(status_file, data_only=True)
-        wb_status = wb_status["20025.12.AA"]
+        assembly_sheet = load_sheet(assembly_file, 'Overview')
+        wb_summary = load_sheet(summary_file)
+        wb_status = load_sheet(status_file, "20025.12.AA")
 
         self.tv_information = {}
         self.tv_parts = {}
@@ -514,7 +501,7 @@ class TVData:
             'Surface Roughness(um)': {'name': 'surface_roughness', 'unit': 'µm'},
         }
 
-        for col_idx, col in enumerate(wb.active.iter_cols(min_row=2, min_col=2, max_row=9, values_only=True)):
+        for col_idx, col in enumerate(assembly_sheet.iter_cols(min_row=2, min_col=2, max_row=9, values_only=True)):
 
             if all(cell is None for cell in col):
                 break
@@ -541,14 +528,14 @@ class TVData:
                         self.tv_parts[str(tv_id)][part_sequence[row_idx]] = cell
 
         # extract TV assembly parameters
-        self.extract_tv_parameters(wb, tv_id_sequence, assembly_param_map, min_row=12, max_row=18)
-        self.extract_tv_parameters(wb, tv_id_sequence, assembly_param_map, min_row=50, max_row=54)
+        self.extract_tv_parameters(assembly_sheet, tv_id_sequence, assembly_param_map, min_row=12, max_row=18)
+        self.extract_tv_parameters(assembly_sheet, tv_id_sequence, assembly_param_map, min_row=50, max_row=54)
 
         # self.clean_and_interpolate_date_field(self.tv_information, 'start_date')
         # self.clean_and_interpolate_date_field(self.tv_information, 'end_date')
     
         # min/max opening temperature row 20, columns from 3 onwards
-        for col_idx, cell in enumerate(wb.active.iter_cols(min_row=20, max_row=20, min_col=3, values_only=True)):
+        for col_idx, cell in enumerate(assembly_sheet.iter_cols(min_row=20, max_row=20, min_col=3, values_only=True)):
             tv_id = get_tv_id(col_idx, 1)
             if tv_id is None:
                 continue
@@ -569,7 +556,7 @@ class TVData:
         
 
         # welded status row 54, columns from 3 onwards
-        for col_idx, cell in enumerate(wb.active.iter_cols(min_row=58, max_row=58, min_col=3, values_only=True)):
+        for col_idx, cell in enumerate(assembly_sheet.iter_cols(min_row=58, max_row=58, min_col=3, values_only=True)):
             tv_id = get_tv_id(col_idx, 1)
             if tv_id is None:
                 continue
@@ -578,7 +565,7 @@ class TVData:
             self.tv_information[tv_id]['welded'] = {'value': welded, 'unit': ''}
 
         # status row 72, columns from 3 onwards
-        for col_idx, cell in enumerate(wb.active.iter_cols(min_row=76, max_row=76, min_col=3, values_only=True)):
+        for col_idx, cell in enumerate(assembly_sheet.iter_cols(min_row=76, max_row=76, min_col=3, values_only=True)):
             tv_id = get_tv_id(col_idx, 1)
             if tv_id is None:
                 continue
@@ -701,9 +688,9 @@ class TVData:
         """
 
         # Extract relevant data
-        self.body_temps = np.array([i[self.temp_used_for_opening] for i in self.test_parameters])
-        self.flow_rates = np.array([i[TVTestParameters.ANODE_FLOW.value] for i in self.test_parameters])
-        self.log_times = [i[TVTestParameters.LOGTIME.value] for i in self.test_parameters]
+        self.body_temps = np.array(self.test_parameters[self.temp_used_for_opening], dtype=float)
+        self.flow_rates = np.array(self.test_parameters[TVTestParameters.ANODE_FLOW.value], dtype=float)
+        self.log_times = np.array(self.test_parameters[TVTestParameters.LOGTIME.value])
 
         # Normalize flow rates to start from zero
         self.flow_rates -= np.min(self.flow_rates)
@@ -730,7 +717,7 @@ class TVData:
         n_points = len(self.heating_temps)
         if n_points < 15:
             print("Not enough valid data for smoothing; marking test as corrupt.")
-            self.test_parameters = []
+            self.test_parameters = ColumnarResults()
             self.opening_temperature = None
             self.hysteresis = None
             return
@@ -1712,6 +1699,7 @@ class TVLogicSQL:
             tv_parts = self.tv_data.extracted_tv_parts
             date = self.tv_data.booking_date
             certification = self.tv_data.certification
+            new_certs: list[TVCertification] = []
             if tv_parts:
                 
                 for part_name, part_info in tv_parts.items():
@@ -1735,6 +1723,7 @@ class TVLogicSQL:
                                     for _ in range(part_amount):
                                         new_cert = TVCertification(drawing=part_type, part_name=part_name, certification=certification, tv_id=tv_id, date = date)
                                         session.add(new_cert)
+                                        new_certs.append(new_cert)
                                         tv_status = session.query(TVStatus).filter_by(tv_id=tv_id).first()
                                         if tv_status:
                                             tv_status.status = TVProgressStatus.WELDING_COMPLETED
@@ -1767,7 +1756,11 @@ class TVLogicSQL:
                             if date:
                                 new_cert.date = date
                             session.add(new_cert)
+                            new_certs.append(new_cert)
+            session.flush()
+            new_rows = [dimension_row(cert) for cert in new_certs]
             session.commit()
+            update_dimension_store(session, new_rows)
             self.fms.print_table(TVCertification)
             
         except Exception as e:
@@ -1827,12 +1820,7 @@ class TVLogicSQL:
                 print("No TV test results to process")
                 return
         
-            results = {}
-            for row in self.tv_test_results:
-                for key, value in row.items():
-                    if key not in results:
-                        results[key] = []
-                    results[key].append(value)
+            results = self.tv_test_results.to_lists()
             current_test_date = self.test_id_to_datetime(test_reference)
             existing_cycles = session.query(TVTvac).filter_by(tv_id=self.tv_id, cycles=cycle_amount).first()
             if existing_cycles:
@@ -1910,18 +1898,20 @@ class TVLogicSQL:
         if characteristics:
             print(f"Test results for reference {self.tv_test_reference} already exist. Skipping entry.")
             return
-        for idx,row in enumerate(self.tv_test_results):
+        columns = [(param, self.tv_test_results[param].tolist(), self.tv_test_results.valid_mask(param).tolist())
+                   for param in self.tv_test_results]
+        for idx in range(self.tv_test_results.n_rows):
             try:
-                for param, value in row.items():    
+                for param, values, valid in columns:
                     unit = self.tv_units[param]
-                        
-                    if (isinstance(value, float) and np.isnan(value)) or str(value).lower() == "nan":
+
+                    if not valid[idx]:
                         continue
 
                     new_characteristic = TVTestResults(
                         test_reference=self.tv_test_reference,
                         parameter_name=param,
-                        parameter_value=value,
+                        parameter_value=values[idx],
                         unit = unit
                     )
                     session.add(new_characteristic)
@@ -2570,6 +2560,7 @@ class TVLogicSQL:
                 session.merge(TVStatus(**values))
 
             session.commit()
+            invalidate_dimension_store()
             # print(len(self.tv_temps), len(self.tv_flow_rates))
             # self.print_table(TVTestResults)
             # self.fms.print_table(TVCertification)
@@ -2669,6 +2660,7 @@ class TVLogicSQL:
                     session.add(new_cert_2)
 
                 session.commit()
+                invalidate_dimension_store()
             # self.fms.print_table(TVCertification)
             # self.fms.print_table(TVStatus)
         except Exception as e:
@@ -0,0 +1,279 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+# Standard library
+import threading
+
+# Third-party
+import numpy as np
+from sqlalchemy import func
+
+# Local imports
+from ..db import TVCertification
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+
+def _to_float(value: object) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _padded(rows: list[list], width: int) -> np.ndarray:
+    array = np.full((len(rows), width), np.nan)
+    for idx, row in enumerate(rows):
+        if row:
+            array[idx, :len(row)] = [_to_float(v) for v in row[:width]]
+    return array
+
+
+def dimension_row(cert: TVCertification) -> tuple:
+    """
+    Columns of a TVCertification entry as stored in the dimension store.
+    Args:
+        cert (TVCertification): Part certification entry (flushed, so part_id is set).
+    Returns:
+        tuple: (part_id, part_name, certification, tv_id, dimensions, nominal_dimensions, min_dimensions, max_dimensions).
+    """
+    return (cert.part_id, cert.part_name, cert.certification, cert.tv_id,
+            cert.dimensions, cert.nominal_dimensions, cert.min_dimensions, cert.max_dimensions)
+
+
+class PartDimensions:
+    """
+    Measured dimensions of every certified part of one type (e.g. all gaskets), as dense arrays.
+
+    The ragged JSON dimension lists of the TVCertification entries are normalized once into
+    (parts x dimensions) arrays padded with NaN, so distributions and trends are array slices.
+
+    Attributes
+    ----------
+    part_name : str
+        Part name (TVParts value).
+    part_ids : np.ndarray
+        TVCertification primary keys, one per row.
+    certifications : np.ndarray
+        Certification per row.
+    tv_ids : np.ndarray
+        TV the part is allocated to, NaN if not allocated.
+    lengths : np.ndarray
+        Number of recorded dimensions per row.
+    dimensions : np.ndarray
+        Measured dimensions, NaN padded.
+    nominal_dimensions : np.ndarray
+        Nominal dimensions, NaN padded.
+    min_dimensions : np.ndarray
+        Lower tolerance limits, NaN padded.
+    max_dimensions : np.ndarray
+        Upper tolerance limits, NaN padded.
+
+    Methods
+    -------
+    append(rows):
+        Add certification rows, widening the arrays if needed.
+    mask(certification='all', allocated=False):
+        Boolean row selection by certification and allocation.
+    row(tv_id):
+        Row of the part allocated to a TV.
+    column(idx, mask=None):
+        Recorded values of one dimension.
+    """
+
+    def __init__(self, part_name: str, rows: list[tuple] = None) -> None:
+        self.part_name = part_name
+        self.part_ids = np.empty(0, dtype=np.int64)
+        self.certifications = np.empty(0, dtype=object)
+        self.tv_ids = np.empty(0)
+        self.lengths = np.empty(0, dtype=np.int64)
+        self.dimensions = np.empty((0, 0))
+        self.nominal_dimensions = np.empty((0, 0))
+        self.min_dimensions = np.empty((0, 0))
+        self.max_dimensions = np.empty((0, 0))
+        if rows:
+            self.append(rows)
+
+    @property
+    def width(self) -> int:
+        return self.dimensions.shape[1]
+
+    def append(self, rows: list[tuple]) -> None:
+        """
+        Add certification rows (see dimension_row), widening the arrays if a row has more dimensions.
+        Args:
+            rows (list[tuple]): Rows of this part type.
+        """
+        if not rows:
+            return
+        _, _, certifications, tv_ids, dimensions, nominal, minimum, maximum = zip(*rows)
+        width = max([self.width] + [len(d) for group in (dimensions, nominal, minimum, maximum) for d in group if d])
+
+        def extend(existing: np.ndarray, new: list[list]) -> np.ndarray:
+            existing = np.pad(existing, ((0, 0), (0, width - existing.shape[1])), constant_values=np.nan)
+            return np.vstack([existing, _padded(new, width)])
+
+        self.part_ids = np.concatenate([self.part_ids, np.array([r[0] for r in rows], dtype=np.int64)])
+        self.certifications = np.concatenate([self.certifications, np.array(certifications, dtype=object)])
+        self.tv_ids = np.concatenate([self.tv_ids, np.array([np.nan if t is None else t for t in tv_ids], dtype=float)])
+        self.lengths = np.concatenate([self.lengths, np.array([len(d) if d else 0 for d in dimensions], dtype=np.int64)])
+        self.dimensions = extend(self.dimensions, dimensions)
+        self.nominal_dimensions = extend(self.nominal_dimensions, nominal)
+        self.min_dimensions = extend(self.min_dimensions, minimum)
+        self.max_dimensions = extend(self.max_dimensions, maximum)
+
+    def mask(self, certification: str = 'all', allocated: bool = False) -> np.ndarray:
+        """
+        Boolean row selection.
+        Args:
+            certification (str): Certification to keep, 'all' for every certification.
+            allocated (bool): Only keep parts allocated to a TV.
+        Returns:
+            np.ndarray: True for the selected rows.
+        """
+        mask = np.ones(len(self.part_ids), dtype=bool)
+        if certification != 'all':
+            mask &= self.certifications == certification
+        if allocated:
+            mask &= ~np.isnan(self.tv_ids)
+        return mask
+
+    def row(self, tv_id: int | None = None) -> int | None:
+        """
+        First row (lowest part_id) of a part allocated to the given TV, or to any TV if tv_id is None.
+        Args:
+            tv_id (int | None): TV ID.
+        Returns:
+            int | None: Row index, None if there is no such part.
+        """
+        matches = np.flatnonzero(~np.isnan(self.tv_ids) if tv_id is None else self.tv_ids == tv_id)
+        return int(matches[0]) if len(matches) else None
+
+    def column(self, idx: int, mask: np.ndarray = None) -> np.ndarray:
+        """
+        Recorded values of one dimension, NaN (not recorded) entries removed.
+        Args:
+            idx (int): Dimension index (0-based).
+            mask (np.ndarray): Row selection, defaults to all rows.
+        Returns:
+            np.ndarray: Dimension values.
+        """
+        if idx >= self.width:
+            return np.empty(0)
+        values = self.dimensions[:, idx] if mask is None else self.dimensions[mask, idx]
+        return values[~np.isnan(values)]
+
+
+class DimensionStore:
+    """
+    Per-part dimension arrays of all TV part certifications of a database.
+
+    Attributes
+    ----------
+    parts : dict[str, PartDimensions]
+        Part name -> dimension arrays.
+    signature : tuple
+        Row count, highest part_id and number of allocated parts when the store was last synchronized.
+
+    Methods
+    -------
+    part(part_name):
+        Dimension arrays of a part type.
+    add(rows):
+        Add certification rows to the per-part arrays.
+    """
+
+    def __init__(self, rows: list[tuple] = None, signature: tuple = None) -> None:
+        self.parts: dict[str, PartDimensions] = {}
+        self.signature = signature
+        self.add(rows or [])
+
+    def part(self, part_name: str) -> PartDimensions:
+        """
+        Dimension arrays of a part type, empty if no such part is certified.
+        """
+        return self.parts.get(part_name) or PartDimensions(part_name)
+
+    def add(self, rows: list[tuple]) -> None:
+        """
+        Add certification rows (see dimension_row) to the arrays of their part type.
+        """
+        grouped: dict[str, list[tuple]] = {}
+        for row in rows:
+            grouped.setdefault(row[1], []).append(row)
+        for part_name, part_rows in grouped.items():
+            self.parts.setdefault(part_name, PartDimensions(part_name)).append(part_rows)
+
+
+_store_cache: dict[str, DimensionStore] = {}
+_store_lock = threading.Lock()
+
+
+def _signature(session: "Session") -> tuple:
+    return tuple(session.query(func.count(TVCertification.part_id), func.max(TVCertification.part_id),
+                               func.count(TVCertification.tv_id)).one())
+
+
+def load_dimension_store(session: "Session") -> DimensionStore:
+    """
+    Dimension store of the database, built once with a single query and reused until the
+    certification table changes (row count, highest part_id or number of allocated parts),
+    or invalidate_dimension_store() is called.
+    Args:
+        session (Session): Database session.
+    Returns:
+        DimensionStore: Per-part dimension arrays.
+    """
+    key = str(session.get_bind().url)
+    signature = _signature(session)
+    with _store_lock:
+        cached = _store_cache.get(key)
+        if cached is not None and cached.signature == signature:
+            return cached
+
+    rows = session.query(
+        TVCertification.part_id,
+        TVCertification.part_name,
+        TVCertification.certification,
+        TVCertification.tv_id,
+        TVCertification.dimensions,
+        TVCertification.nominal_dimensions,
+        TVCertification.min_dimensions,
+        TVCertification.max_dimensions
+    ).order_by(TVCertification.part_id).all()
+    store = DimensionStore(rows, signature=signature)
+
+    with _store_lock:
+        _store_cache[key] = store
+    return store
+
+
+def update_dimension_store(session: "Session", rows: list[tuple]) -> None:
+    """
+    Append newly committed certification rows to the cached store of the database, if any,
+    instead of rebuilding it on the next query. The store is dropped if the table changed otherwise.
+    Args:
+        session (Session): Session the rows were committed with.
+        rows (list[tuple]): New rows, see dimension_row.
+    """
+    key = str(session.get_bind().url)
+    signature = _signature(session)
+    with _store_lock:
+        store = _store_cache.get(key)
+        if store is None:
+            return
+        if store.signature is None or store.signature[0] + len(rows) != signature[0]:
+            # Other writes happened in between, rebuild on the next query
+            del _store_cache[key]
+            return
+        store.add(rows)
+        store.signature = signature
+
+
+def invalidate_dimension_store() -> None:
+    """
+    Forget the cached dimension stores, e.g. after parts were allocated to TVs.
+    """
+    with _store_lock:
+        _store_cache.clear()
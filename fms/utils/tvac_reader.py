@@ -0,0 +1,162 @@
+# Standard library
+import csv
+import re
+
+# Third-party
+import numpy as np
+import pandas as pd
+
+
+class TVACReader:
+    """
+    Columnar reader for the (UTF-16) CSV exports of the TVAC data loggers.
+
+    The layout (separator, header line, first data line, column count) is detected once
+    from the first few KB of the file, after which the file is parsed in chunks with the
+    pandas C engine, restricted to the requested columns. The result is a dictionary of
+    NumPy arrays, one per column, instead of a DataFrame or a list of row dictionaries.
+
+    Attributes
+    ----------
+    csv_file : str
+        Path to the CSV export.
+    encoding : str
+        File encoding, the loggers write UTF-16.
+    sample_size : int
+        Number of characters read to detect the layout.
+    chunksize : int
+        Number of rows parsed per chunk.
+    sep : str
+        Detected field separator.
+    header : list[str] | None
+        Column names from the header line, None for exports without a header line.
+    data_row : int
+        Index of the first data line (number of lines to skip).
+    n_columns : int
+        Number of fields in the data lines.
+
+    Methods
+    -------
+    sniff():
+        Detect the separator, header line and first data line from the start of the file.
+    read_columns(names=None, usecols=None, time_column=None, time_format=None):
+        Parse the file into a dictionary of column arrays.
+    """
+
+    separators = ['\t', ';', ',']
+    timestamp_pattern = re.compile(r'^\d{1,4}[-/]\d{1,2}[-/]\d{1,4}[ T]\d{1,2}:\d{2}:\d{2}')
+
+    def __init__(self, csv_file: str, encoding: str = 'utf-16', sample_size: int = 65536, chunksize: int = 200000) -> None:
+        self.csv_file = csv_file
+        self.encoding = encoding
+        self.sample_size = sample_size
+        self.chunksize = chunksize
+        self.sep = None
+        self.header = None
+        self.data_row = None
+        self.n_columns = None
+
+    def _split(self, line: str, sep: str) -> list[str]:
+        return next(csv.reader([line], delimiter=sep))
+
+    def _is_data_line(self, fields: list[str]) -> bool:
+        return len(fields) > 2 and fields[0].strip().isdigit() and bool(self.timestamp_pattern.match(fields[1].strip()))
+
+    def sniff(self) -> None:
+        """
+        Detect the layout of the export from its first sample_size characters.
+        The first data line is the first line starting with a scan number followed by a timestamp,
+        the header line (if any) is the line right above it starting with 'Scan'.
+        """
+        with open(self.csv_file, 'r', encoding=self.encoding, newline='') as f:
+            sample = f.read(self.sample_size)
+        lines = sample.splitlines()
+        if len(sample) >= self.sample_size:
+            lines = lines[:-1]
+
+        for sep in self.separators:
+            for idx, line in enumerate(lines):
+                fields = self._split(line, sep)
+                if not self._is_data_line(fields):
+                    continue
+                following = [self._split(l, sep) for l in lines[idx + 1: idx + 6] if l.strip()]
+                if any(len(f) != len(fields) for f in following):
+                    continue
+                self.sep = sep
+                self.data_row = idx
+                self.n_columns = len(fields)
+                previous = self._split(lines[idx - 1], sep) if idx > 0 else []
+                if previous and previous[0].strip().strip('"').lower() == 'scan':
+                    self.header = [name.strip() for name in previous]
+                return
+
+        raise ValueError(f"Could not detect the TVAC data layout of {self.csv_file}")
+
+    def read_columns(self, names: list[str] = None, usecols: list[str] = None, time_column: str = None,
+                     time_format: str = None) -> dict[str, np.ndarray]:
+        """
+        Parse the export into column arrays.
+        Args:
+            names (list[str]): Column names to use instead of the header line (exports without header).
+                If longer than the number of fields, it is truncated.
+            usecols (list[str]): Columns to keep, defaults to all.
+            time_column (str): Column holding the logger timestamps, kept as datetime64 values.
+            time_format (str): strftime format of the timestamps. If it does not match, the format is inferred.
+        Returns:
+            dict[str, np.ndarray]: Column name -> array, numeric columns as float64 (forward filled).
+        """
+        if self.sep is None:
+            self.sniff()
+
+        columns = list(names[:self.n_columns]) if names else list(self.header or range(self.n_columns))
+        usecols = [c for c in (usecols or columns) if c in columns]
+        dtypes = {time_column: str} if time_column in usecols else None
+
+        chunks: dict[str, list[np.ndarray]] = {col: [] for col in usecols}
+        reader = pd.read_csv(
+            self.csv_file,
+            sep=self.sep,
+            engine='c',
+            encoding=self.encoding,
+            skiprows=self.data_row,
+            header=None,
+            names=columns,
+            usecols=usecols,
+            dtype=dtypes,
+            on_bad_lines='skip',
+            chunksize=self.chunksize
+        )
+        for chunk in reader:
+            for col in usecols:
+                if col == time_column:
+                    chunks[col].append(chunk[col].to_numpy(dtype=object))
+                else:
+                    chunks[col].append(pd.to_numeric(chunk[col], errors='coerce').to_numpy(dtype=float))
+
+        data = {}
+        for col, parts in chunks.items():
+            values = np.concatenate(parts) if parts else np.array([], dtype=object if col == time_column else float)
+            if col == time_column:
+                data[col] = self._parse_times(values, time_format)
+            else:
+                data[col] = self._ffill(values)
+        return data
+
+    def _parse_times(self, values: np.ndarray, time_format: str = None) -> np.ndarray:
+        times = pd.Series(values, dtype=object)
+        if time_format:
+            parsed = pd.to_datetime(times, format=time_format, errors='coerce')
+            if not parsed.isna().all():
+                return parsed.ffill().to_numpy()
+        # Milliseconds are written as HH:MM:SS:mmm by the loggers
+        times = times.str.replace(r'(?<=\d{2}:\d{2}:\d{2}):', '.', regex=True)
+        return pd.to_datetime(times, errors='coerce').ffill().to_numpy()
+
+    @staticmethod
+    def _ffill(values: np.ndarray) -> np.ndarray:
+        mask = np.isnan(values)
+        if not mask.any():
+            return values
+        idx = np.where(~mask, np.arange(len(values)), 0)
+        np.maximum.accumulate(idx, out=idx)
+        return values[idx]
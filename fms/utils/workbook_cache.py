@@ -0,0 +1,310 @@
+# Standard library
+import os
+import posixpath
+import threading
+import zipfile
+from collections.abc import Iterator
+from xml.etree import ElementTree
+from xml.parsers import expat
+
+# Third-party
+import openpyxl
+from openpyxl.utils import column_index_from_string
+
+
+class SheetSnapshot:
+    """
+    Read-only, in-memory copy of the cell values of a worksheet.
+
+    Mirrors the values_only iteration of an openpyxl worksheet (1-based rows and columns),
+    so parsers written against openpyxl keep working, and adds indexed lookups (key -> row)
+    that are built once per snapshot and shared by every parser using the same workbook.
+
+    Attributes
+    ----------
+    title : str
+        Worksheet name.
+    rows : list[tuple]
+        Cell values per row, all rows padded to max_column.
+    max_row : int
+        Number of rows.
+    max_column : int
+        Number of columns.
+
+    Methods
+    -------
+    iter_rows(min_row=1, max_row=None, min_col=1, max_col=None):
+        Iterate over row value tuples.
+    iter_cols(min_row=1, max_row=None, min_col=1, max_col=None):
+        Iterate over column value tuples.
+    value(row, column):
+        Value of a single cell.
+    index(column=1, min_row=2, max_col=None, prefix=None):
+        Lookup table of key column value -> row values.
+    """
+
+    def __init__(self, title: str, rows: list[tuple]) -> None:
+        self.title = title
+        self.max_column = max((len(row) for row in rows), default=0)
+        self.rows = [tuple(row) + (None,) * (self.max_column - len(row)) for row in rows]
+        self.max_row = len(self.rows)
+        self._indexes: dict[tuple, dict] = {}
+        self._lock = threading.Lock()
+
+    def _bounds(self, min_row: int, max_row: int, min_col: int, max_col: int) -> tuple[int, int, int, int]:
+        max_row = self.max_row if max_row is None else max_row
+        max_col = self.max_column if max_col is None else max_col
+        return max(min_row, 1), max_row, max(min_col, 1), max_col
+
+    def _row(self, row: int, min_col: int, max_col: int) -> tuple:
+        values = self.rows[row - 1] if row <= self.max_row else ()
+        values = values[min_col - 1:max_col]
+        return values + (None,) * (max_col - min_col + 1 - len(values))
+
+    def iter_rows(self, min_row: int = 1, max_row: int = None, min_col: int = 1, max_col: int = None,
+                  values_only: bool = True) -> Iterator[tuple]:
+        """
+        Iterate over the rows as value tuples, like Worksheet.iter_rows(values_only=True).
+        """
+        min_row, max_row, min_col, max_col = self._bounds(min_row, max_row, min_col, max_col)
+        for row in range(min_row, max_row + 1):
+            yield self._row(row, min_col, max_col)
+
+    def iter_cols(self, min_row: int = 1, max_row: int = None, min_col: int = 1, max_col: int = None,
+                  values_only: bool = True) -> Iterator[tuple]:
+        """
+        Iterate over the columns as value tuples, like Worksheet.iter_cols(values_only=True).
+        """
+        min_row, max_row, min_col, max_col = self._bounds(min_row, max_row, min_col, max_col)
+        block = [self._row(row, min_col, max_col) for row in range(min_row, max_row + 1)]
+        for col in range(max_col - min_col + 1):
+            yield tuple(row[col] for row in block)
+
+    def value(self, row: int, column: int) -> object:
+        """
+        Value of the cell at (row, column), None outside the used range.
+        """
+        return self._row(row, column, column)[0]
+
+    def index(self, column: int = 1, min_row: int = 2, max_col: int = None, prefix: int = None) -> dict[str, tuple]:
+        """
+        Lookup table of the (stripped, string) values of a key column -> row values.
+        Stops at the first empty row, later duplicates overwrite earlier ones.
+        Built once per snapshot and argument combination.
+        Args:
+            column (int): Key column (1-based).
+            min_row (int): First data row (1-based).
+            max_col (int): Last column of the returned rows, shorter rows are padded with None.
+            prefix (int): Only keep the first prefix characters of the key (e.g. serials followed by a revision).
+        Returns:
+            dict[str, tuple]: Key -> row values.
+        """
+        cache_key = (column, min_row, max_col, prefix)
+        with self._lock:
+            if cache_key in self._indexes:
+                return self._indexes[cache_key]
+        lookup = {}
+        for row in self.iter_rows(min_row=min_row, max_col=max_col):
+            if all(cell is None for cell in row):
+                break
+            key = row[column - 1]
+            if key is None:
+                continue
+            key = str(key).strip()
+            lookup[key[:prefix] if prefix else key] = row
+        with self._lock:
+            self._indexes[cache_key] = lookup
+        return lookup
+
+
+_snapshot_cache: dict[tuple[str, int, int], dict[str, SheetSnapshot]] = {}
+_snapshot_lock = threading.Lock()
+
+
+def load_sheet(path: str, sheet: str = None) -> SheetSnapshot:
+    """
+    Snapshot of a worksheet, loaded once per workbook version.
+    The workbook is opened with read_only=True and data_only=True and closed right away,
+    snapshots are cached per path, modification time and size, so a master file on the network
+    share is only parsed again after it changed.
+    Args:
+        path (str): Path to the Excel workbook.
+        sheet (str): Worksheet name, defaults to the active sheet.
+    Returns:
+        SheetSnapshot: Cell values of the worksheet.
+    """
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    name = sheet or ""
+    with _snapshot_lock:
+        sheets = _snapshot_cache.get(key, {})
+        if name in sheets:
+            return sheets[name]
+
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet] if sheet else wb.active
+        snapshot = SheetSnapshot(ws.title, list(ws.iter_rows(values_only=True)))
+    finally:
+        wb.close()
+
+    with _snapshot_lock:
+        # Drop snapshots of older versions of the same workbook
+        for cached in [k for k in _snapshot_cache if k[0] == key[0] and k != key]:
+            del _snapshot_cache[cached]
+        _snapshot_cache.setdefault(key, {})[name] = snapshot
+    return snapshot
+
+class SheetRecord:
+    """
+    One worksheet row of a streamed sheet.
+
+    Attributes
+    ----------
+    row : int
+        Row number (1-based).
+    values : tuple
+        Cell values of the row.
+    filled : bool
+        Whether the flag column of the row has a solid fill.
+    """
+
+    __slots__ = ("row", "values", "filled")
+
+    def __init__(self, row: int, values: tuple, filled: bool) -> None:
+        self.row = row
+        self.values = values
+        self.filled = filled
+
+
+def _open_sheet(wb: openpyxl.Workbook, sheet: str = None, fallback: bool = False):
+    if sheet and (sheet in wb.sheetnames or not fallback):
+        return wb[sheet]
+    return wb.active
+
+
+_MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+
+
+def _sheet_part(archive: zipfile.ZipFile, sheet: str = None, fallback: bool = False) -> str:
+    workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+    sheets = workbook.findall(f"{_MAIN_NS}sheets/{_MAIN_NS}sheet")
+    names = [entry.get("name") for entry in sheets]
+    if sheet and sheet in names:
+        chosen = sheets[names.index(sheet)]
+    elif sheet and not fallback:
+        raise KeyError(f"Worksheet {sheet} does not exist.")
+    else:
+        view = workbook.find(f"{_MAIN_NS}bookViews/{_MAIN_NS}workbookView")
+        chosen = sheets[int(view.get("activeTab", 0)) if view is not None else 0]
+    rels = ElementTree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    target = next(rel.get("Target") for rel in rels if rel.get("Id") == chosen.get(f"{_REL_NS}id"))
+    return target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target))
+
+
+def _solid_styles(archive: zipfile.ZipFile) -> set[int]:
+    if "xl/styles.xml" not in archive.namelist():
+        return set()
+    styles = ElementTree.fromstring(archive.read("xl/styles.xml"))
+    patterns = []
+    for fill in styles.findall(f"{_MAIN_NS}fills/{_MAIN_NS}fill"):
+        pattern = fill.find(f"{_MAIN_NS}patternFill")
+        patterns.append(pattern.get("patternType") if pattern is not None else None)
+    solid = set()
+    for idx, xf in enumerate(styles.findall(f"{_MAIN_NS}cellXfs/{_MAIN_NS}xf")):
+        fill_id = int(xf.get("fillId", 0))
+        if fill_id < len(patterns) and patterns[fill_id] == "solid":
+            solid.add(idx)
+    return solid
+
+
+_fill_cache: dict[tuple[str, int, int], dict[tuple, frozenset[int]]] = {}
+_fill_lock = threading.Lock()
+
+
+def filled_rows(path: str, sheet: str = None, column: int = 1, fallback: bool = False) -> frozenset[int]:
+    """
+    Rows whose cell in a column has a solid fill (e.g. the operator flag of the FR databases).
+    Scans the worksheet XML for the style ids of that column only, without building cell objects,
+    the result is cached per workbook version.
+    Args:
+        path (str): Path to the Excel workbook.
+        sheet (str): Worksheet name, defaults to the active sheet.
+        column (int): Flag column (1-based).
+        fallback (bool): Use the active sheet if the named sheet does not exist.
+    Returns:
+        frozenset[int]: Row numbers (1-based) with a solid fill.
+    """
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    name = (sheet or "", column, fallback)
+    with _fill_lock:
+        cached = _fill_cache.get(key, {})
+        if name in cached:
+            return cached[name]
+
+    rows = set()
+    with zipfile.ZipFile(path) as archive:
+        solid = _solid_styles(archive)
+        part = _sheet_part(archive, sheet, fallback)
+        if solid:
+            position = {"row": 0, "col": 0}
+
+            def start_element(tag: str, attrs: dict) -> None:
+                tag = tag.rsplit(":", 1)[-1]
+                if tag == "row":
+                    position["row"] = int(attrs.get("r", position["row"] + 1))
+                    position["col"] = 0
+                elif tag == "c":
+                    ref = attrs.get("r")
+                    position["col"] = column_index_from_string(ref.rstrip("0123456789")) if ref else position["col"] + 1
+                    if position["col"] == column and int(attrs.get("s", 0)) in solid:
+                        rows.add(position["row"])
+
+            # expat without a tree: only the start tags are looked at
+            parser = expat.ParserCreate()
+            parser.StartElementHandler = start_element
+            with archive.open(part) as xml:
+                parser.ParseFile(xml)
+    rows = frozenset(rows)
+
+    with _fill_lock:
+        for stale in [k for k in _fill_cache if k[0] == key[0] and k != key]:
+            del _fill_cache[stale]
+        _fill_cache.setdefault(key, {})[name] = rows
+    return rows
+
+
+def iter_records(path: str, sheet: str = None, min_row: int = 1, flag_column: int = 1, fallback: bool = False) -> Iterator[SheetRecord]:
+    """
+    Stream the rows of a worksheet as records, without keeping the sheet in memory.
+    The values come from a read-only, data-only pass; the fill flags from a separate scan of
+    the style ids of the flag column (see filled_rows), as read-only values carry no styles.
+    Args:
+        path (str): Path to the Excel workbook.
+        sheet (str): Worksheet name, defaults to the active sheet.
+        min_row (int): First row (1-based).
+        flag_column (int): Column whose solid fill sets SheetRecord.filled.
+        fallback (bool): Use the active sheet if the named sheet does not exist.
+    Yields:
+        SheetRecord: Row number, values and fill flag per row.
+    """
+    flagged = filled_rows(path, sheet, flag_column, fallback)
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = _open_sheet(wb, sheet, fallback)
+        for row_number, values in enumerate(ws.iter_rows(min_row=min_row, values_only=True), start=min_row):
+            yield SheetRecord(row_number, values, row_number in flagged)
+    finally:
+        wb.close()
+
+
+def clear_workbook_cache() -> None:
+    """
+    Forget all cached worksheet snapshots and fill flags.
+    """
+    with _snapshot_lock:
+        _snapshot_cache.clear()
+    with _fill_lock:
+        _fill_cache.clear()